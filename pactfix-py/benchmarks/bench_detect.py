@@ -0,0 +1,303 @@
+#!/usr/bin/env python3
+"""Benchmark `detect_language` against the previous if-chain implementation.
+
+Usage:
+    python benchmarks/bench_detect.py [--repeat 200] [--large-kb 512]
+
+Every fixture under tests/fixtures, test-projects and ../examples is
+classified by both implementations, with and without its filename; the
+script exits non-zero if any result differs. Timings are reported for the
+fixture set and for a large, unnamed input where the prefix fast path
+applies.
+"""
+
+import argparse
+import re
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from pactfix.analyzer import detect_language  # noqa: E402
+
+FIXTURE_DIRS = (ROOT / 'tests' / 'fixtures', ROOT / 'test-projects', ROOT.parent / 'examples')
+
+
+def legacy_detect_language(code: str, filename: str = None) -> str:
+    """detect_language as it was before the lookup tables (reference copy)."""
+    lines = code.strip().split('\n')
+    first_line = lines[0] if lines else ''
+    
+    if filename:
+        fn_lower = filename.lower()
+        fn_name = Path(filename).name.lower()
+        
+        if fn_name == 'dockerfile' or fn_lower.endswith('/dockerfile'):
+            return 'dockerfile'
+        if any(fn_lower.endswith(x) for x in ['docker-compose.yml', 'docker-compose.yaml', 'compose.yml', 'compose.yaml']):
+            return 'docker-compose'
+        if fn_lower.endswith('.tf'):
+            return 'terraform'
+        if fn_lower.endswith('.sql'):
+            return 'sql'
+        if fn_lower.endswith('nginx.conf') or '.nginx' in fn_lower:
+            return 'nginx'
+        if fn_lower.endswith(('.yml', '.yaml')) and ('workflow' in fn_lower or '.github' in fn_lower):
+            return 'github-actions'
+        if fn_name in ('.gitlab-ci.yml', '.gitlab-ci.yaml'):
+            return 'gitlab-ci'
+        if any(x in fn_lower for x in ['playbook', 'ansible']):
+            return 'ansible'
+        if fn_name in ('chart.yaml', 'chart.yml', 'values.yaml', 'values.yml'):
+            return 'helm'
+        if '/templates/' in fn_lower and fn_lower.endswith(('.yml', '.yaml')):
+            return 'helm'
+        if fn_lower.endswith(('.tpl', '.gotmpl')):
+            return 'helm'
+        if fn_lower.endswith('.py'):
+            return 'python'
+        if fn_lower.endswith('.php'):
+            return 'php'
+        if fn_lower.endswith('.js'):
+            if 'require(' in code or 'module.exports' in code:
+                return 'nodejs'
+            return 'javascript'
+        if fn_lower.endswith('.sh'):
+            return 'bash'
+        if fn_lower.endswith('.ts') or fn_lower.endswith('.tsx'):
+            return 'typescript'
+        if fn_lower.endswith('.go'):
+            return 'go'
+        if fn_lower.endswith('.rs'):
+            return 'rust'
+        if fn_lower.endswith('.java'):
+            return 'java'
+        if fn_lower.endswith('.cs'):
+            return 'csharp'
+        if fn_lower.endswith('.rb'):
+            return 'ruby'
+        if fn_lower.endswith('.json') or fn_lower.endswith('.jsonc'):
+            return 'json'
+        if fn_lower.endswith('.toml'):
+            return 'toml'
+        if fn_lower.endswith('.ini') or fn_lower.endswith('.cfg'):
+            return 'ini'
+        if fn_name == 'makefile' or fn_lower.endswith('.mk'):
+            return 'makefile'
+        if fn_lower.endswith('.html') or fn_lower.endswith('.htm'):
+            return 'html'
+        if fn_lower.endswith('.css'):
+            return 'css'
+        if fn_lower.endswith('.conf') and 'apache' in fn_lower:
+            return 'apache'
+        if fn_lower.endswith('.service') or fn_lower.endswith('.timer'):
+            return 'systemd'
+        if fn_lower.endswith('.md') or fn_lower.endswith('.markdown') or fn_lower.endswith('.mdx'):
+            if 'markpact:' in code:
+                return 'markpact'
+            return 'markdown'
+        if fn_name == 'jenkinsfile':
+            return 'jenkinsfile'
+        if fn_lower.endswith(('.yml', '.yaml')):
+            # Check for specific YAML types first
+            if 'workflow' in fn_lower or '.github' in fn_lower:
+                return 'github-actions'
+            if fn_name in ('.gitlab-ci.yml', '.gitlab-ci.yaml'):
+                return 'gitlab-ci'
+            if fn_name in ('chart.yaml', 'chart.yml', 'values.yaml', 'values.yml'):
+                return 'helm'
+            if '/templates/' in fn_lower:
+                return 'helm'
+            # Check for Kubernetes patterns in filename
+            if any(x in fn_lower for x in ['deployment', 'service', 'configmap', 'secret', 'ingress', 'statefulset', 'daemonset', 'cronjob']):
+                return 'kubernetes'
+            return 'yaml'
+
+    # Content-based detection
+    if any(line.strip().upper().startswith(('FROM ', 'RUN ', 'COPY ', 'ENTRYPOINT ')) for line in lines[:20]):
+        if 'FROM ' in code.upper():
+            return 'dockerfile'
+    
+    if 'services:' in code and ('image:' in code or 'build:' in code):
+        return 'docker-compose'
+    
+    if 'apiVersion:' in code and 'kind:' in code:
+        return 'kubernetes'
+    
+    if 'resource "' in code or 'provider "' in code or 'variable "' in code:
+        return 'terraform'
+    
+    sql_keywords = ['SELECT ', 'INSERT ', 'UPDATE ', 'DELETE ', 'CREATE TABLE', 'DROP ']
+    if any(kw in code.upper() for kw in sql_keywords):
+        return 'sql'
+    
+    if 'on:' in code and ('push:' in code or 'pull_request:' in code) and 'jobs:' in code:
+        return 'github-actions'
+    
+    if 'stages:' in code and 'script:' in code and ('.gitlab-ci' in (filename or '').lower() or 'gitlab' in code.lower()):
+        return 'gitlab-ci'
+
+    if ('pipeline {' in code or 'node {' in code) and ('stage(' in code or 'stages {' in code):
+        return 'jenkinsfile'
+    
+    if '- hosts:' in code or ('- name:' in code and 'tasks:' in code):
+        return 'ansible'
+
+    if '{{' in code and '}}' in code and ('.Values' in code or '.Release' in code or '.Chart' in code):
+        return 'helm'
+    
+    if 'server {' in code or 'location ' in code:
+        return 'nginx'
+    
+    # TypeScript detection
+    if 'interface ' in code and '{' in code and (':' in code or 'export ' in code):
+        return 'typescript'
+    
+    # Go detection
+    if 'package ' in code and ('func ' in code or 'import (' in code):
+        return 'go'
+    
+    # Rust detection
+    if 'fn ' in code and ('let ' in code or 'use ' in code) and '::' in code:
+        return 'rust'
+    
+    # Java detection
+    if ('public class ' in code or 'private class ' in code) and 'void ' in code:
+        return 'java'
+    
+    # C# detection
+    if 'namespace ' in code and ('class ' in code or 'interface ' in code):
+        return 'csharp'
+    
+    # Ruby detection
+    if 'def ' in code and 'end' in code and ('class ' in code or 'module ' in code):
+        return 'ruby'
+    
+    yaml_key_lines = sum(1 for l in lines if re.match(r'^\s*[A-Za-z0-9_.-]+\s*:\s*\S?', l))
+    has_makefile_recipe = re.search(r'^\t(?!\s*[A-Za-z0-9_.-]+\s*:)\S', code, re.MULTILINE) is not None
+    if yaml_key_lines >= 3 and not has_makefile_recipe and not re.search(r'^\s*(?:export\s+)?[A-Za-z_][A-Za-z0-9_]*\s*[:+?]?=\s*', code, re.MULTILINE):
+        return 'yaml'
+    
+    # Makefile detection
+    if (re.search(r'^[A-Za-z0-9_.-]+:\s*$', code, re.MULTILINE) or '.PHONY:' in code) and (has_makefile_recipe or '.PHONY:' in code):
+        return 'makefile'
+    
+    # HTML detection
+    if '<!DOCTYPE' in code.upper() or '<html' in code.lower():
+        return 'html'
+    
+    # CSS detection
+    if re.search(r'[.#]\w+\s*\{', code) and ':' in code and ';' in code:
+        return 'css'
+    
+    # Apache config detection
+    if '<VirtualHost' in code or 'ServerName' in code or 'DocumentRoot' in code:
+        return 'apache'
+    
+    # Systemd unit detection
+    if '[Unit]' in code or '[Service]' in code or '[Install]' in code:
+        return 'systemd'
+    
+    if first_line.startswith('#!'):
+        if 'python' in first_line.lower():
+            return 'python'
+        if 'bash' in first_line or 'sh' in first_line:
+            return 'bash'
+        if 'node' in first_line:
+            return 'nodejs'
+    
+    if '<?php' in code:
+        return 'php'
+    
+    python_patterns = [r'^def\s+\w+\s*\(', r'^class\s+\w+.*:', r'^import\s+\w+', r'^from\s+\w+\s+import']
+    for pattern in python_patterns:
+        if any(re.search(pattern, line) for line in lines):
+            return 'python'
+    
+    if 'require(' in code or 'module.exports' in code:
+        return 'nodejs'
+    
+    js_patterns = [r'\bconst\s+\w+\s*=', r'\blet\s+\w+\s*=', r'\bvar\s+\w+\s*=', r'function\s+\w+\s*\(']
+    for pattern in js_patterns:
+        if any(re.search(pattern, line) for line in lines):
+            return 'javascript'
+    
+    # INI/TOML/JSON detection
+    # JSON: starts with { or [ and contains :
+    stripped_code = code.lstrip()
+    if stripped_code.startswith('{') or stripped_code.startswith('['):
+        if ':' in code:
+            return 'json'
+    # TOML: section headers [x] or key = value
+    if re.search(r'^\s*\[[^\]]+\]\s*$', code, re.MULTILINE) and '=' in code:
+        return 'toml'
+    # INI: section headers [x] and key=value
+    if re.search(r'^\s*\[[^\]]+\]\s*$', code, re.MULTILINE) and re.search(r'^\s*[^#;\[][^=]*=', code, re.MULTILINE):
+        return 'ini'
+
+    return 'bash'
+
+
+def load_fixtures():
+    samples = []
+    for base in FIXTURE_DIRS:
+        if not base.is_dir():
+            continue
+        for path in sorted(p for p in base.rglob('*') if p.is_file()):
+            try:
+                code = path.read_text(encoding='utf-8')
+            except (OSError, UnicodeDecodeError):
+                continue
+            samples.append((str(path.relative_to(base.parent)), code))
+    return samples
+
+
+def mismatches(samples):
+    """Return (name, filename, legacy, new) for every differing classification."""
+    diffs = []
+    for name, code in samples:
+        for filename in (name, None):
+            old = legacy_detect_language(code, filename)
+            new = detect_language(code, filename)
+            if old != new:
+                diffs.append((name, filename, old, new))
+    return diffs
+
+
+def _time(func, samples, repeat):
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        for _, code in samples:
+            func(code)
+    return time.perf_counter() - t0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=200)
+    parser.add_argument('--large-kb', type=int, default=512)
+    args = parser.parse_args()
+
+    samples = load_fixtures()
+    diffs = mismatches(samples)
+    for name, filename, old, new in diffs:
+        print(f'MISMATCH {name} (filename={filename!r}): legacy={old} new={new}')
+    print(f'fixtures: {len(samples)}, mismatches: {len(diffs)}')
+
+    legacy_s = _time(legacy_detect_language, samples, args.repeat)
+    new_s = _time(detect_language, samples, args.repeat)
+    print(f'fixtures x{args.repeat}: legacy {legacy_s:.3f}s  new {new_s:.3f}s  speedup x{legacy_s / new_s:.2f}')
+
+    block = 'echo "line $i"\nfor f in *.txt; do cat "$f"; done\n'
+    large = [('large', block * (args.large_kb * 1024 // len(block)))]
+    repeat = max(1, args.repeat // 20)
+    legacy_s = _time(legacy_detect_language, large, repeat)
+    new_s = _time(detect_language, large, repeat)
+    print(f'{args.large_kb} KB unnamed x{repeat}: legacy {legacy_s:.3f}s  new {new_s:.3f}s  speedup x{legacy_s / new_s:.2f}')
+    return 1 if diffs else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""Benchmark `pactfix --path --jobs N` on a generated corpus.
+
+Usage:
+    python benchmarks/bench_jobs.py [--files 2000] [--jobs 1 2 4 8]
+
+Each run gets a fresh copy of the corpus (in-place mode rewrites files) and
+the result cache is disabled so every file is really analyzed.
+"""
+
+import argparse
+import contextlib
+import io
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from pactfix.cache import configure_cache  # noqa: E402
+from pactfix.cli import process_project  # noqa: E402
+
+TEMPLATES = {
+    'sh': '#!/bin/bash\nOUTPUT=/tmp/out-{i}\ncd /var/www\nread name\necho $OUTPUT/$name\n' * 20,
+    'py': 'import os\nimport sys\n\ndef handler_{i}(items=[]):\n    if items == None:\n        print "empty"\n    try:\n        pass\n    except:\n        pass\n' * 20,
+    'sql': 'SELECT * FROM users_{i};\nDROP TABLE logs_{i};\nCREATE TABLE t_{i} (id INT);\nGRANT ALL ON db TO admin;\n' * 20,
+    'js': 'var x = require("fs");\nif (x == null) {{ console.log(x) }}\neval("1 + {i}");\n' * 20,
+    'tf': 'resource "aws_s3_bucket" "b{i}" {{\n  acl = "public-read"\n  password = "hunter2"\n}}\n' * 20,
+}
+
+
+def generate_corpus(root: Path, count: int) -> None:
+    exts = list(TEMPLATES)
+    for i in range(count):
+        ext = exts[i % len(exts)]
+        sub = root / f'pkg{i % 50:02d}'
+        sub.mkdir(parents=True, exist_ok=True)
+        (sub / f'file{i}.{ext}').write_text(TEMPLATES[ext].format(i=i), encoding='utf-8')
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--files', type=int, default=2000)
+    parser.add_argument('--jobs', type=int, nargs='+', default=[1, 2, 4, 8])
+    args = parser.parse_args()
+
+    configure_cache(enabled=False)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        template = Path(tmp) / 'template'
+        generate_corpus(template, args.files)
+
+        baseline = None
+        print(f'corpus: {args.files} files')
+        for jobs in args.jobs:
+            work = Path(tmp) / f'run-{jobs}'
+            shutil.copytree(template, work)
+            t0 = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                process_project(str(work), jobs=jobs)
+            elapsed = time.perf_counter() - t0
+            baseline = baseline or elapsed
+            print(f'jobs={jobs:<2} {elapsed:7.2f}s  {args.files / elapsed:8.0f} files/s  speedup x{baseline / elapsed:.2f}')
+            shutil.rmtree(work)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
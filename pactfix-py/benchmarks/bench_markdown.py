@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""Benchmark the markdown analyzer on a long README.
+
+Usage:
+    python benchmarks/bench_markdown.py [--blocks 400] [--workers N]
+
+Builds a document with ``--blocks`` fenced blocks (bash, python, sql,
+dockerfile and untagged ones) and times a cold run in-process, a cold run
+on ``--workers`` processes (default: one per CPU) and a "keystroke" run
+after editing one block, which should only re-analyze that block. Exits
+non-zero if the three runs disagree.
+"""
+
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from pactfix.analyzers import markdown  # noqa: E402
+
+SNIPPETS = (
+    ('bash', 'cd /tmp\nrm -rf $DIR/build\necho $HOME\nfor f in $(ls *.txt); do cat $f; done'),
+    ('python', 'import os\nprint "hello"\ntry:\n    os.remove(path)\nexcept:\n    pass'),
+    ('sql', 'SELECT * FROM users WHERE name = \'$name\';\nDELETE FROM logs;'),
+    ('dockerfile', 'FROM ubuntu:latest\nRUN apt-get update\nRUN apt-get install -y curl\nUSER root'),
+    ('', 'echo "no tag"\ncd build'),
+)
+
+
+def build_document(blocks: int) -> str:
+    parts = ['# Handbook\n']
+    for i in range(blocks):
+        lang, body = SNIPPETS[i % len(SNIPPETS)]
+        parts.append(f'## Step {i}\n\nRun this:\n\n```{lang}\n# step {i}\n{body}\n```\n')
+    return '\n'.join(parts)
+
+
+def summary(result) -> tuple:
+    return (result.fixed_code, [(e.line, e.code) for e in result.errors],
+            [(w.line, w.code) for w in result.warnings], [f.line for f in result.fixes])
+
+
+def timed(fn) -> tuple:
+    t0 = time.perf_counter()
+    value = fn()
+    return value, time.perf_counter() - t0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--blocks', type=int, default=400)
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    doc = build_document(args.blocks)
+    print(f'{doc.count(chr(10)) + 1} lines, {args.blocks} blocks, {args.workers} workers')
+
+    os.environ['PACTFIX_MARKDOWN_WORKERS'] = '1'
+    markdown.analyze_markdown(build_document(len(SNIPPETS)))  # import analyzers, compile regexes
+    markdown._block_cache.clear()
+    serial, t_serial = timed(lambda: markdown.analyze_markdown(doc))
+    print(f'  cold, in-process        {t_serial * 1000:8.1f} ms')
+
+    os.environ['PACTFIX_MARKDOWN_WORKERS'] = str(args.workers)
+    markdown._block_cache.clear()
+    if args.workers > 1:
+        markdown._block_pool()  # measure analysis, not process start-up
+    parallel, t_parallel = timed(lambda: markdown.analyze_markdown(doc))
+    print(f'  cold, pool              {t_parallel * 1000:8.1f} ms')
+
+    edited = doc.replace('# step 7\n', '# step 7 (edited)\n', 1)
+    stats_before = markdown._block_cache.stats()
+    warm, t_warm = timed(lambda: markdown.analyze_markdown(edited))
+    stats = markdown._block_cache.stats()
+    print(f'  one block edited        {t_warm * 1000:8.1f} ms  '
+          f'({stats["misses"] - stats_before["misses"]} block(s) analyzed)')
+    markdown.shutdown_block_pool()
+
+    markdown._block_cache.clear()
+    os.environ['PACTFIX_MARKDOWN_WORKERS'] = '1'
+    expected = markdown.analyze_markdown(edited)
+    if summary(serial) != summary(parallel) or summary(warm) != summary(expected):
+        print('❌ Results differ between runs')
+        return 1
+    print('✅ Same results in-process, on the pool and from the block cache')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""Measure lines/sec of the per-line analyzers on multi-MB inputs.
+
+Usage:
+    python benchmarks/bench_rules.py [--mb 4] [--repeat 3]
+
+Each input is built by repeating the analyzer's fixtures from tests/fixtures
+until it reaches the requested size; the best of ``--repeat`` runs is shown.
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from pactfix.analyzers.bash import analyze_bash  # noqa: E402
+from pactfix.analyzers.nginx import analyze_nginx  # noqa: E402
+from pactfix.analyzers.python_lang import analyze_python  # noqa: E402
+from pactfix.analyzers.sql import analyze_sql  # noqa: E402
+
+ANALYZERS = {
+    'bash': analyze_bash,
+    'sql': analyze_sql,
+    'nginx': analyze_nginx,
+    'python': analyze_python,
+}
+
+
+def build_input(language: str, size: int) -> str:
+    fixtures = sorted((ROOT / 'tests' / 'fixtures' / language).glob('*'))
+    chunk = '\n'.join(p.read_text(encoding='utf-8') for p in fixtures if p.is_file())
+    return (chunk + '\n') * max(1, size // max(1, len(chunk)))
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--mb', type=float, default=4)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('languages', nargs='*', default=list(ANALYZERS))
+    args = parser.parse_args()
+
+    for language in args.languages:
+        code = build_input(language, int(args.mb * 1024 * 1024))
+        n_lines = code.count('\n') + 1
+        best = None
+        for _ in range(args.repeat):
+            t0 = time.perf_counter()
+            ANALYZERS[language](code)
+            elapsed = time.perf_counter() - t0
+            best = elapsed if best is None else min(best, elapsed)
+        print(f'{language:<7} {len(code) / 1e6:6.1f} MB {n_lines:>9} lines  {best:6.2f}s  {n_lines / best:>10.0f} lines/s')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
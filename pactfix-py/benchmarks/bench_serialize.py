@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""Benchmark AnalysisResult serialization and Issue/Fix memory.
+
+Usage:
+    python benchmarks/bench_serialize.py [--files 10000] [--repeat 3]
+
+Analyzes every fixture under tests/fixtures once, then serializes a batch of
+``--files`` results (cycling through the fixtures) with the previous
+``dataclasses.asdict`` path and with ``to_dict``/``to_json``. Exits non-zero
+if any fixture serializes differently. Memory is measured with tracemalloc
+for the issues and fixes of the whole batch, as slotted objects and as the
+previous ``__dict__``-backed dataclasses.
+"""
+
+import argparse
+import json
+import sys
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from pactfix.analyzer import analyze_code  # noqa: E402
+from pactfix.serialize import JSON_BACKEND, dumps  # noqa: E402
+
+
+@dataclass
+class LegacyIssue:
+    line: int
+    column: int
+    code: str
+    message: str
+    severity: str = "warning"
+
+
+@dataclass
+class LegacyFix:
+    line: int
+    description: str
+    before: str
+    after: str
+    edits: List[Dict[str, Any]] = field(default_factory=list)
+
+
+@dataclass
+class LegacyResult:
+    language: str
+    original_code: str
+    fixed_code: str
+    errors: List[LegacyIssue] = field(default_factory=list)
+    warnings: List[LegacyIssue] = field(default_factory=list)
+    fixes: List[LegacyFix] = field(default_factory=list)
+    context: Dict[str, Any] = field(default_factory=dict)
+
+    @classmethod
+    def from_result(cls, result) -> 'LegacyResult':
+        return cls(result.language, result.original_code, result.fixed_code,
+                   [LegacyIssue(**e.to_dict()) for e in result.errors],
+                   [LegacyIssue(**w.to_dict()) for w in result.warnings],
+                   [LegacyFix(**f.to_dict()) for f in result.fixes],
+                   result.context)
+
+    def to_dict(self) -> dict:
+        """AnalysisResult.to_dict as it was before the hand-written serializer."""
+        return {
+            'language': self.language,
+            'originalCode': self.original_code,
+            'fixedCode': self.fixed_code,
+            'errors': [asdict(e) for e in self.errors],
+            'warnings': [asdict(w) for w in self.warnings],
+            'fixes': [{**asdict(f), 'message': f.description} for f in self.fixes],
+            'context': self.context
+        }
+
+
+def load_results() -> list:
+    results = []
+    for path in sorted((ROOT / 'tests' / 'fixtures').rglob('*')):
+        if path.is_file():
+            code = path.read_text(encoding='utf-8', errors='replace')
+            results.append(analyze_code(code, str(path), use_cache=False))
+    return results
+
+
+def mismatches(results) -> list:
+    return [r.language for r in results if r.to_dict() != LegacyResult.from_result(r).to_dict()]
+
+
+def _best(fn, repeat: int) -> float:
+    best = None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - t0
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def _traced_size(build) -> int:
+    tracemalloc.start()
+    kept = build()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del kept
+    return size
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--files', type=int, default=10000)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    results = load_results()
+    bad = mismatches(results)
+    if bad:
+        print(f'❌ to_dict differs from the asdict path for: {", ".join(bad)}')
+        return 1
+
+    batch = [results[i % len(results)] for i in range(args.files)]
+    legacy_batch = [LegacyResult.from_result(r) for r in batch]
+    n_items = sum(len(r.errors) + len(r.warnings) + len(r.fixes) for r in batch)
+    print(f'{len(batch)} results, {n_items} issues+fixes, backend: {JSON_BACKEND}')
+
+    timings = {
+        'asdict + json.dumps': lambda: json.dumps([r.to_dict() for r in legacy_batch], ensure_ascii=False),
+        'to_dict + json.dumps': lambda: json.dumps([r.to_dict() for r in batch], ensure_ascii=False),
+        f'to_dict + dumps ({JSON_BACKEND})': lambda: dumps([r.to_dict() for r in batch]),
+        'to_dict(include_code=False) + dumps': lambda: dumps([r.to_dict(include_code=False) for r in batch]),
+    }
+    for label, fn in timings.items():
+        print(f'  {label:<40} {_best(fn, args.repeat) * 1000:8.1f} ms')
+
+    slotted = _traced_size(lambda: [([i.__class__(**i.to_dict()) for i in r.errors + r.warnings],
+                                     [f.__class__(**f.to_dict()) for f in r.fixes]) for r in batch])
+    legacy = _traced_size(lambda: [([LegacyIssue(**i.to_dict()) for i in r.errors + r.warnings],
+                                    [LegacyFix(**f.to_dict()) for f in r.fixes]) for r in batch])
+    print(f'  issue/fix objects: {legacy / 1e6:.1f} MB (dict-backed) -> {slotted / 1e6:.1f} MB (slotted)')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
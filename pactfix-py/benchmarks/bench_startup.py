@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""Benchmark pactfix cold start with `python -X importtime`.
+
+Usage:
+    python benchmarks/bench_startup.py [--repeat 5]
+
+Runs `python -X importtime -m pactfix <file>` on a one-line bash script and
+on `--version`, reports wall time and cumulative import time, and lists the
+analyzer modules that were imported. Exits non-zero if analyzing the bash
+file imports any analyzer other than `pactfix.analyzers.bash`, or if the
+sandbox module, PyYAML or multiprocessing are imported at all.
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+FORBIDDEN = ('pactfix.sandbox', 'yaml', 'multiprocessing')
+
+
+def imported_modules(argv: list) -> tuple:
+    """Run ``python -X importtime -m pactfix *argv``; return (wall seconds, {module: cumulative us})."""
+    env = dict(os.environ, PYTHONPATH=str(ROOT) + os.pathsep + os.environ.get('PYTHONPATH', ''))
+    t0 = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-m', 'pactfix', *argv],
+        capture_output=True, text=True, env=env, cwd=str(ROOT),
+    )
+    elapsed = time.perf_counter() - t0
+    modules = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith('import time:') or '|' not in line:
+            continue
+        _, cumulative, name = line.split('|')
+        try:
+            modules[name.strip()] = int(cumulative)
+        except ValueError:
+            continue  # header line
+    return elapsed, modules
+
+
+def check_single_bash_file(modules: dict) -> list:
+    """Return the modules that should not have been imported for one bash file."""
+    unexpected = [m for m in modules if m.startswith('pactfix.analyzers.') and m != 'pactfix.analyzers.bash']
+    unexpected += [m for m in modules if m in FORBIDDEN]
+    if 'pactfix.analyzers.bash' not in modules:
+        unexpected.append('(pactfix.analyzers.bash missing)')
+    return sorted(unexpected)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        script = Path(tmp) / 'deploy.sh'
+        script.write_text('#!/bin/bash\necho $HOME\n', encoding='utf-8')
+
+        for label, argv in (('--version', ['--version']), ('one .sh file', [str(script)])):
+            runs = [imported_modules(argv) for _ in range(args.repeat)]
+            best_wall = min(r[0] for r in runs)
+            modules = runs[-1][1]
+            pactfix_us = modules.get('pactfix', 0) + modules.get('pactfix.cli', 0)
+            analyzers = sorted(m for m in modules if m.startswith('pactfix.analyzers.'))
+            print(f'{label:<14} wall {best_wall * 1000:7.1f} ms  pactfix imports {pactfix_us / 1000:6.1f} ms  '
+                  f'analyzers: {", ".join(analyzers) or "-"}')
+
+        unexpected = check_single_bash_file(modules)
+    if unexpected:
+        print(f'❌ Unexpected imports for a single bash file: {", ".join(unexpected)}')
+        return 1
+    print('✅ Only the bash analyzer was imported')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
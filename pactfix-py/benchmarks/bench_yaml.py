@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""Benchmark the kubernetes analyzer on a `helm template`-sized manifest stream.
+
+Usage:
+    python benchmarks/bench_yaml.py [--lines 20000] [--repeat 3]
+
+Generates a multi-document stream of Deployments, Services and ConfigMaps
+(every container is called ``app``, like most charts) until it has
+``--lines`` lines, then reports the time spent composing/indexing the YAML,
+in the cross-object index and in the whole analysis, and the tracemalloc
+peak of ``analyze_kubernetes`` against ``analyze_kubernetes_stream`` fed
+line by line. Exits non-zero if a K8S008 warning does not point at the
+``- name: app`` line of its own container, if the (consistent) set gets a
+cross-object warning, or if streaming reports different issues.
+"""
+
+import argparse
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from pactfix.analyzers.kubernetes import analyze_kubernetes, analyze_kubernetes_stream  # noqa: E402
+from pactfix.k8sindex import ManifestIndex, iter_objects  # noqa: E402
+from pactfix.yamldoc import SafeLoader, load_yaml_documents  # noqa: E402
+
+DEPLOYMENT = """\
+apiVersion: apps/v1
+kind: Deployment
+metadata:
+  name: svc-{i}
+  namespace: apps
+spec:
+  replicas: 2
+  template:
+    metadata:
+      labels:
+        app: svc-{i}
+    spec:
+      containers:
+      - name: app
+        image: registry.local/svc-{i}:1.{i}
+        ports:
+        - containerPort: 8080
+        envFrom:
+        - configMapRef:
+            name: svc-{i}-config
+        env:
+        - name: app
+          value: "{i}"
+        - name: LOG_LEVEL
+          value: info
+      - name: sidecar
+        image: envoyproxy/envoy:latest
+        securityContext:
+          privileged: true
+---
+apiVersion: v1
+kind: Service
+metadata:
+  name: svc-{i}
+  namespace: apps
+spec:
+  selector:
+    app: svc-{i}
+  ports:
+  - port: 80
+    targetPort: 8080
+---
+apiVersion: v1
+kind: ConfigMap
+metadata:
+  name: svc-{i}-config
+  namespace: apps
+data:
+  LOG_FORMAT: json
+---
+"""
+
+
+def iter_stream_lines(lines: int):
+    """Yield the lines of the generated stream without building the text."""
+    total = 0
+    i = 0
+    while total < lines:
+        chunk = DEPLOYMENT.format(i=i)
+        yield from chunk.splitlines(keepends=True)
+        total += chunk.count('\n')
+        i += 1
+
+
+def build_stream(lines: int) -> str:
+    return ''.join(iter_stream_lines(lines))
+
+
+def issue_keys(results) -> list:
+    return sorted((i.code, i.line) for r in results for i in r.errors + r.warnings)
+
+
+def _peak(fn) -> tuple:
+    tracemalloc.start()
+    value = fn()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return value, peak
+
+
+def misplaced(code: str, result) -> list:
+    lines = code.split('\n')
+    return [w.line for w in result.warnings
+            if w.code == 'K8S008' and lines[w.line - 1].strip() not in ('- name: app', '- name: sidecar')]
+
+
+def _best(fn, repeat: int) -> float:
+    best = None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - t0
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--lines', type=int, default=20000)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    code = build_stream(args.lines)
+    result = analyze_kubernetes(code)
+    print(f'{code.count(chr(10))} lines, {len(result.context["kinds"])} documents, '
+          f'{len(result.errors) + len(result.warnings)} issues, loader: {SafeLoader.__name__}')
+    print(f'  load_yaml_documents     {_best(lambda: load_yaml_documents(code), args.repeat) * 1000:8.1f} ms')
+    docs = load_yaml_documents(code)
+    print(f'  cross-object index      {_best(lambda: ManifestIndex(iter_objects(docs)).check(), args.repeat) * 1000:8.1f} ms')
+    print(f'  analyze_kubernetes      {_best(lambda: analyze_kubernetes(code), args.repeat) * 1000:8.1f} ms')
+
+    whole, whole_peak = _peak(lambda: issue_keys([analyze_kubernetes(build_stream(args.lines))]))
+    streamed, stream_peak = _peak(lambda: issue_keys(analyze_kubernetes_stream(iter_stream_lines(args.lines))))
+    print(f'  peak memory: {whole_peak / 1e6:.1f} MB (whole text) -> {stream_peak / 1e6:.1f} MB (streamed)')
+    if whole != streamed:
+        print('❌ Streaming reports different issues')
+        return 1
+
+    cross = [w for w in result.warnings if w.code in ('K8S011', 'K8S012', 'K8S013', 'K8S014', 'K8S015')]
+    if cross:
+        print(f'❌ Cross-object warnings in a consistent set: {[(w.line, w.code) for w in cross[:10]]}')
+        return 1
+
+    bad = misplaced(code, result)
+    if bad:
+        print(f'❌ K8S008 not on a container line: {bad[:10]}')
+        return 1
+    print('✅ Every K8S008 points at its own container')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
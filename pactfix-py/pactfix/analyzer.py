@@ -1,7 +1,7 @@
 """Multi-language code and config file analyzer."""
 
 import re
-from dataclasses import dataclass, field, asdict
+from dataclasses import dataclass, field
 from typing import List, Dict, Any, Optional
 from pathlib import Path
 
@@ -14,7 +14,7 @@ SUPPORTED_LANGUAGES = [
     'json', 'toml', 'ini',
     'helm', 'gitlab-ci', 'jenkinsfile', 'markdown', 'markpact']
 
-@dataclass
+@dataclass(slots=True)
 class Issue:
     line: int
     column: int
@@ -22,7 +22,11 @@ class Issue:
     message: str
     severity: str = "warning"
 
-@dataclass
+    def to_dict(self) -> dict:
+        return {'line': self.line, 'column': self.column, 'code': self.code,
+                'message': self.message, 'severity': self.severity}
+
+@dataclass(slots=True)
 class Fix:
     line: int
     description: str
@@ -30,6 +34,11 @@ class Fix:
     after: str
     edits: List[Dict[str, Any]] = field(default_factory=list)
 
+    def to_dict(self) -> dict:
+        # Edits are flat dicts of scalars, so a shallow copy is a full copy
+        return {'line': self.line, 'description': self.description, 'before': self.before,
+                'after': self.after, 'edits': [dict(e) for e in self.edits]}
+
 @dataclass
 class AnalysisResult:
     language: str
@@ -40,111 +49,135 @@ class AnalysisResult:
     fixes: List[Fix] = field(default_factory=list)
     context: Dict[str, Any] = field(default_factory=dict)
 
-    def to_dict(self) -> dict:
-        return {
-            'language': self.language,
-            'originalCode': self.original_code,
-            'fixedCode': self.fixed_code,
-            'errors': [asdict(e) for e in self.errors],
-            'warnings': [asdict(w) for w in self.warnings],
-            'fixes': [{**asdict(f), 'message': f.description} for f in self.fixes],
-            'context': self.context
-        }
+    def to_dict(self, include_code: bool = True) -> dict:
+        """Serialize for JSON output; ``include_code=False`` omits originalCode/fixedCode."""
+        data = {'language': self.language}
+        if include_code:
+            data['originalCode'] = self.original_code
+            data['fixedCode'] = self.fixed_code
+        data['errors'] = [e.to_dict() for e in self.errors]
+        data['warnings'] = [w.to_dict() for w in self.warnings]
+        fixes = []
+        for f in self.fixes:
+            item = f.to_dict()
+            item['message'] = f.description
+            fixes.append(item)
+        data['fixes'] = fixes
+        data['context'] = self.context
+        return data
+
+    def to_json(self, include_code: bool = True, indent: bool = False) -> str:
+        """``to_dict`` as a JSON string, encoded with orjson when it is installed."""
+        from .serialize import dumps
+        return dumps(self.to_dict(include_code), indent=indent)
+
+
+# Language detection tables. Filename rules that depend on path substrings are
+# ordered checks in detect_language; plain extensions and basenames are looked up.
+_COMPOSE_SUFFIXES = ('docker-compose.yml', 'docker-compose.yaml', 'compose.yml', 'compose.yaml')
+_YAML_SUFFIXES = ('.yml', '.yaml')
+_HELM_FILENAMES = frozenset({'chart.yaml', 'chart.yml', 'values.yaml', 'values.yml'})
+_GITLAB_CI_FILENAMES = frozenset({'.gitlab-ci.yml', '.gitlab-ci.yaml'})
+_K8S_FILENAME_HINTS = ('deployment', 'service', 'configmap', 'secret', 'ingress', 'statefulset', 'daemonset', 'cronjob')
+
+_EXTENSION_LANGUAGES = {
+    'py': 'python', 'php': 'php', 'js': 'javascript', 'sh': 'bash',
+    'ts': 'typescript', 'tsx': 'typescript', 'go': 'go', 'rs': 'rust',
+    'java': 'java', 'cs': 'csharp', 'rb': 'ruby',
+    'json': 'json', 'jsonc': 'json', 'toml': 'toml', 'ini': 'ini', 'cfg': 'ini',
+    'mk': 'makefile', 'html': 'html', 'htm': 'html', 'css': 'css',
+    'conf': 'apache', 'service': 'systemd', 'timer': 'systemd',
+    'md': 'markdown', 'markdown': 'markdown', 'mdx': 'markdown',
+    'yml': 'yaml', 'yaml': 'yaml',
+}
+_FILENAME_LANGUAGES = {'makefile': 'makefile', 'jenkinsfile': 'jenkinsfile'}
+
+# Content classification only looks at this many leading characters of large inputs.
+DETECT_PREFIX_CHARS = 64 * 1024
+
+_RE_YAML_KEY_LINE = re.compile(r'^[^\S\n]*[A-Za-z0-9_.-]+[^\S\n]*:', re.MULTILINE)
+_RE_MAKEFILE_RECIPE = re.compile(r'^\t(?!\s*[A-Za-z0-9_.-]+\s*:)\S', re.MULTILINE)
+_RE_SHELL_ASSIGNMENT = re.compile(r'^\s*(?:export\s+)?[A-Za-z_][A-Za-z0-9_]*\s*[:+?]?=\s*', re.MULTILINE)
+_RE_MAKEFILE_TARGET = re.compile(r'^[A-Za-z0-9_.-]+:\s*$', re.MULTILINE)
+_RE_CSS_RULE = re.compile(r'[.#]\w+\s*\{')
+_RE_PYTHON = re.compile(
+    r'^(?:def[^\S\n]+\w+[^\S\n]*\(|class[^\S\n]+\w+.*:|import[^\S\n]+\w+|from[^\S\n]+\w+[^\S\n]+import)',
+    re.MULTILINE)
+_RE_JAVASCRIPT = re.compile(
+    r'\bconst[^\S\n]+\w+[^\S\n]*=|\blet[^\S\n]+\w+[^\S\n]*=|\bvar[^\S\n]+\w+[^\S\n]*=|function[^\S\n]+\w+[^\S\n]*\(')
+_RE_INI_SECTION = re.compile(r'^\s*\[[^\]]+\]\s*$', re.MULTILINE)
+_RE_INI_KEY = re.compile(r'^\s*[^#;\[][^=]*=', re.MULTILINE)
+_SQL_KEYWORDS = ('SELECT ', 'INSERT ', 'UPDATE ', 'DELETE ', 'CREATE TABLE', 'DROP ')
+_DOCKERFILE_PREFIXES = ('FROM ', 'RUN ', 'COPY ', 'ENTRYPOINT ')
+
+
+def _detect_language_from_filename(filename: str, code: str) -> Optional[str]:
+    fn_lower = filename.lower()
+    fn_name = Path(filename).name.lower()
+    ext = fn_lower.rsplit('.', 1)[1] if '.' in fn_lower else ''
+    is_yaml = ext in ('yml', 'yaml')
+
+    if fn_name == 'dockerfile' or fn_lower.endswith('/dockerfile'):
+        return 'dockerfile'
+    if fn_lower.endswith(_COMPOSE_SUFFIXES):
+        return 'docker-compose'
+    if ext == 'tf':
+        return 'terraform'
+    if ext == 'sql':
+        return 'sql'
+    if fn_lower.endswith('nginx.conf') or '.nginx' in fn_lower:
+        return 'nginx'
+    if is_yaml and ('workflow' in fn_lower or '.github' in fn_lower):
+        return 'github-actions'
+    if fn_name in _GITLAB_CI_FILENAMES:
+        return 'gitlab-ci'
+    if 'playbook' in fn_lower or 'ansible' in fn_lower:
+        return 'ansible'
+    if fn_name in _HELM_FILENAMES:
+        return 'helm'
+    if is_yaml and '/templates/' in fn_lower:
+        return 'helm'
+    if ext in ('tpl', 'gotmpl'):
+        return 'helm'
+
+    language = _FILENAME_LANGUAGES.get(fn_name) or _EXTENSION_LANGUAGES.get(ext)
+    if language == 'javascript':
+        if 'require(' in code or 'module.exports' in code:
+            return 'nodejs'
+    elif language == 'markdown':
+        if 'markpact:' in code:
+            return 'markpact'
+    elif language == 'apache':
+        if 'apache' not in fn_lower:
+            return None
+    elif language == 'yaml':
+        if any(x in fn_lower for x in _K8S_FILENAME_HINTS):
+            return 'kubernetes'
+    return language
 
 
 def detect_language(code: str, filename: str = None) -> str:
-    """Detect the language/format of the code."""
-    lines = code.strip().split('\n')
-    first_line = lines[0] if lines else ''
-    
+    """Detect the language/format of the code.
+
+    The filename decides first; otherwise the content is classified. Inputs
+    longer than ``DETECT_PREFIX_CHARS`` are classified by their leading lines.
+    """
     if filename:
-        fn_lower = filename.lower()
-        fn_name = Path(filename).name.lower()
-        
-        if fn_name == 'dockerfile' or fn_lower.endswith('/dockerfile'):
-            return 'dockerfile'
-        if any(fn_lower.endswith(x) for x in ['docker-compose.yml', 'docker-compose.yaml', 'compose.yml', 'compose.yaml']):
-            return 'docker-compose'
-        if fn_lower.endswith('.tf'):
-            return 'terraform'
-        if fn_lower.endswith('.sql'):
-            return 'sql'
-        if fn_lower.endswith('nginx.conf') or '.nginx' in fn_lower:
-            return 'nginx'
-        if fn_lower.endswith(('.yml', '.yaml')) and ('workflow' in fn_lower or '.github' in fn_lower):
-            return 'github-actions'
-        if fn_name in ('.gitlab-ci.yml', '.gitlab-ci.yaml'):
-            return 'gitlab-ci'
-        if any(x in fn_lower for x in ['playbook', 'ansible']):
-            return 'ansible'
-        if fn_name in ('chart.yaml', 'chart.yml', 'values.yaml', 'values.yml'):
-            return 'helm'
-        if '/templates/' in fn_lower and fn_lower.endswith(('.yml', '.yaml')):
-            return 'helm'
-        if fn_lower.endswith(('.tpl', '.gotmpl')):
-            return 'helm'
-        if fn_lower.endswith('.py'):
-            return 'python'
-        if fn_lower.endswith('.php'):
-            return 'php'
-        if fn_lower.endswith('.js'):
-            if 'require(' in code or 'module.exports' in code:
-                return 'nodejs'
-            return 'javascript'
-        if fn_lower.endswith('.sh'):
-            return 'bash'
-        if fn_lower.endswith('.ts') or fn_lower.endswith('.tsx'):
-            return 'typescript'
-        if fn_lower.endswith('.go'):
-            return 'go'
-        if fn_lower.endswith('.rs'):
-            return 'rust'
-        if fn_lower.endswith('.java'):
-            return 'java'
-        if fn_lower.endswith('.cs'):
-            return 'csharp'
-        if fn_lower.endswith('.rb'):
-            return 'ruby'
-        if fn_lower.endswith('.json') or fn_lower.endswith('.jsonc'):
-            return 'json'
-        if fn_lower.endswith('.toml'):
-            return 'toml'
-        if fn_lower.endswith('.ini') or fn_lower.endswith('.cfg'):
-            return 'ini'
-        if fn_name == 'makefile' or fn_lower.endswith('.mk'):
-            return 'makefile'
-        if fn_lower.endswith('.html') or fn_lower.endswith('.htm'):
-            return 'html'
-        if fn_lower.endswith('.css'):
-            return 'css'
-        if fn_lower.endswith('.conf') and 'apache' in fn_lower:
-            return 'apache'
-        if fn_lower.endswith('.service') or fn_lower.endswith('.timer'):
-            return 'systemd'
-        if fn_lower.endswith('.md') or fn_lower.endswith('.markdown') or fn_lower.endswith('.mdx'):
-            if 'markpact:' in code:
-                return 'markpact'
-            return 'markdown'
-        if fn_name == 'jenkinsfile':
-            return 'jenkinsfile'
-        if fn_lower.endswith(('.yml', '.yaml')):
-            # Check for specific YAML types first
-            if 'workflow' in fn_lower or '.github' in fn_lower:
-                return 'github-actions'
-            if fn_name in ('.gitlab-ci.yml', '.gitlab-ci.yaml'):
-                return 'gitlab-ci'
-            if fn_name in ('chart.yaml', 'chart.yml', 'values.yaml', 'values.yml'):
-                return 'helm'
-            if '/templates/' in fn_lower:
-                return 'helm'
-            # Check for Kubernetes patterns in filename
-            if any(x in fn_lower for x in ['deployment', 'service', 'configmap', 'secret', 'ingress', 'statefulset', 'daemonset', 'cronjob']):
-                return 'kubernetes'
-            return 'yaml'
+        language = _detect_language_from_filename(filename, code)
+        if language:
+            return language
 
     # Content-based detection
-    if any(line.strip().upper().startswith(('FROM ', 'RUN ', 'COPY ', 'ENTRYPOINT ')) for line in lines[:20]):
-        if 'FROM ' in code.upper():
+    if len(code) > DETECT_PREFIX_CHARS:
+        cut = code.rfind('\n', 0, DETECT_PREFIX_CHARS)
+        code = code[:cut if cut > 0 else DETECT_PREFIX_CHARS]
+    stripped = code.strip()
+    head_lines = stripped.split('\n', 20)[:20]
+    first_line = head_lines[0]
+    code_upper = code.upper()
+
+    if any(line.strip().upper().startswith(_DOCKERFILE_PREFIXES) for line in head_lines):
+        if 'FROM ' in code_upper:
             return 'dockerfile'
     
     if 'services:' in code and ('image:' in code or 'build:' in code):
@@ -156,8 +189,7 @@ def detect_language(code: str, filename: str = None) -> str:
     if 'resource "' in code or 'provider "' in code or 'variable "' in code:
         return 'terraform'
     
-    sql_keywords = ['SELECT ', 'INSERT ', 'UPDATE ', 'DELETE ', 'CREATE TABLE', 'DROP ']
-    if any(kw in code.upper() for kw in sql_keywords):
+    if any(kw in code_upper for kw in _SQL_KEYWORDS):
         return 'sql'
     
     if 'on:' in code and ('push:' in code or 'pull_request:' in code) and 'jobs:' in code:
@@ -202,21 +234,25 @@ def detect_language(code: str, filename: str = None) -> str:
     if 'def ' in code and 'end' in code and ('class ' in code or 'module ' in code):
         return 'ruby'
     
-    yaml_key_lines = sum(1 for l in lines if re.match(r'^\s*[A-Za-z0-9_.-]+\s*:\s*\S?', l))
-    has_makefile_recipe = re.search(r'^\t(?!\s*[A-Za-z0-9_.-]+\s*:)\S', code, re.MULTILINE) is not None
-    if yaml_key_lines >= 3 and not has_makefile_recipe and not re.search(r'^\s*(?:export\s+)?[A-Za-z_][A-Za-z0-9_]*\s*[:+?]?=\s*', code, re.MULTILINE):
+    yaml_key_lines = 0
+    for _ in _RE_YAML_KEY_LINE.finditer(stripped):
+        yaml_key_lines += 1
+        if yaml_key_lines >= 3:
+            break
+    has_makefile_recipe = _RE_MAKEFILE_RECIPE.search(code) is not None
+    if yaml_key_lines >= 3 and not has_makefile_recipe and not _RE_SHELL_ASSIGNMENT.search(code):
         return 'yaml'
     
     # Makefile detection
-    if (re.search(r'^[A-Za-z0-9_.-]+:\s*$', code, re.MULTILINE) or '.PHONY:' in code) and (has_makefile_recipe or '.PHONY:' in code):
+    if (_RE_MAKEFILE_TARGET.search(code) or '.PHONY:' in code) and (has_makefile_recipe or '.PHONY:' in code):
         return 'makefile'
     
     # HTML detection
-    if '<!DOCTYPE' in code.upper() or '<html' in code.lower():
+    if '<!DOCTYPE' in code_upper or '<html' in code.lower():
         return 'html'
     
     # CSS detection
-    if re.search(r'[.#]\w+\s*\{', code) and ':' in code and ';' in code:
+    if _RE_CSS_RULE.search(code) and ':' in code and ';' in code:
         return 'css'
     
     # Apache config detection
@@ -238,30 +274,26 @@ def detect_language(code: str, filename: str = None) -> str:
     if '<?php' in code:
         return 'php'
     
-    python_patterns = [r'^def\s+\w+\s*\(', r'^class\s+\w+.*:', r'^import\s+\w+', r'^from\s+\w+\s+import']
-    for pattern in python_patterns:
-        if any(re.search(pattern, line) for line in lines):
-            return 'python'
+    if _RE_PYTHON.search(stripped):
+        return 'python'
     
     if 'require(' in code or 'module.exports' in code:
         return 'nodejs'
     
-    js_patterns = [r'\bconst\s+\w+\s*=', r'\blet\s+\w+\s*=', r'\bvar\s+\w+\s*=', r'function\s+\w+\s*\(']
-    for pattern in js_patterns:
-        if any(re.search(pattern, line) for line in lines):
-            return 'javascript'
+    if _RE_JAVASCRIPT.search(stripped):
+        return 'javascript'
     
     # INI/TOML/JSON detection
     # JSON: starts with { or [ and contains :
-    stripped_code = code.lstrip()
-    if stripped_code.startswith('{') or stripped_code.startswith('['):
+    if stripped.startswith('{') or stripped.startswith('['):
         if ':' in code:
             return 'json'
     # TOML: section headers [x] or key = value
-    if re.search(r'^\s*\[[^\]]+\]\s*$', code, re.MULTILINE) and '=' in code:
+    has_section = _RE_INI_SECTION.search(code) is not None
+    if has_section and '=' in code:
         return 'toml'
     # INI: section headers [x] and key=value
-    if re.search(r'^\s*\[[^\]]+\]\s*$', code, re.MULTILINE) and re.search(r'^\s*[^#;\[][^=]*=', code, re.MULTILINE):
+    if has_section and _RE_INI_KEY.search(code):
         return 'ini'
 
     return 'bash'
@@ -385,83 +417,42 @@ def _apply_edits_to_lines(lines: List[str], edits: List[Dict[str, Any]]) -> List
     return out
 
 
-from .analyzers import (
-    analyze_bash,
-    analyze_python,
-    analyze_php,
-    analyze_javascript,
-    analyze_dockerfile,
-    analyze_sql,
-    analyze_nginx,
-    analyze_github_actions,
-    analyze_ansible,
-    analyze_typescript,
-    analyze_go,
-    analyze_rust,
-    analyze_java,
-    analyze_csharp,
-    analyze_ruby,
-    analyze_makefile,
-    analyze_yaml,
-    analyze_apache,
-    analyze_systemd,
-    analyze_html,
-    analyze_css,
-    analyze_json,
-    analyze_toml,
-    analyze_ini,
-    analyze_helm,
-    analyze_gitlab_ci,
-    analyze_jenkinsfile,
-    analyze_docker_compose,
-    analyze_kubernetes,
-    analyze_terraform,
-    analyze_markdown,
-    analyze_markpact,
-)
-
-
-def analyze_code(code: str, filename: str = None, force_language: str = None) -> AnalysisResult:
-    """Main entry point for code analysis."""
-    language = force_language or detect_language(code, filename)
+from . import analyzers as _analyzers
+from .cache import get_result_cache
 
-    analyzers = {
-        'bash': analyze_bash,
-        'python': analyze_python,
-        'php': analyze_php,
-        'javascript': lambda c: analyze_javascript(c, False),
-        'nodejs': lambda c: analyze_javascript(c, True),
-        'dockerfile': analyze_dockerfile,
-        'docker-compose': analyze_docker_compose,
-        'sql': analyze_sql,
-        'terraform': analyze_terraform,
-        'kubernetes': analyze_kubernetes,
-        'nginx': analyze_nginx,
-        'github-actions': analyze_github_actions,
-        'ansible': analyze_ansible,
-        'gitlab-ci': analyze_gitlab_ci,
-        'jenkinsfile': analyze_jenkinsfile,
-        'typescript': analyze_typescript,
-        'go': analyze_go,
-        'rust': analyze_rust,
-        'java': analyze_java,
-        'csharp': analyze_csharp,
-        'ruby': analyze_ruby,
-        'makefile': analyze_makefile,
-        'yaml': analyze_yaml,
-        'apache': analyze_apache,
-        'systemd': analyze_systemd,
-        'html': analyze_html,
-        'css': analyze_css,
-        'helm': analyze_helm,
-        'json': analyze_json,
-        'toml': analyze_toml,
-        'ini': analyze_ini,
-        'markdown': analyze_markdown,
-        'markpact': analyze_markpact,
-    }
 
-    analyzer = analyzers.get(language, analyze_bash)
-    result = analyzer(code)
+def analyze_code(code: str, filename: str = None, force_language: str = None,
+                 use_cache: bool = True, manifest_set: bool = False) -> AnalysisResult:
+    """Main entry point for code analysis.
+
+    Results are served from the process-wide result cache (see
+    ``pactfix.cache``) when the same code was already analyzed as the same
+    language; pass ``use_cache=False`` to force a fresh analysis.
+    ``manifest_set=True`` marks Kubernetes input as the complete set of
+    manifests and enables the cross-object rules (K8S011-K8S015).
+    """
+    language = force_language or detect_language(code, filename)
+    manifest_set = manifest_set and language == 'kubernetes'
+
+    cache = get_result_cache() if use_cache else None
+    cache_key = None
+    if cache is not None:
+        cache_key = cache.make_key(code, language, force_language,
+                                   variant='manifest-set' if manifest_set else '')
+        cached = cache.get(cache_key, code)
+        if cached is not None:
+            return cached
+
+    analyzer = _analyzers.get_analyzer(language)
+    result = analyzer(code, manifest_set=True) if manifest_set else analyzer(code)
     result.language = language
+    if cache is not None:
+        cache.put(cache_key, result)
     return result
+
+
+def __getattr__(name: str):
+    # ``from pactfix.analyzer import analyze_bash`` imports just that analyzer
+    if name in _analyzers.ANALYZER_MODULES:
+        return getattr(_analyzers, name)
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
@@ -1,69 +1,129 @@
-"""Language-specific analyzers for pactfix."""
-
-from .bash import analyze_bash
-from .python_lang import analyze_python
-from .php import analyze_php
-from .javascript import analyze_javascript
-from .dockerfile import analyze_dockerfile
-from .sql import analyze_sql
-from .nginx import analyze_nginx
-from .github_actions import analyze_github_actions
-from .ansible import analyze_ansible
-from .typescript import analyze_typescript
-from .go import analyze_go
-from .rust import analyze_rust
-from .java import analyze_java
-from .csharp import analyze_csharp
-from .ruby import analyze_ruby
-from .makefile import analyze_makefile
-from .yaml_generic import analyze_yaml
-from .apache import analyze_apache
-from .systemd import analyze_systemd
-from .html import analyze_html
-from .css import analyze_css
-from .json_generic import analyze_json
-from .toml_generic import analyze_toml
-from .ini_generic import analyze_ini
-from .helm import analyze_helm
-from .gitlab_ci import analyze_gitlab_ci
-from .jenkinsfile import analyze_jenkinsfile
-from .docker_compose import analyze_docker_compose
-from .kubernetes import analyze_kubernetes
-from .terraform import analyze_terraform
-from .markdown import analyze_markdown
-from .markpact import analyze_markpact
-
-__all__ = [
-    'analyze_bash',
-    'analyze_python',
-    'analyze_php',
-    'analyze_javascript',
-    'analyze_dockerfile',
-    'analyze_sql',
-    'analyze_nginx',
-    'analyze_github_actions',
-    'analyze_ansible',
-    'analyze_typescript',
-    'analyze_go',
-    'analyze_rust',
-    'analyze_java',
-    'analyze_csharp',
-    'analyze_ruby',
-    'analyze_makefile',
-    'analyze_yaml',
-    'analyze_apache',
-    'analyze_systemd',
-    'analyze_html',
-    'analyze_css',
-    'analyze_json',
-    'analyze_toml',
-    'analyze_ini',
-    'analyze_helm',
-    'analyze_gitlab_ci',
-    'analyze_jenkinsfile',
-    'analyze_docker_compose',
-    'analyze_kubernetes',
-    'analyze_terraform',
-    'analyze_markdown',
-    'analyze_markpact',
-]
+"""Language-specific analyzers for pactfix.
+
+Analyzer modules are imported on first use: ``get_analyzer('bash')`` (or
+``from pactfix.analyzers import analyze_bash``) loads only ``bash.py``, so
+analyzing a single file does not pay for all 32 analyzers and PyYAML.
+"""
+
+from typing import Callable, Dict, Optional, Tuple
+
+# analyzer function -> module in this package
+ANALYZER_MODULES: Dict[str, str] = {
+    'analyze_bash': 'bash',
+    'analyze_python': 'python_lang',
+    'analyze_php': 'php',
+    'analyze_javascript': 'javascript',
+    'analyze_dockerfile': 'dockerfile',
+    'analyze_sql': 'sql',
+    'analyze_nginx': 'nginx',
+    'analyze_github_actions': 'github_actions',
+    'analyze_ansible': 'ansible',
+    'analyze_typescript': 'typescript',
+    'analyze_go': 'go',
+    'analyze_rust': 'rust',
+    'analyze_java': 'java',
+    'analyze_csharp': 'csharp',
+    'analyze_ruby': 'ruby',
+    'analyze_makefile': 'makefile',
+    'analyze_yaml': 'yaml_generic',
+    'analyze_apache': 'apache',
+    'analyze_systemd': 'systemd',
+    'analyze_html': 'html',
+    'analyze_css': 'css',
+    'analyze_json': 'json_generic',
+    'analyze_toml': 'toml_generic',
+    'analyze_ini': 'ini_generic',
+    'analyze_helm': 'helm',
+    'analyze_gitlab_ci': 'gitlab_ci',
+    'analyze_jenkinsfile': 'jenkinsfile',
+    'analyze_docker_compose': 'docker_compose',
+    'analyze_kubernetes': 'kubernetes',
+    'analyze_kubernetes_stream': 'kubernetes',
+    'analyze_terraform': 'terraform',
+    'analyze_markdown': 'markdown',
+    'analyze_markpact': 'markpact',
+}
+
+# language -> (analyzer function, extra positional args after the code)
+LANGUAGE_ANALYZERS: Dict[str, Tuple[str, tuple]] = {
+    'bash': ('analyze_bash', ()),
+    'python': ('analyze_python', ()),
+    'php': ('analyze_php', ()),
+    'javascript': ('analyze_javascript', (False,)),
+    'nodejs': ('analyze_javascript', (True,)),
+    'dockerfile': ('analyze_dockerfile', ()),
+    'docker-compose': ('analyze_docker_compose', ()),
+    'sql': ('analyze_sql', ()),
+    'terraform': ('analyze_terraform', ()),
+    'kubernetes': ('analyze_kubernetes', ()),
+    'nginx': ('analyze_nginx', ()),
+    'github-actions': ('analyze_github_actions', ()),
+    'ansible': ('analyze_ansible', ()),
+    'gitlab-ci': ('analyze_gitlab_ci', ()),
+    'jenkinsfile': ('analyze_jenkinsfile', ()),
+    'typescript': ('analyze_typescript', ()),
+    'go': ('analyze_go', ()),
+    'rust': ('analyze_rust', ()),
+    'java': ('analyze_java', ()),
+    'csharp': ('analyze_csharp', ()),
+    'ruby': ('analyze_ruby', ()),
+    'makefile': ('analyze_makefile', ()),
+    'yaml': ('analyze_yaml', ()),
+    'apache': ('analyze_apache', ()),
+    'systemd': ('analyze_systemd', ()),
+    'html': ('analyze_html', ()),
+    'css': ('analyze_css', ()),
+    'helm': ('analyze_helm', ()),
+    'json': ('analyze_json', ()),
+    'toml': ('analyze_toml', ()),
+    'ini': ('analyze_ini', ()),
+    'markdown': ('analyze_markdown', ()),
+    'markpact': ('analyze_markpact', ()),
+}
+
+DEFAULT_LANGUAGE = 'bash'
+
+_resolved: Dict[str, Callable] = {}
+
+
+def _load(name: str) -> Callable:
+    # Same as ``from .<module> import <name>`` (and visible to ``-X importtime``)
+    module = __import__(ANALYZER_MODULES[name], globals(), None, (name,), 1)
+    func = getattr(module, name)
+    globals()[name] = func
+    return func
+
+
+def _with_args(func: Callable, args: tuple) -> Callable:
+    return lambda code: func(code, *args)
+
+
+def get_analyzer(language: str) -> Callable:
+    """Return the analyzer for ``language`` (bash for unknown languages), importing it on first use."""
+    func = _resolved.get(language)
+    if func is None:
+        name, args = LANGUAGE_ANALYZERS.get(language) or LANGUAGE_ANALYZERS[DEFAULT_LANGUAGE]
+        func = globals().get(name) or _load(name)
+        if args:
+            func = _with_args(func, args)
+        _resolved[language] = func
+    return func
+
+
+def preload_analyzers(languages: Optional[list] = None) -> None:
+    """Import the analyzers for ``languages`` (all by default), e.g. before forking workers."""
+    for language in languages or LANGUAGE_ANALYZERS:
+        get_analyzer(language)
+
+
+def __getattr__(name: str):
+    if name in ANALYZER_MODULES:
+        return _load(name)
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
+
+def __dir__():
+    return sorted(set(globals()) | set(ANALYZER_MODULES))
+
+
+__all__ = list(ANALYZER_MODULES) + ['get_analyzer', 'preload_analyzers', 'LANGUAGE_ANALYZERS']
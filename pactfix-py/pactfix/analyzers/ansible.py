@@ -2,6 +2,7 @@ import re
 from typing import List
 
 from ..analyzer import Issue, Fix, AnalysisResult
+from ..credentials import scan_credentials
 
 
 def analyze_ansible(code: str) -> AnalysisResult:
@@ -9,11 +10,13 @@ def analyze_ansible(code: str) -> AnalysisResult:
     errors, warnings, fixes = [], [], []
     lines = code.split('\n')
     
+    credential_hits = scan_credentials('ansible', lines, code)
+
     for i, line in enumerate(lines, 1):
         stripped = line.strip()
         
-        if re.search(r'password\s*:\s*["\']?[^\$\{]', stripped, re.I):
-            errors.append(Issue(i, 1, 'ANS001', 'Plain text password - użyj ansible-vault'))
+        for hit in credential_hits.get(i, ()):
+            errors.append(Issue(i, 1, hit.code, hit.message))
         
         if stripped.startswith('- shell:') or stripped.startswith('- command:'):
             if 'changed_when' not in '\n'.join(lines[i:min(i+5, len(lines))]):
@@ -2,6 +2,37 @@ import re
 from typing import List, Dict, Any
 
 from ..analyzer import Issue, Fix, AnalysisResult
+from ..rules import LineRule, iter_lines, run_line_rules
+
+_NAME_START = frozenset('ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz_')
+_NAME_CHARS = _NAME_START | frozenset('0123456789')
+_RE_UNBRACED_VAR = re.compile(r'\$[A-Za-z_][A-Za-z0-9_]*')
+_RE_MISPLACED_QUOTE = re.compile(r'(\w+)="([^"]*)"(\w+)')
+_RE_QUOTE_IN_SUBST = re.compile(r'\$\(([^)]*)"([^)]*)\)')
+
+
+def _fix_misplaced_quote(ctx, m):
+    return m.group(0), f'{m.group(1)}="{m.group(2)}{m.group(3)}"'
+
+
+BASH_RULES = (
+    # SC2164: cd without error handling
+    LineRule('SC2164', 'cd bez obsługi błędów - użyj cd ... || exit', r'^cd\s+',
+             requires=('cd',), excludes=('||', '&&'),
+             fix=lambda ctx, m: (ctx.stripped, ctx.stripped + ' || exit 1'),
+             fix_description='Dodano obsługę błędów dla cd'),
+    # SC2162: read without -r
+    LineRule('SC2162', 'read bez -r może interpretować backslashe', r'^read\s+',
+             requires=('read',), excludes=('-r',)),
+    # Misplaced quotes: word="text"word (quotes between words)
+    LineRule('SC1073', 'Błędne umiejscowienie cudzysłowów', _RE_MISPLACED_QUOTE, severity='error',
+             requires=('="',), fix=_fix_misplaced_quote, fix_description='Poprawiono cudzysłowy'),
+    # Mismatched quotes in command substitution like $(cmd") - move the quote outside
+    LineRule('SC1073', 'Błędnie umieszczony cudzysłów wewnątrz podstawienia polecenia', _RE_QUOTE_IN_SUBST,
+             severity='error', requires=('$(',),
+             fix=lambda ctx, m: (ctx.stripped, _RE_QUOTE_IN_SUBST.sub(r'$(\1\2)"', ctx.stripped)),
+             fix_description='Poprawiono cudzysłów w podstawieniu'),
+)
 
 
 def _brace_unbraced_bash_vars(line: str) -> str:
@@ -37,9 +68,9 @@ def _brace_unbraced_bash_vars(line: str) -> str:
                 out.append(ch)
                 i += 1
                 continue
-            if i + 1 < len(line) and re.match(r'[A-Za-z_]', line[i + 1]):
+            if i + 1 < len(line) and line[i + 1] in _NAME_START:
                 j = i + 2
-                while j < len(line) and re.match(r'[A-Za-z0-9_]', line[j]):
+                while j < len(line) and line[j] in _NAME_CHARS:
                     j += 1
                 name = line[i + 1:j]
                 out.append('${' + name + '}')
@@ -78,50 +109,20 @@ def analyze_bash(code: str) -> AnalysisResult:
     lines = code.split('\n')
     fixed_lines = lines.copy()
     
-    for i, line in enumerate(lines, 1):
-        current_line = fixed_lines[i-1]
-        stripped = current_line.strip()
+    for ctx in iter_lines(lines):
+        current_line = ctx.line
+        stripped = ctx.stripped
         
         # Variables without braces: use ${VAR} for clarity (e.g. ${OUTPUT}/${HOST})
-        if not stripped.startswith('#') and '$' in current_line and re.search(r'\$[A-Za-z_][A-Za-z0-9_]*', current_line):
+        if not stripped.startswith('#') and '$' in current_line and _RE_UNBRACED_VAR.search(current_line):
             code_part, comment_part = _split_bash_comment(current_line)
             braced_code_part = _brace_unbraced_bash_vars(code_part)
             if braced_code_part != code_part:
                 new_line = braced_code_part + comment_part
-                warnings.append(Issue(i, 1, 'BASH001', 'Zmienne bez klamerek: użyj składni ${VAR} (np. ${OUTPUT}/${HOST})'))
-                fixes.append(Fix(i, 'Dodano klamerki do zmiennych', current_line.strip(), new_line.strip()))
-                current_line = new_line
-                stripped = current_line.strip()
-        
-        # SC2164: cd without error handling
-        if re.match(r'^cd\s+', stripped) and '||' not in stripped and '&&' not in stripped:
-            warnings.append(Issue(i, 1, 'SC2164', 'cd bez obsługi błędów - użyj cd ... || exit'))
-            fix_line = stripped + ' || exit 1'
-            fixes.append(Fix(i, 'Dodano obsługę błędów dla cd', stripped, fix_line))
-            current_line = current_line.replace(stripped, fix_line)
-            stripped = fix_line
-        
-        # SC2162: read without -r
-        if re.match(r'^read\s+', stripped) and '-r' not in stripped:
-            warnings.append(Issue(i, 1, 'SC2162', 'read bez -r może interpretować backslashe'))
-        
-        # Check for misplaced quotes
-        # Pattern 1: word="text"word (quotes between words)
-        quote_match = re.search(r'(\w+)="([^"]*)"(\w+)', stripped)
-        if quote_match:
-            errors.append(Issue(i, 1, 'SC1073', 'Błędne umiejscowienie cudzysłowów'))
-            fixed = f'{quote_match.group(1)}="{quote_match.group(2)}{quote_match.group(3)}"'
-            fixes.append(Fix(i, 'Poprawiono cudzysłowy', quote_match.group(0), fixed))
-            current_line = current_line.replace(quote_match.group(0), fixed)
-        
-        # Pattern 2: Mismatched quotes in command substitution like $(cmd")
-        if re.search(r'\$\([^)]*"[^)]*\)', stripped):
-            errors.append(Issue(i, 1, 'SC1073', 'Błędnie umieszczony cudzysłów wewnątrz podstawienia polecenia'))
-            # Fix by moving the quote outside
-            fixed = re.sub(r'\$\(([^)]*)"([^)]*)\)', r'$(\1\2)"', stripped)
-            fixes.append(Fix(i, 'Poprawiono cudzysłów w podstawieniu', stripped, fixed))
-            current_line = current_line.replace(stripped, fixed)
+                warnings.append(Issue(ctx.line_no, 1, 'BASH001', 'Zmienne bez klamerek: użyj składni ${VAR} (np. ${OUTPUT}/${HOST})'))
+                fixes.append(Fix(ctx.line_no, 'Dodano klamerki do zmiennych', current_line.strip(), new_line.strip()))
+                ctx.set_line(new_line)
         
-        fixed_lines[i-1] = current_line
+        fixed_lines[ctx.line_no - 1] = run_line_rules(BASH_RULES, ctx, errors, warnings, fixes)
     
     return AnalysisResult('bash', code, '\n'.join(fixed_lines), errors, warnings, fixes)
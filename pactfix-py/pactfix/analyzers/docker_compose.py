@@ -1,12 +1,10 @@
 import re
-from typing import List, Dict, Any
-
-try:
-    import yaml
-except ImportError:
-    yaml = None
+from typing import List
 
 from ..analyzer import Issue, Fix, AnalysisResult
+from .. import yamldoc
+
+_PRIVILEGED_LINE = re.compile(r'^\s*privileged\s*:\s*true\s*(#.*)?$')
 
 
 def analyze_docker_compose(code: str) -> AnalysisResult:
@@ -17,41 +15,41 @@ def analyze_docker_compose(code: str) -> AnalysisResult:
     lines = code.splitlines()
     fixed_lines = lines.copy()
 
-    if yaml is None:
+    if yamldoc.yaml is None:
         # Fallback: return empty result when PyYAML not installed
         return AnalysisResult('docker-compose', code, code, [], [Issue(1, 1, 'COMPOSE998', 'PyYAML not installed - install pactfix[yaml] for full analysis')], [])
 
     try:
-        data = yaml.safe_load(code) or {}
-    except yaml.YAMLError:
+        documents = yamldoc.load_yaml_documents(code)
+    except yamldoc.YAMLError:
+        return AnalysisResult('docker-compose', code, code, [Issue(1, 1, 'COMPOSE999', 'Invalid YAML')], [], [])
+    if len(documents) > 1:
+        # Same error yaml.safe_load reports for multi-document input
         return AnalysisResult('docker-compose', code, code, [Issue(1, 1, 'COMPOSE999', 'Invalid YAML')], [], [])
 
+    doc = documents[0] if documents else None
+    data = doc.data if doc is not None and isinstance(doc.data, dict) else {}
     services = data.get('services', {})
+    if not isinstance(services, dict):
+        services = {}
     networks = data.get('networks', {})
     has_networks = bool(networks)
 
-    # Track line numbers for keys via simple scan
-    key_line_map: Dict[str, int] = {}
-    for i, line in enumerate(lines, 1):
-        m = re.match(r'^\s*([a-zA-Z0-9_-]+)\s*:', line)
-        if m:
-            key_line_map[m.group(1)] = i
-
     for svc_name, svc in services.items():
         if not isinstance(svc, dict):
             continue
 
+        svc_key = str(svc_name)
+        svc_line = doc.line('services', svc_key, default=1)
+
+        def key_line(*path) -> int:
+            return doc.line('services', svc_key, *path, default=svc_line)
+
         # Image tag fixes
         image = svc.get('image', '')
         if image:
             if ':latest' in image or ':' not in image:
-                # Determine line number for image key within this service
-                svc_start_line = key_line_map.get(svc_name, 1)
-                img_line = svc_start_line
-                for j in range(svc_start_line, len(lines)):
-                    if re.match(r'^\s*image\s*:', lines[j]):
-                        img_line = j + 1
-                        break
+                img_line = key_line('image')
                 warnings.append(Issue(img_line, 1, 'COMPOSE001', 'Użyj konkretnego tagu wersji'))
                 replacement = image
                 if image.startswith('alpine'):
@@ -75,31 +73,25 @@ def analyze_docker_compose(code: str) -> AnalysisResult:
 
         # Remove privileged: true
         if svc.get('privileged') is True:
-            priv_line = key_line_map.get(svc_name, 1)
-            for j in range(priv_line, len(lines)):
-                if re.match(r'^\s*privileged\s*:\s*true', lines[j]):
-                    errors.append(Issue(j + 1, 1, 'COMPOSE002', 'privileged: true jest niebezpieczne'))
-                    fixed_lines[j] = ''
-                    fixes.append(Fix(j + 1, 'Usunięto privileged: true', lines[j].strip(), ''))
-                    break
+            j = key_line('privileged') - 1
+            errors.append(Issue(j + 1, 1, 'COMPOSE002', 'privileged: true jest niebezpieczne'))
+            # Only a line holding nothing else can go; in a flow mapping
+            # (``web: {image: x, privileged: true}``) it is the whole service
+            if _PRIVILEGED_LINE.match(lines[j]):
+                fixed_lines[j] = ''
+                fixes.append(Fix(j + 1, 'Usunięto privileged: true', lines[j].strip(), ''))
 
         # Warn on network_mode: host
         if svc.get('network_mode') == 'host':
-            nm_line = key_line_map.get(svc_name, 1)
-            for j in range(nm_line, len(lines)):
-                if re.match(r'^\s*network_mode\s*:\s*host', lines[j]):
-                    warnings.append(Issue(j + 1, 1, 'COMPOSE003', 'network_mode: host omija izolację'))
-                    break
+            warnings.append(Issue(key_line('network_mode'), 1, 'COMPOSE003', 'network_mode: host omija izolację'))
 
         # Warn on docker.sock mount
         volumes = svc.get('volumes', [])
-        for vol in volumes:
+        if not isinstance(volumes, list):
+            volumes = []
+        for vi, vol in enumerate(volumes):
             if isinstance(vol, str) and '/var/run/docker.sock' in vol:
-                v_line = key_line_map.get(svc_name, 1)
-                for j in range(v_line, len(lines)):
-                    if '/var/run/docker.sock' in lines[j]:
-                        errors.append(Issue(j + 1, 1, 'COMPOSE004', 'Montowanie docker.sock daje pełny dostęp'))
-                        break
+                errors.append(Issue(key_line('volumes', vi), 1, 'COMPOSE004', 'Montowanie docker.sock daje pełny dostęp'))
 
         # Hardcoded secrets in environment
         env = svc.get('environment', {})
@@ -107,13 +99,9 @@ def analyze_docker_compose(code: str) -> AnalysisResult:
         if isinstance(env, dict):
             for k, v in env.items():
                 if any(p in k.upper() for p in secret_patterns) and isinstance(v, str) and not v.startswith('${'):
-                    env_line = key_line_map.get(svc_name, 1)
-                    for j in range(env_line, len(lines)):
-                        if f'{k}:' in lines[j]:
-                            errors.append(Issue(j + 1, 1, 'COMPOSE005', 'Hardcoded secret - użyj .env'))
-                            break
+                    errors.append(Issue(key_line('environment', str(k)), 1, 'COMPOSE005', 'Hardcoded secret - użyj .env'))
         elif isinstance(env, list):
-            for item in env:
+            for ei, item in enumerate(env):
                 if not isinstance(item, str):
                     continue
                 if '=' not in item:
@@ -124,11 +112,7 @@ def analyze_docker_compose(code: str) -> AnalysisResult:
                 if not k:
                     continue
                 if any(p in k.upper() for p in secret_patterns) and v and not v.startswith('${'):
-                    env_line = key_line_map.get(svc_name, 1)
-                    for j in range(env_line, len(lines)):
-                        if item in lines[j]:
-                            errors.append(Issue(j + 1, 1, 'COMPOSE005', 'Hardcoded secret - użyj .env'))
-                            break
+                    errors.append(Issue(key_line('environment', ei), 1, 'COMPOSE005', 'Hardcoded secret - użyj .env'))
 
     # Add networks block if missing and more than 1 service
     if len(services) > 1 and not has_networks:
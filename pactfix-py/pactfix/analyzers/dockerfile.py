@@ -2,6 +2,7 @@ import re
 from typing import List
 
 from ..analyzer import Issue, Fix, AnalysisResult
+from ..credentials import scan_credentials
 
 
 def analyze_dockerfile(code: str) -> AnalysisResult:
@@ -15,6 +16,8 @@ def analyze_dockerfile(code: str) -> AnalysisResult:
     base_image = None
     env_vars = set()
     
+    credential_hits = scan_credentials('dockerfile', lines, code)
+
     for i, line in enumerate(lines, 1):
         stripped = line.strip()
         upper = stripped.upper()
@@ -56,10 +59,8 @@ def analyze_dockerfile(code: str) -> AnalysisResult:
             fixes.append(Fix(i, 'Dodano / do WORKDIR', stripped, fixed))
             fixed_lines[i-1] = line.replace(stripped, fixed)
         
-        secret_patterns = ['PASSWORD=', 'SECRET=', 'API_KEY=', 'TOKEN=']
-        for pattern in secret_patterns:
-            if pattern in upper and 'ARG' not in upper:
-                errors.append(Issue(i, 1, 'DOCKER007', 'Hardcoded secret - użyj build args lub secrets'))
+        for hit in credential_hits.get(i, ()):
+            errors.append(Issue(i, 1, hit.code, hit.message))
         
         if (upper.startswith('CMD ') or upper.startswith('ENTRYPOINT ')) and '[' not in stripped:
             warnings.append(Issue(i, 1, 'DOCKER006', 'Użyj formy exec (JSON array) dla CMD/ENTRYPOINT'))
@@ -2,6 +2,7 @@ import re
 from typing import List
 
 from ..analyzer import Issue, Fix, AnalysisResult
+from ..credentials import scan_credentials
 
 
 def analyze_github_actions(code: str) -> AnalysisResult:
@@ -10,6 +11,8 @@ def analyze_github_actions(code: str) -> AnalysisResult:
     lines = code.split('\n')
     fixed_lines = lines.copy()
     
+    credential_hits = scan_credentials('github-actions', lines, code)
+
     for i, line in enumerate(lines, 1):
         stripped = line.strip()
         
@@ -22,8 +25,8 @@ def analyze_github_actions(code: str) -> AnalysisResult:
         if 'pull_request_target' in stripped:
             warnings.append(Issue(i, 1, 'GHA002', 'pull_request_target może być niebezpieczne'))
         
-        if re.search(r'(password|token|key|secret)\s*[:=]\s*(?!\$\{\{)(?!\$\{)(?!\$)\S+', stripped, re.I):
-            errors.append(Issue(i, 1, 'GHA003', 'Hardcoded secret - użyj ${{ secrets.NAME }}'))
+        for hit in credential_hits.get(i, ()):
+            errors.append(Issue(i, 1, hit.code, hit.message))
         
         if '${{' in stripped and ('github.event.' in stripped or 'inputs.' in stripped):
             if 'run:' in stripped:
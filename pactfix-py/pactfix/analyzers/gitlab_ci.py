@@ -2,6 +2,7 @@ import re
 from typing import List
 
 from ..analyzer import Issue, Fix, AnalysisResult
+from ..credentials import PROFILES, scan_credentials
 
 
 def analyze_gitlab_ci(code: str) -> AnalysisResult:
@@ -11,6 +12,7 @@ def analyze_gitlab_ci(code: str) -> AnalysisResult:
 
     lines = code.splitlines()
     fixed_lines = lines.copy()
+    credential_hits = scan_credentials('gitlab-ci', lines)
 
     for i, line in enumerate(lines, 1):
         current = fixed_lines[i - 1]
@@ -56,7 +58,8 @@ def analyze_gitlab_ci(code: str) -> AnalysisResult:
         if re.search(r'\b(curl|wget)\b', current) and '|' in current and re.search(r'\b(bash|sh)\b', current):
             warnings.append(Issue(i, 1, 'GL004', 'Pipe do bash/sh w CI może być niebezpieczny'))
 
-        if re.search(r'(?i)\b(password|token|secret|key)\b\s*:\s*(?!\$\{?\w+\}?)[^\s#]+', current):
-            errors.append(Issue(i, 1, 'GL005', 'Hardcoded secret w .gitlab-ci.yml'))
+        hits = credential_hits.get(i, ()) if current == line else PROFILES['gitlab-ci'].check_line(current)
+        for hit in hits:
+            errors.append(Issue(i, 1, hit.code, hit.message))
 
     return AnalysisResult('gitlab-ci', code, '\n'.join(fixed_lines), errors, warnings, fixes)
@@ -3,6 +3,7 @@
 import re
 from typing import List
 from ..analyzer import Issue, Fix, AnalysisResult
+from ..credentials import scan_credentials
 
 
 def analyze_go(code: str) -> AnalysisResult:
@@ -16,6 +17,8 @@ def analyze_go(code: str) -> AnalysisResult:
     in_func = False
     has_error_check = False
 
+    credential_hits = scan_credentials('go', lines, code)
+
     for i, line in enumerate(lines, 1):
         stripped = line.strip()
         indent = len(line) - len(line.lstrip())
@@ -58,10 +61,8 @@ def analyze_go(code: str) -> AnalysisResult:
             warnings.append(Issue(i, 1, 'GO008', 'time.Sleep w kodzie produkcyjnym - rozważ context.WithTimeout'))
 
         # GO009: Hardcoded credentials
-        secret_patterns = ['password', 'secret', 'apikey', 'api_key', 'token']
-        for pattern in secret_patterns:
-            if re.search(rf'{pattern}\s*[:=]\s*["\'][^"\']+["\']', stripped, re.I):
-                errors.append(Issue(i, 1, 'GO009', f'Hardcoded {pattern} - użyj zmiennych środowiskowych'))
+        for hit in credential_hits.get(i, ()):
+            errors.append(Issue(i, 1, hit.code, hit.message))
 
         # GO010: SQL injection risk
         if 'db.Query(' in stripped or 'db.Exec(' in stripped:
@@ -3,6 +3,7 @@
 import re
 from typing import List
 from ..analyzer import Issue, Fix, AnalysisResult
+from ..credentials import scan_credentials
 
 
 def analyze_java(code: str) -> AnalysisResult:
@@ -13,6 +14,8 @@ def analyze_java(code: str) -> AnalysisResult:
     lines = code.split('\n')
     fixed_lines = lines.copy()
 
+    credential_hits = scan_credentials('java', lines, code)
+
     for i, line in enumerate(lines, 1):
         stripped = line.strip()
         indent = len(line) - len(line.lstrip())
@@ -37,10 +40,8 @@ def analyze_java(code: str) -> AnalysisResult:
             warnings.append(Issue(i, 1, 'JAVA004', 'Użyj loggera zamiast System.out/err'))
 
         # JAVA005: Hardcoded credentials
-        secret_patterns = ['password', 'secret', 'apiKey', 'api_key', 'token']
-        for pattern in secret_patterns:
-            if re.search(rf'{pattern}\s*=\s*"[^"]+', stripped, re.I):
-                errors.append(Issue(i, 1, 'JAVA005', f'Hardcoded {pattern}'))
+        for hit in credential_hits.get(i, ()):
+            errors.append(Issue(i, 1, hit.code, hit.message))
 
         # JAVA006: Using raw types (generics without type parameter)
         raw_types = ['List', 'Map', 'Set', 'ArrayList', 'HashMap', 'HashSet']
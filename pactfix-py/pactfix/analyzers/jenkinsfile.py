@@ -2,6 +2,7 @@ import re
 from typing import List
 
 from ..analyzer import Issue, Fix, AnalysisResult
+from ..credentials import PROFILES, scan_credentials
 
 
 def analyze_jenkinsfile(code: str) -> AnalysisResult:
@@ -11,6 +12,7 @@ def analyze_jenkinsfile(code: str) -> AnalysisResult:
 
     lines = code.splitlines()
     fixed_lines = lines.copy()
+    credential_hits = scan_credentials('jenkinsfile', lines)
 
     for i, line in enumerate(lines, 1):
         current = fixed_lines[i - 1]
@@ -60,7 +62,8 @@ def analyze_jenkinsfile(code: str) -> AnalysisResult:
                     fixed_lines[i - 1] = fixed
                     current = fixed
 
-        if re.search(r'(?i)\b(password|token|secret|key)\b\s*[=:]\s*[\"\'][^\"\']+[\"\']', current):
-            errors.append(Issue(i, 1, 'JEN005', 'Hardcoded secret w Jenkinsfile'))
+        hits = credential_hits.get(i, ()) if current == line else PROFILES['jenkinsfile'].check_line(current)
+        for hit in hits:
+            errors.append(Issue(i, 1, hit.code, hit.message))
 
     return AnalysisResult('jenkinsfile', code, '\n'.join(fixed_lines), errors, warnings, fixes)
@@ -5,15 +5,7 @@ import re
 from typing import List, Any, Tuple
 
 from ..analyzer import Issue, Fix, AnalysisResult
-
-
-def _pos_to_line_col(code: str, pos: int) -> Tuple[int, int]:
-    if pos is None or pos < 0:
-        return 1, 1
-    prefix = code[:pos]
-    line = prefix.count('\n') + 1
-    col = len(prefix.rsplit('\n', 1)[-1]) + 1
-    return line, col
+from ..lineindex import LineIndex
 
 
 def _load_with_duplicates(code: str) -> Tuple[Any, List[str]]:
@@ -80,7 +72,7 @@ def analyze_json(code: str) -> AnalysisResult:
         line, col = getattr(e, 'lineno', 1), getattr(e, 'colno', 1)
         # Fallback when lineno/colno are missing
         if (line, col) == (1, 1) and getattr(e, 'pos', None) is not None:
-            line, col = _pos_to_line_col(fixed_code, e.pos)
+            line, col = LineIndex(fixed_code).line_col(e.pos)
 
         errors.append(Issue(line, col, 'JSON001', f'Nieprawidłowy JSON: {e.msg}'))
 
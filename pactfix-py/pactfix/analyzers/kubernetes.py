@@ -1,323 +1,253 @@
 import re
-from typing import List, Dict, Any
-
-try:
-    import yaml
-except ImportError:
-    yaml = None
+from typing import Dict, Iterable, Iterator, List, Tuple
 
 from ..analyzer import Issue, Fix, AnalysisResult
-
-
-def analyze_kubernetes(code: str) -> AnalysisResult:
+from ..credentials import scan_credentials
+from ..k8sindex import ManifestIndex, iter_objects
+from ..lineindex import shift_fix, shift_issue
+from .. import yamldoc
+
+# Document markers at column 0 (a "---" line may carry content, e.g. "--- !tag")
+_DOCUMENT_START = re.compile(r'---(?:[ \t]|\r?\n|$)')
+_DOCUMENT_END = re.compile(r'\.\.\.[ \t]*(?:#.*)?\r?\n?$')
+
+_RESOURCES_SKELETON = ('resources:', '  limits:', '    cpu: 500m', '    memory: 512Mi',
+                       '  requests:', '    cpu: 250m', '    memory: 256Mi')
+_LIVENESS_SKELETON = ('livenessProbe:', '  httpGet:', '    path: /health', '    port: 8080',
+                      '  initialDelaySeconds: 30', '  periodSeconds: 10')
+_READINESS_SKELETON = ('readinessProbe:', '  httpGet:', '    path: /ready', '    port: 8080',
+                       '  initialDelaySeconds: 5', '  periodSeconds: 5')
+_POD_SECURITY_SKELETON = ('securityContext:', '  runAsNonRoot: true', '  runAsUser: 1000', '  fsGroup: 2000')
+
+
+def analyze_kubernetes(code: str, manifest_set: bool = False) -> AnalysisResult:
+    """Analyze Kubernetes manifests.
+
+    The cross-object rules (K8S011-K8S015) assume ``code`` is the complete
+    set of manifests (e.g. ``helm template`` output); they only run when the
+    caller says so with ``manifest_set=True``, since a single file of a
+    larger bundle routinely references objects defined elsewhere.
+    """
     errors: List[Issue] = []
     warnings: List[Issue] = []
     fixes: List[Fix] = []
 
     lines = code.splitlines()
     fixed_lines = lines.copy()
+    # Skeleton blocks to insert, keyed by the index of the line they go before
+    inserts: Dict[int, List[str]] = {}
 
-    if yaml is None:
+    if yamldoc.yaml is None:
         return AnalysisResult('kubernetes', code, code, [], [Issue(1, 1, 'K8S998', 'PyYAML not installed - install pactfix[yaml] for full analysis')], [])
 
     try:
         # Handle multi-document YAML
-        documents = list(yaml.safe_load_all(code))
-        if len(documents) == 1 and documents[0] is None:
-            documents = []
-    except yaml.YAMLError:
+        documents = yamldoc.load_yaml_documents(code)
+    except yamldoc.YAMLError:
         return AnalysisResult('kubernetes', code, code, [Issue(1, 1, 'K8S999', 'Invalid YAML')], [], [])
 
-    # Track line numbers for keys via simple scan
-    key_line_map: Dict[str, int] = {}
-    for i, line in enumerate(lines, 1):
-        m = re.match(r'^\s*([a-zA-Z0-9_-]+)\s*:', line)
-        if m:
-            key_line_map[m.group(1)] = i
+    def _insert(after_line: int, indent: int, skeleton, description: str, summary: str) -> None:
+        inserts.setdefault(after_line, []).extend(' ' * indent + s for s in skeleton)
+        fixes.append(Fix(after_line, description, '', summary))
 
     # Process each document
     for doc in documents:
-        if not isinstance(doc, dict):
+        data = doc.data
+        if not isinstance(data, dict):
             continue
 
-        kind = doc.get('kind', '')
-        metadata = doc.get('metadata', {})
-        spec = doc.get('spec', {})
-        
+        kind = data.get('kind', '')
+        metadata = data.get('metadata', {})
+        if not isinstance(metadata, dict):
+            metadata = {}
+        spec = data.get('spec', {})
+        if not isinstance(spec, dict):
+            spec = {}
+
         # Check for namespace
         namespace = metadata.get('namespace', 'default')
         if namespace == 'default':
-            ns_line = key_line_map.get('namespace')
+            # Only an explicit ``namespace: default``; a missing key is left to the deploy context
+            ns_line = doc.line('metadata', 'namespace')
             if ns_line:
                 warnings.append(Issue(ns_line, 1, 'K8S007', 'Użycie default namespace'))
 
         # Analyze based on kind
-        if kind in ('Deployment', 'Pod', 'StatefulSet', 'DaemonSet'):
-            # Get pod spec
-            if kind == 'Pod':
-                pod_spec = spec
-            else:
-                pod_spec = spec.get('template', {}).get('spec', {})
-
-            if not isinstance(pod_spec, dict):
-                continue
-
-            # Check containers
-            containers = pod_spec.get('containers', [])
-            if isinstance(containers, list):
-                for idx, container in enumerate(containers):
-                    if not isinstance(container, dict):
-                        continue
-                    
-                    container_name = container.get('name')
-                    container_display_name = container_name or f'container-{idx}'
-                    
-                    # Image tag fixes
-                    image = container.get('image', '')
-                    if image:
-                        if ':latest' in image or ':' not in image:
-                            # Find image line
-                            if container_name:
-                                img_line = _find_container_line(lines, container_name, 'image')
-                            else:
-                                img_line = _find_container_key_line_by_index(lines, idx, 'image')
-                            if img_line:
-                                warnings.append(Issue(img_line, 1, 'K8S004', 'Użyj konkretnego tagu'))
-                                replacement = _suggest_image_tag(image)
-                                if replacement != image:
-                                    fixed_lines[img_line - 1] = fixed_lines[img_line - 1].replace(image, replacement)
-                                    fixes.append(Fix(img_line, 'Zmieniono image na wersjonowany tag', f'image: {image}', f'image: {replacement}'))
-
-                    # Security context checks
-                    security_context = container.get('securityContext', {})
-                    if isinstance(security_context, dict):
-                        if security_context.get('privileged') is True:
-                            if container_name:
-                                priv_line = _find_container_line(lines, container_name, 'privileged')
-                            else:
-                                priv_line = _find_container_key_line_by_index(lines, idx, 'privileged')
-                            if priv_line:
-                                errors.append(Issue(priv_line, 1, 'K8S001', 'Kontener privileged'))
-                                # Remove privileged: true
-                                fixed_lines[priv_line - 1] = re.sub(r'^(\s*)privileged:\s*true.*$', r'\1# privileged: true - REMOVED', fixed_lines[priv_line - 1])
-                                fixes.append(Fix(priv_line, 'Usunięto privileged: true', 'privileged: true', '# privileged: true - REMOVED'))
-
-                        if security_context.get('runAsUser') == 0:
-                            root_line = _find_container_line(lines, container_name, 'runAsUser')
-                            if root_line:
-                                warnings.append(Issue(root_line, 1, 'K8S002', 'Kontener jako root'))
-
-                    # Resource limits
-                    resources = container.get('resources', {})
-                    if not isinstance(resources, dict) or not resources:
-                        res_line = _find_container_line(lines, container_name, 'name')
-                        if res_line:
-                            warnings.append(Issue(res_line, 1, 'K8S008', f'Brak resource limits dla {kind}'))
-                            # Add resource limits skeleton
-                            indent = _get_line_indent(lines[res_line - 1])
-                            skeleton = [
-                                f'{indent}resources:',
-                                f'{indent}  limits:',
-                                f'{indent}    cpu: 500m',
-                                f'{indent}    memory: 512Mi',
-                                f'{indent}  requests:',
-                                f'{indent}    cpu: 250m',
-                                f'{indent}    memory: 256Mi'
-                            ]
-                            # Insert after container name or image
-                            insert_line = res_line
-                            if ':' in lines[res_line - 1]:
-                                insert_line = res_line
-                            else:
-                                insert_line = res_line + 1
-                            
-                            for i, skel_line in enumerate(skeleton):
-                                fixed_lines.insert(insert_line + i, skel_line)
-                            
-                            fixes.append(Fix(insert_line, 'Dodano resource limits', '', 'resources: [...]'))
-
-                    # Probes
-                    if not container.get('livenessProbe'):
-                        probe_line = _find_container_line(lines, container_name, 'name')
-                        if probe_line:
-                            warnings.append(Issue(probe_line, 1, 'K8S009', f'Brak liveness probe dla {kind}'))
-                            # Add liveness probe skeleton
-                            indent = _get_line_indent(lines[probe_line - 1])
-                            probe_skel = [
-                                f'{indent}livenessProbe:',
-                                f'{indent}  httpGet:',
-                                f'{indent}    path: /health',
-                                f'{indent}    port: 8080',
-                                f'{indent}  initialDelaySeconds: 30',
-                                f'{indent}  periodSeconds: 10'
-                            ]
-                            insert_pos = _find_insert_position(lines, probe_line, container_name)
-                            for i, skel in enumerate(probe_skel):
-                                fixed_lines.insert(insert_pos + i, skel)
-                            fixes.append(Fix(insert_pos, 'Dodano liveness probe', '', 'livenessProbe: [...]'))
-
-                    if not container.get('readinessProbe'):
-                        probe_line = _find_container_line(lines, container_name, 'name')
-                        if probe_line:
-                            warnings.append(Issue(probe_line, 1, 'K8S009', f'Brak readiness probe dla {kind}'))
-                            # Add readiness probe skeleton
-                            indent = _get_line_indent(lines[probe_line - 1])
-                            probe_skel = [
-                                f'{indent}readinessProbe:',
-                                f'{indent}  httpGet:',
-                                f'{indent}    path: /ready',
-                                f'{indent}    port: 8080',
-                                f'{indent}  initialDelaySeconds: 5',
-                                f'{indent}  periodSeconds: 5'
-                            ]
-                            insert_pos = _find_insert_position(lines, probe_line, container_name)
-                            for i, skel in enumerate(probe_skel):
-                                fixed_lines.insert(insert_pos + i, skel)
-                            fixes.append(Fix(insert_pos, 'Dodano readiness probe', '', 'readinessProbe: [...]'))
-
-            # Pod-level security context
-            if not pod_spec.get('securityContext'):
-                warnings.append(Issue(1, 1, 'K8S010', f'Brak pod-level securityContext dla {kind}'))
-                # Add pod security context at the end of spec
-                spec_line = key_line_map.get('spec')
-                if spec_line:
-                    indent = _get_line_indent(lines[spec_line - 1])
-                    context_lines = [
-                        f'{indent}securityContext:',
-                        f'{indent}  runAsNonRoot: true',
-                        f'{indent}  runAsUser: 1000',
-                        f'{indent}  fsGroup: 2000'
-                    ]
-                    # Find where to insert (after containers or other spec fields)
-                    insert_pos = spec_line + 1
-                    while insert_pos < len(lines) and (lines[insert_pos].startswith(' ') or lines[insert_pos].strip() == ''):
-                        insert_pos += 1
-                    
-                    for i, ctx_line in enumerate(context_lines):
-                        fixed_lines.insert(insert_pos + i, ctx_line)
-                    fixes.append(Fix(insert_pos, 'Dodano pod securityContext', '', 'securityContext: [...]'))
-
-            # Check for hostPath volumes
-            volumes = pod_spec.get('volumes', [])
-            if isinstance(volumes, list):
-                for volume in volumes:
-                    if isinstance(volume, dict) and 'hostPath' in volume:
-                        vol_line = key_line_map.get('hostPath')
-                        if vol_line:
-                            warnings.append(Issue(vol_line, 1, 'K8S003', 'hostPath - użyj PersistentVolume'))
-
-        # Check for hardcoded secrets in any kind
-        if 'value:' in code:
-            for i, line in enumerate(lines, 1):
-                if 'value:' in line:
-                    stripped = line.strip()
-                    if any(secret in stripped.upper() for secret in ['PASSWORD', 'SECRET', 'KEY', 'TOKEN']):
-                        if '${' not in line and 'valueFrom:' not in line:
-                            errors.append(Issue(i, 1, 'K8S006', 'Hardcoded secret - użyj Secret'))
-
-    return AnalysisResult('kubernetes', code, '\n'.join(fixed_lines), errors, warnings, fixes, {'kinds': [d.get('kind') for d in documents if isinstance(d, dict)]})
-
-
-def _find_container_key_line_by_index(lines: List[str], container_index: int, key: str) -> int:
-    """Find the line number for a key within the Nth container item in spec.containers.
-
-    This is a fallback for minimal YAML inputs where a container may not have a `name:` field.
-    """
-    containers_line_idx = None
-    containers_indent = 0
-    for i, line in enumerate(lines):
-        if line.strip().startswith('containers:'):
-            containers_line_idx = i
-            containers_indent = len(line) - len(line.lstrip())
-            break
-
-    if containers_line_idx is None:
-        return 0
-
-    item_start_idx = None
-    item_indent = 0
-    item_count = -1
-    for i in range(containers_line_idx + 1, len(lines)):
-        line = lines[i]
-        if not line.strip():
-            continue
-        indent = len(line) - len(line.lstrip())
-
-        # Left containers list (next key in spec/etc.)
-        if indent <= containers_indent and not line.lstrip().startswith('-'):
-            break
-
-        if line.lstrip().startswith('-'):
-            item_count += 1
-            if item_count == container_index:
-                item_start_idx = i
-                item_indent = indent
-                break
-
-    if item_start_idx is None:
-        return 0
-
-    key_re = re.compile(rf'^\s*(?:-\s*)?{re.escape(key)}\s*:')
-    for j in range(item_start_idx, len(lines)):
-        line = lines[j]
-        if j > item_start_idx and line.strip():
-            indent = len(line) - len(line.lstrip())
-            if indent <= containers_indent and not line.lstrip().startswith('-'):
-                break
-            if line.lstrip().startswith('-') and indent == item_indent:
-                break
-
-        if key_re.search(line):
-            return j + 1
-
-    return 0
-
-
-def _find_container_line(lines: List[str], container_name: str, key: str) -> int:
-    """Find the line number for a specific key within a container definition."""
-    in_container = False
-    container_indent = 0
-    
-    for i, line in enumerate(lines, 1):
-        stripped = line.strip()
-        indent = len(line) - len(line.lstrip())
-        
-        # Check for container start
-        if f'name: {container_name}' in stripped:
-            in_container = True
-            container_indent = indent
+        if kind not in ('Deployment', 'Pod', 'StatefulSet', 'DaemonSet'):
             continue
-        
-        # Check if we've left the container
-        if in_container and stripped and indent <= container_indent and not line.startswith(' '):
-            in_container = False
-            continue
-        
-        # Look for the key within container
-        if in_container and f'{key}:' in stripped:
-            return i
-    
-    return 0
-
 
-def _get_line_indent(line: str) -> str:
-    """Get the indentation of a line as spaces."""
-    return line[:len(line) - len(line.lstrip())]
+        # Get pod spec
+        if kind == 'Pod':
+            pod_path = ('spec',)
+            pod_spec = spec
+        else:
+            pod_path = ('spec', 'template', 'spec')
+            template = spec.get('template', {})
+            pod_spec = template.get('spec', {}) if isinstance(template, dict) else None
 
+        if not isinstance(pod_spec, dict):
+            continue
 
-def _find_insert_position(lines: List[str], start_line: int, container_name: str) -> int:
-    """Find a good position to insert new lines within a container."""
-    container_indent = len(lines[start_line - 1]) - len(lines[start_line - 1].lstrip())
-    
-    for i in range(start_line, min(start_line + 20, len(lines))):
-        line = lines[i]
-        indent = len(line) - len(line.lstrip())
-        
-        # If we find a line with less or equal indentation that's not empty, we've left the container
-        if line.strip() and indent <= container_indent and i > start_line:
-            return i
-    
-    return start_line + 1
+        # Check containers
+        containers = pod_spec.get('containers', [])
+        if isinstance(containers, list):
+            for idx, container in enumerate(containers):
+                if not isinstance(container, dict):
+                    continue
+
+                cpath = pod_path + ('containers', idx)
+                container_line = doc.line(*cpath, 'name') or doc.line(*cpath)
+                container_end = doc.end_line(*cpath)
+                container_indent = doc.first_key_column(*cpath)
+
+                # Image tag fixes
+                image = container.get('image', '')
+                if image and isinstance(image, str):
+                    if ':latest' in image or ':' not in image:
+                        img_line = doc.line(*cpath, 'image')
+                        if img_line:
+                            warnings.append(Issue(img_line, 1, 'K8S004', 'Użyj konkretnego tagu'))
+                            replacement = _suggest_image_tag(image)
+                            if replacement != image:
+                                fixed_lines[img_line - 1] = fixed_lines[img_line - 1].replace(image, replacement)
+                                fixes.append(Fix(img_line, 'Zmieniono image na wersjonowany tag', f'image: {image}', f'image: {replacement}'))
+
+                # Security context checks
+                security_context = container.get('securityContext', {})
+                if isinstance(security_context, dict):
+                    if security_context.get('privileged') is True:
+                        priv_line = doc.line(*cpath, 'securityContext', 'privileged')
+                        if priv_line:
+                            errors.append(Issue(priv_line, 1, 'K8S001', 'Kontener privileged'))
+                            # Remove privileged: true
+                            fixed_lines[priv_line - 1] = re.sub(r'^(\s*)privileged:\s*true.*$', r'\1# privileged: true - REMOVED', fixed_lines[priv_line - 1])
+                            fixes.append(Fix(priv_line, 'Usunięto privileged: true', 'privileged: true', '# privileged: true - REMOVED'))
+
+                    if security_context.get('runAsUser') == 0:
+                        root_line = doc.line(*cpath, 'securityContext', 'runAsUser')
+                        if root_line:
+                            warnings.append(Issue(root_line, 1, 'K8S002', 'Kontener jako root'))
+
+                if not container_line:
+                    continue
+
+                # Resource limits; skeletons go after the last line of the container
+                resources = container.get('resources', {})
+                if not isinstance(resources, dict) or not resources:
+                    warnings.append(Issue(container_line, 1, 'K8S008', f'Brak resource limits dla {kind}'))
+                    if 'resources' not in container:
+                        _insert(container_end, container_indent, _RESOURCES_SKELETON,
+                                'Dodano resource limits', 'resources: [...]')
+
+                # Probes
+                if not container.get('livenessProbe'):
+                    warnings.append(Issue(container_line, 1, 'K8S009', f'Brak liveness probe dla {kind}'))
+                    if 'livenessProbe' not in container:
+                        _insert(container_end, container_indent, _LIVENESS_SKELETON,
+                                'Dodano liveness probe', 'livenessProbe: [...]')
+
+                if not container.get('readinessProbe'):
+                    warnings.append(Issue(container_line, 1, 'K8S009', f'Brak readiness probe dla {kind}'))
+                    if 'readinessProbe' not in container:
+                        _insert(container_end, container_indent, _READINESS_SKELETON,
+                                'Dodano readiness probe', 'readinessProbe: [...]')
+
+        # Pod-level security context
+        if not pod_spec.get('securityContext'):
+            pod_line = doc.line(*pod_path)
+            warnings.append(Issue(pod_line or 1, 1, 'K8S010', f'Brak pod-level securityContext dla {kind}'))
+            if pod_line and pod_spec and 'securityContext' not in pod_spec:
+                _insert(doc.end_line(*pod_path), doc.first_key_column(*pod_path), _POD_SECURITY_SKELETON,
+                        'Dodano pod securityContext', 'securityContext: [...]')
+
+        # Check for hostPath volumes
+        volumes = pod_spec.get('volumes', [])
+        if isinstance(volumes, list):
+            for vi, volume in enumerate(volumes):
+                if isinstance(volume, dict) and 'hostPath' in volume:
+                    vol_line = doc.line(*pod_path, 'volumes', vi, 'hostPath')
+                    if vol_line:
+                        warnings.append(Issue(vol_line, 1, 'K8S003', 'hostPath - użyj PersistentVolume'))
+
+    if manifest_set:
+        warnings.extend(ManifestIndex(iter_objects(documents)).check())
+
+    # Check for hardcoded secrets in any kind
+    if 'value:' in code and any(isinstance(doc.data, dict) for doc in documents):
+        for i, hits in sorted(scan_credentials('kubernetes', lines).items()):
+            for hit in hits:
+                errors.append(Issue(i, 1, hit.code, hit.message))
+
+    if inserts:
+        fixed_lines = _splice(fixed_lines, inserts)
+
+    return AnalysisResult('kubernetes', code, '\n'.join(fixed_lines), errors, warnings, fixes, {'kinds': [d.data.get('kind') for d in documents if isinstance(d.data, dict)]})
+
+
+def split_yaml_documents(lines: Iterable[str]) -> Iterator[Tuple[int, str]]:
+    """Yield ``(first_line, text)`` for every document of a YAML stream.
+
+    ``lines`` is any iterable of lines with their line endings, e.g. an open
+    file, so only the current document is held in memory. A ``---`` line at
+    column 0 starts a new chunk and ``...`` ends the current one (a root-level
+    block scalar with such a line in it would be split too). Concatenating
+    the texts gives back the input.
+    """
+    chunk: List[str] = []
+    first_line = 1
+    line_no = 0
+    for line in lines:
+        line_no += 1
+        if _DOCUMENT_START.match(line) and chunk:
+            yield first_line, ''.join(chunk)
+            chunk = []
+            first_line = line_no
+        chunk.append(line)
+        if _DOCUMENT_END.match(line):
+            yield first_line, ''.join(chunk)
+            chunk = []
+            first_line = line_no + 1
+    if chunk:
+        yield first_line, ''.join(chunk)
+
+
+def analyze_kubernetes_stream(lines: Iterable[str]) -> Iterator[AnalysisResult]:
+    """Analyze a multi-document manifest one document at a time.
+
+    Yields one result per chunk of ``split_yaml_documents`` with issue and
+    fix lines relative to the whole stream; ``context`` adds the chunk's
+    ``document`` number, ``firstLine`` and ``lastLine``. ``fixed_code`` keeps
+    the chunk's trailing newline, so the fixed texts concatenate into the
+    fixed stream. Cross-document rules need the whole set, use
+    ``analyze_kubernetes`` for them.
+    """
+    for number, (first_line, chunk) in enumerate(split_yaml_documents(lines), 1):
+        result = analyze_kubernetes(chunk)
+        fixed = result.fixed_code
+        if chunk.endswith('\n') and not fixed.endswith('\n'):
+            fixed += '\n'
+        context = dict(result.context)
+        context.update(document=number, firstLine=first_line,
+                       lastLine=first_line + max(len(chunk.splitlines()), 1) - 1)
+        yield AnalysisResult(
+            'kubernetes', chunk, fixed,
+            [shift_issue(e, first_line) for e in result.errors],
+            [shift_issue(w, first_line) for w in result.warnings],
+            [shift_fix(f, first_line) for f in result.fixes],
+            context,
+        )
+
+
+def _splice(lines: List[str], inserts: Dict[int, List[str]]) -> List[str]:
+    """Insert ``inserts[i]`` before ``lines[i]`` (``i == len(lines)`` appends) in one pass."""
+    out: List[str] = []
+    for i, line in enumerate(lines):
+        block = inserts.get(i)
+        if block:
+            out.extend(block)
+        out.append(line)
+    out.extend(inserts.get(len(lines), ()))
+    return out
 
 
 def _suggest_image_tag(image: str) -> str:
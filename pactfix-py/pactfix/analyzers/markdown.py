@@ -1,9 +1,32 @@
-"""Markdown analyzer - extracts fenced code blocks and analyzes each block."""
+"""Markdown analyzer - extracts fenced code blocks and analyzes each block.
 
+Block results are cached by (block hash, forced language) in a dedicated LRU,
+so re-analyzing a long README after an edit only analyzes the blocks that
+changed. When many blocks miss the cache they are analyzed on a process pool
+(``PACTFIX_MARKDOWN_WORKERS``, default 1 = off; ``pactfix --path`` runs set it
+to one per CPU, servers keep it off);
+results are remapped and emitted in document order either way.
+"""
+
+import os
 import re
-from typing import List, Dict, Any
+import threading
+from typing import List, Dict, Any, Optional, Tuple
 
 from ..analyzer import Issue, Fix, AnalysisResult
+from ..cache import ResultCache, get_result_cache
+from ..lineindex import shift_fix, shift_issue
+
+# Cache of per-block results, separate from the whole-file cache so a long
+# document's blocks do not evict (or get evicted by) other files
+BLOCK_CACHE_SIZE = int(os.environ.get('PACTFIX_BLOCK_CACHE_SIZE', 4096))
+_block_cache = ResultCache(max_entries=BLOCK_CACHE_SIZE)
+
+# Fan out to worker processes only when this many blocks need analysis
+PARALLEL_MIN_BLOCKS = 8
+
+_pool = None
+_pool_lock = threading.Lock()
 
 
 # Language aliases for fenced code block tags
@@ -61,28 +84,104 @@ _LANG_ALIASES = {
 }
 
 
-def analyze_markdown(code: str) -> AnalysisResult:
-    """Analyze Markdown by extracting fenced code blocks and analyzing each."""
-    # Import here to avoid circular imports
+def _analyze_block(block_code: str, forced: Optional[str]) -> AnalysisResult:
+    # Import here to avoid circular imports; module level so the pool can pickle it
     from ..analyzer import analyze_code
+    return analyze_code(block_code, force_language=forced, use_cache=False)
+
+
+def _markdown_workers() -> int:
+    try:
+        return int(os.environ.get('PACTFIX_MARKDOWN_WORKERS', 1))
+    except ValueError:
+        return 1
+
+
+def _block_pool():
+    """Shared process pool for block analysis, or None when it would not help."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            import multiprocessing
+            workers = _markdown_workers()
+            # Never nest pools, e.g. inside ``pactfix --path --jobs N`` workers
+            if workers <= 1 or multiprocessing.parent_process() is not None:
+                return None
+            from concurrent.futures import ProcessPoolExecutor
+            _pool = ProcessPoolExecutor(max_workers=workers)
+        return _pool
+
+
+def shutdown_block_pool(pool=None) -> None:
+    """Stop the block worker pool (it is recreated on demand).
 
+    With ``pool``, only stop it if it is still the shared pool, so a request
+    that saw a broken pool does not shut down a fresh one in use by others.
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None or (pool is not None and pool is not _pool):
+            return
+        pool, _pool = _pool, None
+    pool.shutdown(cancel_futures=True)
+
+
+def _analyze_blocks(items: List[Tuple[str, Optional[str]]]) -> List[AnalysisResult]:
+    """Analyze ``(code, forced language)`` pairs, in order."""
+    pool = _block_pool() if len(items) >= PARALLEL_MIN_BLOCKS else None
+    if pool is not None:
+        codes, languages = zip(*items)
+        try:
+            return list(pool.map(_analyze_block, codes, languages,
+                                 chunksize=max(1, len(items) // (_markdown_workers() * 4))))
+        except (OSError, RuntimeError):
+            # BrokenProcessPool is a RuntimeError; analyze in-process instead
+            shutdown_block_pool(pool)
+    return [_analyze_block(block_code, forced) for block_code, forced in items]
+
+
+def _resolve_blocks(items: List[Tuple[str, Optional[str]]]) -> List[AnalysisResult]:
+    """Results for ``items`` from the block cache, analyzing only the misses."""
+    cache = _block_cache if get_result_cache() is not None else None
+    results: List[Optional[AnalysisResult]] = [None] * len(items)
+    keys: List[Optional[str]] = [None] * len(items)
+    misses: List[int] = []
+    for i, (block_code, forced) in enumerate(items):
+        if cache is not None:
+            keys[i] = cache.make_key(block_code, forced or '', forced)
+            # Block results are only read below, never mutated
+            results[i] = cache.get(keys[i], block_code, clone=False)
+        if results[i] is None:
+            misses.append(i)
+
+    if misses:
+        analyzed = _analyze_blocks([items[i] for i in misses])
+        for i, result in zip(misses, analyzed):
+            results[i] = result
+            if cache is not None:
+                cache.put(keys[i], result)
+    return results
+
+
+def analyze_markdown(code: str) -> AnalysisResult:
+    """Analyze Markdown by extracting fenced code blocks and analyzing each."""
     errors: List[Issue] = []
     warnings: List[Issue] = []
     fixes: List[Fix] = []
 
     lines = code.split('\n')
-    out_lines: List[str] = []
+    # Fixed lines; None marks where the fixed lines of pending[i] go
+    out_lines: List[Optional[str]] = []
 
     in_fence = False
     fence_lang = None
     fence_start_line = None
     block_lines: List[str] = []
 
-    blocks: List[Dict[str, Any]] = []
+    # (code, forced language, fence start line, end fence line) of blocks to analyze
+    pending: List[Tuple[str, Optional[str], int, int]] = []
 
     def _flush_block(end_fence_line: int):
-        nonlocal errors, warnings, fixes
-
         block_code = '\n'.join(block_lines)
         if not block_code.strip():
             out_lines.extend(block_lines)
@@ -93,46 +192,8 @@ def analyze_markdown(code: str) -> AnalysisResult:
             lang_tag = fence_lang.strip().lower()
             forced = _LANG_ALIASES.get(lang_tag, lang_tag)
 
-        result = analyze_code(block_code, force_language=forced)
-
-        fixed_block_lines = result.fixed_code.split('\n') if result.fixed_code else ['']
-
-        content_start_line = (fence_start_line or 1) + 1
-        for e in result.errors:
-            errors.append(Issue(
-                line=content_start_line + (e.line - 1),
-                column=e.column,
-                code=e.code,
-                message=e.message,
-                severity=e.severity,
-            ))
-        for w in result.warnings:
-            warnings.append(Issue(
-                line=content_start_line + (w.line - 1),
-                column=w.column,
-                code=w.code,
-                message=w.message,
-                severity=w.severity,
-            ))
-        for f in result.fixes:
-            fixes.append(Fix(
-                line=content_start_line + (f.line - 1),
-                description=f.description,
-                before=f.before,
-                after=f.after,
-            ))
-
-        out_lines.extend(fixed_block_lines)
-
-        blocks.append({
-            'language': forced or result.language,
-            'start_line': fence_start_line,
-            'end_line': end_fence_line,
-            'content_start_line': content_start_line,
-            'errors': len(result.errors),
-            'warnings': len(result.warnings),
-            'fixes': len(result.fixes),
-        })
+        pending.append((block_code, forced, fence_start_line, end_fence_line))
+        out_lines.append(None)
 
     for idx, line in enumerate(lines, 1):
         stripped = line.strip()
@@ -161,6 +222,37 @@ def analyze_markdown(code: str) -> AnalysisResult:
         _flush_block(end_fence_line=len(lines))
         # Don't re-add lines since _flush_block already added fixed lines
 
+    results = _resolve_blocks([(block_code, forced) for block_code, forced, _, _ in pending])
+
+    blocks: List[Dict[str, Any]] = []
+    fixed_blocks = []
+    for (_, forced, start_line, end_line), result in zip(pending, results):
+        content_start_line = (start_line or 1) + 1
+        errors.extend(shift_issue(e, content_start_line) for e in result.errors)
+        warnings.extend(shift_issue(w, content_start_line) for w in result.warnings)
+        fixes.extend(shift_fix(f, content_start_line, keep_edits=False) for f in result.fixes)
+        fixed_blocks.append(result.fixed_code.split('\n') if result.fixed_code else [''])
+
+        blocks.append({
+            'language': forced or result.language,
+            'start_line': start_line,
+            'end_line': end_line,
+            'content_start_line': content_start_line,
+            'errors': len(result.errors),
+            'warnings': len(result.warnings),
+            'fixes': len(result.fixes),
+        })
+
+    if fixed_blocks:
+        fixed_iter = iter(fixed_blocks)
+        assembled: List[str] = []
+        for line in out_lines:
+            if line is None:
+                assembled.extend(next(fixed_iter))
+            else:
+                assembled.append(line)
+        out_lines = assembled
+
     fixed_code = '\n'.join(out_lines)
 
     return AnalysisResult(
@@ -4,6 +4,7 @@ import re
 from typing import List, Dict, Any
 
 from ..analyzer import Issue, Fix, AnalysisResult
+from ..lineindex import LineIndex, shift_fix, shift_issue
 
 # Regex matching markpact codeblocks: ```lang markpact:kind meta\nbody\n```
 MARKPACT_BLOCK_RE = re.compile(
@@ -105,11 +106,6 @@ def _resolve_language(lang: str, kind: str, meta: str, body: str) -> str | None:
     return None
 
 
-def _find_block_line(code: str, match: re.Match) -> int:
-    """Return the 1-indexed line number where a regex match starts."""
-    return code[:match.start()].count('\n') + 1
-
-
 def analyze_markpact(code: str) -> AnalysisResult:
     """Analyze a markpact file by inspecting each markpact:* codeblock.
 
@@ -142,15 +138,17 @@ def analyze_markpact(code: str) -> AnalysisResult:
     from ..analyzer import analyze_code
 
     context_blocks: List[Dict[str, Any]] = []
+    index = LineIndex(code)
 
     for match in blocks:
         lang = (match.group('lang') or '').strip()
         kind = match.group('kind')
         meta = (match.group('meta') or '').strip()
-        body = match.group('body').strip()
-        block_start_line = _find_block_line(code, match)
-        # Body starts after the opening ``` line
-        body_start_line = block_start_line + 1
+        raw_body = match.group('body')
+        body = raw_body.strip()
+        block_start_line = index.line_of(match.start())
+        # Line 1 of the stripped body: leading blank lines are not part of it
+        body_start_line = index.line_of(match.start('body') + len(raw_body) - len(raw_body.lstrip()))
 
         resolved_lang = _resolve_language(lang, kind, meta, body)
 
@@ -180,35 +178,13 @@ def analyze_markpact(code: str) -> AnalysisResult:
 
         # Re-map line numbers from the sub-result to the markpact file
         for issue in result.errors:
-            mapped_line = body_start_line + issue.line - 1
-            errors.append(Issue(
-                mapped_line, issue.column, issue.code,
-                f'[{block_label}] {issue.message}',
-                issue.severity,
-            ))
+            errors.append(shift_issue(issue, body_start_line, f'[{block_label}] {issue.message}'))
 
         for issue in result.warnings:
-            mapped_line = body_start_line + issue.line - 1
-            warnings.append(Issue(
-                mapped_line, issue.column, issue.code,
-                f'[{block_label}] {issue.message}',
-                issue.severity,
-            ))
+            warnings.append(shift_issue(issue, body_start_line, f'[{block_label}] {issue.message}'))
 
         for fix in result.fixes:
-            mapped_line = body_start_line + fix.line - 1
-            mapped_edits = []
-            for edit in (fix.edits or []):
-                mapped_edit = dict(edit)
-                if 'startLine' in mapped_edit:
-                    mapped_edit['startLine'] = body_start_line + int(mapped_edit['startLine']) - 1
-                if 'endLine' in mapped_edit:
-                    mapped_edit['endLine'] = body_start_line + int(mapped_edit['endLine']) - 1
-                mapped_edits.append(mapped_edit)
-            fixes.append(Fix(
-                mapped_line, f'[{block_label}] {fix.description}',
-                fix.before, fix.after, edits=mapped_edits,
-            ))
+            fixes.append(shift_fix(fix, body_start_line, f'[{block_label}] {fix.description}'))
 
         block_info['issues'] = len(result.errors) + len(result.warnings)
         context_blocks.append(block_info)
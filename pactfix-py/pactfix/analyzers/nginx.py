@@ -2,6 +2,34 @@ import re
 from typing import List
 
 from ..analyzer import Issue, Fix, AnalysisResult
+from ..rules import LineRule, iter_lines, run_line_rules
+
+_RE_INDENT = re.compile(r'^\s*')
+_RE_SERVER_OPEN = re.compile(r'^\s*server\s*\{\s*$')
+_RE_LISTEN_443 = re.compile(r'^\s*listen\s+443\b', re.MULTILINE)
+_RE_LISTEN_80 = re.compile(r'^\s*listen\s+80\b', re.MULTILINE)
+_RE_DOTFILES_LOCATION = re.compile(r'^\s*location\s+~\s*/\\.\s*\{\s*$', re.MULTILINE)
+
+NGINX_RULES = (
+    LineRule('NGINX001', 'server_tokens ujawnia wersję', requires=('server_tokens on',),
+             fix=lambda ctx, m: (ctx.stripped, ctx.stripped.replace('server_tokens on', 'server_tokens off')),
+             fix_description='Wyłączono server_tokens'),
+    LineRule('NGINX002', 'autoindex ujawnia strukturę', requires=('autoindex on',),
+             fix=lambda ctx, m: (ctx.stripped, ctx.stripped.replace('autoindex on', 'autoindex off')),
+             fix_description='Wyłączono autoindex'),
+    LineRule('NGINX003', 'Słabe protokoły SSL', severity='error', requires=('ssl_protocols',),
+             when=lambda ctx: 'SSLv3' in ctx.stripped or 'TLSv1 ' in ctx.stripped or 'TLSv1.1' in ctx.stripped,
+             fix=lambda ctx, m: (ctx.stripped, 'ssl_protocols TLSv1.2 TLSv1.3;'),
+             fix_description='Ustawiono bezpieczne ssl_protocols', whole_line=True),
+    LineRule('NGINX004', 'Słabe szyfry w ssl_ciphers', severity='error', requires=('ssl_ciphers',),
+             when=lambda ctx: 'RC4' in ctx.upper or 'MD5' in ctx.upper or 'DES' in ctx.upper,
+             fix=lambda ctx, m: (ctx.stripped, "ssl_ciphers 'HIGH:!aNULL:!MD5:!3DES:!RC4';"),
+             fix_description='Ustawiono bezpieczne ssl_ciphers', whole_line=True),
+)
+
+
+def _indent(line: str) -> str:
+    return _RE_INDENT.match(line).group(0)
 
 
 def analyze_nginx(code: str) -> AnalysisResult:
@@ -10,36 +38,8 @@ def analyze_nginx(code: str) -> AnalysisResult:
     lines = code.splitlines()
     fixed_lines = lines.copy()
 
-    for i, line in enumerate(lines, 1):
-        stripped = line.strip()
-
-        if 'server_tokens on' in stripped:
-            warnings.append(Issue(i, 1, 'NGINX001', 'server_tokens ujawnia wersję'))
-            fixed = stripped.replace('server_tokens on', 'server_tokens off')
-            fixes.append(Fix(i, 'Wyłączono server_tokens', stripped, fixed))
-            fixed_lines[i - 1] = line.replace(stripped, fixed)
-
-        if 'autoindex on' in stripped:
-            warnings.append(Issue(i, 1, 'NGINX002', 'autoindex ujawnia strukturę'))
-            fixed = stripped.replace('autoindex on', 'autoindex off')
-            fixes.append(Fix(i, 'Wyłączono autoindex', stripped, fixed))
-            fixed_lines[i - 1] = line.replace(stripped, fixed)
-
-        if 'ssl_protocols' in stripped and ('SSLv3' in stripped or 'TLSv1 ' in stripped or 'TLSv1.1' in stripped):
-            errors.append(Issue(i, 1, 'NGINX003', 'Słabe protokoły SSL'))
-            fixed = 'ssl_protocols TLSv1.2 TLSv1.3;'
-            indent = re.match(r'^\s*', line).group(0)
-            fixes.append(Fix(i, 'Ustawiono bezpieczne ssl_protocols', stripped, fixed))
-            fixed_lines[i - 1] = indent + fixed
-
-        if 'ssl_ciphers' in stripped:
-            upper = stripped.upper()
-            if 'RC4' in upper or 'MD5' in upper or 'DES' in upper:
-                errors.append(Issue(i, 1, 'NGINX004', 'Słabe szyfry w ssl_ciphers'))
-                fixed = "ssl_ciphers 'HIGH:!aNULL:!MD5:!3DES:!RC4';"
-                indent = re.match(r'^\s*', line).group(0)
-                fixes.append(Fix(i, 'Ustawiono bezpieczne ssl_ciphers', stripped, fixed))
-                fixed_lines[i - 1] = indent + fixed
+    for ctx in iter_lines(lines):
+        fixed_lines[ctx.line_no - 1] = run_line_rules(NGINX_RULES, ctx, errors, warnings, fixes)
 
     server_blocks = []
     brace = 0
@@ -49,7 +49,7 @@ def analyze_nginx(code: str) -> AnalysisResult:
 
     for idx, line in enumerate(fixed_lines):
         stripped = line.strip()
-        if not in_server and re.match(r'^\s*server\s*\{\s*$', stripped):
+        if not in_server and _RE_SERVER_OPEN.match(stripped):
             in_server = True
             server_start = idx
             server_level = brace
@@ -64,13 +64,13 @@ def analyze_nginx(code: str) -> AnalysisResult:
 
     inserts = []
     all_text = '\n'.join(fixed_lines)
-    has_any_ssl = bool(re.search(r'^\s*listen\s+443\b', all_text, re.MULTILINE)) or ('ssl_certificate' in all_text)
+    has_any_ssl = bool(_RE_LISTEN_443.search(all_text)) or ('ssl_certificate' in all_text)
 
     for start, end in server_blocks:
         block_lines = fixed_lines[start:end + 1]
         block_text = '\n'.join(block_lines)
-        has_ssl = bool(re.search(r'^\s*listen\s+443\b', block_text, re.MULTILINE)) or ' ssl' in block_text
-        has_http = bool(re.search(r'^\s*listen\s+80\b', block_text, re.MULTILINE))
+        has_ssl = bool(_RE_LISTEN_443.search(block_text)) or ' ssl' in block_text
+        has_http = bool(_RE_LISTEN_80.search(block_text))
         has_headers = 'add_header' in block_text
 
         if has_http and has_any_ssl and 'return 301 https://' not in block_text:
@@ -79,16 +79,16 @@ def analyze_nginx(code: str) -> AnalysisResult:
             for j in range(start, end + 1):
                 if 'server_name' in fixed_lines[j]:
                     insert_at = j + 1
-                    insert_indent = re.match(r'^\s*', fixed_lines[j]).group(0)
+                    insert_indent = _indent(fixed_lines[j])
                     break
             if insert_indent is None:
                 for j in range(start, end + 1):
-                    if re.search(r'^\s*listen\s+80\b', fixed_lines[j]):
+                    if _RE_LISTEN_80.search(fixed_lines[j]):
                         insert_at = j + 1
-                        insert_indent = re.match(r'^\s*', fixed_lines[j]).group(0)
+                        insert_indent = _indent(fixed_lines[j])
                         break
             if insert_indent is None:
-                insert_indent = re.match(r'^\s*', fixed_lines[start]).group(0) + '    '
+                insert_indent = _indent(fixed_lines[start]) + '    '
 
             inserts.append((insert_at, [insert_indent + 'return 301 https://$host$request_uri;'], start + 1))
             warnings.append(Issue(start + 1, 1, 'NGINX007', 'Brak przekierowania HTTP->HTTPS'))
@@ -100,10 +100,10 @@ def analyze_nginx(code: str) -> AnalysisResult:
             for j in range(start, end + 1):
                 if 'server_name' in fixed_lines[j]:
                     insert_at = j + 1
-                    insert_indent = re.match(r'^\s*', fixed_lines[j]).group(0)
+                    insert_indent = _indent(fixed_lines[j])
                     break
             if insert_indent is None:
-                insert_indent = re.match(r'^\s*', fixed_lines[start]).group(0) + '    '
+                insert_indent = _indent(fixed_lines[start]) + '    '
 
             hdrs = [
                 insert_indent + 'add_header X-Frame-Options "SAMEORIGIN" always;',
@@ -115,17 +115,17 @@ def analyze_nginx(code: str) -> AnalysisResult:
 
         if has_ssl and 'ssl_session_tickets' not in block_text:
             insert_at = end
-            insert_indent = re.match(r'^\s*', fixed_lines[start]).group(0) + '    '
+            insert_indent = _indent(fixed_lines[start]) + '    '
             inserts.append((insert_at, [insert_indent + 'ssl_session_tickets off;'], start + 1))
             warnings.append(Issue(start + 1, 1, 'NGINX008', 'Brak ssl_session_tickets off'))
 
         if has_ssl and 'ssl_prefer_server_ciphers' not in block_text:
             insert_at = end
-            insert_indent = re.match(r'^\s*', fixed_lines[start]).group(0) + '    '
+            insert_indent = _indent(fixed_lines[start]) + '    '
             inserts.append((insert_at, [insert_indent + 'ssl_prefer_server_ciphers on;'], start + 1))
             warnings.append(Issue(start + 1, 1, 'NGINX009', 'Brak ssl_prefer_server_ciphers on'))
 
-        if re.search(r'^\s*location\s+~\s*/\\.\s*\{\s*$', block_text, re.MULTILINE):
+        if _RE_DOTFILES_LOCATION.search(block_text):
             brace2 = 0
             in_loc = False
             loc_start = None
@@ -133,7 +133,7 @@ def analyze_nginx(code: str) -> AnalysisResult:
             for j in range(start, end + 1):
                 l = fixed_lines[j]
                 s = l.strip()
-                if not in_loc and re.match(r'^\s*location\s+~\s*/\\.\s*\{\s*$', s):
+                if not in_loc and _RE_DOTFILES_LOCATION.match(s):
                     in_loc = True
                     loc_start = j
                     loc_level = brace2
@@ -141,16 +141,24 @@ def analyze_nginx(code: str) -> AnalysisResult:
                 if in_loc and loc_level is not None and brace2 == loc_level and loc_start is not None and j > loc_start:
                     loc_text = '\n'.join(fixed_lines[loc_start:j + 1])
                     if 'deny all;' not in loc_text:
-                        indent = re.match(r'^\s*', fixed_lines[loc_start]).group(0) + '    '
+                        indent = _indent(fixed_lines[loc_start]) + '    '
                         inserts.append((loc_start + 1, [indent + 'deny all;'], loc_start + 1))
                         warnings.append(Issue(loc_start + 1, 1, 'NGINX006', 'Brak deny all dla dotfiles'))
                     in_loc = False
                     loc_start = None
                     loc_level = None
 
+    # Splice all inserts in one pass; at equal positions later inserts go first
+    pending = {}
     for insert_at, new_lines, line_no in sorted(inserts, key=lambda x: x[0], reverse=True):
-        for k, nl in enumerate(new_lines):
-            fixed_lines.insert(insert_at + k, nl)
+        pending[insert_at] = new_lines + pending.get(insert_at, [])
         fixes.append(Fix(line_no, 'Dodano ustawienia hardening', '', new_lines[0].strip()))
+    if pending:
+        spliced = []
+        for idx, line in enumerate(fixed_lines):
+            spliced.extend(pending.get(idx, ()))
+            spliced.append(line)
+        spliced.extend(pending.get(len(fixed_lines), ()))
+        fixed_lines = spliced
 
     return AnalysisResult('nginx', code, '\n'.join(fixed_lines), errors, warnings, fixes)
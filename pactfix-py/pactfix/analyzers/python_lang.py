@@ -4,6 +4,23 @@ from typing import List, Dict, Any
 
 from ..analyzer import Issue, Fix, AnalysisResult
 
+_RE_INDENT = re.compile(r'^\s*')
+_RE_DEF = re.compile(r'^\s*def\s+\w+\s*\(')
+_RE_PRINT_STATEMENT = re.compile(r'^print\s+["\']|^print\s+\w')
+_RE_PRINT_ARGS = re.compile(r'^print\s+(.+)$')
+_RE_BARE_EXCEPT = re.compile(r'^except\s*:')
+_RE_BARE_EXCEPT_LINE = re.compile(r'^except\s*:\s*$')
+_RE_MUTABLE_DEFAULT = re.compile(r'def\s+\w+\s*\([^)]*=\s*(\[\]|\{\})')
+_RE_DEF_SIGNATURE = re.compile(r'^(\s*def\s+\w+\s*\()(?P<args>[^)]*)(\)\s*:.*)$')
+_RE_MUTABLE_ARG = re.compile(r'(?P<name>[A-Za-z_][A-Za-z0-9_]*)\s*=\s*(?P<lit>\[\]|\{\})')
+_RE_EQ_NONE = re.compile(r'==\s*None\b')
+_RE_NE_NONE = re.compile(r'!=\s*None\b')
+_RE_TYPE_CMP = re.compile(r'\btype\s*\(\s*(?P<expr>[^)]+?)\s*\)\s*==\s*(?P<typ>list|dict|tuple|set)\b')
+_LITERAL_PAT = r'("[^"]*"|\'[^\']*\'|\d+)'
+_TAIL_PAT = r'(?=\s|$|:|,|\)|\]|\})'
+_RE_IS_NOT_LITERAL = re.compile(rf'\bis\s+not\s+(?!None\b){_LITERAL_PAT}{_TAIL_PAT}')
+_RE_IS_LITERAL = re.compile(rf'\bis\s+(?!None\b){_LITERAL_PAT}{_TAIL_PAT}')
+
 
 def _split_python_comment(line: str) -> tuple[str, str]:
     in_single = False
@@ -40,7 +57,7 @@ def analyze_python(code: str) -> AnalysisResult:
         code_stripped = code_part.strip()
         in_condition_stmt = code_stripped.startswith(('if ', 'elif ', 'while ', 'assert '))
 
-        if re.match(r'^\s*def\s+\w+\s*\(', current_line):
+        if 'def' in current_line and _RE_DEF.match(current_line):
             next_non_empty = ''
             next_idx = i
             while next_idx < len(fixed_lines):
@@ -51,11 +68,11 @@ def analyze_python(code: str) -> AnalysisResult:
                 next_idx += 1
             if next_non_empty and not next_non_empty.startswith(('"""', "'''")):
                 warnings.append(Issue(i, 1, 'PY006', 'Funkcja nie ma docstringa'))
-                def_indent_match = re.match(r'^\s*', current_line)
+                def_indent_match = _RE_INDENT.match(current_line)
                 def_indent = def_indent_match.group(0) if def_indent_match else ''
                 body_indent = def_indent + '    '
                 if next_idx < len(fixed_lines):
-                    probe_indent_match = re.match(r'^\s*', fixed_lines[next_idx])
+                    probe_indent_match = _RE_INDENT.match(fixed_lines[next_idx])
                     probe_indent = probe_indent_match.group(0) if probe_indent_match else ''
                     if len(probe_indent) > len(def_indent):
                         body_indent = probe_indent
@@ -64,10 +81,10 @@ def analyze_python(code: str) -> AnalysisResult:
                 fixes.append(Fix(i, 'Dodano szablon docstringa', current_line.strip(), '', edits=[edit]))
         
         # Python 2 print statement
-        if re.match(r'^print\s+["\']', stripped) or re.match(r'^print\s+\w', stripped):
+        if stripped.startswith('print') and _RE_PRINT_STATEMENT.match(stripped):
             if not stripped.startswith('print('):
                 errors.append(Issue(i, 1, 'PY001', 'Użyj print() z nawiasami (Python 3)'))
-                match = re.match(r'^print\s+(.+)$', stripped)
+                match = _RE_PRINT_ARGS.match(stripped)
                 if match:
                     fixed = f'print({match.group(1)})'
                     fixes.append(Fix(i, 'Dodano nawiasy do print()', stripped, fixed))
@@ -78,10 +95,10 @@ def analyze_python(code: str) -> AnalysisResult:
                     stripped = current_line.strip()
         
         # Bare except
-        if re.match(r'^except\s*:', code_stripped):
+        if code_stripped.startswith('except') and _RE_BARE_EXCEPT.match(code_stripped):
             warnings.append(Issue(i, 1, 'PY002', 'Unikaj pustego except: - złap konkretne wyjątki'))
-            if re.match(r'^except\s*:\s*$', code_stripped):
-                fixed = re.sub(r'^except\s*:\s*$', 'except Exception:', code_stripped)
+            if _RE_BARE_EXCEPT_LINE.match(code_stripped):
+                fixed = _RE_BARE_EXCEPT_LINE.sub('except Exception:', code_stripped)
                 if fixed != code_stripped:
                     fixes.append(Fix(i, 'Zmieniono except: na except Exception:', code_stripped, fixed))
                     fixed_lines[i - 1] = (code_part[:len(code_part) - len(code_part.lstrip())] + fixed + comment_part)
@@ -91,12 +108,12 @@ def analyze_python(code: str) -> AnalysisResult:
                     stripped = current_line.strip()
         
         # Mutable default argument
-        if re.search(r'def\s+\w+\s*\([^)]*=\s*(\[\]|\{\})', stripped):
+        if 'def' in stripped and '=' in stripped and _RE_MUTABLE_DEFAULT.search(stripped):
             warnings.append(Issue(i, 1, 'PY003', 'Mutable default argument - użyj None'))
-            m = re.match(r'^(\s*def\s+\w+\s*\()(?P<args>[^)]*)(\)\s*:.*)$', current_line)
+            m = _RE_DEF_SIGNATURE.match(current_line)
             if m:
                 args = m.group('args')
-                arg_match = re.search(r'(?P<name>[A-Za-z_][A-Za-z0-9_]*)\s*=\s*(?P<lit>\[\]|\{\})', args)
+                arg_match = _RE_MUTABLE_ARG.search(args)
                 if arg_match:
                     name = arg_match.group('name')
                     lit = arg_match.group('lit')
@@ -107,14 +124,14 @@ def analyze_python(code: str) -> AnalysisResult:
                     if re.search(rf'^\s*if\s+{re.escape(name)}\s+is\s+None\s*:', next_line or ''):
                         pass
                     else:
-                        def_indent_match = re.match(r'^\s*', current_line)
+                        def_indent_match = _RE_INDENT.match(current_line)
                         def_indent = def_indent_match.group(0) if def_indent_match else ''
                         body_indent = def_indent + '    '
                         for j in range(i, len(fixed_lines)):
                             probe = fixed_lines[j]
                             if probe.strip() == '':
                                 continue
-                            probe_indent_match = re.match(r'^\s*', probe)
+                            probe_indent_match = _RE_INDENT.match(probe)
                             probe_indent = probe_indent_match.group(0) if probe_indent_match else ''
                             if len(probe_indent) > len(def_indent):
                                 body_indent = probe_indent
@@ -147,8 +164,8 @@ def analyze_python(code: str) -> AnalysisResult:
         if in_condition_stmt and ('== None' in code_part or '!= None' in code_part):
             warnings.append(Issue(i, 1, 'PY004', 'Użyj "is None" zamiast "== None"'))
             fixed_code = code_part
-            fixed_code = re.sub(r'==\s*None\b', 'is None', fixed_code)
-            fixed_code = re.sub(r'!=\s*None\b', 'is not None', fixed_code)
+            fixed_code = _RE_EQ_NONE.sub('is None', fixed_code)
+            fixed_code = _RE_NE_NONE.sub('is not None', fixed_code)
             if fixed_code != code_part:
                 before = code_part.strip()
                 after = fixed_code.strip()
@@ -161,11 +178,8 @@ def analyze_python(code: str) -> AnalysisResult:
 
         # type(x) == T instead of isinstance(x, T)
         m_type_cmp = None
-        if in_condition_stmt:
-            m_type_cmp = re.search(
-                r'\btype\s*\(\s*(?P<expr>[^)]+?)\s*\)\s*==\s*(?P<typ>list|dict|tuple|set)\b',
-                code_part,
-            )
+        if in_condition_stmt and 'type' in code_part:
+            m_type_cmp = _RE_TYPE_CMP.search(code_part)
         if m_type_cmp:
             warnings.append(Issue(i, 1, 'PY007', 'Rozważ isinstance() zamiast type() == ...'))
             expr = m_type_cmp.group('expr')
@@ -182,15 +196,11 @@ def analyze_python(code: str) -> AnalysisResult:
                 stripped = current_line.strip()
 
         # Using 'is'/'is not' for literal string/int comparison
-        literal_pat = r'("[^"]*"|\'[^\']*\'|\d+)'
-        tail_pat = r'(?=\s|$|:|,|\)|\]|\})'
-        is_not_pat = rf'\bis\s+not\s+(?!None\b){literal_pat}{tail_pat}'
-        is_pat = rf'\bis\s+(?!None\b){literal_pat}{tail_pat}'
-        if in_condition_stmt and (re.search(is_not_pat, code_part) or re.search(is_pat, code_part)):
+        if in_condition_stmt and 'is' in code_part and (_RE_IS_NOT_LITERAL.search(code_part) or _RE_IS_LITERAL.search(code_part)):
             warnings.append(Issue(i, 1, 'PY008', 'Nie używaj "is" do porównań z literałami - użyj =='))
             fixed_code = code_part
-            fixed_code = re.sub(is_not_pat, r'!= \1', fixed_code)
-            fixed_code = re.sub(is_pat, r'== \1', fixed_code)
+            fixed_code = _RE_IS_NOT_LITERAL.sub(r'!= \1', fixed_code)
+            fixed_code = _RE_IS_LITERAL.sub(r'== \1', fixed_code)
             if fixed_code != code_part:
                 fixes.append(Fix(i, 'Zamieniono "is" na == dla literałów', code_part.strip(), fixed_code.strip()))
                 fixed_lines[i - 1] = fixed_code + comment_part
@@ -202,11 +212,15 @@ def analyze_python(code: str) -> AnalysisResult:
     try:
         tree = ast.parse('\n'.join(fixed_lines))
         used_names: set[str] = set()
+        import_nodes = []
         for node in ast.walk(tree):
-            if isinstance(node, ast.Name) and isinstance(node.ctx, ast.Load):
-                used_names.add(node.id)
+            if isinstance(node, ast.Name):
+                if isinstance(node.ctx, ast.Load):
+                    used_names.add(node.id)
+            elif isinstance(node, (ast.Import, ast.ImportFrom)):
+                import_nodes.append(node)
 
-        for node in ast.walk(tree):
+        for node in import_nodes:
             if isinstance(node, ast.Import) and getattr(node, 'lineno', None):
                 if len(node.names) != 1:
                     continue
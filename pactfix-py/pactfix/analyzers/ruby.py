@@ -3,6 +3,7 @@
 import re
 from typing import List
 from ..analyzer import Issue, Fix, AnalysisResult
+from ..credentials import scan_credentials
 
 
 def analyze_ruby(code: str) -> AnalysisResult:
@@ -13,6 +14,8 @@ def analyze_ruby(code: str) -> AnalysisResult:
     lines = code.split('\n')
     fixed_lines = lines.copy()
 
+    credential_hits = scan_credentials('ruby', lines, code)
+
     for i, line in enumerate(lines, 1):
         stripped = line.strip()
         indent = len(line) - len(line.lstrip())
@@ -38,10 +41,8 @@ def analyze_ruby(code: str) -> AnalysisResult:
             warnings.append(Issue(i, 1, 'RUBY004', 'puts/print - użyj Loggera'))
 
         # RUBY005: Hardcoded credentials
-        secret_patterns = ['password', 'secret', 'api_key', 'token']
-        for pattern in secret_patterns:
-            if re.search(rf'{pattern}\s*=\s*["\'][^"\']+["\']', stripped, re.I):
-                errors.append(Issue(i, 1, 'RUBY005', f'Hardcoded {pattern}'))
+        for hit in credential_hits.get(i, ()):
+            errors.append(Issue(i, 1, hit.code, hit.message))
 
         # RUBY006: Using eval
         if 'eval(' in stripped or 'eval ' in stripped:
@@ -3,6 +3,7 @@
 import re
 from typing import List
 from ..analyzer import Issue, Fix, AnalysisResult
+from ..credentials import scan_credentials
 
 
 def analyze_rust(code: str) -> AnalysisResult:
@@ -13,6 +14,8 @@ def analyze_rust(code: str) -> AnalysisResult:
     lines = code.split('\n')
     fixed_lines = lines.copy()
 
+    credential_hits = scan_credentials('rust', lines, code)
+
     for i, line in enumerate(lines, 1):
         stripped = line.strip()
         indent = len(line) - len(line.lstrip())
@@ -58,10 +61,8 @@ def analyze_rust(code: str) -> AnalysisResult:
             warnings.append(Issue(i, 1, 'RUST008', 'println! zamiast log/tracing - użyj proper logging'))
 
         # RUST009: Hardcoded secrets
-        secret_patterns = ['password', 'secret', 'api_key', 'token']
-        for pattern in secret_patterns:
-            if re.search(rf'{pattern}\s*=\s*"[^"]+', stripped, re.I):
-                errors.append(Issue(i, 1, 'RUST009', f'Hardcoded {pattern}'))
+        for hit in credential_hits.get(i, ()):
+            errors.append(Issue(i, 1, hit.code, hit.message))
 
         # RUST010: Using unsafe without comment
         if 'unsafe {' in stripped or 'unsafe fn' in stripped:
@@ -2,6 +2,28 @@ import re
 from typing import List
 
 from ..analyzer import Issue, Fix, AnalysisResult
+from ..credentials import scan_credentials
+from ..rules import LineRule, iter_lines, literal_matcher, run_line_rules
+
+_RE_CREATE_TABLE = re.compile(r'CREATE\s+TABLE\s+(?:IF\s+NOT\s+EXISTS\s+)?[`"\[]?(\w+)')
+_RE_TABLE_REF = re.compile(r'(?:FROM|JOIN|INTO|UPDATE)\s+[`"\[]?(\w+)')
+_TABLE_REF_KEYWORDS = literal_matcher(('FROM ', 'JOIN ', 'INTO ', 'UPDATE '))
+
+SQL_RULES = (
+    LineRule('SQL001', 'SELECT * - wymień konkretne kolumny', r'\bSELECT\s+\*',
+             field='upper', requires=('SELECT',)),
+    LineRule('SQL003', 'UPDATE/DELETE bez WHERE!', severity='error',
+             field='upper', requires=('UPDATE ', 'DELETE FROM'), excludes=('WHERE',),
+             when=lambda ctx: ';' in ctx.stripped or ctx.is_last),
+    LineRule('SQL004', 'DROP bez IF EXISTS',
+             field='upper', requires=('DROP ',), excludes=('IF EXISTS',),
+             fix=lambda ctx, m: (ctx.stripped, ctx.stripped.replace('DROP ', 'DROP IF EXISTS ', 1)),
+             fix_description='Dodano IF EXISTS'),
+    LineRule('SQL005', 'CREATE bez IF NOT EXISTS',
+             field='upper', requires=('CREATE TABLE',), excludes=('IF NOT EXISTS',)),
+    LineRule('SQL007', 'GRANT ALL - przyznaj tylko wymagane uprawnienia',
+             field='upper', requires=('GRANT ALL',)),
+)
 
 
 def analyze_sql(code: str) -> AnalysisResult:
@@ -9,45 +31,27 @@ def analyze_sql(code: str) -> AnalysisResult:
     errors, warnings, fixes = [], [], []
     lines = code.split('\n')
     fixed_lines = lines.copy()
-    
+
     tables_created = set()
     tables_referenced = set()
-    
-    for i, line in enumerate(lines, 1):
-        stripped = line.strip()
-        upper = stripped.upper()
-        
+    credential_hits = scan_credentials('sql', lines, code)
+
+    for ctx in iter_lines(lines):
+        upper = ctx.upper
+
         if 'CREATE TABLE' in upper:
-            match = re.search(r'CREATE\s+TABLE\s+(?:IF\s+NOT\s+EXISTS\s+)?[`"\[]?(\w+)', upper)
+            match = _RE_CREATE_TABLE.search(upper)
             if match:
                 tables_created.add(match.group(1).lower())
-        
-        if any(kw in upper for kw in ['FROM ', 'JOIN ', 'INTO ', 'UPDATE ']):
-            for match in re.finditer(r'(?:FROM|JOIN|INTO|UPDATE)\s+[`"\[]?(\w+)', upper):
+
+        if _TABLE_REF_KEYWORDS.search(upper):
+            for match in _RE_TABLE_REF.finditer(upper):
                 tables_referenced.add(match.group(1).lower())
-        
-        if re.search(r'\bSELECT\s+\*', upper):
-            warnings.append(Issue(i, 1, 'SQL001', 'SELECT * - wymień konkretne kolumny'))
-        
-        if ('UPDATE ' in upper or 'DELETE FROM' in upper) and 'WHERE' not in upper:
-            if ';' in stripped or i == len(lines):
-                errors.append(Issue(i, 1, 'SQL003', 'UPDATE/DELETE bez WHERE!'))
-        
-        if 'DROP ' in upper and 'IF EXISTS' not in upper:
-            warnings.append(Issue(i, 1, 'SQL004', 'DROP bez IF EXISTS'))
-            fixed = stripped.replace('DROP ', 'DROP IF EXISTS ', 1)
-            fixes.append(Fix(i, 'Dodano IF EXISTS', stripped, fixed))
-            fixed_lines[i-1] = line.replace(stripped, fixed)
-        
-        if 'CREATE TABLE' in upper and 'IF NOT EXISTS' not in upper:
-            warnings.append(Issue(i, 1, 'SQL005', 'CREATE bez IF NOT EXISTS'))
-        
-        if 'GRANT ALL' in upper:
-            warnings.append(Issue(i, 1, 'SQL007', 'GRANT ALL - przyznaj tylko wymagane uprawnienia'))
-        
-        if re.search(r"PASSWORD\s*[=:]\s*['\"][^'\"]+['\"]", upper):
-            errors.append(Issue(i, 1, 'SQL008', 'Hasło w plain text'))
-    
+
+        fixed_lines[ctx.line_no - 1] = run_line_rules(SQL_RULES, ctx, errors, warnings, fixes)
+        for hit in credential_hits.get(ctx.line_no, ()):
+            errors.append(Issue(ctx.line_no, 1, hit.code, hit.message))
+
     missing = tables_referenced - tables_created - {'dual', 'information_schema'}
     context = {'tables_created': list(tables_created), 'tables_referenced': list(tables_referenced), 'potentially_missing': list(missing)}
     return AnalysisResult('sql', code, '\n'.join(fixed_lines), errors, warnings, fixes, context)
@@ -3,6 +3,7 @@
 import re
 from typing import List
 from ..analyzer import Issue, Fix, AnalysisResult
+from ..credentials import scan_credentials
 
 
 def analyze_systemd(code: str) -> AnalysisResult:
@@ -21,6 +22,8 @@ def analyze_systemd(code: str) -> AnalysisResult:
     has_working_dir = False
     service_type = None
 
+    credential_hits = scan_credentials('systemd', lines, code)
+
     for i, line in enumerate(lines, 1):
         stripped = line.strip()
         indent = len(line) - len(line.lstrip())
@@ -83,10 +86,8 @@ def analyze_systemd(code: str) -> AnalysisResult:
 
         # SYSTEMD008: Environment with hardcoded secrets
         if stripped.startswith('Environment='):
-            secret_patterns = ['PASSWORD', 'SECRET', 'API_KEY', 'TOKEN']
-            for pattern in secret_patterns:
-                if pattern in stripped.upper() and '${' not in stripped:
-                    errors.append(Issue(i, 1, 'SYSTEMD008', f'Hardcoded {pattern} - użyj EnvironmentFile'))
+            for hit in credential_hits.get(i, ()):
+                errors.append(Issue(i, 1, hit.code, hit.message))
 
         # SYSTEMD009: Missing RestartSec
         if has_restart and stripped.startswith('Restart=') and 'always' in stripped.lower():
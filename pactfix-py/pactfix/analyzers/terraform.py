@@ -2,6 +2,7 @@ import re
 from typing import List, Dict, Set, Tuple
 
 from ..analyzer import Issue, Fix, AnalysisResult
+from ..credentials import scan_credentials
 
 
 def analyze_terraform(code: str) -> AnalysisResult:
@@ -20,6 +21,7 @@ def analyze_terraform(code: str) -> AnalysisResult:
     # Track resource blocks for context
     current_resource = None
     resource_start_line = 0
+    credential_hits = scan_credentials('terraform', lines)
 
     for i, line in enumerate(lines, 1):
         stripped = line.strip()
@@ -58,29 +60,21 @@ def analyze_terraform(code: str) -> AnalysisResult:
                 providers.append(match.group(1))
         
         # Check for hardcoded credentials and fix them
-        credential_patterns = [
-            (r'(access_key)\s*=\s*"([^"$]+)"', 'access_key'),
-            (r'(secret_key)\s*=\s*"([^"$]+)"', 'secret_key'),
-            (r'(password)\s*=\s*"([^"$]+)"', 'password'),
-            (r'(token)\s*=\s*"([^"$]+)"', 'token'),
-            (r'(api_key)\s*=\s*"([^"$]+)"', 'api_key'),
-        ]
-        
-        for pattern, cred_type in credential_patterns:
-            match = re.search(pattern, stripped, re.I)
-            if match:
-                errors.append(Issue(i, 1, 'TF001', f'Hardcoded {cred_type}'))
-                # Create variable name
-                var_name = f"{current_resource['type']}_{current_resource['name']}_{cred_type}" if current_resource else f"{cred_type}_var"
-                # Replace with variable
-                fixed_line = re.sub(pattern, f'{cred_type} = var.{var_name}', stripped)
-                fixed_lines[i-1] = line.replace(stripped, fixed_line)
-                fixes.append(Fix(i, f'Zamieniono {cred_type} na zmienną', match.group(0), f'{cred_type} = var.{var_name}'))
-                
-                # Add variable definition at the end
-                var_def = f'\nvariable "{var_name}" {{\n  description = "{cred_type} for {current_resource["type"] if current_resource else "general"}"\n  type        = string\n  sensitive   = true\n}}\n'
-                fixed_lines.append(var_def)
-                fixes.append(Fix(len(lines) + 1, f'Dodano zmienną {var_name}', '', var_def.strip()))
+        for hit in credential_hits.get(i, ()):
+            # Fixes use the case-sensitive pattern, as before
+            pattern, cred_type, match = hit.rule.pattern.pattern, hit.rule.name, hit.match
+            errors.append(Issue(i, 1, hit.code, hit.message))
+            # Create variable name
+            var_name = f"{current_resource['type']}_{current_resource['name']}_{cred_type}" if current_resource else f"{cred_type}_var"
+            # Replace with variable
+            fixed_line = re.sub(pattern, f'{cred_type} = var.{var_name}', stripped)
+            fixed_lines[i-1] = line.replace(stripped, fixed_line)
+            fixes.append(Fix(i, f'Zamieniono {cred_type} na zmienną', match.group(0), f'{cred_type} = var.{var_name}'))
+            
+            # Add variable definition at the end
+            var_def = f'\nvariable "{var_name}" {{\n  description = "{cred_type} for {current_resource["type"] if current_resource else "general"}"\n  type        = string\n  sensitive   = true\n}}\n'
+            fixed_lines.append(var_def)
+            fixes.append(Fix(len(lines) + 1, f'Dodano zmienną {var_name}', '', var_def.strip()))
         
         # Check for insecure CIDR blocks
         if 'cidr_blocks' in stripped and '0.0.0.0/0' in stripped:
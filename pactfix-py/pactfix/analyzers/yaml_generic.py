@@ -3,6 +3,7 @@
 import re
 from typing import List
 from ..analyzer import Issue, Fix, AnalysisResult
+from ..credentials import scan_credentials
 
 
 def analyze_yaml(code: str) -> AnalysisResult:
@@ -16,6 +17,8 @@ def analyze_yaml(code: str) -> AnalysisResult:
     indent_stack = [0]
     prev_indent = 0
 
+    credential_hits = scan_credentials('yaml', lines, code)
+
     for i, line in enumerate(lines, 1):
         stripped = line.strip()
         if not stripped or stripped.startswith('#'):
@@ -95,11 +98,8 @@ def analyze_yaml(code: str) -> AnalysisResult:
                     break
 
         # YAML008: Hardcoded secrets
-        secret_patterns = ['password', 'secret', 'api_key', 'token', 'credential']
-        for pattern in secret_patterns:
-            if re.search(rf'{pattern}\s*:\s*["\']?[^\s${{][^#]*', stripped, re.I):
-                if '${' not in stripped and '$(' not in stripped:
-                    errors.append(Issue(i, 1, 'YAML008', f'Hardcoded {pattern} - użyj zmiennej środowiskowej'))
+        for hit in credential_hits.get(i, ()):
+            errors.append(Issue(i, 1, hit.code, hit.message))
 
         # YAML009: Empty value
         if re.match(r'^[a-zA-Z_][a-zA-Z0-9_]*:\s*$', stripped):
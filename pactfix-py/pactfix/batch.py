@@ -0,0 +1,187 @@
+"""Analysis of many files in one request (``POST /api/analyze/batch``).
+
+A batch is a list of ``{"filename", "code", "language"}`` items sent as a
+JSON array (or ``{"items": [...]}``) or as NDJSON, one item per line,
+optionally gzip-compressed. ``parse_batch`` enforces the item count and
+decompressed size limits before anything is analyzed; ``iter_batch`` then
+analyzes the items on a shared process pool (analyzers are CPU-bound) and
+yields per-item results in input order, which ``analyze_batch`` collects
+together with the totals.
+"""
+
+import json
+import os
+import threading
+import zlib
+from typing import Dict, Iterator, List
+
+from .analyzer import analyze_code
+
+BATCH_MAX_ITEMS = int(os.environ.get('PACTFIX_BATCH_MAX_ITEMS', 1000))
+BATCH_MAX_BYTES = int(os.environ.get('PACTFIX_BATCH_MAX_BYTES', 20 * 1024 * 1024))
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+class BatchError(ValueError):
+    """Invalid batch request; ``status`` is the HTTP status to answer with."""
+
+    def __init__(self, message: str, status: int = 400):
+        super().__init__(message)
+        self.status = status
+
+
+def _batch_workers() -> int:
+    try:
+        return int(os.environ.get('PACTFIX_BATCH_WORKERS', os.cpu_count() or 1))
+    except ValueError:
+        return 1
+
+
+def _batch_pool():
+    """Shared process pool for batch items, or None when configured with one worker."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            workers = _batch_workers()
+            if workers <= 1:
+                return None
+            from concurrent.futures import ProcessPoolExecutor
+            _pool = ProcessPoolExecutor(max_workers=workers)
+        return _pool
+
+
+def shutdown_batch_pool(pool=None) -> None:
+    """Stop the batch worker pool (it is recreated on demand).
+
+    With ``pool``, only stop it if it is still the shared pool, so a request
+    that saw a broken pool does not shut down a fresh one in use by others.
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None or (pool is not None and pool is not _pool):
+            return
+        pool, _pool = _pool, None
+    pool.shutdown(cancel_futures=True)
+
+
+def read_limited(stream, max_bytes: int = BATCH_MAX_BYTES) -> bytes:
+    """Read ``stream`` to the end, raising ``BatchError`` (413) past ``max_bytes``."""
+    chunks, size = [], 0
+    while True:
+        chunk = stream.read(min(64 * 1024, max_bytes + 1 - size))
+        if not chunk:
+            return b''.join(chunks)
+        chunks.append(chunk)
+        size += len(chunk)
+        if size > max_bytes:
+            raise BatchError(f'Batch larger than {max_bytes} bytes', 413)
+
+
+def _decompress(body: bytes, max_bytes: int) -> bytes:
+    """gunzip ``body``, refusing to inflate past ``max_bytes``."""
+    inflater = zlib.decompressobj(16 + zlib.MAX_WBITS)
+    try:
+        data = inflater.decompress(body, max_bytes + 1)
+    except zlib.error as e:
+        raise BatchError(f'Invalid gzip body: {e}')
+    if len(data) > max_bytes or inflater.unconsumed_tail:
+        raise BatchError(f'Batch larger than {max_bytes} bytes', 413)
+    return data
+
+
+def parse_batch(body: bytes, content_type: str = '', content_encoding: str = '',
+                max_items: int = BATCH_MAX_ITEMS, max_bytes: int = BATCH_MAX_BYTES) -> List[dict]:
+    """Validated items of a batch request body.
+
+    NDJSON is recognised by its content type (``application/x-ndjson``),
+    gzip by ``Content-Encoding: gzip`` or the gzip magic bytes. Raises
+    ``BatchError`` (413 for limits, 400 otherwise).
+    """
+    if 'gzip' in (content_encoding or '').lower() or body[:2] == b'\x1f\x8b':
+        body = _decompress(body, max_bytes)
+    elif len(body) > max_bytes:
+        raise BatchError(f'Batch larger than {max_bytes} bytes', 413)
+
+    try:
+        text = body.decode('utf-8')
+        if 'ndjson' in (content_type or '').lower():
+            raw = [json.loads(line) for line in text.splitlines() if line.strip()]
+        else:
+            raw = json.loads(text or '[]')
+            if isinstance(raw, dict):
+                raw = raw.get('items')
+    except (UnicodeDecodeError, json.JSONDecodeError) as e:
+        raise BatchError(f'Invalid JSON: {e}')
+    if not isinstance(raw, list):
+        raise BatchError('Expected a list of items')
+    if len(raw) > max_items:
+        raise BatchError(f'Batch has {len(raw)} items, the limit is {max_items}', 413)
+
+    items = []
+    for i, item in enumerate(raw):
+        if not isinstance(item, dict) or not isinstance(item.get('code'), str):
+            raise BatchError(f'Item {i}: expected an object with a "code" string')
+        filename, language = item.get('filename'), item.get('language')
+        if filename is not None and not isinstance(filename, str):
+            raise BatchError(f'Item {i}: "filename" must be a string')
+        if language is not None and not isinstance(language, str):
+            raise BatchError(f'Item {i}: "language" must be a string')
+        items.append({'filename': filename, 'code': item['code'], 'language': language})
+    return items
+
+
+def analyze_item(item: dict) -> dict:
+    """Result of one item; analyzer failures are reported in the item, not raised."""
+    try:
+        result = analyze_code(item['code'], item.get('filename'), item.get('language')).to_dict()
+    except Exception as e:
+        return {'filename': item.get('filename'), 'error': str(e)}
+    result['filename'] = item.get('filename')
+    return result
+
+
+def new_totals(items: int) -> Dict[str, object]:
+    return {'items': items, 'analyzed': 0, 'failed': 0, 'errors': 0, 'warnings': 0, 'fixes': 0,
+            'languages': {}}
+
+
+def add_to_totals(totals: dict, result: dict) -> None:
+    if 'error' in result:
+        totals['failed'] += 1
+        return
+    totals['analyzed'] += 1
+    totals['errors'] += len(result['errors'])
+    totals['warnings'] += len(result['warnings'])
+    totals['fixes'] += len(result['fixes'])
+    languages = totals['languages']
+    languages[result['language']] = languages.get(result['language'], 0) + 1
+
+
+def iter_batch(items: List[dict]) -> Iterator[dict]:
+    """Yield the result of every item, in input order."""
+    done = 0
+    pool = _batch_pool() if len(items) > 1 else None
+    if pool is not None:
+        try:
+            chunksize = max(1, len(items) // (_batch_workers() * 4))
+            for result in pool.map(analyze_item, items, chunksize=chunksize):
+                yield result
+                done += 1
+            return
+        except (OSError, RuntimeError):
+            # BrokenProcessPool is a RuntimeError; finish in-process
+            shutdown_batch_pool(pool)
+    yield from map(analyze_item, items[done:])
+
+
+def analyze_batch(items: List[dict]) -> dict:
+    """``{"results": [...], "totals": {...}}`` for ``items``."""
+    totals = new_totals(len(items))
+    results = []
+    for index, result in enumerate(iter_batch(items)):
+        result['index'] = index
+        add_to_totals(totals, result)
+        results.append(result)
+    return {'results': results, 'totals': totals}
@@ -0,0 +1,262 @@
+"""Content-addressed result cache for analyze_code.
+
+Results are keyed by the sha256 of the analyzed code together with the
+resolved language, the forced language, the pactfix version and a fingerprint
+of the analyzer sources, so a cached entry is never served after the rules
+change. Entries live in a bounded in-memory LRU and, optionally, in an
+on-disk store (e.g. ``.pactfix/cache/``) shared between runs.
+"""
+
+import copy
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from . import __version__
+
+DEFAULT_MAX_ENTRIES = 512
+# Bound on the code held in memory (original + fixed code of every entry);
+# entry count alone does not bound a long-running server analyzing large files
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+CACHE_FORMAT_VERSION = 1
+
+
+# Modules that cannot change an analysis result; every other module of the
+# package (analyzers, rule tables, credential patterns, line mapping...) is
+# part of the ruleset fingerprint.
+_NON_RULE_MODULES = frozenset({
+    '__main__.py', 'batch.py', 'cache.py', 'cli.py', 'manifest.py', 'prefork.py',
+    'sandbox.py', 'serialize.py', 'server.py', 'walker.py',
+})
+
+
+@lru_cache(maxsize=1)
+def ruleset_fingerprint() -> str:
+    """Return a hash of the rule-defining sources shipped with this installation."""
+    package_dir = Path(__file__).resolve().parent
+    sources = sorted(src for src in package_dir.rglob('*.py')
+                     if src.parent != package_dir or src.name not in _NON_RULE_MODULES)
+    h = hashlib.sha256()
+    for src in sources:
+        h.update(src.relative_to(package_dir).as_posix().encode('utf-8'))
+        try:
+            h.update(src.read_bytes())
+        except OSError:
+            continue
+    return h.hexdigest()[:16]
+
+
+def _clone_result(result):
+    """Copy a result so callers can mutate it without touching the cache."""
+    return result.__class__(
+        language=result.language,
+        original_code=result.original_code,
+        fixed_code=result.fixed_code,
+        errors=[copy.copy(e) for e in result.errors],
+        warnings=[copy.copy(w) for w in result.warnings],
+        fixes=[copy.deepcopy(f) for f in result.fixes],
+        context=copy.deepcopy(result.context),
+    )
+
+
+def _result_to_record(result) -> Dict[str, Any]:
+    return {
+        'format': CACHE_FORMAT_VERSION,
+        'language': result.language,
+        'fixed_code': result.fixed_code,
+        'errors': [e.to_dict() for e in result.errors],
+        'warnings': [w.to_dict() for w in result.warnings],
+        'fixes': [f.to_dict() for f in result.fixes],
+        'context': result.context,
+    }
+
+
+def _result_from_record(record: Dict[str, Any], code: str):
+    from .analyzer import AnalysisResult, Fix, Issue
+
+    return AnalysisResult(
+        language=record['language'],
+        original_code=code,
+        fixed_code=record['fixed_code'],
+        errors=[Issue(**e) for e in record.get('errors', [])],
+        warnings=[Issue(**w) for w in record.get('warnings', [])],
+        fixes=[Fix(**f) for f in record.get('fixes', [])],
+        context=record.get('context') or {},
+    )
+
+
+class ResultCache:
+    """Bounded LRU cache of AnalysisResult objects with an optional disk tier.
+
+    The memory tier is bounded by ``max_entries`` and by ``max_bytes``, the
+    total length of the original and fixed code of the stored results.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES, directory: Optional[str] = None,
+                 max_bytes: int = DEFAULT_MAX_BYTES):
+        self.max_entries = max(0, int(max_entries))
+        self.max_bytes = max(0, int(max_bytes))
+        self.directory = Path(directory) if directory else None
+        self._entries: 'OrderedDict[str, Any]' = OrderedDict()
+        self._sizes: Dict[str, int] = {}
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._counters = {
+            'hits': 0,
+            'misses': 0,
+            'evictions': 0,
+            'disk_hits': 0,
+            'disk_writes': 0,
+        }
+
+    @staticmethod
+    def make_key(code: str, language: str, force_language: Optional[str] = None,
+                 variant: str = '') -> str:
+        h = hashlib.sha256()
+        for part in (__version__, ruleset_fingerprint(), language or '', force_language or '', variant):
+            h.update(part.encode('utf-8'))
+            h.update(b'\0')
+        h.update(code.encode('utf-8', errors='surrogatepass'))
+        return h.hexdigest()
+
+    def _disk_path(self, key: str) -> Path:
+        return self.directory / key[:2] / f'{key}.json'
+
+    def get(self, key: str, code: str, clone: bool = True):
+        """Return a copy of the cached result for ``key`` or None.
+
+        ``clone=False`` returns the stored object itself, for callers that only
+        read it (e.g. the markdown analyzer remapping block results).
+        """
+        with self._lock:
+            result = self._entries.get(key)
+            if result is not None:
+                self._entries.move_to_end(key)
+                self._counters['hits'] += 1
+                return _clone_result(result) if clone else result
+
+        if self.directory is not None:
+            try:
+                record = json.loads(self._disk_path(key).read_text(encoding='utf-8'))
+                if record.get('format') == CACHE_FORMAT_VERSION:
+                    result = _result_from_record(record, code)
+                    with self._lock:
+                        self._counters['hits'] += 1
+                        self._counters['disk_hits'] += 1
+                        self._remember(key, result)
+                    return _clone_result(result) if clone else result
+            except (OSError, ValueError, KeyError, TypeError):
+                pass
+
+        with self._lock:
+            self._counters['misses'] += 1
+        return None
+
+    def put(self, key: str, result) -> None:
+        """Store a copy of ``result`` under ``key``."""
+        stored = _clone_result(result)
+        with self._lock:
+            self._remember(key, stored)
+
+        if self.directory is not None:
+            path = self._disk_path(key)
+            try:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                tmp = path.with_suffix(f'.{os.getpid()}.{threading.get_ident()}.tmp')
+                tmp.write_text(json.dumps(_result_to_record(stored), ensure_ascii=False), encoding='utf-8')
+                tmp.replace(path)
+                with self._lock:
+                    self._counters['disk_writes'] += 1
+            except (OSError, TypeError, ValueError):
+                pass
+
+    def _remember(self, key: str, result) -> None:
+        size = len(result.original_code or '') + len(result.fixed_code or '')
+        if self.max_entries <= 0 or size > self.max_bytes:
+            return
+        self._bytes += size - self._sizes.get(key, 0)
+        self._sizes[key] = size
+        self._entries[key] = result
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+            old_key, _ = self._entries.popitem(last=False)
+            self._bytes -= self._sizes.pop(old_key)
+            self._counters['evictions'] += 1
+
+    def clear(self) -> None:
+        """Drop all in-memory entries and reset counters (the disk tier is kept)."""
+        with self._lock:
+            self._entries.clear()
+            self._sizes.clear()
+            self._bytes = 0
+            for name in self._counters:
+                self._counters[name] = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self._counters['hits'] + self._counters['misses']
+            return {
+                **self._counters,
+                'size': len(self._entries),
+                'max_entries': self.max_entries,
+                'bytes': self._bytes,
+                'max_bytes': self.max_bytes,
+                'hit_ratio': (self._counters['hits'] / lookups) if lookups else 0.0,
+                'directory': str(self.directory) if self.directory else None,
+            }
+
+
+_default_cache: Optional[ResultCache] = None
+_cache_enabled = os.environ.get('PACTFIX_CACHE', '1').lower() not in ('0', 'false', 'no', 'off')
+
+
+def get_result_cache() -> Optional[ResultCache]:
+    """Return the process-wide result cache, or None when caching is disabled."""
+    global _default_cache
+    if not _cache_enabled:
+        return None
+    if _default_cache is None:
+        _default_cache = ResultCache(
+            max_entries=int(os.environ.get('PACTFIX_CACHE_SIZE', DEFAULT_MAX_ENTRIES)),
+            max_bytes=int(os.environ.get('PACTFIX_CACHE_BYTES', DEFAULT_MAX_BYTES)),
+            directory=os.environ.get('PACTFIX_CACHE_DIR') or None,
+        )
+    return _default_cache
+
+
+def cache_settings() -> Dict[str, Any]:
+    """Return the current cache configuration as ``configure_cache`` kwargs.
+
+    Used to set up the same cache in worker processes.
+    """
+    cache = get_result_cache()
+    if cache is None:
+        return {'enabled': False}
+    return {
+        'enabled': True,
+        'max_entries': cache.max_entries,
+        'max_bytes': cache.max_bytes,
+        'directory': str(cache.directory) if cache.directory else None,
+    }
+
+
+def configure_cache(enabled: bool = True, max_entries: Optional[int] = None,
+                    directory: Optional[str] = None,
+                    max_bytes: Optional[int] = None) -> Optional[ResultCache]:
+    """Replace the process-wide result cache."""
+    global _default_cache, _cache_enabled
+    _cache_enabled = enabled
+    if not enabled:
+        _default_cache = None
+        return None
+    _default_cache = ResultCache(
+        max_entries=DEFAULT_MAX_ENTRIES if max_entries is None else max_entries,
+        directory=directory,
+        max_bytes=DEFAULT_MAX_BYTES if max_bytes is None else max_bytes,
+    )
+    return _default_cache
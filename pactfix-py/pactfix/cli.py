@@ -4,22 +4,57 @@ import argparse
 import json
 import sys
 import os
+from itertools import repeat
 from pathlib import Path
 from datetime import datetime
 
-# Load environment variables from .env file if it exists
-try:
-    from dotenv import load_dotenv
-    load_dotenv()
-except ImportError:
-    pass  # python-dotenv not installed, use system environment only
-
+# sandbox, dotenv and multiprocessing are imported where they are used, so
+# `pactfix --version` or a single-file run does not pay for them.
 from . import __version__
 from .analyzer import analyze_code, detect_language, SUPPORTED_LANGUAGES, add_fix_comments
-from .sandbox import Sandbox, detect_project_language, create_all_dockerfiles, LANGUAGE_DOCKERFILES
+from .cache import cache_settings, configure_cache, get_result_cache
+from .walker import find_project_files, walk_files
+from .manifest import FileManifest, read_path_list
+
+
+def _load_dotenv() -> None:
+    """Load environment variables from .env file if it exists."""
+    try:
+        from dotenv import load_dotenv
+        load_dotenv()
+    except ImportError:
+        pass  # python-dotenv not installed, use system environment only
+
+
+def serve_main(argv: list) -> int:
+    """``pactfix serve``: run the API on pre-forked, pre-warmed worker processes."""
+    from .prefork import DEFAULT_APP, serve
+
+    _load_dotenv()  # HOST/PORT/PACTFIX_WORKERS from .env set the defaults below
+    parser = argparse.ArgumentParser(prog='pactfix serve', description='Run the pactfix API server')
+    parser.add_argument('--host', default=os.environ.get('HOST', '0.0.0.0'))
+    parser.add_argument('--port', type=int, default=int(os.environ.get('PORT', 5000)))
+    parser.add_argument('-w', '--workers', type=int, default=int(os.environ.get('PACTFIX_WORKERS', 0)),
+                        help='Worker processes (0 = one per CPU)')
+    parser.add_argument('--max-requests', type=int, default=10000,
+                        help='Recycle a worker after N requests (0 = never)')
+    parser.add_argument('--max-memory-mb', type=float, default=0,
+                        help='Recycle a worker whose resident memory exceeds this (0 = no limit)')
+    parser.add_argument('--graceful-timeout', type=float, default=30,
+                        help='Seconds to let requests finish on SIGTERM before killing workers')
+    parser.add_argument('--access-log', action='store_true', help='Log every request to stderr')
+    parser.add_argument('--app', default=DEFAULT_APP, help='WSGI application as module:attribute')
+    args = parser.parse_args(argv)
+    return serve(args.app, host=args.host, port=args.port, workers=args.workers,
+                 max_requests=args.max_requests, max_memory_mb=args.max_memory_mb,
+                 graceful_timeout=args.graceful_timeout, access_log=args.access_log)
 
 
 def main():
+    # `pactfix serve ...` (a file named "serve" can still be analyzed as ./serve)
+    if sys.argv[1:2] == ['serve']:
+        return serve_main(sys.argv[2:])
+
     parser = argparse.ArgumentParser(
         prog='pactfix',
         description='Multi-language code and config file analyzer and fixer'
@@ -34,6 +69,10 @@ def main():
     parser.add_argument('--batch', help='Process all files in directory')
     parser.add_argument('--fix-all', action='store_true', help='Fix all files in examples/')
     parser.add_argument('--json', action='store_true', help='Output as JSON')
+    parser.add_argument('--stream', action='store_true',
+                        help='Analyze a multi-document Kubernetes manifest per document, printing NDJSON')
+    parser.add_argument('--manifest-set', action='store_true',
+                        help='Treat Kubernetes input as the complete manifest set (cross-object rules K8S011-K8S015)')
     parser.add_argument('--version', action='version', version=f'pactfix {__version__}')
     
     # New options for project scanning and sandbox
@@ -42,8 +81,24 @@ def main():
     parser.add_argument('--sandbox-only', action='store_true', help='Only setup sandbox without fixing')
     parser.add_argument('--test', action='store_true', help='Run tests in sandbox after fixing')
     parser.add_argument('--init-dockerfiles', help='Create Dockerfiles for all languages in specified directory')
+    parser.add_argument('-j', '--jobs', type=int, default=1,
+                        help='Analyze --path files on N worker processes (0 = one per CPU)')
+    parser.add_argument('--changed-only', action='store_true',
+                        help='With --path: skip files unchanged since the last scan (.pactfix/manifest.json)')
+    parser.add_argument('--paths-from-stdin', action='store_true',
+                        help='With --path: read changed file paths from stdin (e.g. git diff --name-only)')
+
+    # Result cache
+    parser.add_argument('--cache-dir', help='Persist analysis results in this directory (e.g. .pactfix/cache)')
+    parser.add_argument('--no-cache', action='store_true', help='Disable the analysis result cache')
     
     args = parser.parse_args()
+    _load_dotenv()
+
+    if args.no_cache:
+        configure_cache(enabled=False)
+    elif args.cache_dir:
+        configure_cache(directory=args.cache_dir)
     
     # Initialize Dockerfiles for all languages
     if args.init_dockerfiles:
@@ -51,7 +106,15 @@ def main():
     
     # Project-wide scanning with --path
     if args.path:
-        return process_project(args.path, args.comment, args.sandbox, args.test, args.verbose)
+        jobs = args.jobs if args.jobs > 0 else (os.cpu_count() or 1)
+        # Long READMEs fan their blocks out to a pool; --jobs workers never nest one
+        os.environ.setdefault('PACTFIX_MARKDOWN_WORKERS', str(os.cpu_count() or 1))
+        changed_paths = None
+        if args.paths_from_stdin:
+            changed_paths = read_path_list(sys.stdin, Path(args.path).resolve())
+        return process_project(args.path, args.comment, args.sandbox, args.test, args.verbose, jobs,
+                               changed_only=args.changed_only or changed_paths is not None,
+                               changed_paths=changed_paths)
     
     # Sandbox-only mode
     if args.sandbox_only:
@@ -64,21 +127,27 @@ def main():
     if args.batch:
         return process_batch(args.batch, args.verbose)
     
+    if args.stream:
+        return process_stream(args.input, args.output, args.language)
+
     if args.input == '-':
-        return process_stdin(args.output, args.language, args.comment, args.log_file, args.verbose, args.json)
+        return process_stdin(args.output, args.language, args.comment, args.log_file, args.verbose, args.json,
+                             args.manifest_set)
 
     if not args.input:
         if not sys.stdin.isatty():
-            return process_stdin(args.output, args.language, args.comment, args.log_file, args.verbose, args.json)
+            return process_stdin(args.output, args.language, args.comment, args.log_file, args.verbose, args.json,
+                             args.manifest_set)
         parser.print_help()
         return 1
     
-    return process_file(args.input, args.output, args.language, args.comment, args.log_file, args.verbose, args.json)
+    return process_file(args.input, args.output, args.language, args.comment, args.log_file, args.verbose, args.json,
+                        args.manifest_set)
 
 
 def process_file(input_path: str, output_path: str = None, language: str = None,
                  comment: bool = False, log_file: str = None, verbose: bool = False,
-                 as_json: bool = False) -> int:
+                 as_json: bool = False, manifest_set: bool = False) -> int:
     """Process a single file."""
     try:
         with open(input_path, 'r', encoding='utf-8') as f:
@@ -90,12 +159,12 @@ def process_file(input_path: str, output_path: str = None, language: str = None,
         print(f"❌ Błąd odczytu: {e}", file=sys.stderr)
         return 1
     
-    result = analyze_code(code, input_path, language)
+    result = analyze_code(code, input_path, language, manifest_set=manifest_set)
     if comment:
         result.fixed_code = add_fix_comments(result)
     
     if as_json:
-        print(json.dumps(result.to_dict(), indent=2, ensure_ascii=False))
+        print(result.to_json(indent=True))
         return 0
     
     timestamp = datetime.now().strftime('%H:%M:%S')
@@ -152,7 +221,8 @@ def process_file(input_path: str, output_path: str = None, language: str = None,
 
 
 def process_stdin(output_path: str = None, language: str = None, comment: bool = False,
-                  log_file: str = None, verbose: bool = False, as_json: bool = False) -> int:
+                  log_file: str = None, verbose: bool = False, as_json: bool = False,
+                  manifest_set: bool = False) -> int:
     """Process code from stdin."""
     try:
         code = sys.stdin.read()
@@ -161,12 +231,12 @@ def process_stdin(output_path: str = None, language: str = None, comment: bool =
         return 1
 
     filename_hint = output_path or '<stdin>'
-    result = analyze_code(code, filename_hint, language)
+    result = analyze_code(code, filename_hint, language, manifest_set=manifest_set)
     if comment:
         result.fixed_code = add_fix_comments(result)
 
     if as_json:
-        print(json.dumps(result.to_dict(), indent=2, ensure_ascii=False))
+        print(result.to_json(indent=True))
         return 0
 
     timestamp = datetime.now().strftime('%H:%M:%S')
@@ -222,6 +292,56 @@ def process_stdin(output_path: str = None, language: str = None, comment: bool =
     return 0 if len(result.errors) == 0 else 1
 
 
+def process_stream(input_path: str = None, output_path: str = None, language: str = None) -> int:
+    """Analyze a Kubernetes manifest stream document by document and print NDJSON.
+
+    Prints one ``{"type": "document", ...}`` record per YAML document (lines
+    are global to the input) and a final ``{"type": "totals", ...}`` record.
+    Only one document is held in memory; with ``output_path`` the fixed
+    documents are written as they are produced.
+    """
+    from .analyzers import analyze_kubernetes_stream
+    from .serialize import dumps
+
+    if language and language != 'kubernetes':
+        print(f"❌ --stream obsługuje tylko kubernetes, nie {language}", file=sys.stderr)
+        return 1
+
+    try:
+        source = sys.stdin if input_path in (None, '-') else open(input_path, 'r', encoding='utf-8')
+    except OSError as e:
+        print(f"❌ Błąd odczytu: {e}", file=sys.stderr)
+        return 1
+
+    totals = {'documents': 0, 'errors': 0, 'warnings': 0, 'fixes': 0}
+    out = None
+    try:
+        if output_path:
+            os.makedirs(os.path.dirname(output_path) or '.', exist_ok=True)
+            out = open(output_path, 'w', encoding='utf-8')
+        for result in analyze_kubernetes_stream(source):
+            if out is not None:
+                out.write(result.fixed_code)
+            if not (result.context.get('kinds') or result.errors or result.warnings):
+                continue  # comments or an empty document
+            totals['documents'] += 1
+            totals['errors'] += len(result.errors)
+            totals['warnings'] += len(result.warnings)
+            totals['fixes'] += len(result.fixes)
+            print(dumps({'type': 'document', **result.to_dict(include_code=False)}), flush=True)
+    except (OSError, UnicodeDecodeError) as e:
+        print(f"❌ Błąd odczytu: {e}", file=sys.stderr)
+        return 1
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if out is not None:
+            out.close()
+
+    print(dumps({'type': 'totals', **totals}), flush=True)
+    return 0 if totals['errors'] == 0 else 1
+
+
 def process_batch(directory: str, verbose: bool = False) -> int:
     """Process all files in a directory."""
     path = Path(directory)
@@ -230,14 +350,7 @@ def process_batch(directory: str, verbose: bool = False) -> int:
         return 1
     
     extensions = ['.sh', '.py', '.php', '.js', '.sql', '.tf', '.yml', '.yaml', '.conf']
-    files = []
-    for ext in extensions:
-        files.extend(path.rglob(f'*{ext}'))
-    
-    # Also find Dockerfiles
-    files.extend(path.rglob('Dockerfile'))
-    files.extend(path.rglob('docker-compose.yml'))
-    files.extend(path.rglob('docker-compose.yaml'))
+    files = sorted(walk_files(path, extensions, names=['Dockerfile']))
     
     if not files:
         print(f"⚠️  Brak plików do analizy w: {directory}")
@@ -249,7 +362,7 @@ def process_batch(directory: str, verbose: bool = False) -> int:
     total_warnings = 0
     total_fixes = 0
     
-    for file_path in sorted(set(files)):
+    for file_path in files:
         try:
             with open(file_path, 'r', encoding='utf-8') as f:
                 code = f.read()
@@ -273,9 +386,21 @@ def process_batch(directory: str, verbose: bool = False) -> int:
             print(f"❌ {file_path}: {e}")
     
     print(f"\n📊 Podsumowanie: {total_errors} errors, {total_warnings} warnings, {total_fixes} fixes")
+    if verbose:
+        print_cache_stats()
     return 0 if total_errors == 0 else 1
 
 
+def print_cache_stats() -> None:
+    """Print result cache counters (used in verbose mode)."""
+    cache = get_result_cache()
+    if cache is None:
+        return
+    stats = cache.stats()
+    print(f"   🗄️  Cache: {stats['hits']} hits, {stats['misses']} misses, "
+          f"{stats['evictions']} evictions, {stats['size']}/{stats['max_entries']} entries")
+
+
 def fix_all_examples(verbose: bool = False, comment: bool = False) -> int:
     """Fix all files in examples/ directory and save to fixed/ subdirectories."""
     env_examples = os.environ.get('PACTFIX_EXAMPLES_DIR')
@@ -382,6 +507,8 @@ def fix_all_examples(verbose: bool = False, comment: bool = False) -> int:
 
 def init_dockerfiles(output_dir: str) -> int:
     """Create Dockerfiles for all supported languages."""
+    from .sandbox import create_all_dockerfiles
+
     output_path = Path(output_dir)
     print(f"🐳 Creating Dockerfiles in {output_path}\n")
     
@@ -396,6 +523,8 @@ def init_dockerfiles(output_dir: str) -> int:
 
 def setup_sandbox_only(project_path: str, verbose: bool = False) -> int:
     """Setup sandbox without running fixes."""
+    from .sandbox import Sandbox
+
     path = Path(project_path).resolve()
     
     if not path.exists():
@@ -416,14 +545,69 @@ def setup_sandbox_only(project_path: str, verbose: bool = False) -> int:
     return 0
 
 
+def _analyze_project_file(file_path: Path, comment: bool = False):
+    """Read and analyze one project file.
+
+    Runs in worker processes for ``--jobs``, so it returns
+    ``(result, changed, error)`` instead of raising.
+    """
+    try:
+        with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
+            code = f.read()
+
+        result = analyze_code(code, str(file_path))
+
+        if comment and result.fixes:
+            result.fixed_code = add_fix_comments(result)
+
+        return result, result.fixed_code != code, None
+    except Exception as e:
+        return None, False, str(e)
+
+
+def _init_project_worker(cache_settings: dict) -> None:
+    configure_cache(**cache_settings)
+
+
+def _iter_project_results(files: list, comment: bool = False, jobs: int = 1):
+    """Yield ``(file_path, (result, changed, error))`` in the order of ``files``.
+
+    With ``jobs > 1`` files are analyzed on a process pool (analyzers are
+    CPU-bound, so threads would serialize on the GIL); results still arrive
+    in input order so output and reports match the serial run.
+    """
+    if jobs <= 1 or len(files) < 2:
+        for file_path in files:
+            yield file_path, _analyze_project_file(file_path, comment)
+        return
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    chunksize = max(1, len(files) // (jobs * 8))
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_init_project_worker,
+                             initargs=(cache_settings(),)) as executor:
+        outcomes = executor.map(_analyze_project_file, files, repeat(comment), chunksize=chunksize)
+        yield from zip(files, outcomes)
+
+
 def process_project(project_path: str, comment: bool = False, sandbox: bool = False,
-                    run_tests: bool = False, verbose: bool = False) -> int:
+                    run_tests: bool = False, verbose: bool = False, jobs: int = 1,
+                    changed_only: bool = False, changed_paths: set = None) -> int:
     """Process entire project - scan, fix all files, optionally run in sandbox.
     
     Modes:
     - Without --sandbox: Fix files IN PLACE (replace original files)
     - With --sandbox: Copy fixed files to .pactfix/ and run Docker sandbox
+
+    ``jobs`` > 1 analyzes files on that many worker processes.
+
+    With ``changed_only`` files whose fingerprint matches
+    ``.pactfix/manifest.json`` are not re-analyzed; their stored summaries
+    are merged into the totals. ``changed_paths`` (resolved paths, e.g. from
+    ``git diff --name-only``) marks exactly which files changed.
     """
+    from .sandbox import Sandbox, detect_project_language
+
     path = Path(project_path).resolve()
     
     if not path.exists():
@@ -441,31 +625,8 @@ def process_project(project_path: str, comment: bool = False, sandbox: bool = Fa
         print(f"   Scores: {stats['all_scores']}")
     print()
     
-    # Find all files to process
-    extensions = ['.sh', '.py', '.php', '.js', '.ts', '.sql', '.tf', '.yml', '.yaml',
-                  '.conf', '.go', '.rs', '.java', '.cs', '.rb', '.html', '.css',
-                  '.json', '.jsonc', '.toml', '.ini', '.cfg', '.tpl', '.gotmpl']
-    
-    files_to_process = []
-    for ext in extensions:
-        files_to_process.extend(path.rglob(f'*{ext}'))
-    
-    # Add Dockerfiles and special files
-    files_to_process.extend(path.rglob('Dockerfile'))
-    files_to_process.extend(path.rglob('Makefile'))
-    files_to_process.extend(path.rglob('Jenkinsfile'))
-    files_to_process.extend(path.rglob('.gitlab-ci.yml'))
-    files_to_process.extend(path.rglob('.gitlab-ci.yaml'))
-    
-    # Filter out hidden directories and common excludes
-    exclude_dirs = {'.git', '.pactfix', '_fixtures', 'node_modules', '__pycache__', 'venv', '.venv', 
-                    'vendor', 'target', 'build', 'dist', '.idea', '.vscode'}
-    
-    files_to_process = [
-        f for f in files_to_process 
-        if not any(excl in f.parts for excl in exclude_dirs)
-        and f.is_file()
-    ]
+    # Find all files to process (excluded and ignored directories are pruned)
+    files_to_process = find_project_files(path)
     
     if not files_to_process:
         print(f"⚠️  No files found to analyze in: {path}")
@@ -474,34 +635,46 @@ def process_project(project_path: str, comment: bool = False, sandbox: bool = Fa
     print(f"📁 Found {len(files_to_process)} files to analyze\n")
     
     # Process files
-    results = []
     fixed_files = {}
     files_modified = []
-    total_errors = 0
-    total_warnings = 0
-    total_fixes = 0
     
-    # Only create .pactfix dir in sandbox mode
+    # Only create .pactfix dir in sandbox mode (or to keep the --changed-only manifest)
     pactfix_dir = path / '.pactfix' if sandbox else None
     
-    for file_path in sorted(set(files_to_process)):
+    # Incremental mode: reuse summaries of files whose fingerprint is unchanged
+    manifest = None
+    cached = {}
+    if changed_only:
+        manifest = FileManifest.load(path / '.pactfix' / 'manifest.json')
+        manifest.retain(str(f.relative_to(path)) for f in files_to_process)
+        for file_path in files_to_process:
+            rel = str(file_path.relative_to(path))
+            if changed_paths is not None:
+                # Trust the caller's list (e.g. git diff --name-only) instead of stat-ing every file
+                summary = None if file_path in changed_paths else manifest.entries.get(rel, {}).get('summary')
+            else:
+                summary = manifest.cached_summary(rel, file_path)
+            if summary is not None:
+                cached[file_path] = summary
+        if sandbox:
+            for file_path, summary in cached.items():
+                fixed_file_path = pactfix_dir / 'fixed' / file_path.relative_to(path)
+                if summary.get('changed') and fixed_file_path.is_file():
+                    fixed_files[str(file_path.relative_to(path))] = fixed_file_path.read_text(encoding='utf-8')
+        print(f"⏭️  Unchanged since last scan: {len(cached)}, analyzing {len(files_to_process) - len(cached)}\n")
+    
+    analyzed = {}
+    to_analyze = [f for f in files_to_process if f not in cached]
+    for file_path, outcome in _iter_project_results(to_analyze, comment, jobs):
         try:
-            with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                code = f.read()
-            
-            result = analyze_code(code, str(file_path))
-            
-            if comment and result.fixes:
-                result.fixed_code = add_fix_comments(result)
-            
-            total_errors += len(result.errors)
-            total_warnings += len(result.warnings)
-            total_fixes += len(result.fixes)
+            result, changed, error = outcome
+            if error is not None:
+                raise RuntimeError(error)
             
             rel_path = file_path.relative_to(path)
             
             # Save fixed file
-            if result.fixed_code != code:
+            if changed:
                 if sandbox:
                     # Sandbox mode: save to .pactfix/fixed/
                     fixed_dir = pactfix_dir / 'fixed'
@@ -530,18 +703,45 @@ def process_project(project_path: str, comment: bool = False, sandbox: bool = Fa
                     for fix in result.fixes:
                         print(f"   🔧 L{fix.line}: {fix.description}")
             
-            results.append({
-                'file': str(rel_path),
+            summary = {
                 'language': result.language,
                 'errors': len(result.errors),
                 'warnings': len(result.warnings),
-                'fixes': len(result.fixes)
-            })
+                'fixes': len(result.fixes),
+                'changed': changed,
+            }
+            analyzed[file_path] = summary
+            if manifest is not None:
+                if changed and not sandbox:
+                    # Rewritten in place - analyze the fixed file again next time
+                    manifest.forget(str(rel_path))
+                else:
+                    manifest.record(str(rel_path), file_path, summary)
             
         except Exception as e:
             if verbose:
                 print(f"❌ {file_path}: {e}")
     
+    if manifest is not None:
+        manifest.save()
+    
+    # Merge fresh and cached summaries in scan order
+    results = []
+    for file_path in files_to_process:
+        summary = analyzed.get(file_path) or cached.get(file_path)
+        if summary is None:
+            continue
+        results.append({
+            'file': str(file_path.relative_to(path)),
+            'language': summary.get('language'),
+            'errors': summary.get('errors', 0),
+            'warnings': summary.get('warnings', 0),
+            'fixes': summary.get('fixes', 0),
+        })
+    total_errors = sum(r['errors'] for r in results)
+    total_warnings = sum(r['warnings'] for r in results)
+    total_fixes = sum(r['fixes'] for r in results)
+    
     # Print summary
     print(f"\n{'='*60}")
     print(f"📊 Project Summary: {path.name}")
@@ -549,6 +749,8 @@ def process_project(project_path: str, comment: bool = False, sandbox: bool = Fa
     print(f"   ❌ Errors:   {total_errors}")
     print(f"   ⚠️  Warnings: {total_warnings}")
     print(f"   🔧 Fixes:    {total_fixes}")
+    if verbose:
+        print_cache_stats()
     
     if not sandbox and files_modified:
         print(f"\n   � Files modified in place: {len(files_modified)}")
@@ -0,0 +1,193 @@
+"""Shared hardcoded-credential scanner.
+
+Every analyzer that flags hardcoded passwords, tokens or keys declares its
+patterns here, in a profile. ``scan_credentials`` runs one case-insensitive
+alternation of the profile's literal anchors (``password``, ``token``...)
+over the whole file; only the lines it hits are checked against the exact
+per-rule patterns. The analyzer then emits the hits for each line under its
+own issue codes, at the point where it used to run its own regexes, so the
+order of issues is unchanged.
+"""
+
+import re
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+
+class CredentialRule:
+    """One credential check.
+
+    Args:
+        code: Issue code emitted by the analyzer (e.g. ``'GO009'``).
+        message: Issue message.
+        pattern: Compiled regex searched in the stripped line (or its
+            upper-cased form with ``upper=True``).
+        anchors: Lower-case literals, one of which occurs in every match;
+            they form the file-level prefilter.
+        name: The credential kind (``'password'``, ``'token'``...).
+        requires: Literals that must all occur in the stripped line.
+        excludes: Literals that must not occur in the stripped line.
+    """
+
+    __slots__ = ('code', 'message', 'pattern', 'anchors', 'name', 'upper', 'requires', 'excludes')
+
+    def __init__(self, code: str, message: str, pattern: 're.Pattern[str]', anchors: Sequence[str],
+                 name: str = '', upper: bool = False, requires: Sequence[str] = (), excludes: Sequence[str] = ()):
+        self.code = code
+        self.message = message
+        self.pattern = pattern
+        self.anchors = tuple(a.lower() for a in anchors)
+        self.name = name
+        self.upper = upper
+        self.requires = tuple(requires)
+        self.excludes = tuple(excludes)
+
+    def search(self, stripped: str, upper: Optional[str] = None):
+        for lit in self.requires:
+            if lit not in stripped:
+                return None
+        for lit in self.excludes:
+            if lit in stripped:
+                return None
+        if self.upper:
+            return self.pattern.search(upper if upper is not None else stripped.upper())
+        return self.pattern.search(stripped)
+
+
+class CredentialHit(NamedTuple):
+    rule: CredentialRule
+    match: 're.Match[str]'
+
+    @property
+    def code(self) -> str:
+        return self.rule.code
+
+    @property
+    def message(self) -> str:
+        return self.rule.message
+
+
+class CredentialProfile:
+    """The ordered credential rules of one analyzer plus their combined prefilter."""
+
+    def __init__(self, rules: Iterable[CredentialRule]):
+        self.rules: Tuple[CredentialRule, ...] = tuple(rules)
+        anchors = sorted({a for rule in self.rules for a in rule.anchors}, key=lambda a: (-len(a), a))
+        self.prefilter = re.compile('|'.join(re.escape(a) for a in anchors), re.IGNORECASE)
+        self.needs_upper = any(rule.upper for rule in self.rules)
+
+    def check_line(self, line: str) -> List[CredentialHit]:
+        """Run every rule on one line (no prefilter)."""
+        stripped = line.strip()
+        upper = stripped.upper() if self.needs_upper else None
+        hits = []
+        for rule in self.rules:
+            m = rule.search(stripped, upper)
+            if m:
+                hits.append(CredentialHit(rule, m))
+        return hits
+
+    def scan(self, lines: Sequence[str], text: Optional[str] = None) -> Dict[int, List[CredentialHit]]:
+        """Return ``{line_no: [hits]}`` (1-based) for ``lines``.
+
+        ``text`` may be passed when it already equals ``'\\n'.join(lines)``.
+        """
+        if text is None:
+            text = '\n'.join(lines)
+        hits: Dict[int, List[CredentialHit]] = {}
+        search = self.prefilter.search
+        line_idx = 0
+        line_start = 0
+        m = search(text)
+        while m is not None:
+            line_idx += text.count('\n', line_start, m.start())
+            line_start = text.rfind('\n', 0, m.start()) + 1
+            line_hits = self.check_line(lines[line_idx])
+            if line_hits:
+                hits[line_idx + 1] = line_hits
+            # Resume at the next line: each line is checked at most once
+            next_line = text.find('\n', m.end())
+            if next_line == -1:
+                break
+            line_idx += 1
+            line_start = next_line + 1
+            m = search(text, line_start)
+        return hits
+
+
+def _keyword_rules(code: str, keywords: Sequence[str], pattern: str, message: str,
+                   flags: int = re.IGNORECASE, **kwargs) -> List[CredentialRule]:
+    """One rule per keyword; ``{kw}`` in ``pattern`` and ``message`` is the keyword."""
+    return [
+        CredentialRule(code, message.format(kw=kw), re.compile(pattern.replace('{kw}', kw), flags),
+                       anchors=(kw,), name=kw, **kwargs)
+        for kw in keywords
+    ]
+
+
+_ANY_SECRET = ('password', 'token', 'secret', 'key')
+
+PROFILES: Dict[str, CredentialProfile] = {
+    'terraform': CredentialProfile(
+        _keyword_rules('TF001', ['access_key', 'secret_key', 'password', 'token', 'api_key'],
+                       r'({kw})\s*=\s*"([^"$]+)"', 'Hardcoded {kw}')),
+    'sql': CredentialProfile([
+        CredentialRule('SQL008', 'Hasło w plain text', re.compile(r"PASSWORD\s*[=:]\s*['\"][^'\"]+['\"]"),
+                       anchors=('password',), upper=True),
+    ]),
+    'kubernetes': CredentialProfile([
+        CredentialRule('K8S006', 'Hardcoded secret - użyj Secret', re.compile('PASSWORD|SECRET|KEY|TOKEN'),
+                       anchors=('password', 'secret', 'key', 'token'), upper=True,
+                       requires=('value:',), excludes=('${', 'valueFrom:')),
+    ]),
+    'dockerfile': CredentialProfile(
+        # Lines mentioning ARG anywhere are build-arg declarations, not hardcoded values
+        _keyword_rules('DOCKER007', ['PASSWORD=', 'SECRET=', 'API_KEY=', 'TOKEN='], r'^(?!.*ARG).*{kw}',
+                       'Hardcoded secret - użyj build args lub secrets', flags=0, upper=True)),
+    'github-actions': CredentialProfile([
+        CredentialRule('GHA003', 'Hardcoded secret - użyj ${{ secrets.NAME }}',
+                       re.compile(r'(password|token|key|secret)\s*[:=]\s*(?!\$\{\{)(?!\$\{)(?!\$)\S+', re.IGNORECASE),
+                       anchors=_ANY_SECRET),
+    ]),
+    'gitlab-ci': CredentialProfile([
+        CredentialRule('GL005', 'Hardcoded secret w .gitlab-ci.yml',
+                       re.compile(r'(?i)\b(password|token|secret|key)\b\s*:\s*(?!\$\{?\w+\}?)[^\s#]+'),
+                       anchors=_ANY_SECRET),
+    ]),
+    'jenkinsfile': CredentialProfile([
+        CredentialRule('JEN005', 'Hardcoded secret w Jenkinsfile',
+                       re.compile(r'(?i)\b(password|token|secret|key)\b\s*[=:]\s*[\"\'][^\"\']+[\"\']'),
+                       anchors=_ANY_SECRET),
+    ]),
+    'ansible': CredentialProfile([
+        CredentialRule('ANS001', 'Plain text password - użyj ansible-vault',
+                       re.compile(r'password\s*:\s*["\']?[^\$\{]', re.IGNORECASE), anchors=('password',)),
+    ]),
+    'yaml': CredentialProfile(
+        _keyword_rules('YAML008', ['password', 'secret', 'api_key', 'token', 'credential'],
+                       r'{kw}\s*:\s*["\']?[^\s${][^#]*', 'Hardcoded {kw} - użyj zmiennej środowiskowej',
+                       excludes=('${', '$('))),
+    # Only emitted for Environment= lines by the analyzer
+    'systemd': CredentialProfile(
+        _keyword_rules('SYSTEMD008', ['PASSWORD', 'SECRET', 'API_KEY', 'TOKEN'], '{kw}',
+                       'Hardcoded {kw} - użyj EnvironmentFile', flags=0, upper=True, excludes=('${',))),
+    'csharp': CredentialProfile(
+        _keyword_rules('CS005', ['password', 'secret', 'apiKey', 'connectionString'],
+                       r'{kw}\s*=\s*"[^"]+', 'Hardcoded {kw}')),
+    'go': CredentialProfile(
+        _keyword_rules('GO009', ['password', 'secret', 'apikey', 'api_key', 'token'],
+                       r'{kw}\s*[:=]\s*["\'][^"\']+["\']', 'Hardcoded {kw} - użyj zmiennych środowiskowych')),
+    'java': CredentialProfile(
+        _keyword_rules('JAVA005', ['password', 'secret', 'apiKey', 'api_key', 'token'],
+                       r'{kw}\s*=\s*"[^"]+', 'Hardcoded {kw}')),
+    'ruby': CredentialProfile(
+        _keyword_rules('RUBY005', ['password', 'secret', 'api_key', 'token'],
+                       r'{kw}\s*=\s*["\'][^"\']+["\']', 'Hardcoded {kw}')),
+    'rust': CredentialProfile(
+        _keyword_rules('RUST009', ['password', 'secret', 'api_key', 'token'],
+                       r'{kw}\s*=\s*"[^"]+', 'Hardcoded {kw}')),
+}
+
+
+def scan_credentials(language: str, lines: Sequence[str], text: Optional[str] = None) -> Dict[int, List[CredentialHit]]:
+    """Scan ``lines`` once with the credential profile of ``language``."""
+    return PROFILES[language].scan(lines, text)
@@ -0,0 +1,186 @@
+"""Re-analyze only the edited lines of a previously analyzed text.
+
+An edit replaces lines ``start..end`` (1-based, inclusive, in the previous
+text; ``end == start - 1`` inserts before ``start``) with new ``lines``.
+For analyzers whose rules only look at a bounded neighbourhood of each line,
+such an edit can only change the issues and fixes of the lines around it:
+those lines are analyzed again, in a window with enough context, and
+everything else is taken over from the previous result, shifted to the new
+line numbers. Other analyzers keep file-wide state (nginx server blocks,
+systemd sections, INI/YAML whole-file checks, SQL table context...) and
+``reanalyze`` returns None for them.
+"""
+
+from bisect import bisect_right
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from .analyzer import AnalysisResult, Fix, Issue
+
+# language -> (lines before, lines after) that a line's rules may look at
+LINE_WINDOWS: Dict[str, Tuple[int, int]] = {
+    'bash': (0, 0),
+    'css': (9, 3),  # CSS009 looks 9 lines back, CSS003 up to 3 lines ahead
+}
+
+Range = Tuple[int, int]
+
+
+class EditError(ValueError):
+    """Edits do not apply to the base text."""
+
+
+class LineMap:
+    """Old line number -> new line number after a list of edits."""
+
+    __slots__ = ('_starts', '_ends', '_deltas', 'old_count')
+
+    def __init__(self, old_count: int):
+        self.old_count = old_count
+        self._starts: List[int] = []   # first replaced old line of each edit
+        self._ends: List[int] = []     # last replaced old line (start - 1 for insertions)
+        self._deltas: List[int] = []   # shift of the old lines after each edit
+
+    def add(self, start: int, end: int, delta: int) -> None:
+        self._starts.append(start)
+        self._ends.append(end)
+        self._deltas.append(delta)
+
+    def __call__(self, old: int) -> Optional[int]:
+        """New number of ``old``, or None if the line was replaced (or never existed)."""
+        if not 1 <= old <= self.old_count:
+            return None
+        i = bisect_right(self._starts, old) - 1
+        if i < 0:
+            return old
+        if old <= self._ends[i]:
+            return None
+        return old + self._deltas[i]
+
+
+def apply_line_edits(lines: Sequence[str], edits: Sequence[dict]) -> Tuple[List[str], LineMap, List[Range]]:
+    """Apply ``edits`` to ``lines``.
+
+    Returns the new lines, a ``LineMap`` from old to new line numbers and the
+    edited ranges in new line numbers. Edits must be sorted and must not
+    overlap.
+    """
+    n = len(lines)
+    new_lines: List[str] = []
+    mapping = LineMap(n)
+    ranges: List[Range] = []
+    pos = 1  # next old line to copy
+    for edit in edits:
+        try:
+            start, end, text = int(edit['start']), int(edit['end']), edit['lines']
+        except (KeyError, TypeError, ValueError):
+            raise EditError('Edit needs integer start/end and a list of lines')
+        if not isinstance(text, list) or not all(isinstance(line, str) for line in text):
+            raise EditError('Edit lines must be a list of strings')
+        if start < pos or end < start - 1 or end > n:
+            raise EditError(f'Edit {start}-{end} is out of order or outside 1-{n}')
+        new_lines.extend(lines[pos - 1:start - 1])
+        first = len(new_lines) + 1
+        new_lines.extend(text)
+        ranges.append((first, len(new_lines)))
+        mapping.add(start, end, len(new_lines) - end)
+        pos = end + 1
+    new_lines.extend(lines[pos - 1:])
+    return new_lines, mapping, ranges
+
+
+def _dirty_ranges(ranges: Sequence[Range], before: int, after: int, total: int) -> List[Range]:
+    """Lines whose results an edit can change, merged and clipped to the text."""
+    dirty: List[Range] = []
+    for first, last in ranges:
+        # A deletion (last < first) still changes its neighbours' context
+        a = max(1, min(first, last) - after)
+        b = min(total, max(first, last) + before)
+        if a > b:
+            continue
+        if dirty and a <= dirty[-1][1] + 1:
+            dirty[-1] = (dirty[-1][0], max(dirty[-1][1], b))
+        else:
+            dirty.append((a, b))
+    return dirty
+
+
+# Results are never mutated once built, so items that keep their line (and
+# the edit lists of moved fixes) are shared with the base result.
+
+def _shift_issue(issue: Issue, line: int) -> Issue:
+    if line == issue.line:
+        return issue
+    return Issue(line, issue.column, issue.code, issue.message, issue.severity)
+
+
+def _shift_fix(fix: Fix, line: int) -> Fix:
+    if line == fix.line:
+        return fix
+    return Fix(line, fix.description, fix.before, fix.after, edits=fix.edits)
+
+
+def _carry_over(items: list, mapping: LineMap, dirty_lines: set, shift) -> list:
+    """Base ``items`` moved to their new lines, minus those in ``dirty_lines``."""
+    starts, ends, deltas = mapping._starts, mapping._ends, mapping._deltas
+    old_count = mapping.old_count
+    kept = []
+    for item in items:
+        old = item.line
+        if not 1 <= old <= old_count:
+            continue
+        i = bisect_right(starts, old) - 1
+        if i < 0:
+            new = old
+        elif old <= ends[i]:
+            continue
+        else:
+            new = old + deltas[i]
+        if new not in dirty_lines:
+            kept.append(item if new == old else shift(item, new))
+    return kept
+
+
+def reanalyze(base: AnalysisResult, edits: Sequence[dict], analyzer) -> Optional[Tuple[AnalysisResult, List[Range]]]:
+    """Splice a partial re-analysis of ``edits`` into ``base``.
+
+    ``analyzer`` is the analyzer for ``base.language``. Returns the new result
+    and the re-analyzed line ranges, or None when the language (or this
+    result) does not allow it; callers then run a full analysis of the text
+    from ``apply_line_edits``. Raises ``EditError`` for invalid edits.
+    """
+    window = LINE_WINDOWS.get(base.language)
+    base_lines = base.original_code.split('\n')
+    new_lines, mapping, ranges = apply_line_edits(base_lines, edits)
+    base_fixed = base.fixed_code.split('\n')
+    # Splicing fixed lines needs a 1:1 line mapping between code and fixed code
+    if window is None or len(base_fixed) != len(base_lines):
+        return None
+    before, after = window
+    dirty = _dirty_ranges(ranges, before, after, len(new_lines))
+    dirty_lines = {line for a, b in dirty for line in range(a, b + 1)}
+
+    # Unchanged fixed lines, with the edited lines spliced in (re-analyzed below)
+    fixed_lines, _, _ = apply_line_edits(base_fixed, edits)
+
+    errors: List[Issue] = _carry_over(base.errors, mapping, dirty_lines, _shift_issue)
+    warnings: List[Issue] = _carry_over(base.warnings, mapping, dirty_lines, _shift_issue)
+    fixes: List[Fix] = _carry_over(base.fixes, mapping, dirty_lines, _shift_fix)
+
+    for a, b in dirty:
+        w0, w1 = max(1, a - before), min(len(new_lines), b + after)
+        part = analyzer('\n'.join(new_lines[w0 - 1:w1]))
+        part_fixed = part.fixed_code.split('\n')
+        if len(part_fixed) != w1 - w0 + 1:
+            return None
+        fixed_lines[a - 1:b] = part_fixed[a - w0:b - w0 + 1]
+        offset = w0 - 1
+        for issues, target in ((part.errors, errors), (part.warnings, warnings)):
+            target.extend(_shift_issue(i, i.line + offset) for i in issues if a <= i.line + offset <= b)
+        fixes.extend(_shift_fix(f, f.line + offset) for f in part.fixes if a <= f.line + offset <= b)
+
+    # Analyzers emit in line order; sort is stable, so same-line order is kept
+    for items in (errors, warnings, fixes):
+        items.sort(key=lambda item: item.line)
+    result = AnalysisResult(base.language, '\n'.join(new_lines), '\n'.join(fixed_lines),
+                            errors, warnings, fixes, dict(base.context))
+    return result, dirty
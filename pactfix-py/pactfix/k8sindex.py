@@ -0,0 +1,210 @@
+"""Cross-object index for a set of Kubernetes manifests.
+
+``ManifestIndex`` walks every object once (items of ``kind: List`` included)
+and records, per namespace, pod template labels, Service selectors,
+ConfigMap/Secret/PVC names, the references to them from pod specs and HPA
+scale targets. ``check()`` then runs the cross-object rules as dictionary
+lookups, so a cluster dump with 10k objects costs one pass plus one lookup
+per selector label or reference:
+
+- K8S011 Service selects no pods
+- K8S012/K8S013/K8S014 referenced ConfigMap/Secret/PVC is not in the set
+- K8S015 two HPAs scale the same workload
+"""
+
+from typing import Dict, Iterable, Iterator, List, Set, Tuple
+
+from .analyzer import Issue
+
+# kind -> path from the object to its pod template ("metadata" + "spec")
+_POD_TEMPLATES: Dict[str, tuple] = {
+    'Pod': (),
+    'Deployment': ('spec', 'template'),
+    'StatefulSet': ('spec', 'template'),
+    'DaemonSet': ('spec', 'template'),
+    'ReplicaSet': ('spec', 'template'),
+    'ReplicationController': ('spec', 'template'),
+    'Job': ('spec', 'template'),
+    'CronJob': ('spec', 'jobTemplate', 'spec', 'template'),
+}
+
+# Referenced kind -> issue code
+_REFERENCE_CODES = {
+    'ConfigMap': 'K8S012',
+    'Secret': 'K8S013',
+    'PersistentVolumeClaim': 'K8S014',
+}
+
+# Kinds whose controller creates an object of another kind with the same name
+_PROVIDES = {
+    'SealedSecret': 'Secret',
+    'ExternalSecret': 'Secret',
+}
+
+# (volume source, name field) -> referenced kind
+_VOLUME_REFERENCES = (
+    ('configMap', 'name', 'ConfigMap'),
+    ('secret', 'secretName', 'Secret'),
+    ('persistentVolumeClaim', 'claimName', 'PersistentVolumeClaim'),
+)
+
+Reference = Tuple['ManifestObject', tuple, str, str]
+
+
+def _get(data, *path):
+    for key in path:
+        if not isinstance(data, dict):
+            return None
+        data = data.get(key)
+    return data
+
+
+def _items(value) -> list:
+    return value if isinstance(value, list) else []
+
+
+class ManifestObject:
+    """One object of the set with its document and path inside it."""
+
+    __slots__ = ('doc', 'prefix', 'data', 'kind', 'name', 'namespace')
+
+    def __init__(self, doc, prefix: tuple, data: dict):
+        self.doc = doc
+        self.prefix = prefix
+        self.data = data
+        self.kind = str(data.get('kind') or '')
+        metadata = data.get('metadata')
+        if not isinstance(metadata, dict):
+            metadata = {}
+        self.name = str(metadata.get('name') or '')
+        self.namespace = str(metadata.get('namespace') or 'default')
+
+    def line(self, *path) -> int:
+        """1-based line of ``path`` in this object, falling back to its parents."""
+        path = self.prefix + path
+        while path:
+            line = self.doc.line(*path)
+            if line:
+                return line
+            path = path[:-1]
+        return 1
+
+
+def iter_objects(documents) -> Iterator[ManifestObject]:
+    """Objects of ``yamldoc`` documents, expanding ``kind: List``."""
+    for doc in documents:
+        data = doc.data
+        if not isinstance(data, dict):
+            continue
+        if data.get('kind') == 'List' and isinstance(data.get('items'), list):
+            for i, item in enumerate(data['items']):
+                if isinstance(item, dict):
+                    yield ManifestObject(doc, ('items', i), item)
+        else:
+            yield ManifestObject(doc, (), data)
+
+
+class ManifestIndex:
+    """Labels, names, references and scale targets of a manifest set."""
+
+    def __init__(self, objects: Iterable[ManifestObject]):
+        # (namespace, label key, label value) -> ids of pod templates carrying it
+        self.labels: Dict[Tuple[str, str, str], Set[int]] = {}
+        # (kind, namespace, name) of every object
+        self.names: Set[Tuple[str, str, str]] = set()
+        self.services: List[ManifestObject] = []
+        self.references: List[Reference] = []
+        # (namespace, kind, name) of the target -> HPAs scaling it
+        self.scale_targets: Dict[Tuple[str, str, str], List[ManifestObject]] = {}
+        self._pods = 0
+        for obj in objects:
+            self.add(obj)
+
+    def add(self, obj: ManifestObject) -> None:
+        ns = obj.namespace
+        self.names.add((obj.kind, ns, obj.name))
+        if obj.kind in _PROVIDES:
+            self.names.add((_PROVIDES[obj.kind], ns, obj.name))
+
+        if obj.kind == 'Service':
+            self.services.append(obj)
+        elif obj.kind == 'HorizontalPodAutoscaler':
+            target = _get(obj.data, 'spec', 'scaleTargetRef')
+            if isinstance(target, dict) and target.get('name'):
+                key = (ns, str(target.get('kind') or ''), str(target['name']))
+                self.scale_targets.setdefault(key, []).append(obj)
+        elif obj.kind in _POD_TEMPLATES:
+            self._add_pod_template(obj, _POD_TEMPLATES[obj.kind])
+
+    def _add_pod_template(self, obj: ManifestObject, template: tuple) -> None:
+        labels = _get(obj.data, *template, 'metadata', 'labels')
+        if isinstance(labels, dict):
+            pod_id = self._pods
+            self._pods += 1
+            for key, value in labels.items():
+                self.labels.setdefault((obj.namespace, str(key), str(value)), set()).add(pod_id)
+
+        spec_path = template + ('spec',)
+        pod_spec = _get(obj.data, *spec_path)
+        if not isinstance(pod_spec, dict):
+            return
+        refs = self.references
+
+        for vi, volume in enumerate(_items(pod_spec.get('volumes'))):
+            if not isinstance(volume, dict):
+                continue
+            for source, field, kind in _VOLUME_REFERENCES:
+                ref = volume.get(source)
+                if isinstance(ref, dict) and ref.get(field) and not ref.get('optional'):
+                    refs.append((obj, spec_path + ('volumes', vi, source, field), kind, str(ref[field])))
+
+        for group in ('initContainers', 'containers'):
+            for ci, container in enumerate(_items(pod_spec.get(group))):
+                if not isinstance(container, dict):
+                    continue
+                cpath = spec_path + (group, ci)
+                for ei, source in enumerate(_items(container.get('envFrom'))):
+                    for field, kind in (('configMapRef', 'ConfigMap'), ('secretRef', 'Secret')):
+                        ref = _get(source, field)
+                        if isinstance(ref, dict) and ref.get('name') and not ref.get('optional'):
+                            refs.append((obj, cpath + ('envFrom', ei, field, 'name'), kind, str(ref['name'])))
+                for ei, env in enumerate(_items(container.get('env'))):
+                    for field, kind in (('configMapKeyRef', 'ConfigMap'), ('secretKeyRef', 'Secret')):
+                        ref = _get(env, 'valueFrom', field)
+                        if isinstance(ref, dict) and ref.get('name') and not ref.get('optional'):
+                            refs.append((obj, cpath + ('env', ei, 'valueFrom', field, 'name'), kind, str(ref['name'])))
+
+    def selects_any(self, namespace: str, selector: dict) -> bool:
+        """True if some pod template in ``namespace`` has all ``selector`` labels."""
+        candidates = []
+        for key, value in selector.items():
+            pods = self.labels.get((namespace, str(key), str(value)))
+            if not pods:
+                return False
+            candidates.append(pods)
+        candidates.sort(key=len)
+        return bool(candidates[0].intersection(*candidates[1:]))
+
+    def check(self) -> List[Issue]:
+        """Run the cross-object rules; all findings are warnings."""
+        issues: List[Issue] = []
+
+        for svc in self.services:
+            selector = _get(svc.data, 'spec', 'selector')
+            if isinstance(selector, dict) and selector and not self.selects_any(svc.namespace, selector):
+                labels = ', '.join(f'{k}={v}' for k, v in selector.items())
+                issues.append(Issue(svc.line('spec', 'selector'), 1, 'K8S011',
+                                    f'Service {svc.name} nie wybiera żadnego poda (selector: {labels})'))
+
+        for obj, path, kind, name in self.references:
+            if (kind, obj.namespace, name) not in self.names:
+                issues.append(Issue(obj.line(*path), 1, _REFERENCE_CODES[kind],
+                                    f'Brak {kind} {name} w manifestach ({obj.kind} {obj.name})'))
+
+        for (_, kind, name), hpas in self.scale_targets.items():
+            for hpa in hpas[1:]:
+                issues.append(Issue(hpa.line('spec', 'scaleTargetRef'), 1, 'K8S015',
+                                    f'HPA {hpa.name} skaluje {kind}/{name} tak jak HPA {hpas[0].name}'))
+
+        issues.sort(key=lambda issue: issue.line)
+        return issues
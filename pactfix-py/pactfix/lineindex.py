@@ -0,0 +1,83 @@
+"""Offset <-> (line, column) conversion for analyzers that work on the whole text.
+
+``LineIndex`` records the offset of every line start once; lookups are a
+bisect instead of ``code[:pos].count('\\n')``, so mapping many match
+positions stays linear in the size of the file. Lines and columns are
+1-based, like ``Issue.line``/``Issue.column``.
+"""
+
+from bisect import bisect_right
+from itertools import accumulate
+from typing import List, Tuple
+
+from .analyzer import Fix, Issue
+
+
+class LineIndex:
+    """Line start offsets of ``text``."""
+
+    __slots__ = ('text', 'starts')
+
+    def __init__(self, text: str):
+        self.text = text
+        # starts[i] is the offset of line i + 1; lengths + 1 account for the '\n'
+        starts = list(accumulate((len(line) + 1 for line in text.split('\n')), initial=0))
+        starts.pop()
+        self.starts: List[int] = starts
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def line_of(self, offset: int) -> int:
+        """1-based line containing ``offset`` (clamped to the text)."""
+        if offset <= 0:
+            return 1
+        return bisect_right(self.starts, offset)
+
+    def line_col(self, offset: int) -> Tuple[int, int]:
+        """1-based ``(line, column)`` of ``offset``."""
+        if offset is None or offset < 0:
+            return 1, 1
+        offset = min(offset, len(self.text))
+        line = bisect_right(self.starts, offset)
+        return line, offset - self.starts[line - 1] + 1
+
+    def offset(self, line: int, column: int = 1) -> int:
+        """Offset of 1-based ``(line, column)``."""
+        line = min(max(line, 1), len(self.starts))
+        return self.starts[line - 1] + max(column, 1) - 1
+
+    def line_span(self, line: int) -> Tuple[int, int]:
+        """``(start, end)`` offsets of 1-based ``line``, without its newline."""
+        start = self.starts[line - 1]
+        end = self.starts[line] - 1 if line < len(self.starts) else len(self.text)
+        return start, end
+
+    def line(self, line: int) -> str:
+        start, end = self.line_span(line)
+        return self.text[start:end]
+
+
+def shift_issue(issue: Issue, first_line: int, message: str = None) -> Issue:
+    """Map an issue from a nested block whose line 1 is ``first_line`` in the outer file."""
+    return Issue(first_line + issue.line - 1, issue.column, issue.code,
+                 issue.message if message is None else message, issue.severity)
+
+
+def shift_edits(edits, first_line: int) -> list:
+    """Map ``startLine``/``endLine`` of nested fix edits to the outer file."""
+    shifted = []
+    for edit in edits or ():
+        edit = dict(edit)
+        if 'startLine' in edit:
+            edit['startLine'] = first_line + int(edit['startLine']) - 1
+        if 'endLine' in edit:
+            edit['endLine'] = first_line + int(edit['endLine']) - 1
+        shifted.append(edit)
+    return shifted
+
+
+def shift_fix(fix: Fix, first_line: int, description: str = None, keep_edits: bool = True) -> Fix:
+    """Map a fix from a nested block whose line 1 is ``first_line`` in the outer file."""
+    return Fix(first_line + fix.line - 1, fix.description if description is None else description,
+               fix.before, fix.after, edits=shift_edits(fix.edits, first_line) if keep_edits else [])
@@ -0,0 +1,129 @@
+"""Persistent file manifest for incremental project scans.
+
+The manifest (``.pactfix/manifest.json``) remembers, per project-relative
+path, the file fingerprint (mtime, size, sha256) and the summary of its last
+analysis. ``pactfix --path --changed-only`` uses it to skip files whose
+fingerprint is unchanged while still reporting totals for the whole project.
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from . import __version__
+from .cache import ruleset_fingerprint
+
+MANIFEST_FORMAT_VERSION = 1
+
+
+def file_sha256(path: Path) -> str:
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+class FileManifest:
+    """Fingerprints and result summaries of previously analyzed files."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.entries: Dict[str, Dict[str, Any]] = {}
+
+    @classmethod
+    def load(cls, path: Path) -> 'FileManifest':
+        """Load a manifest; entries written by another pactfix/rule version are dropped."""
+        manifest = cls(path)
+        try:
+            data = json.loads(manifest.path.read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            return manifest
+        if (
+            isinstance(data, dict)
+            and data.get('format') == MANIFEST_FORMAT_VERSION
+            and data.get('version') == __version__
+            and data.get('ruleset') == ruleset_fingerprint()
+            and isinstance(data.get('files'), dict)
+        ):
+            manifest.entries = data['files']
+        return manifest
+
+    def save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(self.path.suffix + '.tmp')
+        tmp.write_text(json.dumps({
+            'format': MANIFEST_FORMAT_VERSION,
+            'version': __version__,
+            'ruleset': ruleset_fingerprint(),
+            'files': self.entries,
+        }, indent=1, sort_keys=True), encoding='utf-8')
+        tmp.replace(self.path)
+
+    def cached_summary(self, rel_path: str, file_path: Path) -> Optional[Dict[str, Any]]:
+        """Return the stored summary if ``file_path`` still matches its fingerprint.
+
+        mtime and size are checked first; the content hash is only computed
+        when the size matches but the mtime moved (e.g. after a checkout).
+        """
+        entry = self.entries.get(rel_path)
+        if not entry:
+            return None
+        try:
+            st = file_path.stat()
+        except OSError:
+            return None
+        if st.st_size != entry.get('size'):
+            return None
+        if st.st_mtime_ns != entry.get('mtime_ns'):
+            try:
+                if file_sha256(file_path) != entry.get('sha256'):
+                    return None
+            except OSError:
+                return None
+            entry['mtime_ns'] = st.st_mtime_ns
+        return entry.get('summary')
+
+    def record(self, rel_path: str, file_path: Path, summary: Dict[str, Any]) -> None:
+        try:
+            st = file_path.stat()
+            digest = file_sha256(file_path)
+        except OSError:
+            self.entries.pop(rel_path, None)
+            return
+        self.entries[rel_path] = {
+            'mtime_ns': st.st_mtime_ns,
+            'size': st.st_size,
+            'sha256': digest,
+            'summary': summary,
+        }
+
+    def forget(self, rel_path: str) -> None:
+        self.entries.pop(rel_path, None)
+
+    def retain(self, rel_paths) -> None:
+        """Drop entries for files that no longer exist in the project."""
+        keep = set(rel_paths)
+        for rel in [r for r in self.entries if r not in keep]:
+            del self.entries[rel]
+
+
+def read_path_list(stream, project_root: Path) -> set:
+    """Read newline-separated paths (e.g. ``git diff --name-only``) as resolved Paths.
+
+    Relative paths are resolved against the project root first and then
+    against the current directory.
+    """
+    paths = set()
+    for raw in stream:
+        line = raw.strip()
+        if not line:
+            continue
+        candidate = Path(line)
+        if not candidate.is_absolute():
+            in_project = project_root / candidate
+            candidate = in_project if in_project.exists() else Path(os.getcwd()) / candidate
+        paths.add(candidate.resolve())
+    return paths
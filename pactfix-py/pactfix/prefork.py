@@ -0,0 +1,262 @@
+"""Pre-forking HTTP server for the pactfix API (``pactfix serve``).
+
+The master process binds the listening socket, imports every analyzer and
+runs each one once (so module-level and ``re``-cached patterns are compiled),
+then forks the workers: they start warm and share those pages copy-on-write.
+Each worker accepts connections from the shared socket and serves one request
+per connection with ``wsgiref``. A worker exits after ``max_requests``
+requests or once its resident memory passes ``max_memory_mb`` and the master
+forks a fresh one. SIGTERM/SIGINT drain: workers stop accepting, finish the
+request in flight and exit; the master waits ``graceful_timeout`` seconds
+before killing the rest.
+"""
+
+import gc
+import importlib
+import os
+import random
+import resource
+import selectors
+import signal
+import socket
+import sys
+import time
+import traceback
+from typing import Callable, Dict, Optional
+from wsgiref.simple_server import WSGIRequestHandler, WSGIServer
+
+from .analyzer import analyze_code
+from .analyzers import LANGUAGE_ANALYZERS, preload_analyzers
+
+DEFAULT_APP = 'pactfix.server:app'
+
+# Touches the common rules of every analyzer during warm-up
+_WARMUP_SAMPLE = ('#!/bin/bash\nFROM ubuntu:latest\nRUN apt-get install -y curl\n'
+                  'SELECT * FROM users;\nkey: value\nserver {\n  listen 80;\n}\n'
+                  'import os\nprint "x"\necho $HOME\ncd /tmp\n')
+
+
+def warm_up() -> None:
+    """Import all analyzers and run each once so their regexes are compiled."""
+    preload_analyzers()
+    for language in LANGUAGE_ANALYZERS:
+        try:
+            analyze_code(_WARMUP_SAMPLE, force_language=language, use_cache=False)
+        except Exception:
+            pass  # warm-up is best effort, a failing analyzer fails later per request
+
+
+def load_app(spec: str) -> Callable:
+    """WSGI application named by ``module:attribute``."""
+    module_name, _, attr = spec.partition(':')
+    return getattr(importlib.import_module(module_name), attr or 'app')
+
+
+def _rss_mb() -> float:
+    """Current resident set size in MiB (peak RSS where /proc is unavailable)."""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / (1024 * 1024)
+    except (OSError, ValueError, IndexError):
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+class _RequestHandler(WSGIRequestHandler):
+    timeout = 30  # a stalled client must not pin a worker
+
+    def log_message(self, format, *args):
+        if self.server.access_log:
+            super().log_message(format, *args)
+
+
+class PreforkServer:
+    """Serve ``app`` on ``workers`` pre-forked processes sharing one socket."""
+
+    def __init__(self, app: Callable, host: str = '0.0.0.0', port: int = 5000, workers: int = 0,
+                 max_requests: int = 10000, max_requests_jitter: Optional[int] = None,
+                 max_memory_mb: float = 0, graceful_timeout: float = 30,
+                 access_log: bool = False, backlog: int = 1024):
+        self.app = app
+        self.host = host
+        self.port = port
+        self.workers = workers if workers > 0 else (os.cpu_count() or 1)
+        self.max_requests = max_requests
+        # Spread recycling so the workers do not all restart at once
+        self.max_requests_jitter = (max_requests // 10 if max_requests_jitter is None
+                                    else max_requests_jitter)
+        self.max_memory_mb = max_memory_mb
+        self.graceful_timeout = graceful_timeout
+        self.access_log = access_log
+        self.backlog = backlog
+        self.socket: Optional[socket.socket] = None
+        self._children: Dict[int, int] = {}  # pid -> worker slot
+        self._stopping = False
+        self.recycled = 0
+
+    # -- master -----------------------------------------------------------------
+
+    def bind(self) -> None:
+        sock = socket.socket(socket.AF_INET6 if ':' in self.host else socket.AF_INET, socket.SOCK_STREAM)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        sock.bind((self.host, self.port))
+        sock.listen(self.backlog)
+        # Several workers wake up for one connection; the losers get EAGAIN
+        sock.setblocking(False)
+        self.socket = sock
+        self.port = sock.getsockname()[1]
+
+    def serve(self) -> int:
+        """Run the master loop until SIGTERM/SIGINT; returns the exit status."""
+        if self.socket is None:
+            self.bind()
+        gc.collect()
+        gc.freeze()  # keep the collector from touching (and copying) the warm heap
+        signal.signal(signal.SIGTERM, self._on_stop)
+        signal.signal(signal.SIGINT, self._on_stop)
+        print(f'🚀 pactfix serve: http://{self.host}:{self.port} ({self.workers} workers, pid {os.getpid()})',
+              file=sys.stderr, flush=True)
+        try:
+            for slot in range(self.workers):
+                self._spawn(slot)
+            while not self._stopping:
+                self._reap()
+                time.sleep(0.1)
+        finally:
+            self._drain()
+            self.socket.close()
+        return 0
+
+    def _on_stop(self, signum, frame) -> None:
+        self._stopping = True
+
+    def _spawn(self, slot: int) -> None:
+        pid = os.fork()
+        if pid == 0:
+            code = 1
+            try:
+                code = self._worker()
+            except BaseException:
+                traceback.print_exc()
+            finally:
+                sys.stderr.flush()
+                os._exit(code)
+        self._children[pid] = slot
+
+    def _reap(self) -> None:
+        while self._children:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                return
+            if pid == 0:
+                return
+            slot = self._children.pop(pid, None)
+            if slot is None:
+                continue
+            if os.waitstatus_to_exitcode(status) == 0:
+                self.recycled += 1
+            else:
+                print(f'⚠️  Worker {pid} zakończył się ze statusem {os.waitstatus_to_exitcode(status)}',
+                      file=sys.stderr, flush=True)
+                time.sleep(0.5)  # do not spin on a worker that crashes at start-up
+            if not self._stopping:
+                self._spawn(slot)
+
+    def _drain(self) -> None:
+        for pid in list(self._children):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+        deadline = time.monotonic() + self.graceful_timeout
+        while self._children and time.monotonic() < deadline:
+            try:
+                pid, _ = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                break
+            if pid:
+                self._children.pop(pid, None)
+            else:
+                time.sleep(0.05)
+        for pid in list(self._children):
+            try:
+                os.kill(pid, signal.SIGKILL)
+                os.waitpid(pid, 0)
+            except (ProcessLookupError, ChildProcessError):
+                pass
+        self._children.clear()
+
+    # -- worker -----------------------------------------------------------------
+
+    def _worker(self) -> int:
+        # One pool per worker would run workers x CPUs processes; opt in explicitly
+        os.environ.setdefault('PACTFIX_BATCH_WORKERS', '1')
+        os.environ.setdefault('PACTFIX_MARKDOWN_WORKERS', '1')
+        try:
+            return self._serve_requests()
+        finally:
+            # os._exit skips atexit: stop the pools this worker started, or their processes outlive it
+            from .analyzers.markdown import shutdown_block_pool
+            from .batch import shutdown_batch_pool
+            shutdown_batch_pool()
+            shutdown_block_pool()
+
+    def _serve_requests(self) -> int:
+        stopping = []
+        signal.signal(signal.SIGTERM, lambda signum, frame: stopping.append(signum))
+        signal.signal(signal.SIGINT, signal.SIG_IGN)  # Ctrl+C reaches the whole group; the master drains
+        gc.unfreeze()
+        random.seed()
+
+        server = WSGIServer((self.host, self.port), _RequestHandler, bind_and_activate=False)
+        server.socket.close()
+        server.socket = self.socket
+        server.server_name = socket.getfqdn(self.host) if self.host not in ('', '0.0.0.0', '::') else 'localhost'
+        server.server_port = self.port
+        server.setup_environ()
+        server.set_app(self.app)
+        server.access_log = self.access_log
+
+        limit = self.max_requests + random.randint(0, self.max_requests_jitter) if self.max_requests > 0 else 0
+        served = 0
+        with selectors.DefaultSelector() as selector:
+            selector.register(self.socket, selectors.EVENT_READ)
+            while not stopping:
+                if not selector.select(timeout=1.0):
+                    continue
+                try:
+                    request, address = self.socket.accept()
+                except (BlockingIOError, InterruptedError):
+                    continue  # another worker took it
+                if server.verify_request(request, address):
+                    try:
+                        server.process_request(request, address)
+                    except Exception:
+                        server.handle_error(request, address)
+                        server.shutdown_request(request)
+                else:
+                    server.shutdown_request(request)
+                served += 1
+                if limit and served >= limit:
+                    break
+                if self.max_memory_mb and _rss_mb() > self.max_memory_mb:
+                    break
+        return 0
+
+
+def serve(app: str = DEFAULT_APP, **options) -> int:
+    """Warm up, load ``app`` (``module:attribute``) and run a ``PreforkServer``."""
+    try:
+        wsgi_app = load_app(app)
+    except ImportError as e:
+        print(f'❌ Nie można załadować aplikacji {app}: {e} (pip install pactfix[server])', file=sys.stderr)
+        return 1
+    warm_up()
+    server = PreforkServer(wsgi_app, **options)
+    try:
+        server.bind()
+    except OSError as e:
+        print(f'❌ Nie można otworzyć portu {server.port}: {e}', file=sys.stderr)
+        return 1
+    return server.serve()
@@ -0,0 +1,159 @@
+"""Declarative per-line rules shared by the line-oriented analyzers.
+
+An analyzer declares its rules once at module level. Patterns are compiled
+at import time and cheap literal checks (``requires``/``excludes``) run
+before any regex, so most lines never reach the regex engine::
+
+    RULES = (
+        LineRule('SQL004', 'DROP bez IF EXISTS', field='upper',
+                 requires=('DROP ',), excludes=('IF EXISTS',),
+                 fix=lambda ctx, m: (ctx.stripped, ctx.stripped.replace('DROP ', 'DROP IF EXISTS ', 1)),
+                 fix_description='Dodano IF EXISTS'),
+    )
+
+    for ctx in iter_lines(lines):
+        fixed_lines[ctx.line_no - 1] = run_line_rules(RULES, ctx, errors, warnings, fixes)
+"""
+
+import re
+from typing import Callable, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from .analyzer import Issue, Fix
+
+# fix(ctx, match) -> (before, after) or None
+Fixer = Callable[['LineContext', object], Optional[Tuple[str, str]]]
+
+
+def literal_matcher(literals: Sequence[str]):
+    """Return None, the single literal, or a compiled alternation of ``literals``.
+
+    A single substring test is cheapest with ``in``; several literals are
+    checked in one pass by the regex engine instead of an ``any()`` loop.
+    """
+    literals = tuple(literals)
+    if not literals:
+        return None
+    if len(literals) == 1:
+        return literals[0]
+    return re.compile('|'.join(re.escape(lit) for lit in literals))
+
+
+class LineContext:
+    """The line being checked, with lazily derived views rules can match on."""
+
+    __slots__ = ('line_no', 'line', 'stripped', 'is_last', '_upper')
+
+    def __init__(self, line_no: int, line: str, is_last: bool = False):
+        self.line_no = line_no
+        self.is_last = is_last
+        self.set_line(line)
+
+    def set_line(self, line: str) -> None:
+        self.line = line
+        self.stripped = line.strip()
+        self._upper = None
+
+    @property
+    def upper(self) -> str:
+        if self._upper is None:
+            self._upper = self.stripped.upper()
+        return self._upper
+
+
+class LineRule:
+    """One check: literal prefilters, an optional regex and an optional fixer.
+
+    Args:
+        code: Issue code, e.g. ``'SQL004'``.
+        message: Issue message.
+        pattern: Regex (``str`` or compiled) searched in ``field``; None means
+            the literal checks alone decide.
+        severity: ``'error'`` or ``'warning'`` - selects the result list.
+        field: ``LineContext`` attribute to match: ``'stripped'``, ``'upper'`` or ``'line'``.
+        requires: At least one of these literals must occur in ``field``.
+        excludes: None of these literals may occur in ``field``.
+        when: Extra predicate on the context, checked before the regex.
+        fix: Returns ``(before, after)``; the line is rewritten by replacing
+            ``before`` with ``after`` (or re-indented ``after`` with ``whole_line``).
+        fix_description: ``Fix.description`` for applied fixes.
+        whole_line: Replace the whole line, keeping its indentation.
+    """
+
+    __slots__ = ('code', 'message', 'pattern', 'severity', 'field', 'requires', 'excludes',
+                 'when', 'fix', 'fix_description', 'whole_line', '_requires', '_excludes')
+
+    def __init__(self, code: str, message: str, pattern=None, *, severity: str = 'warning',
+                 field: str = 'stripped', requires: Sequence[str] = (), excludes: Sequence[str] = (),
+                 when: Optional[Callable[[LineContext], bool]] = None, fix: Optional[Fixer] = None,
+                 fix_description: str = '', whole_line: bool = False, flags: int = 0):
+        self.code = code
+        self.message = message
+        self.pattern = re.compile(pattern, flags) if isinstance(pattern, str) else pattern
+        self.severity = severity
+        self.field = field
+        self.requires = tuple(requires)
+        self.excludes = tuple(excludes)
+        self.when = when
+        self.fix = fix
+        self.fix_description = fix_description
+        self.whole_line = whole_line
+        self._requires = literal_matcher(self.requires)
+        self._excludes = literal_matcher(self.excludes)
+
+    def match(self, ctx: LineContext):
+        """Return the regex match (or True for literal-only rules) if the rule fires."""
+        field = self.field
+        text = ctx.stripped if field == 'stripped' else (ctx.upper if field == 'upper' else ctx.line)
+        requires = self._requires
+        if requires is not None:
+            if requires.__class__ is str:
+                if requires not in text:
+                    return None
+            elif requires.search(text) is None:
+                return None
+        excludes = self._excludes
+        if excludes is not None:
+            if excludes.__class__ is str:
+                if excludes in text:
+                    return None
+            elif excludes.search(text) is not None:
+                return None
+        if self.when is not None and not self.when(ctx):
+            return None
+        if self.pattern is None:
+            return True
+        return self.pattern.search(text)
+
+
+def iter_lines(lines: Sequence[str]) -> Iterator[LineContext]:
+    """Yield a ``LineContext`` (1-based line numbers) for every line."""
+    last = len(lines)
+    for i, line in enumerate(lines, 1):
+        yield LineContext(i, line, i == last)
+
+
+def run_line_rules(rules: Iterable[LineRule], ctx: LineContext, errors: List[Issue],
+                   warnings: List[Issue], fixes: List[Fix]) -> str:
+    """Apply ``rules`` in order to one line and return the (possibly fixed) line.
+
+    Fixes are applied as they fire, so later rules see the updated line.
+    """
+    for rule in rules:
+        m = rule.match(ctx)
+        if not m:
+            continue
+        issue = Issue(ctx.line_no, 1, rule.code, rule.message)
+        (errors if rule.severity == 'error' else warnings).append(issue)
+        if rule.fix is None:
+            continue
+        change = rule.fix(ctx, m)
+        if change is None:
+            continue
+        before, after = change
+        fixes.append(Fix(ctx.line_no, rule.fix_description, before, after))
+        if rule.whole_line:
+            line = ctx.line[:len(ctx.line) - len(ctx.line.lstrip())] + after
+        else:
+            line = ctx.line.replace(before, after)
+        ctx.set_line(line)
+    return ctx.line
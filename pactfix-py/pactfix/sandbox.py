@@ -8,6 +8,8 @@ from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 from datetime import datetime
 
+from .walker import walk_files
+
 
 LANGUAGE_DOCKERFILES = {
     'python': '''FROM python:3.11-slim
@@ -261,17 +263,21 @@ def detect_project_language(project_path: Path) -> Tuple[str, Dict]:
     
     allow_hidden_files = {'.gitlab-ci.yml', '.gitlab-ci.yaml'}
 
-    for item in project_path.rglob('*'):
-        if item.is_file() and '_fixtures' not in item.parts and (not any(p.startswith('.') for p in item.parts) or item.name.lower() in allow_hidden_files):
-            ext = item.suffix.lower()
-            name = item.name.lower()
-            
-            for lang, info in indicators.items():
-                if name in [f.lower() for f in info['files']]:
-                    info['weight'] += 10
-                if ext in info['extensions']:
-                    info['weight'] += 1
-                    file_counts[lang] = file_counts.get(lang, 0) + 1
+    # Classify every file with two lookups instead of scanning all indicators
+    langs_by_name: Dict[str, List[str]] = {}
+    langs_by_ext: Dict[str, List[str]] = {}
+    for lang, info in indicators.items():
+        for fname in info['files']:
+            langs_by_name.setdefault(fname.lower(), []).append(lang)
+        for ext in info['extensions']:
+            langs_by_ext.setdefault(ext, []).append(lang)
+
+    for item in walk_files(project_path, include_hidden=False, hidden_names=allow_hidden_files):
+        for lang in langs_by_name.get(item.name.lower(), ()):
+            indicators[lang]['weight'] += 10
+        for lang in langs_by_ext.get(item.suffix.lower(), ()):
+            indicators[lang]['weight'] += 1
+            file_counts[lang] = file_counts.get(lang, 0) + 1
     
     # TypeScript override - if tsconfig.json exists, prefer TS over JS
     if indicators['typescript']['weight'] > 0 and indicators['nodejs']['weight'] > 0:
@@ -0,0 +1,36 @@
+"""JSON encoding for analysis results.
+
+Uses orjson when it is installed (``pip install orjson``) and the standard
+library otherwise. Both produce UTF-8 text without ASCII escaping, matching
+``json.dumps(..., ensure_ascii=False)``.
+"""
+
+import json
+from typing import Any
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+JSON_BACKEND = 'orjson' if orjson is not None else 'json'
+
+
+def dumps(obj: Any, indent: bool = False) -> str:
+    """Encode ``obj`` as JSON; ``indent=True`` pretty-prints with two spaces."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0).decode('utf-8')
+        except TypeError:
+            pass  # e.g. non-str dict keys or integers beyond 64 bits: use the stdlib encoder
+    return json.dumps(obj, ensure_ascii=False, indent=2 if indent else None)
+
+
+def dumps_bytes(obj: Any) -> bytes:
+    """Compact JSON as UTF-8 bytes, e.g. for HTTP responses."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj)
+        except TypeError:
+            pass
+    return json.dumps(obj, ensure_ascii=False).encode('utf-8')
@@ -1,7 +1,7 @@
 """Pactfix API Server - Flask-based REST API for code analysis."""
 
 import os
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, jsonify
 from flask_cors import CORS
 
 # Load environment variables from .env file if it exists
@@ -12,6 +12,9 @@ except ImportError:
     pass  # python-dotenv not installed, use system environment only
 
 from .analyzer import analyze_code, detect_language, SUPPORTED_LANGUAGES
+from .batch import (BATCH_MAX_BYTES, BatchError, add_to_totals, analyze_batch, iter_batch, new_totals, parse_batch,
+                    read_limited)
+from .serialize import dumps_bytes
 
 app = Flask(__name__)
 CORS(app)
@@ -53,12 +56,47 @@ def analyze():
             })
         
         result = analyze_code(code, filename, language)
-        return jsonify(result.to_dict())
+        return app.response_class(dumps_bytes(result.to_dict()), mimetype='application/json')
     
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 
+@app.route('/api/analyze/batch', methods=['POST'])
+def analyze_batch_endpoint():
+    """Analyze a list of {filename, code, language} items in one request.
+
+    The body is a JSON array (or {"items": [...]}) or NDJSON
+    (Content-Type: application/x-ndjson), optionally gzip-compressed. The
+    response is {"results": [...], "totals": {...}}, or with
+    Accept: application/x-ndjson one {"type": "item"} line per item, in
+    order, followed by a {"type": "totals"} line.
+    """
+    if (request.content_length or 0) > BATCH_MAX_BYTES:
+        return jsonify({'error': f'Batch larger than {BATCH_MAX_BYTES} bytes'}), 413
+    try:
+        # Chunked uploads have no Content-Length: stop reading past the limit
+        items = parse_batch(read_limited(request.stream), request.content_type or '',
+                            request.headers.get('Content-Encoding', ''))
+    except BatchError as e:
+        return jsonify({'error': str(e)}), e.status
+
+    if 'application/x-ndjson' not in (request.headers.get('Accept') or ''):
+        try:
+            return app.response_class(dumps_bytes(analyze_batch(items)), mimetype='application/json')
+        except Exception as e:
+            return jsonify({'error': str(e)}), 500
+
+    def records():
+        totals = new_totals(len(items))
+        for index, result in enumerate(iter_batch(items)):
+            add_to_totals(totals, result)
+            yield dumps_bytes({'type': 'item', 'index': index, **result}) + b'\n'
+        yield dumps_bytes({'type': 'totals', **totals}) + b'\n'
+
+    return Response(records(), mimetype='application/x-ndjson')
+
+
 @app.route('/api/detect', methods=['POST'])
 def detect():
     """Detect language endpoint."""
@@ -0,0 +1,202 @@
+"""Single-pass project file discovery.
+
+``walk_files`` walks a directory tree once, prunes excluded and ignored
+directories before descending into them, and yields the files whose name or
+extension matches. It honours ``.gitignore`` and ``.pactfixignore`` files
+(root and nested) using the common subset of gitignore syntax: comments,
+``!`` negation, trailing ``/`` for directories, leading ``/`` anchoring,
+``*``, ``?``, ``[...]`` and ``**``.
+"""
+
+import os
+import re
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+DEFAULT_EXCLUDE_DIRS = frozenset({
+    '.git', '.pactfix', '_fixtures', 'node_modules', '__pycache__', 'venv', '.venv',
+    'vendor', 'target', 'build', 'dist', '.idea', '.vscode',
+})
+
+IGNORE_FILES = ('.gitignore', '.pactfixignore')
+
+# Files analyzed by `pactfix --path`
+PROJECT_EXTENSIONS = (
+    '.sh', '.py', '.php', '.js', '.ts', '.sql', '.tf', '.yml', '.yaml',
+    '.conf', '.go', '.rs', '.java', '.cs', '.rb', '.html', '.css',
+    '.json', '.jsonc', '.toml', '.ini', '.cfg', '.tpl', '.gotmpl',
+)
+PROJECT_FILENAMES = ('Dockerfile', 'Makefile', 'Jenkinsfile', '.gitlab-ci.yml', '.gitlab-ci.yaml')
+
+
+def _glob_to_regex(pattern: str) -> str:
+    out = []
+    i = 0
+    while i < len(pattern):
+        ch = pattern[i]
+        if pattern.startswith('**/', i):
+            out.append('(?:.*/)?')
+            i += 3
+            continue
+        if pattern.startswith('**', i):
+            out.append('.*')
+            i += 2
+            continue
+        if ch == '*':
+            out.append('[^/]*')
+        elif ch == '?':
+            out.append('[^/]')
+        elif ch == '[':
+            end = pattern.find(']', i + 1)
+            if end == -1:
+                out.append(re.escape(ch))
+            else:
+                body = pattern[i + 1:end]
+                if body.startswith('!'):
+                    body = '^' + body[1:]
+                out.append(f'[{body}]')
+                i = end
+        else:
+            out.append(re.escape(ch))
+        i += 1
+    return ''.join(out)
+
+
+class IgnoreRules:
+    """Patterns from one ignore file, relative to the directory containing it."""
+
+    def __init__(self, base: str, lines: Iterable[str]):
+        self.base = base
+        self.rules: List[Tuple['re.Pattern[str]', bool, bool, bool]] = []
+        for raw in lines:
+            line = raw.rstrip('\n').rstrip()
+            if not line or line.startswith('#'):
+                continue
+            negate = line.startswith('!')
+            if negate:
+                line = line[1:]
+            if line.startswith('\\'):
+                line = line[1:]
+            dir_only = line.endswith('/')
+            line = line.rstrip('/')
+            if not line:
+                continue
+            anchored = '/' in line
+            line = line.lstrip('/')
+            regex = re.compile(_glob_to_regex(line) + r'\Z')
+            self.rules.append((regex, negate, dir_only, anchored))
+
+    @classmethod
+    def from_dir(cls, dirpath: str, base: str) -> Optional['IgnoreRules']:
+        lines: List[str] = []
+        for name in IGNORE_FILES:
+            try:
+                with open(os.path.join(dirpath, name), 'r', encoding='utf-8', errors='ignore') as f:
+                    lines.extend(f.readlines())
+            except OSError:
+                continue
+        rules = cls(base, lines)
+        return rules if rules.rules else None
+
+    def match(self, rel_path: str, is_dir: bool) -> Optional[bool]:
+        """Return True (ignored), False (re-included) or None (no rule matched)."""
+        if self.base:
+            if not rel_path.startswith(self.base + '/'):
+                return None
+            rel_path = rel_path[len(self.base) + 1:]
+        name = rel_path.rsplit('/', 1)[-1]
+        verdict = None
+        for regex, negate, dir_only, anchored in self.rules:
+            if dir_only and not is_dir:
+                continue
+            if regex.match(rel_path if anchored else name):
+                verdict = not negate
+        return verdict
+
+
+def _is_ignored(stack: List[IgnoreRules], rel_path: str, is_dir: bool) -> bool:
+    ignored = False
+    for rules in stack:
+        verdict = rules.match(rel_path, is_dir)
+        if verdict is not None:
+            ignored = verdict
+    return ignored
+
+
+def walk_files(root, extensions: Optional[Iterable[str]] = None, names: Optional[Iterable[str]] = None,
+               exclude_dirs: Iterable[str] = DEFAULT_EXCLUDE_DIRS, include_hidden: bool = True,
+               hidden_names: Iterable[str] = (), use_ignore_files: bool = True) -> Iterator[Path]:
+    """Yield files under ``root`` in a single traversal.
+
+    Args:
+        root: Directory to walk.
+        extensions: Filename suffixes to accept (e.g. ``'.py'``); None accepts any file.
+        names: Exact filenames to accept in addition to ``extensions``.
+        exclude_dirs: Directory names that are never descended into.
+        include_hidden: Whether dot-files and dot-directories are visited.
+        hidden_names: Dot-files accepted even when ``include_hidden`` is False.
+        use_ignore_files: Honour ``.gitignore``/``.pactfixignore`` patterns.
+
+    Directories and files are visited in sorted order, so output is
+    deterministic; the generator can be cut short (e.g. with ``islice``)
+    without walking the rest of the tree.
+    """
+    root_str = os.fspath(root)
+    suffixes = tuple(extensions) if extensions is not None else None
+    wanted_names = frozenset(names or ())
+    excluded = frozenset(exclude_dirs)
+    allowed_hidden = frozenset(hidden_names)
+
+    def _accept(name: str) -> bool:
+        if suffixes is None:
+            return True
+        return name in wanted_names or name.endswith(suffixes)
+
+    def _walk(dirpath: str, rel_dir: str, stack: List[IgnoreRules]) -> Iterator[Path]:
+        if use_ignore_files:
+            rules = IgnoreRules.from_dir(dirpath, rel_dir)
+            if rules is not None:
+                stack = stack + [rules]
+        try:
+            with os.scandir(dirpath) as it:
+                entries = sorted(it, key=lambda e: e.name)
+        except OSError:
+            return
+
+        subdirs = []
+        for entry in entries:
+            name = entry.name
+            rel_path = f'{rel_dir}/{name}' if rel_dir else name
+            try:
+                is_dir = entry.is_dir(follow_symlinks=False)
+            except OSError:
+                continue
+            if is_dir:
+                if name in excluded or (not include_hidden and name.startswith('.')):
+                    continue
+                if stack and _is_ignored(stack, rel_path, True):
+                    continue
+                subdirs.append((entry.path, rel_path))
+                continue
+            if not include_hidden and name.startswith('.') and name not in allowed_hidden:
+                continue
+            if not _accept(name):
+                continue
+            try:
+                if not entry.is_file():
+                    continue
+            except OSError:
+                continue
+            if stack and _is_ignored(stack, rel_path, False):
+                continue
+            yield Path(entry.path)
+
+        for sub_path, sub_rel in subdirs:
+            yield from _walk(sub_path, sub_rel, stack)
+
+    yield from _walk(root_str, '', [])
+
+
+def find_project_files(root, exclude_dirs: Iterable[str] = DEFAULT_EXCLUDE_DIRS) -> List[Path]:
+    """Return the sorted list of files `pactfix --path` analyzes under ``root``."""
+    return sorted(walk_files(root, PROJECT_EXTENSIONS, PROJECT_FILENAMES, exclude_dirs=exclude_dirs))
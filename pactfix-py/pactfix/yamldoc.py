@@ -0,0 +1,128 @@
+"""Shared YAML front-end for the YAML-based analyzers.
+
+``load_yaml_documents`` parses the text once (with libyaml's ``CSafeLoader``
+when PyYAML was built with it), keeps the composed node of every document
+next to the constructed data, and indexes the start line of every mapping
+key and sequence item by its path::
+
+    doc = load_yaml_documents(code)[0]
+    doc.data['spec']['containers'][0]['image']
+    doc.line('spec', 'containers', 0, 'image')   # 1-based line of the key
+
+Analyzers look positions up instead of re-scanning the text, so repeated
+names (two containers called ``app``, ``name:`` keys in env lists...) can no
+longer resolve to the wrong line.
+"""
+
+from typing import Any, Dict, List, Tuple
+
+try:
+    import yaml
+except ImportError:
+    yaml = None
+
+if yaml is not None:
+    SafeLoader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+    YAMLError = yaml.YAMLError
+else:
+    SafeLoader = None
+
+    class YAMLError(Exception):
+        """Placeholder so ``except YAMLError`` works without PyYAML."""
+
+Path = Tuple[Any, ...]
+
+
+def _last_content_line(node) -> int:
+    """1-based line of the last character belonging to ``node``."""
+    while True:
+        if isinstance(node, yaml.MappingNode) and node.value:
+            node = node.value[-1][1]
+        elif isinstance(node, yaml.SequenceNode) and node.value:
+            node = node.value[-1]
+        else:
+            break
+    end = node.end_mark
+    # Block scalars end at column 0 of the line after their last line
+    if end.column == 0 and end.line > node.start_mark.line:
+        return end.line
+    return end.line + 1
+
+
+class YamlDocument:
+    """One YAML document: constructed ``data``, its root ``node`` and a path index."""
+
+    __slots__ = ('data', 'node', '_keys')
+
+    def __init__(self, data: Any, node):
+        self.data = data
+        self.node = node
+        # path -> (key node or sequence item node, value node)
+        self._keys: Dict[Path, Tuple[Any, Any]] = {}
+        self._index(node, ())
+
+    def _index(self, node, path: Path) -> None:
+        stack = [(node, path)]
+        keys = self._keys
+        while stack:
+            node, path = stack.pop()
+            if isinstance(node, yaml.MappingNode):
+                for key_node, value_node in node.value:
+                    if isinstance(key_node, yaml.ScalarNode):
+                        child = path + (key_node.value,)
+                        keys[child] = (key_node, value_node)
+                        stack.append((value_node, child))
+            elif isinstance(node, yaml.SequenceNode):
+                for i, item in enumerate(node.value):
+                    child = path + (i,)
+                    keys[child] = (item, item)
+                    stack.append((item, child))
+
+    def _entry(self, path: Path):
+        return self._keys.get(path) if path else (self.node, self.node)
+
+    def line(self, *path, default: int = 0) -> int:
+        """1-based line of the key at ``path`` (or of the item, for a sequence index)."""
+        entry = self._entry(path)
+        return entry[0].start_mark.line + 1 if entry else default
+
+    def column(self, *path, default: int = 0) -> int:
+        """0-based column of the key at ``path``, i.e. its indentation."""
+        entry = self._entry(path)
+        return entry[0].start_mark.column if entry else default
+
+    def value_line(self, *path, default: int = 0) -> int:
+        """1-based line where the value at ``path`` starts."""
+        entry = self._entry(path)
+        return entry[1].start_mark.line + 1 if entry else default
+
+    def end_line(self, *path, default: int = 0) -> int:
+        """1-based line of the last content line of the value at ``path``."""
+        entry = self._entry(path)
+        return _last_content_line(entry[1]) if entry else default
+
+    def first_key_column(self, *path, default: int = 0) -> int:
+        """Indentation of the keys of the mapping at ``path``."""
+        entry = self._entry(path)
+        if entry and isinstance(entry[1], yaml.MappingNode) and entry[1].value:
+            return entry[1].value[0][0].start_mark.column
+        return default
+
+
+def load_yaml_documents(code: str) -> List[YamlDocument]:
+    """Parse every document in ``code`` once; raises ``YAMLError`` on invalid YAML.
+
+    Yields the same documents as ``yaml.safe_load_all``: an explicitly empty
+    document (``---`` with nothing after it) has ``data`` None.
+    """
+    if yaml is None:
+        raise RuntimeError('PyYAML is not installed')
+    loader = SafeLoader(code)
+    documents = []
+    try:
+        while loader.check_node():
+            node = loader.get_node()
+            documents.append(YamlDocument(loader.construct_document(node), node))
+    finally:
+        loader.dispose()
+    return documents
@@ -47,6 +47,21 @@ class TestLanguageDetection:
         assert detect_language("pipeline { stages { stage('Build') { steps { echo 'hi' } } } }", "Jenkinsfile") == 'jenkinsfile'
 
 
+    def test_detect_matches_legacy_on_fixtures(self):
+        import importlib.util
+        from pathlib import Path
+        path = Path(__file__).resolve().parents[1] / 'benchmarks' / 'bench_detect.py'
+        spec = importlib.util.spec_from_file_location('bench_detect', path)
+        bench = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(bench)
+        samples = bench.load_fixtures()
+        assert samples
+        assert bench.mismatches(samples) == []
+
+    def test_detect_large_input_uses_leading_lines(self):
+        code = "def main():\n    pass\n" + "x = 1\n" * 100000 + "<?php echo 1; ?>\n"
+        assert detect_language(code) == 'python'
+
 class TestBashAnalysis:
     def test_cd_without_error_handling(self):
         result = analyze_bash("cd /tmp")
@@ -231,6 +246,12 @@ class TestKubernetesAnalysis:
         result = analyze_kubernetes("apiVersion: v1\nkind: Pod\nmetadata:\n  namespace: default")
         assert any(w.code == 'K8S007' for w in result.warnings)
     
+    def test_missing_namespace_is_not_default_namespace(self):
+        result = analyze_kubernetes(
+            "apiVersion: v1\nkind: Service\nmetadata:\n  name: web\nspec:\n  ports:\n  - port: 80\n"
+            "---\napiVersion: v1\nkind: ConfigMap\nmetadata:\n  name: cfg\ndata:\n  a: b\n")
+        assert not any(w.code == 'K8S007' for w in result.warnings)
+
     def test_latest_tag(self):
         result = analyze_kubernetes("apiVersion: v1\nkind: Deployment\nspec:\n  template:\n    spec:\n      containers:\n      - image: myapp:latest")
         assert any(w.code == 'K8S004' for w in result.warnings)
@@ -255,5 +276,26 @@ class TestIntegration:
         assert 'fixes' in d
 
 
+class TestSerialization:
+    def test_to_dict_matches_asdict_path(self):
+        import importlib.util
+        from pathlib import Path
+        path = Path(__file__).resolve().parents[1] / 'benchmarks' / 'bench_serialize.py'
+        spec = importlib.util.spec_from_file_location('bench_serialize', path)
+        bench = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(bench)
+        results = bench.load_results()
+        assert results
+        assert bench.mismatches(results) == []
+
+    def test_to_dict_without_code_and_to_json(self):
+        import json
+        result = analyze_code("#!/bin/bash\ncd /tmp\necho $HOME\n", "deploy.sh", use_cache=False)
+        data = result.to_dict(include_code=False)
+        assert 'originalCode' not in data and 'fixedCode' not in data
+        assert json.loads(result.to_json()) == result.to_dict()
+        assert not hasattr(result.errors[0] if result.errors else result.warnings[0], '__dict__')
+
+
 if __name__ == '__main__':
     pytest.main([__file__, '-v'])
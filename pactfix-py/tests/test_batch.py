@@ -0,0 +1,105 @@
+"""Tests for multi-file batch analysis."""
+
+import gzip
+import io
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from pactfix import batch
+from pactfix.analyzer import analyze_code
+from pactfix.batch import BatchError, analyze_batch, parse_batch, read_limited
+
+ITEMS = [
+    {'filename': 'deploy.sh', 'code': '#!/bin/bash\ncd /tmp\necho $HOME\n'},
+    {'filename': 'Dockerfile', 'code': 'FROM ubuntu:latest\nRUN apt-get update\n'},
+    {'filename': 'app.py', 'code': 'print "hi"\n', 'language': 'python'},
+    {'code': 'SELECT * FROM users;', 'language': 'sql'},
+]
+
+
+def test_json_ndjson_and_gzip_bodies_parse_the_same():
+    as_json = json.dumps(ITEMS).encode()
+    as_ndjson = b'\n'.join(json.dumps(item).encode() for item in ITEMS) + b'\n'
+    expected = parse_batch(as_json)
+    assert [item['filename'] for item in expected] == ['deploy.sh', 'Dockerfile', 'app.py', None]
+    assert parse_batch(json.dumps({'items': ITEMS}).encode()) == expected
+    assert parse_batch(as_ndjson, 'application/x-ndjson') == expected
+    assert parse_batch(gzip.compress(as_json), 'application/json', 'gzip') == expected
+    assert parse_batch(gzip.compress(as_ndjson), 'application/x-ndjson') == expected
+
+
+@pytest.mark.parametrize('body, status', [
+    (b'{"code": "x"}', 400),
+    (b'[{"filename": "a.sh"}]', 400),
+    (b'[{"code": "x", "language": 1}]', 400),
+    (b'not json', 400),
+    (b'\x1f\x8b garbage', 400),
+    (json.dumps([{'code': ''}] * 11).encode(), 413),
+    (gzip.compress(json.dumps([{'code': 'x' * 5000}]).encode()), 413),
+])
+def test_invalid_and_oversized_batches(body, status):
+    with pytest.raises(BatchError) as exc:
+        parse_batch(body, max_items=10, max_bytes=4096)
+    assert exc.value.status == status
+
+
+def test_results_match_single_analysis(monkeypatch):
+    monkeypatch.setenv('PACTFIX_BATCH_WORKERS', '1')
+    out = analyze_batch(parse_batch(json.dumps(ITEMS).encode()))
+    for i, (item, result) in enumerate(zip(ITEMS, out['results'])):
+        single = analyze_code(item['code'], item.get('filename'), item.get('language')).to_dict()
+        assert result == {**single, 'filename': item.get('filename'), 'index': i}
+    totals = out['totals']
+    assert (totals['items'], totals['analyzed'], totals['failed']) == (4, 4, 0)
+    assert totals['warnings'] == sum(len(r['warnings']) for r in out['results'])
+    assert totals['languages'] == {'bash': 1, 'dockerfile': 1, 'python': 1, 'sql': 1}
+
+
+def test_process_pool_keeps_input_order(monkeypatch):
+    monkeypatch.setenv('PACTFIX_BATCH_WORKERS', '2')
+    items = [{'filename': f'f{i}.sh', 'code': f'echo ${i}\n'} for i in range(20)]
+    try:
+        out = analyze_batch(items)
+    finally:
+        batch.shutdown_batch_pool()
+    assert [r['filename'] for r in out['results']] == [f'f{i}.sh' for i in range(20)]
+    assert out['totals']['analyzed'] == 20
+
+
+def test_pool_is_created_once_and_stale_shutdowns_are_ignored(monkeypatch):
+    monkeypatch.setenv('PACTFIX_BATCH_WORKERS', '2')
+    try:
+        with ThreadPoolExecutor(max_workers=8) as ex:
+            pools = set(map(id, ex.map(lambda _: batch._batch_pool(), range(16))))
+        assert len(pools) == 1
+        current = batch._batch_pool()
+        batch.shutdown_batch_pool(object())
+        assert batch._batch_pool() is current
+    finally:
+        batch.shutdown_batch_pool()
+
+
+def test_read_limited_stops_past_the_limit():
+    assert read_limited(io.BytesIO(b'x' * 100), max_bytes=100) == b'x' * 100
+    with pytest.raises(BatchError) as exc:
+        read_limited(io.BytesIO(b'x' * 10**6), max_bytes=100)
+    assert exc.value.status == 413
+
+
+def test_flask_endpoint_streams_ndjson():
+    pytest.importorskip('flask')
+    pytest.importorskip('flask_cors')
+    from pactfix.server import app
+
+    client = app.test_client()
+    resp = client.post('/api/analyze/batch', data=gzip.compress(json.dumps(ITEMS).encode()),
+                       headers={'Content-Encoding': 'gzip', 'Accept': 'application/x-ndjson'},
+                       content_type='application/json')
+    lines = [json.loads(line) for line in resp.data.splitlines()]
+    assert [line['type'] for line in lines] == ['item'] * 4 + ['totals']
+    assert lines[-1]['items'] == 4
+
+    resp = client.post('/api/analyze/batch', json=[{'filename': 'a.sh'}])
+    assert resp.status_code == 400
@@ -0,0 +1,118 @@
+"""Tests for the analyze_code result cache."""
+
+from pathlib import Path
+
+from pactfix.analyzer import analyze_code
+from pactfix.cache import ResultCache, ruleset_fingerprint
+
+
+def test_cache_hit_returns_equal_independent_copy():
+    cache = ResultCache(max_entries=4)
+    result = analyze_code("cd /tmp\n", "deploy.sh", use_cache=False)
+    key = cache.make_key("cd /tmp\n", result.language)
+
+    assert cache.get(key, "cd /tmp\n") is None
+    cache.put(key, result)
+
+    cached = cache.get(key, "cd /tmp\n")
+    assert cached is not None
+    assert cached.to_dict() == result.to_dict()
+
+    cached.fixed_code = "mutated"
+    cached.warnings.clear()
+    again = cache.get(key, "cd /tmp\n")
+    assert again.fixed_code == result.fixed_code
+    assert again.warnings
+
+    stats = cache.stats()
+    assert stats['hits'] == 2
+    assert stats['misses'] == 1
+
+
+def test_cache_key_depends_on_language_and_code():
+    key = ResultCache.make_key("x = 1", "python")
+    assert key != ResultCache.make_key("x = 1", "bash")
+    assert key != ResultCache.make_key("x = 2", "python")
+    assert key != ResultCache.make_key("x = 1", "python", force_language="python")
+
+
+def test_cache_lru_eviction():
+    cache = ResultCache(max_entries=2)
+    for i in range(3):
+        code = f"echo {i}\n"
+        cache.put(ResultCache.make_key(code, 'bash'), analyze_code(code, force_language='bash', use_cache=False))
+
+    assert cache.stats()['evictions'] == 1
+    assert cache.stats()['size'] == 2
+    assert cache.get(ResultCache.make_key("echo 0\n", 'bash'), "echo 0\n") is None
+
+
+def test_cache_byte_limit():
+    codes = [f"echo {i}{'x' * 100}\n" for i in range(5)]
+    results = [analyze_code(code, force_language='bash', use_cache=False) for code in codes]
+    size = len(results[0].original_code) + len(results[0].fixed_code)
+    cache = ResultCache(max_entries=100, max_bytes=size * 3)
+    for code, result in zip(codes, results):
+        cache.put(ResultCache.make_key(code, 'bash'), result)
+
+    stats = cache.stats()
+    assert (stats['size'], stats['evictions']) == (3, 2)
+    assert stats['bytes'] <= stats['max_bytes']
+    assert cache.get(ResultCache.make_key(codes[0], 'bash'), codes[0]) is None
+    assert cache.get(ResultCache.make_key(codes[4], 'bash'), codes[4]) is not None
+
+    # A result larger than the whole budget is not kept in memory
+    big = 'echo x\n' * size
+    cache.put(ResultCache.make_key(big, 'bash'), analyze_code(big, force_language='bash', use_cache=False))
+    assert cache.stats()['size'] == 3
+
+
+def test_cache_disk_tier_survives_new_instance(tmp_path):
+    code = 'print "hello"\n'
+    result = analyze_code(code, "app.py", use_cache=False)
+    key = ResultCache.make_key(code, result.language)
+
+    ResultCache(directory=str(tmp_path)).put(key, result)
+
+    fresh = ResultCache(directory=str(tmp_path))
+    cached = fresh.get(key, code)
+    assert cached is not None
+    assert cached.to_dict() == result.to_dict()
+    assert fresh.stats()['disk_hits'] == 1
+
+
+def test_analyze_code_uses_process_cache():
+    code = "SELECT * FROM cache_probe_table"
+    first = analyze_code(code, "probe.sql")
+    first.fixed_code = "mutated by caller"
+    second = analyze_code(code, "probe.sql")
+    assert second.fixed_code != "mutated by caller"
+    assert [w.code for w in second.warnings] == [w.code for w in first.warnings]
+
+
+def test_ruleset_fingerprint_covers_rule_modules(tmp_path, monkeypatch):
+    import shutil
+    import pactfix.cache as cache_module
+
+    package = tmp_path / 'pactfix'
+    shutil.copytree(Path(cache_module.__file__).parent, package,
+                    ignore=shutil.ignore_patterns('__pycache__'))
+    fake_cache = package / 'cache.py'
+
+    def fingerprint():
+        ruleset_fingerprint.cache_clear()
+        monkeypatch.setattr(cache_module, '__file__', str(fake_cache))
+        try:
+            return ruleset_fingerprint()
+        finally:
+            ruleset_fingerprint.cache_clear()
+
+    base = fingerprint()
+    for module in ('credentials.py', 'rules.py', 'k8sindex.py', 'yamldoc.py', 'lineindex.py'):
+        path = package / module
+        original = path.read_text()
+        path.write_text(original + '\n# changed\n')
+        assert fingerprint() != base, module
+        path.write_text(original)
+    (package / 'cli.py').write_text('# changed\n')
+    assert fingerprint() == base
@@ -9,6 +9,8 @@ import subprocess
 import sys
 from pathlib import Path
 
+import pytest
+
 
 def _run_cli(args, cwd, env=None):
     merged_env = os.environ.copy()
@@ -64,3 +66,67 @@ def test_cli_comment_inserts_comment_into_output_file(tmp_path):
     assert "# pactfix:" in text
     assert "Dodano obsługę błędów" in text
     assert "cd /tmp || exit 1" in text
+
+
+def _make_project(root):
+    (root / "scripts").mkdir(parents=True)
+    (root / "scripts" / "deploy.sh").write_text("cd /tmp\necho $HOME\n", encoding="utf-8")
+    (root / "app.py").write_text('print "hello"\n', encoding="utf-8")
+    (root / "db.sql").write_text("DROP TABLE users;\n", encoding="utf-8")
+    (root / "ok.py").write_text('print("ok")\n', encoding="utf-8")
+    return root
+
+
+def test_cli_path_jobs_matches_serial_run(tmp_path):
+    serial = _make_project(tmp_path / "serial")
+    parallel = _make_project(tmp_path / "parallel")
+    cwd = Path(__file__).resolve().parents[1]
+
+    proc_serial = _run_cli(["--path", str(serial), "--no-cache"], cwd=cwd)
+    proc_parallel = _run_cli(["--path", str(parallel), "--no-cache", "--jobs", "2"], cwd=cwd)
+    assert proc_serial.returncode == proc_parallel.returncode
+
+    def _body(out, root):
+        return out.replace(str(root), "<root>").replace(root.name, "<name>")
+
+    assert _body(proc_serial.stdout, serial) == _body(proc_parallel.stdout, parallel)
+    for rel in ("scripts/deploy.sh", "app.py", "db.sql", "ok.py"):
+        assert (serial / rel).read_text(encoding="utf-8") == (parallel / rel).read_text(encoding="utf-8")
+
+
+def test_cli_stream_prints_ndjson_per_document(tmp_path):
+    manifest = tmp_path / "all.yaml"
+    manifest.write_text(
+        "apiVersion: v1\nkind: Pod\nmetadata:\n  name: a\nspec:\n  containers:\n  - name: a\n    image: nginx\n"
+        "---\napiVersion: v1\nkind: Pod\nmetadata:\n  name: b\nspec:\n  containers:\n  - name: b\n    image: redis\n",
+        encoding="utf-8",
+    )
+    fixed = tmp_path / "fixed.yaml"
+
+    proc = _run_cli([str(manifest), "--stream", "-o", str(fixed)], cwd=Path(__file__).resolve().parents[1])
+    assert proc.returncode == 0
+
+    records = [json.loads(line) for line in proc.stdout.splitlines()]
+    assert [r["type"] for r in records] == ["document", "document", "totals"]
+    assert [r["context"]["firstLine"] for r in records[:2]] == [1, 9]
+    assert [w["line"] for w in records[1]["warnings"] if w["code"] == "K8S004"] == [17]
+    assert records[2]["documents"] == 2
+    assert "image: redis:7.2" in fixed.read_text(encoding="utf-8")
+
+
+def test_serve_defaults_come_from_dotenv(tmp_path, monkeypatch):
+    pytest.importorskip('dotenv')
+    from pactfix import cli, prefork
+
+    for name in ('HOST', 'PORT', 'PACTFIX_WORKERS'):
+        monkeypatch.delenv(name, raising=False)
+    (tmp_path / '.env').write_text('HOST=127.0.0.1\nPORT=8123\nPACTFIX_WORKERS=3\n')
+    monkeypatch.chdir(tmp_path)
+    calls = []
+    monkeypatch.setattr(prefork, 'serve', lambda app, **options: calls.append(options) or 0)
+    try:
+        assert cli.serve_main([]) == 0
+    finally:
+        for name in ('HOST', 'PORT', 'PACTFIX_WORKERS'):
+            os.environ.pop(name, None)
+    assert (calls[0]['host'], calls[0]['port'], calls[0]['workers']) == ('127.0.0.1', 8123, 3)
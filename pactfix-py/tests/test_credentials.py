@@ -0,0 +1,34 @@
+"""Tests for the shared credential scanner."""
+
+from pactfix.analyzer import analyze_code
+from pactfix.credentials import PROFILES, scan_credentials
+
+
+def test_scan_maps_hits_to_lines_and_rules():
+    lines = [
+        'package main',
+        'var password = "hunter2"',
+        '// nothing here',
+        'token = "abc"; apikey: "k"',
+        'x := os.Getenv("TOKEN")',
+    ]
+    hits = scan_credentials('go', lines)
+    assert sorted(hits) == [2, 4]
+    assert [h.code for h in hits[2]] == ['GO009']
+    assert [h.rule.name for h in hits[4]] == ['apikey', 'token']
+
+
+def test_scan_matches_check_line_for_every_line():
+    lines = ['  password: "x"', 'api_key: ${KEY}', 'Token: abc', '', 'credential: "y"  # note']
+    hits = scan_credentials('yaml', lines)
+    for no, line in enumerate(lines, 1):
+        assert [h.code for h in hits.get(no, [])] == [h.code for h in PROFILES['yaml'].check_line(line)]
+
+
+def test_profiles_route_to_analyzer_codes():
+    tf = analyze_code('resource "aws_db_instance" "db" {\n  password = "hunter2"\n}\n', 'main.tf')
+    assert [e.code for e in tf.errors if e.code == 'TF001'] == ['TF001']
+    assert 'var.aws_db_instance_db_password' in tf.fixed_code
+
+    docker = analyze_code('FROM alpine:3.19\nENV API_KEY=abc\nARG TOKEN=x\n', 'Dockerfile')
+    assert [e.line for e in docker.errors if e.code == 'DOCKER007'] == [2]
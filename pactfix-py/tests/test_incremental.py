@@ -0,0 +1,72 @@
+"""Tests for re-analyzing only the edited lines of a result."""
+
+import random
+from pathlib import Path
+
+import pytest
+
+from pactfix.analyzers import get_analyzer
+from pactfix.incremental import EditError, LINE_WINDOWS, apply_line_edits, reanalyze
+
+FIXTURES = Path(__file__).parent / 'fixtures'
+
+
+def _summary(result):
+    return (result.fixed_code,
+            [(i.line, i.code, i.message) for i in result.errors],
+            [(i.line, i.code, i.message) for i in result.warnings],
+            [(f.line, f.description, f.before, f.after) for f in result.fixes])
+
+
+def test_apply_line_edits():
+    lines = ['a', 'b', 'c', 'd']
+    new, mapping, ranges = apply_line_edits(lines, [
+        {'start': 2, 'end': 1, 'lines': ['x']},         # insert before b
+        {'start': 3, 'end': 3, 'lines': ['y', 'z']},    # replace c
+    ])
+    assert new == ['a', 'x', 'b', 'y', 'z', 'd']
+    assert [mapping(old) for old in range(1, 5)] == [1, 3, None, 6]
+    assert ranges == [(2, 2), (4, 5)]
+
+
+@pytest.mark.parametrize('edits', [
+    [{'start': 3, 'end': 3, 'lines': ['x']}, {'start': 2, 'end': 2, 'lines': []}],
+    [{'start': 1, 'end': 9, 'lines': []}],
+    [{'start': 1, 'end': 1, 'lines': 'x'}],
+    [{'end': 1, 'lines': []}],
+])
+def test_invalid_edits(edits):
+    with pytest.raises(EditError):
+        apply_line_edits(['a', 'b', 'c'], edits)
+
+
+def test_other_languages_are_not_spliced():
+    base = get_analyzer('nginx')('server {\n  listen 80;\n}')
+    assert 'nginx' not in LINE_WINDOWS
+    assert reanalyze(base, [{'start': 2, 'end': 2, 'lines': ['  listen 8080;']}], get_analyzer('nginx')) is None
+
+
+@pytest.mark.parametrize('language', sorted(LINE_WINDOWS))
+def test_random_edits_match_full_analysis(language):
+    pool = []
+    for path in sorted((FIXTURES / language).iterdir()):
+        pool += path.read_text(errors='replace').split('\n')
+    analyzer = get_analyzer(language)
+    rnd = random.Random(0)
+    for _ in range(100):
+        lines = [rnd.choice(pool) for _ in range(rnd.randint(1, 40))]
+        base = analyzer('\n'.join(lines))
+        base.language = language
+        edits, pos = [], 1
+        for _ in range(rnd.randint(1, 3)):
+            if pos > len(lines) + 1:
+                break
+            start = rnd.randint(pos, min(len(lines) + 1, pos + 10))
+            end = rnd.randint(start - 1, min(len(lines), start + 3))
+            edits.append({'start': start, 'end': end, 'lines': [rnd.choice(pool) for _ in range(rnd.randint(0, 3))]})
+            pos = end + 2
+
+        spliced, dirty = reanalyze(base, edits, analyzer)
+        expected = analyzer('\n'.join(apply_line_edits(lines, edits)[0]))
+        assert _summary(spliced) == _summary(expected), edits
+        assert all(a <= b for a, b in dirty)
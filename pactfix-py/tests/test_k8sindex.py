@@ -0,0 +1,158 @@
+"""Tests for the cross-object Kubernetes rules."""
+
+import pytest
+
+pytest.importorskip('yaml')
+
+from pactfix.analyzer import analyze_code  # noqa: E402
+from pactfix.analyzers.kubernetes import analyze_kubernetes  # noqa: E402
+from pactfix.k8sindex import ManifestIndex, iter_objects  # noqa: E402
+from pactfix.yamldoc import load_yaml_documents  # noqa: E402
+
+
+MANIFESTS = """\
+apiVersion: apps/v1
+kind: Deployment
+metadata:
+  name: web
+spec:
+  template:
+    metadata:
+      labels:
+        app: web
+        tier: front
+    spec:
+      containers:
+      - name: web
+        image: nginx:1.25
+        envFrom:
+        - configMapRef:
+            name: web-config
+        - secretRef:
+            name: web-secret
+            optional: true
+        env:
+        - name: DB_PASSWORD
+          valueFrom:
+            secretKeyRef:
+              name: db
+              key: password
+      volumes:
+      - name: data
+        persistentVolumeClaim:
+          claimName: web-data
+---
+apiVersion: v1
+kind: Service
+metadata:
+  name: web
+spec:
+  selector:
+    app: web
+    tier: front
+---
+apiVersion: v1
+kind: Service
+metadata:
+  name: api
+spec:
+  selector:
+    app: api
+---
+apiVersion: v1
+kind: Service
+metadata:
+  name: web-other-ns
+  namespace: other
+spec:
+  selector:
+    app: web
+---
+apiVersion: bitnami.com/v1alpha1
+kind: SealedSecret
+metadata:
+  name: db
+---
+apiVersion: autoscaling/v2
+kind: HorizontalPodAutoscaler
+metadata:
+  name: web
+spec:
+  scaleTargetRef:
+    apiVersion: apps/v1
+    kind: Deployment
+    name: web
+---
+apiVersion: autoscaling/v2
+kind: HorizontalPodAutoscaler
+metadata:
+  name: web-cpu
+spec:
+  scaleTargetRef:
+    apiVersion: apps/v1
+    kind: Deployment
+    name: web
+"""
+
+
+def _cross(result):
+    return [(w.line, w.code) for w in result.warnings if w.code in ('K8S011', 'K8S012', 'K8S013', 'K8S014', 'K8S015')]
+
+
+def test_cross_object_rules():
+    result = analyze_kubernetes(MANIFESTS, manifest_set=True)
+    assert _cross(result) == [
+        (17, 'K8S012'),  # web-config ConfigMap is missing
+        (30, 'K8S014'),  # web-data PVC is missing
+        (46, 'K8S011'),  # api selects nothing
+        (55, 'K8S011'),  # pods with app=web live in the default namespace
+        (78, 'K8S015'),  # second HPA for Deployment/web
+    ]
+    messages = {w.code: w.message for w in result.warnings}
+    assert 'web-config' in messages['K8S012']
+    assert 'Deployment/web' in messages['K8S015']
+
+
+def test_single_object_is_not_checked():
+    deployment = MANIFESTS.split('---\n')[0]
+    assert _cross(analyze_kubernetes(deployment)) == []
+
+
+def test_cross_object_rules_need_manifest_set_mode():
+    # One file of a larger bundle: its ConfigMap, PVC and Deployment live elsewhere
+    assert _cross(analyze_kubernetes(MANIFESTS)) == []
+    # The two modes are cached separately
+    assert _cross(analyze_code(MANIFESTS, force_language='kubernetes')) == []
+    assert _cross(analyze_code(MANIFESTS, force_language='kubernetes', manifest_set=True))
+    assert _cross(analyze_code(MANIFESTS, force_language='kubernetes')) == []
+
+
+def test_list_items_are_indexed():
+    code = (
+        "apiVersion: v1\n"
+        "kind: List\n"
+        "items:\n"
+        "- apiVersion: v1\n"
+        "  kind: Pod\n"
+        "  metadata:\n"
+        "    name: p\n"
+        "    labels:\n"
+        "      app: p\n"
+        "- apiVersion: v1\n"
+        "  kind: Service\n"
+        "  metadata:\n"
+        "    name: q\n"
+        "  spec:\n"
+        "    selector:\n"
+        "      app: q\n"
+    )
+    objects = list(iter_objects(load_yaml_documents(code)))
+    assert [(o.kind, o.name) for o in objects] == [('Pod', 'p'), ('Service', 'q')]
+    assert [(i.line, i.code) for i in ManifestIndex(objects).check()] == [(15, 'K8S011')]
+
+
+def test_selector_lookup_needs_every_label():
+    index = ManifestIndex(iter_objects(load_yaml_documents(MANIFESTS)))
+    assert index.selects_any('default', {'app': 'web', 'tier': 'front'})
+    assert not index.selects_any('default', {'app': 'web', 'tier': 'back'})
+    assert not index.selects_any('other', {'app': 'web'})
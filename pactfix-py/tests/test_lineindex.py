@@ -0,0 +1,55 @@
+"""Tests for the shared line/offset index."""
+
+import random
+
+from pactfix.analyzer import Fix, Issue, analyze_code
+from pactfix.lineindex import LineIndex, shift_fix, shift_issue
+
+
+def _slow_line_col(text, pos):
+    prefix = text[:pos]
+    return prefix.count('\n') + 1, len(prefix.rsplit('\n', 1)[-1]) + 1
+
+
+def test_line_col_matches_slicing():
+    rnd = random.Random(0)
+    text = ''.join(rnd.choice('ab\n') for _ in range(2000))
+    index = LineIndex(text)
+    assert len(index) == text.count('\n') + 1
+    for pos in range(len(text) + 1):
+        line, col = index.line_col(pos)
+        assert (line, col) == _slow_line_col(text, pos)
+        assert index.offset(line, col) == pos
+        assert index.line_of(pos) == line
+
+
+def test_line_spans():
+    index = LineIndex("first\n\nthird\n")
+    assert [index.line(n) for n in range(1, len(index) + 1)] == ["first", "", "third", ""]
+    assert index.line_span(3) == (7, 12)
+    assert index.line_col(-1) == (1, 1)
+
+
+def test_shift_nested_positions():
+    issue = shift_issue(Issue(2, 5, 'X1', 'msg', 'error'), 10, 'outer')
+    assert (issue.line, issue.column, issue.message, issue.severity) == (11, 5, 'outer', 'error')
+    fix = shift_fix(Fix(3, 'd', 'a', 'b', edits=[{'startLine': 3, 'endLine': 2, 'replacement': 'x'}]), 10)
+    assert fix.line == 12 and fix.edits == [{'startLine': 12, 'endLine': 11, 'replacement': 'x'}]
+
+
+def test_markpact_maps_block_after_blank_lines():
+    code = "# Demo\n\n```bash markpact:run path=run.sh\n\n\necho $HOME\n```\n"
+    result = analyze_code(code, force_language='markpact', use_cache=False)
+    lines = code.split('\n')
+    for issue in result.warnings:
+        if issue.code == 'BASH001':
+            assert lines[issue.line - 1] == 'echo $HOME'
+            break
+    else:
+        raise AssertionError('BASH001 not reported')
+
+
+def test_json_error_position():
+    result = analyze_code('{"a": 1,\n "b": }', force_language='json', use_cache=False)
+    error = next(e for e in result.errors if e.code == 'JSON001')
+    assert (error.line, error.column) == (2, 7)
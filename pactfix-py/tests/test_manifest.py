@@ -0,0 +1,69 @@
+"""Tests for incremental `--changed-only` scans."""
+
+import io
+import json
+
+from pactfix.cache import configure_cache
+from pactfix.cli import process_project
+from pactfix.sandbox import Sandbox
+from pactfix.manifest import FileManifest, read_path_list
+
+
+def _make_project(root):
+    (root / "scripts").mkdir(parents=True)
+    (root / "scripts" / "deploy.sh").write_text("cd /tmp\necho $HOME\n", encoding="utf-8")
+    (root / "app.py").write_text('print "hello"\n', encoding="utf-8")
+    (root / "ok.py").write_text('print("ok")\n', encoding="utf-8")
+    return root
+
+
+def _report(root):
+    return json.loads((root / ".pactfix" / "report.json").read_text(encoding="utf-8"))
+
+
+def test_changed_only_reuses_manifest_and_keeps_full_totals(tmp_path, capsys, monkeypatch):
+    monkeypatch.setattr(Sandbox, "build", lambda self: (False, "docker disabled in tests"))
+    configure_cache(enabled=False)
+    try:
+        root = _make_project(tmp_path / "proj")
+        process_project(str(root), sandbox=True, changed_only=True)
+        first = _report(root)
+        capsys.readouterr()
+
+        process_project(str(root), sandbox=True, changed_only=True)
+        out = capsys.readouterr().out
+        assert "Unchanged since last scan: 3, analyzing 0" in out
+        second = _report(root)
+        for key in ("total_files", "total_errors", "total_warnings", "total_fixes", "files"):
+            assert second[key] == first[key]
+        assert (root / ".pactfix" / "fixed" / "app.py").exists()
+
+        (root / "ok.py").write_text('print "changed"\n', encoding="utf-8")
+        process_project(str(root), sandbox=True, changed_only=True)
+        out = capsys.readouterr().out
+        assert "Unchanged since last scan: 2, analyzing 1" in out
+        assert _report(root)["total_files"] == 3
+        assert _report(root)["total_fixes"] > first["total_fixes"]
+    finally:
+        configure_cache()
+
+
+def test_manifest_detects_content_change_with_same_size(tmp_path):
+    target = tmp_path / "a.sh"
+    target.write_text("echo 1\n", encoding="utf-8")
+    manifest = FileManifest(tmp_path / "manifest.json")
+    manifest.record("a.sh", target, {"errors": 0})
+    manifest.save()
+
+    loaded = FileManifest.load(tmp_path / "manifest.json")
+    assert loaded.cached_summary("a.sh", target) == {"errors": 0}
+
+    target.write_text("echo 2\n", encoding="utf-8")
+    assert loaded.cached_summary("a.sh", target) is None
+
+
+def test_read_path_list_resolves_against_project_root(tmp_path):
+    (tmp_path / "src").mkdir()
+    (tmp_path / "src" / "a.py").write_text("", encoding="utf-8")
+    paths = read_path_list(io.StringIO("src/a.py\n\n"), tmp_path)
+    assert paths == {(tmp_path / "src" / "a.py").resolve()}
@@ -0,0 +1,83 @@
+"""Tests for block caching and parallel block analysis in the markdown analyzer."""
+
+from pactfix.analyzers import markdown
+
+
+DOC = """# Setup
+
+```bash
+cd /tmp
+echo $HOME
+```
+
+```python
+print "hello"
+```
+
+```
+cd /var/log
+```
+"""
+
+
+def _summary(result):
+    return (result.fixed_code, [(e.line, e.code) for e in result.errors],
+            [(w.line, w.code) for w in result.warnings], [f.line for f in result.fixes],
+            result.context['blocks'])
+
+
+def test_unchanged_blocks_come_from_cache():
+    markdown._block_cache.clear()
+    first = markdown.analyze_markdown(DOC)
+    assert markdown._block_cache.stats()['misses'] == 3
+
+    edited = DOC.replace('echo $HOME', 'echo $HOME\necho $USER')
+    second = markdown.analyze_markdown(edited)
+    stats = markdown._block_cache.stats()
+    assert (stats['hits'], stats['misses']) == (2, 4)
+
+    markdown._block_cache.clear()
+    assert _summary(second) == _summary(markdown.analyze_markdown(edited))
+    # Lines after the edited block moved down by one
+    assert [w.line for w in second.warnings if w.line > 6] == [w.line + 1 for w in first.warnings if w.line > 6]
+
+
+def test_forced_language_is_part_of_the_key():
+    markdown._block_cache.clear()
+    markdown.analyze_markdown("```bash\ncd /tmp\n```\n")
+    markdown.analyze_markdown("```python\ncd /tmp\n```\n")
+    assert markdown._block_cache.stats()['misses'] == 2
+
+
+def test_pool_matches_in_process(monkeypatch):
+    doc = DOC * 4
+    monkeypatch.setenv('PACTFIX_MARKDOWN_WORKERS', '1')
+    markdown._block_cache.clear()
+    expected = markdown.analyze_markdown(doc)
+
+    monkeypatch.setenv('PACTFIX_MARKDOWN_WORKERS', '2')
+    monkeypatch.setattr(markdown, 'PARALLEL_MIN_BLOCKS', 2)
+    markdown._block_cache.clear()
+    try:
+        assert markdown._block_pool() is not None
+        assert _summary(markdown.analyze_markdown(doc)) == _summary(expected)
+    finally:
+        markdown.shutdown_block_pool()
+
+
+def test_pool_is_opt_in_and_shared(monkeypatch):
+    from concurrent.futures import ThreadPoolExecutor
+
+    monkeypatch.delenv('PACTFIX_MARKDOWN_WORKERS', raising=False)
+    assert markdown._block_pool() is None
+
+    monkeypatch.setenv('PACTFIX_MARKDOWN_WORKERS', '2')
+    try:
+        with ThreadPoolExecutor(max_workers=8) as ex:
+            pools = set(map(id, ex.map(lambda _: markdown._block_pool(), range(16))))
+        assert len(pools) == 1
+        current = markdown._block_pool()
+        markdown.shutdown_block_pool(object())  # a stale pool leaves the current one alone
+        assert markdown._block_pool() is current
+    finally:
+        markdown.shutdown_block_pool()
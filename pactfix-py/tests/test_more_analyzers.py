@@ -20,6 +20,15 @@ services:
         )
         assert any(e.code == 'COMPOSE002' for e in result.errors)
 
+    def test_privileged_in_flow_mapping_keeps_the_service(self):
+        code = "services:\n  web: {image: nginx:1.25, privileged: true}\n  db:\n    image: postgres:16\n    privileged: true\n"
+        result = analyze_docker_compose(code)
+        assert [e.line for e in result.errors if e.code == 'COMPOSE002'] == [2, 5]
+        fixed = result.fixed_code.split('\n')
+        assert fixed[1] == '  web: {image: nginx:1.25, privileged: true}'
+        assert fixed[4] == ''
+        assert [f.line for f in result.fixes if f.description == 'Usunięto privileged: true'] == [5]
+
     def test_detect_hardcoded_secret(self):
         result = analyze_docker_compose(
             """services:
@@ -0,0 +1,103 @@
+"""Tests for the pre-forking server behind ``pactfix serve``."""
+
+import os
+import signal
+import subprocess
+import sys
+import textwrap
+import threading
+import time
+import urllib.request
+from pathlib import Path
+
+import pytest
+
+if not hasattr(os, 'fork'):
+    pytest.skip('pre-forking needs os.fork', allow_module_level=True)
+
+ROOT = Path(__file__).resolve().parents[1]
+
+SERVER = textwrap.dedent('''
+    import os, sys, time
+    from pactfix import batch
+    from pactfix.prefork import PreforkServer
+
+    def app(environ, start_response):
+        if environ['PATH_INFO'] == '/slow':
+            time.sleep(1)
+        body = str(os.getpid())
+        if environ['PATH_INFO'] == '/batch':
+            batch.analyze_batch([{'code': 'echo $A'}, {'code': 'echo $B'}])
+            body = ' '.join([body] + [str(pid) for pid in batch._pool._processes])
+        start_response('200 OK', [('Content-Type', 'text/plain')])
+        return [body.encode()]
+
+    server = PreforkServer(app, host='127.0.0.1', port=0, workers=2, max_requests=3,
+                           max_requests_jitter=0, graceful_timeout=5)
+    server.bind()
+    print(server.port, flush=True)
+    sys.exit(server.serve())
+''')
+
+
+@pytest.fixture
+def server():
+    env = {**os.environ, 'PACTFIX_BATCH_WORKERS': '2'}
+    proc = subprocess.Popen([sys.executable, '-c', SERVER], cwd=ROOT, stdout=subprocess.PIPE,
+                            stderr=subprocess.DEVNULL, text=True, env=env)
+    port = int(proc.stdout.readline())
+    yield proc, f'http://127.0.0.1:{port}'
+    if proc.poll() is None:
+        proc.kill()
+        proc.wait()
+
+
+def _get(url):
+    with urllib.request.urlopen(url, timeout=10) as resp:
+        return resp.status, int(resp.read().split()[0])
+
+
+def _alive(pid):
+    try:
+        with open(f'/proc/{pid}/stat') as f:
+            return f.read().rsplit(')', 1)[1].split()[0] != 'Z'
+    except FileNotFoundError:
+        return False
+
+
+def test_workers_are_recycled_after_max_requests(server):
+    proc, url = server
+    pids = [_get(url + '/')[1] for _ in range(12)]
+    assert proc.pid not in pids
+    # two workers serve at most 3 requests each before being replaced
+    assert len(set(pids)) >= 4
+    assert all(pids.count(pid) <= 3 for pid in set(pids))
+
+
+def test_sigterm_finishes_requests_in_flight(server):
+    proc, url = server
+    _get(url + '/')  # workers are up
+    responses = []
+    thread = threading.Thread(target=lambda: responses.append(_get(url + '/slow')))
+    thread.start()
+    time.sleep(0.3)
+    proc.send_signal(signal.SIGTERM)
+    thread.join(10)
+    assert responses and responses[0][0] == 200
+    assert proc.wait(10) == 0
+
+
+@pytest.mark.skipif(not os.path.isdir('/proc/self'), reason='needs /proc')
+def test_recycled_workers_stop_their_pools(server):
+    proc, url = server
+    with urllib.request.urlopen(url + '/batch', timeout=30) as resp:
+        worker, *pool = map(int, resp.read().split())
+    assert pool and all(_alive(pid) for pid in pool)
+    # max_requests=3: keep the other worker busy too until this one is replaced
+    for _ in range(8):
+        _get(url + '/')
+    deadline = time.monotonic() + 10
+    while (_alive(worker) or any(map(_alive, pool))) and time.monotonic() < deadline:
+        time.sleep(0.1)
+    assert not _alive(worker)
+    assert not any(map(_alive, pool))
@@ -0,0 +1,44 @@
+"""Tests for the lazy analyzer registry."""
+
+import importlib.util
+from pathlib import Path
+
+from pactfix import analyzers
+from pactfix.analyzer import SUPPORTED_LANGUAGES, analyze_code
+
+
+def _load_bench():
+    path = Path(__file__).resolve().parents[1] / 'benchmarks' / 'bench_startup.py'
+    spec = importlib.util.spec_from_file_location('bench_startup', path)
+    bench = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(bench)
+    return bench
+
+
+def test_every_supported_language_has_an_analyzer():
+    assert set(analyzers.LANGUAGE_ANALYZERS) == set(SUPPORTED_LANGUAGES)
+    for name in analyzers.ANALYZER_MODULES:
+        assert callable(getattr(analyzers, name))
+
+
+def test_legacy_imports_still_work():
+    from pactfix.analyzer import analyze_bash, analyze_javascript
+    from pactfix.analyzers import analyze_kubernetes
+
+    assert analyze_bash("echo $x").language == 'bash'
+    assert analyze_javascript("var x = 1;", True).language == 'nodejs'
+    assert analyze_kubernetes("apiVersion: v1\nkind: Pod\n").language == 'kubernetes'
+
+
+def test_javascript_and_nodejs_dispatch():
+    assert analyze_code("var x = 1;", force_language='nodejs', use_cache=False).language == 'nodejs'
+    assert analyze_code("var x = 1;", force_language='javascript', use_cache=False).language == 'javascript'
+
+
+def test_single_bash_file_imports_only_bash_analyzer(tmp_path):
+    bench = _load_bench()
+    script = tmp_path / 'deploy.sh'
+    script.write_text('#!/bin/bash\necho $HOME\n', encoding='utf-8')
+
+    _, modules = bench.imported_modules([str(script)])
+    assert bench.check_single_bash_file(modules) == []
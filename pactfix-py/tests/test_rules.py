@@ -0,0 +1,41 @@
+"""Tests for the shared per-line rule engine."""
+
+from pactfix.rules import LineContext, LineRule, literal_matcher, run_line_rules
+
+
+def _run(rules, line, is_last=False):
+    errors, warnings, fixes = [], [], []
+    fixed = run_line_rules(rules, LineContext(1, line, is_last), errors, warnings, fixes)
+    return fixed, errors, warnings, fixes
+
+
+def test_literal_prefilters_gate_the_pattern():
+    rule = LineRule('T001', 'msg', r'^DROP\s+', field='upper', requires=('DROP',), excludes=('IF EXISTS',))
+    assert _run([rule], 'drop table x;')[2][0].code == 'T001'
+    assert _run([rule], 'DROP TABLE IF EXISTS x;')[2] == []
+    assert _run([rule], 'SELECT 1;')[2] == []
+
+
+def test_severity_selects_result_list_and_when_predicate():
+    rule = LineRule('T002', 'msg', severity='error', requires=('UPDATE',), when=lambda ctx: ctx.is_last)
+    assert _run([rule], 'UPDATE t SET a = 1')[1] == []
+    _, errors, warnings, _ = _run([rule], 'UPDATE t SET a = 1', is_last=True)
+    assert [e.code for e in errors] == ['T002'] and warnings == []
+
+
+def test_fixes_are_chained_and_whole_line_keeps_indent():
+    first = LineRule('T003', 'a', requires=('on',), fix=lambda ctx, m: (ctx.stripped, ctx.stripped.replace('on', 'off')),
+                     fix_description='first')
+    second = LineRule('T004', 'b', requires=('off',), fix=lambda ctx, m: (ctx.stripped, 'reset;'),
+                      fix_description='second', whole_line=True)
+    fixed, _, warnings, fixes = _run([first, second], '    autoindex on;  ')
+    assert fixed == '    reset;'
+    assert [w.code for w in warnings] == ['T003', 'T004']
+    assert [(f.before, f.after) for f in fixes] == [('autoindex on;', 'autoindex off;'), ('autoindex off;', 'reset;')]
+
+
+def test_literal_matcher_shapes():
+    assert literal_matcher(()) is None
+    assert literal_matcher(('a',)) == 'a'
+    assert literal_matcher(('a.', 'b')).search('xb') is not None
+    assert literal_matcher(('a.', 'b')).search('ax') is None
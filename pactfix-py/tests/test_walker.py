@@ -0,0 +1,74 @@
+"""Tests for single-pass project file discovery."""
+
+from pactfix.sandbox import detect_project_language
+from pactfix.walker import find_project_files, walk_files
+
+
+def _touch(path, text=""):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding="utf-8")
+
+
+def _rel(root, paths):
+    return [p.relative_to(root).as_posix() for p in paths]
+
+
+def test_find_project_files_prunes_excluded_dirs(tmp_path):
+    _touch(tmp_path / "app.py")
+    _touch(tmp_path / "Dockerfile")
+    _touch(tmp_path / ".gitlab-ci.yml")
+    _touch(tmp_path / "notes.txt")
+    _touch(tmp_path / "node_modules" / "lib" / "index.js")
+    _touch(tmp_path / "venv" / "lib" / "site.py")
+    _touch(tmp_path / "src" / "_fixtures" / "faulty" / "main.py")
+    _touch(tmp_path / "src" / "main.go")
+
+    assert _rel(tmp_path, find_project_files(tmp_path)) == [
+        ".gitlab-ci.yml", "Dockerfile", "app.py", "src/main.go",
+    ]
+
+
+def test_excluded_name_in_parent_of_root_is_not_pruned(tmp_path):
+    root = tmp_path / "build" / "project"
+    _touch(root / "deploy.sh")
+    assert _rel(root, find_project_files(root)) == ["deploy.sh"]
+
+
+def test_walk_honours_gitignore_and_pactfixignore(tmp_path):
+    _touch(tmp_path / ".gitignore", "# generated\n*.log\n/out/\ndocs/**/*.md\n!keep.log\n")
+    _touch(tmp_path / ".pactfixignore", "legacy/\n")
+    _touch(tmp_path / "a.log")
+    _touch(tmp_path / "keep.log")
+    _touch(tmp_path / "out" / "x.py")
+    _touch(tmp_path / "src" / "out" / "y.py")
+    _touch(tmp_path / "docs" / "guide" / "intro.md")
+    _touch(tmp_path / "README.md")
+    _touch(tmp_path / "legacy" / "old.sh")
+    _touch(tmp_path / "pkg" / ".gitignore", "secret.py\n")
+    _touch(tmp_path / "pkg" / "secret.py")
+    _touch(tmp_path / "pkg" / "public.py")
+
+    files = _rel(tmp_path, walk_files(tmp_path, include_hidden=False))
+    assert files == ["README.md", "keep.log", "pkg/public.py", "src/out/y.py"]
+
+
+def test_walk_hidden_files_opt_in(tmp_path):
+    _touch(tmp_path / ".hidden" / "a.sh")
+    _touch(tmp_path / ".env")
+    _touch(tmp_path / "b.sh")
+
+    assert _rel(tmp_path, walk_files(tmp_path, include_hidden=False)) == ["b.sh"]
+    assert _rel(tmp_path, walk_files(tmp_path, include_hidden=True, exclude_dirs=())) == [
+        ".env", "b.sh", ".hidden/a.sh",
+    ]
+
+
+def test_detect_project_language_ignores_node_modules(tmp_path):
+    _touch(tmp_path / "requirements.txt")
+    _touch(tmp_path / "main.py")
+    for i in range(30):
+        _touch(tmp_path / "node_modules" / f"m{i}" / "index.js")
+
+    language, stats = detect_project_language(tmp_path)
+    assert language == "python"
+    assert "nodejs" not in stats["file_counts"]
@@ -0,0 +1,114 @@
+"""Tests for the shared YAML front-end and the analyzers built on it."""
+
+import pytest
+
+yaml = pytest.importorskip('yaml')
+
+from pactfix.analyzers.docker_compose import analyze_docker_compose  # noqa: E402
+from pactfix.analyzers.kubernetes import analyze_kubernetes  # noqa: E402
+from pactfix.yamldoc import load_yaml_documents  # noqa: E402
+
+
+TWO_APPS = """\
+apiVersion: apps/v1
+kind: Deployment
+metadata:
+  name: first
+spec:
+  template:
+    spec:
+      containers:
+      - name: app
+        image: nginx:1.25
+        env:
+        - name: app
+          value: x
+---
+apiVersion: v1
+kind: Pod
+metadata:
+  name: second
+spec:
+  containers:
+  - name: app
+    image: redis:latest
+"""
+
+
+def test_paths_resolve_to_key_lines():
+    docs = load_yaml_documents(TWO_APPS)
+    assert [d.data['metadata']['name'] for d in docs] == ['first', 'second']
+    first, second = docs
+    assert first.line('spec', 'template', 'spec', 'containers', 0) == 9
+    assert first.line('spec', 'template', 'spec', 'containers', 0, 'env', 0, 'name') == 12
+    assert first.end_line('spec', 'template', 'spec', 'containers', 0) == 13
+    assert first.first_key_column('spec', 'template', 'spec', 'containers', 0) == 8
+    # Lines are global to the text, not relative to the document
+    assert second.line('spec', 'containers', 0, 'image') == 22
+    assert second.line('missing', default=-1) == -1
+
+
+def test_documents_match_safe_load_all():
+    assert load_yaml_documents('') == []
+    assert [d.data for d in load_yaml_documents('---\n---\na: 1\n')] == [None, {'a': 1}]
+
+
+def test_invalid_yaml_raises():
+    with pytest.raises(yaml.YAMLError):
+        load_yaml_documents('a: [1, 2\n')
+
+
+def test_kubernetes_repeated_names_use_own_lines():
+    result = analyze_kubernetes(TWO_APPS)
+    by_code = {}
+    for issue in result.errors + result.warnings:
+        by_code.setdefault(issue.code, []).append(issue.line)
+    # Resource/probe warnings belong to each container's own "- name: app" line
+    assert by_code['K8S008'] == [9, 21]
+    assert by_code['K8S004'] == [22]
+
+
+def test_kubernetes_inserts_stay_inside_container():
+    result = analyze_kubernetes(TWO_APPS)
+    fixed = list(yaml.safe_load_all(result.fixed_code))
+    container = fixed[0]['spec']['template']['spec']['containers'][0]
+    assert 'resources' in container and 'livenessProbe' in container
+    assert container['env'] == [{'name': 'app', 'value': 'x'}]
+    assert 'securityContext' in fixed[1]['spec']
+
+
+def test_docker_compose_points_at_each_volume():
+    code = (
+        "services:\n"
+        "  a:\n"
+        "    image: nginx:1.25\n"
+        "    volumes:\n"
+        "      - ./data:/data\n"
+        "      - /var/run/docker.sock:/var/run/docker.sock\n"
+        "  b:\n"
+        "    image: nginx:1.25\n"
+        "    volumes:\n"
+        "      - /var/run/docker.sock:/var/run/docker.sock:ro\n"
+    )
+    result = analyze_docker_compose(code)
+    assert [e.line for e in result.errors if e.code == 'COMPOSE004'] == [6, 10]
+
+
+def test_stream_matches_whole_analysis():
+    from pactfix.analyzers.kubernetes import analyze_kubernetes_stream, split_yaml_documents
+
+    code = "# rendered\n" + TWO_APPS + "...\n---\n---\napiVersion: v1\nkind: Pod\nspec:\n  containers:\n  - image: nginx\n"
+    chunks = list(split_yaml_documents(code.splitlines(keepends=True)))
+    assert ''.join(text for _, text in chunks) == code
+    assert [first for first, _ in chunks] == [1, 15, 25, 26]
+
+    whole = analyze_kubernetes(code)
+    results = list(analyze_kubernetes_stream(code.splitlines(keepends=True)))
+
+    def keys(issues):
+        return sorted((i.code, i.line) for i in issues)
+
+    assert keys(whole.errors + whole.warnings) == keys(i for r in results for i in r.errors + r.warnings)
+    assert sorted(f.line for f in whole.fixes) == sorted(f.line for r in results for f in r.fixes)
+    assert ''.join(r.fixed_code for r in results) == whole.fixed_code + '\n'
+    assert [(r.context['firstLine'], r.context['lastLine']) for r in results] == [(1, 14), (15, 24), (25, 25), (26, 31)]
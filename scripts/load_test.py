@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""Load test for the live debug backend (server.py).
+
+Simulates N concurrent editors posting to /api/analyze and reports latency
+percentiles plus 503 (busy) / 504 (timed out) counts. With ``--typing K``
+every request becomes a burst of K overlapping keystroke analyses tagged with
+the editor's session/seq, of which only the last one is shown; latencies are
+then those of the shown results and dropped requests count as superseded.
+
+    python scripts/load_test.py                      # starts server.py on a free port
+    python scripts/load_test.py --url http://localhost:8080 --clients 50 --requests 20
+    python scripts/load_test.py --typing 5 [--no-session]
+"""
+
+import argparse
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from urllib.error import HTTPError, URLError
+from urllib.request import Request, urlopen
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+
+SAMPLES = [
+    ('deploy.sh', '#!/bin/bash\nOUTPUT=/tmp/out-\nfor HOST in a b; do\n    echo $OUTPUT/$HOST\n    cd $HOST\ndone\nread name\n'),
+    ('app.py', 'import os\nprint "hello"\ndef f(x=[]):\n    try:\n        return eval(x)\n    except:\n        pass\n'),
+    ('schema.sql', 'CREATE TABLE users (id INT);\nSELECT * FROM users;\nDELETE FROM users;\nDROP TABLE orders;\n'),
+    ('Dockerfile', 'FROM python:latest\nRUN apt-get update\nRUN apt-get install -y curl\nENV PASSWORD=secret\nADD . /app\n'),
+]
+
+
+def _pick_free_port() -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+        s.bind(('127.0.0.1', 0))
+        return int(s.getsockname()[1])
+
+
+def _wait_ready(url: str, timeout_s: float = 15.0) -> None:
+    deadline = time.time() + timeout_s
+    while time.time() < deadline:
+        try:
+            with urlopen(f'{url}/api/health', timeout=2.0):
+                return
+        except (URLError, OSError):
+            time.sleep(0.2)
+    raise SystemExit(f'Server at {url} did not become ready')
+
+
+def _start_server(env_overrides: dict) -> tuple:
+    port = _pick_free_port()
+    env = os.environ.copy()
+    env.update(env_overrides)
+    env['PORT'] = str(port)
+    env['APP_DIR'] = str(REPO_ROOT / 'app')
+    proc = subprocess.Popen(
+        [sys.executable, str(REPO_ROOT / 'server.py')],
+        cwd=str(REPO_ROOT), env=env,
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    url = f'http://127.0.0.1:{port}'
+    _wait_ready(url)
+    return proc, url
+
+
+def _one_request(url: str, i: int, timeout: float, session: str | None = None, seq: int = 0) -> tuple:
+    filename, code = SAMPLES[i % len(SAMPLES)]
+    # Vary the payload so result caches do not hide analysis cost
+    payload = {'code': f'{code}\n# edit {i}\n', 'filename': filename}
+    if session is not None:
+        payload.update(session=session, seq=seq)
+    body = json.dumps(payload).encode('utf-8')
+    req = Request(f'{url}/api/analyze', method='POST', data=body,
+                  headers={'Content-Type': 'application/json'})
+    start = time.perf_counter()
+    try:
+        with urlopen(req, timeout=timeout) as resp:
+            resp.read()
+            status = resp.status
+    except HTTPError as e:
+        status = e.code
+    except (URLError, OSError):
+        status = 0
+    return status, time.perf_counter() - start
+
+
+def _editor(url: str, editor_id: int, requests: int, timeout: float) -> list:
+    return [_one_request(url, editor_id * requests + n, timeout) for n in range(requests)]
+
+
+def _typing_editor(url: str, editor_id: int, requests: int, timeout: float,
+                   burst: int, use_session: bool) -> tuple:
+    """Bursts of ``burst`` requests 20 ms apart; returns (shown samples, superseded count)."""
+    session = f'load-{os.getpid()}-{editor_id}' if use_session else None
+    shown, superseded = [], 0
+    seq = 0
+    with ThreadPoolExecutor(max_workers=burst) as pool:
+        for n in range(requests):
+            futures = []
+            for k in range(burst):
+                seq += 1
+                i = (editor_id * requests + n) * burst + k
+                futures.append(pool.submit(_one_request, url, i, timeout, session, seq))
+                time.sleep(0.02)
+            results = [f.result() for f in futures]
+            shown.append(results[-1])
+            superseded += sum(1 for status, _ in results[:-1] if status == 409)
+    return shown, superseded
+
+
+def _percentile(values: list, pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    idx = min(len(ordered) - 1, max(0, int(round(pct / 100.0 * len(ordered))) - 1))
+    return ordered[idx]
+
+
+def run(url: str, clients: int, requests: int, timeout: float,
+        typing: int = 1, use_session: bool = True) -> dict:
+    start = time.perf_counter()
+    superseded = 0
+    with ThreadPoolExecutor(max_workers=clients) as pool:
+        if typing > 1:
+            futures = [pool.submit(_typing_editor, url, c, requests, timeout, typing, use_session)
+                       for c in range(clients)]
+            samples = []
+            for f in futures:
+                shown, dropped = f.result()
+                samples += shown
+                superseded += dropped
+        else:
+            futures = [pool.submit(_editor, url, c, requests, timeout) for c in range(clients)]
+            samples = [s for f in futures for s in f.result()]
+    elapsed = time.perf_counter() - start
+
+    ok = [lat for status, lat in samples if status == 200]
+    return {
+        'clients': clients,
+        'requests': len(samples),
+        'ok': len(ok),
+        'busy503': sum(1 for status, _ in samples if status == 503),
+        'timeout504': sum(1 for status, _ in samples if status == 504),
+        'superseded409': superseded,
+        'failed': sum(1 for status, _ in samples if status not in (200, 503, 504)),
+        'p50Ms': round(_percentile(ok, 50) * 1000, 1),
+        'p99Ms': round(_percentile(ok, 99) * 1000, 1),
+        'meanMs': round(statistics.fmean(ok) * 1000, 1) if ok else 0.0,
+        'throughputRps': round(len(samples) / elapsed, 1) if elapsed else 0.0,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='Concurrent /api/analyze load test')
+    parser.add_argument('--url', help='Target server (default: start server.py on a free port)')
+    parser.add_argument('--clients', type=int, default=50, help='Concurrent editors (default: 50)')
+    parser.add_argument('--requests', type=int, default=20, help='Requests per editor (default: 20)')
+    parser.add_argument('--timeout', type=float, default=30.0, help='Client timeout in seconds')
+    parser.add_argument('--max-in-flight', type=int, help='MAX_IN_FLIGHT for the started server')
+    parser.add_argument('--typing', type=int, default=1,
+                        help='Overlapping keystroke requests per shown result (default: 1)')
+    parser.add_argument('--no-session', action='store_true',
+                        help='With --typing, send no session/seq (every request is analyzed)')
+    args = parser.parse_args()
+
+    proc = None
+    url = args.url
+    if not url:
+        overrides = {}
+        if args.max_in_flight:
+            overrides['MAX_IN_FLIGHT'] = str(args.max_in_flight)
+        proc, url = _start_server(overrides)
+    try:
+        stats = run(url.rstrip('/'), args.clients, args.requests, args.timeout,
+                    typing=args.typing, use_session=not args.no_session)
+    finally:
+        if proc is not None:
+            proc.terminate()
+            proc.wait(timeout=5)
+
+    print(json.dumps(stats, indent=2))
+    return 0 if stats['failed'] == 0 else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -4,6 +4,8 @@ Pactown Live Debug - Backend Server
 Real-time Bash script analysis and auto-fix using ShellCheck
 """
 
+import gzip
+import http.client
 import json
 import hashlib
 import subprocess
@@ -11,13 +13,15 @@ import re
 import os
 import time
 import sys
-import urllib.request
-import urllib.error
-from http.server import HTTPServer, SimpleHTTPRequestHandler
+import shutil
+from collections import OrderedDict
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
 from urllib.parse import urlparse
 import logging
 import threading
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from bisect import bisect_left
+from concurrent.futures import CancelledError, FIRST_COMPLETED, ThreadPoolExecutor, TimeoutError as FutureTimeoutError, wait
+from itertools import islice
 from pathlib import Path
 
 # Load environment variables from .env file if it exists
@@ -28,6 +32,13 @@ except ImportError:
     pass  # python-dotenv not installed, use system environment only
 
 PACTFIX_API_URL = os.environ.get('PACTFIX_API_URL', '')
+# Remote pactfix API client: keep-alive pool, circuit breaker and hedging budget
+PACTFIX_API_TIMEOUT = float(os.environ.get('PACTFIX_API_TIMEOUT', '10'))
+PACTFIX_API_POOL = int(os.environ.get('PACTFIX_API_POOL', '8'))
+PACTFIX_API_FAILURES = int(os.environ.get('PACTFIX_API_FAILURES', '3'))
+PACTFIX_API_COOLDOWN = float(os.environ.get('PACTFIX_API_COOLDOWN', '30'))
+PACTFIX_API_HEDGE = float(os.environ.get('PACTFIX_API_HEDGE_MS', '300')) / 1000.0
+PACTFIX_HEALTH_TTL = float(os.environ.get('PACTFIX_HEALTH_TTL', '15'))
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
@@ -45,10 +56,124 @@ try:
 except Exception:
     PACTFIX_LOCAL_AVAILABLE = False
 
+try:
+    from pactfix.walker import walk_files as _pactfix_walk_files  # type: ignore
+except Exception:
+    _pactfix_walk_files = None
+
+try:
+    from pactfix.analyzer import detect_language as _pactfix_detect_language  # type: ignore
+    from pactfix.analyzers import get_analyzer as _pactfix_get_analyzer  # type: ignore
+    from pactfix.incremental import EditError, apply_line_edits, reanalyze as _pactfix_reanalyze  # type: ignore
+except Exception:
+    _pactfix_reanalyze = None
+    EditError = ValueError
+
 SNIPPET_DIR = Path(os.environ.get('SNIPPET_DIR', '/tmp/pactown-live-debug-snippets')).resolve()
-SNIPPET_DIR.mkdir(parents=True, exist_ok=True)
 SNIPPET_MAX_CHARS = int(os.environ.get('SNIPPET_MAX_CHARS', '200000'))
-_SNIPPET_LOCK = threading.Lock()
+# Shared links stay valid for SNIPPET_TTL seconds after their last use; the
+# store is capped at SNIPPET_MAX_BYTES (compressed) and compacted in the background
+SNIPPET_TTL = float(os.environ.get('SNIPPET_TTL', str(24 * 3600)))
+SNIPPET_MAX_BYTES = int(os.environ.get('SNIPPET_MAX_BYTES', str(256 * 1024 * 1024)))
+SNIPPET_COMPACT_INTERVAL = float(os.environ.get('SNIPPET_COMPACT_INTERVAL', '300'))
+
+# Concurrency limits: requests beyond MAX_IN_FLIGHT get 503, analysis runs on a
+# bounded pool and requests waiting longer than REQUEST_TIMEOUT get 504.
+MAX_IN_FLIGHT = int(os.environ.get('MAX_IN_FLIGHT', '32'))
+ANALYSIS_WORKERS = int(os.environ.get('ANALYSIS_WORKERS', str(min(8, (os.cpu_count() or 1) + 2))))
+REQUEST_TIMEOUT = float(os.environ.get('REQUEST_TIMEOUT', '15'))
+BATCH_TIMEOUT = float(os.environ.get('BATCH_TIMEOUT', '120'))
+SOCKET_TIMEOUT = float(os.environ.get('SOCKET_TIMEOUT', '30'))
+_IN_FLIGHT = threading.BoundedSemaphore(MAX_IN_FLIGHT)
+_ANALYSIS_EXECUTOR = ThreadPoolExecutor(max_workers=ANALYSIS_WORKERS, thread_name_prefix='analysis')
+
+# Editor sessions: session id -> (seq, future) of its newest /api/analyze request.
+# A newer request cancels the previous one if it is still queued.
+ANALYSIS_SESSIONS = int(os.environ.get('ANALYSIS_SESSIONS', '1024'))
+_SESSIONS: 'OrderedDict[str, tuple]' = OrderedDict()
+_SESSION_LOCK = threading.Lock()
+_superseded = {'count': 0}
+
+# ShellCheck: concurrent subprocesses, per-run timeout and cached results per script hash
+SHELLCHECK_MAX_PROCS = int(os.environ.get('SHELLCHECK_MAX_PROCS', str(os.cpu_count() or 1)))
+SHELLCHECK_TIMEOUT = float(os.environ.get('SHELLCHECK_TIMEOUT', '10'))
+SHELLCHECK_CACHE_SIZE = int(os.environ.get('SHELLCHECK_CACHE_SIZE', '512'))
+SHELLCHECK_PROBE_TTL = 60.0
+_SHELLCHECK_SLOTS = threading.BoundedSemaphore(SHELLCHECK_MAX_PROCS)
+_SHELLCHECK_CACHE: 'OrderedDict[str, str]' = OrderedDict()
+_SHELLCHECK_LOCK = threading.Lock()
+_SHELLCHECK_PENDING: dict = {}  # script hash -> Event set when the running check finishes
+_shellcheck_probe = {'path': None, 'checked_at': 0.0}
+
+
+
+class LRUCache:
+    """Thread-safe LRU bounded by entry count and/or the summed size of its values (0 = no bound)."""
+
+    def __init__(self, max_entries: int = 0, max_bytes: int = 0):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._data: 'OrderedDict[str, tuple]' = OrderedDict()  # key -> (value, size)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str):
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._data.move_to_end(key)
+            return item[0]
+
+    def put(self, key: str, value, size: int = 0) -> None:
+        if (self.max_entries <= 0 and self.max_bytes <= 0) or (self.max_bytes and size > self.max_bytes):
+            return
+        with self._lock:
+            old = self._data.pop(key, None)
+            if old is not None:
+                self._bytes -= old[1]
+            self._data[key] = (value, size)
+            self._bytes += size
+            while self._data and ((self.max_entries and len(self._data) > self.max_entries)
+                                  or (self.max_bytes and self._bytes > self.max_bytes)):
+                _, (_, evicted) = self._data.popitem(last=False)
+                self._bytes -= evicted
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._data),
+                'bytes': self._bytes,
+                'maxBytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hitRatio': round(self.hits / lookups, 3) if lookups else 0.0,
+            }
+
+
+# Recent local pactfix results by id, so the editor can send a base id plus the
+# edited lines instead of the whole buffer
+RESULT_CACHE_SIZE = int(os.environ.get('RESULT_CACHE_SIZE', '128'))
+_RESULT_CACHE = LRUCache(max_entries=RESULT_CACHE_SIZE)
+
+# Serialized /api/analyze responses by content hash (the ETag), bounded in bytes
+ANALYSIS_CACHE_BYTES = int(os.environ.get('ANALYSIS_CACHE_BYTES', str(32 * 1024 * 1024)))
+_ANALYSIS_CACHE = LRUCache(max_bytes=ANALYSIS_CACHE_BYTES)
+# Analysis responses at least this large are gzipped for clients that accept it
+GZIP_MIN_BYTES = int(os.environ.get('GZIP_MIN_BYTES', '1024'))
+
+
+class UnknownBaseError(LookupError):
+    """The base result of an incremental /api/analyze request is not (or no longer) cached."""
+
+
+class SupersededError(Exception):
+    """A newer /api/analyze request from the same editor session replaced this one."""
 
 
 def _snippet_id_for(code: str, mode: str | None = None) -> str:
@@ -59,16 +184,163 @@ def _snippet_id_for(code: str, mode: str | None = None) -> str:
     return h.hexdigest()
 
 
-def _snippet_path(snippet_id: str) -> Path:
-    return SNIPPET_DIR / f"{snippet_id}.json"
+class SnippetStore:
+    """Gzipped snippet files sharded by id prefix (``<root>/ab/<id>.json.gz``).
+
+    A file's mtime is the snippet's last use: loading or saving it again
+    refreshes it, snippets unused for ``ttl`` seconds expire, and when the
+    store grows past ``max_bytes`` the least recently used ones are removed.
+    Removal happens in a background compactor thread, so request threads only
+    ever touch their own file. Flat ``<root>/<id>.json`` files written by older
+    versions are still read until they expire.
+    """
+
+    # Refresh a file's mtime on read at most this often
+    TOUCH_INTERVAL = 60.0
+    # Leftover temporary files older than this are removed by the compactor
+    STALE_TMP_AGE = 3600.0
+
+    def __init__(self, root: Path, ttl: float = SNIPPET_TTL, max_bytes: int = SNIPPET_MAX_BYTES,
+                 compact_interval: float = SNIPPET_COMPACT_INTERVAL):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.compact_interval = compact_interval
+        self._bytes = 0  # estimate between compactions
+        self._wake = threading.Event()
+        self._thread: threading.Thread | None = None
+        self.last_compaction: dict = {}
+
+    def path(self, snippet_id: str) -> Path:
+        return self.root / snippet_id[:2] / f'{snippet_id}.json.gz'
+
+    def _legacy_path(self, snippet_id: str) -> Path:
+        return self.root / f'{snippet_id}.json'
+
+    def _expired(self, mtime: float, now: float) -> bool:
+        return self.ttl > 0 and now - mtime > self.ttl
+
+    def load(self, snippet_id: str):
+        """Decoded JSON of a snippet, or None if it is missing or expired."""
+        now = time.time()
+        for path, opener in ((self.path(snippet_id), gzip.open), (self._legacy_path(snippet_id), open)):
+            try:
+                mtime = path.stat().st_mtime
+                if self._expired(mtime, now):
+                    return None
+                with opener(path, 'rb') as f:
+                    data = json.loads(f.read())
+                if now - mtime > self.TOUCH_INTERVAL:
+                    os.utime(path)
+                return data
+            except FileNotFoundError:
+                continue
+        return None
+
+    def store(self, snippet_id: str, snippet: dict) -> None:
+        """Save a snippet; saving an existing id only marks it as used."""
+        path = self.path(snippet_id)
+        try:
+            os.utime(path)
+            return
+        except FileNotFoundError:
+            pass
+        body = gzip.compress(json.dumps(snippet, ensure_ascii=False).encode('utf-8'), mtime=0)
+        path.parent.mkdir(exist_ok=True)
+        # Unique temporary name: concurrent saves of the same id each rename a complete file
+        tmp = path.with_name(f'.{path.name}.{os.getpid()}.{threading.get_ident()}.tmp')
+        tmp.write_bytes(body)
+        tmp.replace(path)
+        self._bytes += len(body)
+        if self.max_bytes and self._bytes > self.max_bytes:
+            self._wake.set()
+
+    def _files(self):
+        """(mtime, size, path) of every snippet file; also yields stale temporary files as size -1."""
+        with os.scandir(self.root) as top:
+            top_entries = list(top)
+        for entry in top_entries:
+            if entry.is_dir(follow_symlinks=False) and len(entry.name) == 2:
+                with os.scandir(entry.path) as shard:
+                    entries = list(shard)
+            elif entry.is_file(follow_symlinks=False) and entry.name.endswith('.json'):
+                entries = [entry]
+            else:
+                continue
+            for f in entries:
+                try:
+                    st = f.stat(follow_symlinks=False)
+                except FileNotFoundError:
+                    continue
+                size = -1 if f.name.endswith('.tmp') else st.st_size
+                yield st.st_mtime, size, f.path
+
+    def compact(self) -> dict:
+        """Remove expired snippets, then the least recently used ones above ``max_bytes``."""
+        now = time.time()
+        kept, expired, evicted = [], 0, 0
+        for mtime, size, path in self._files():
+            if size < 0:
+                if now - mtime > self.STALE_TMP_AGE:
+                    self._unlink(path)
+            elif self._expired(mtime, now):
+                expired += self._unlink(path)
+            else:
+                kept.append((mtime, size, path))
+        total = sum(size for _, size, _ in kept)
+        if self.max_bytes and total > self.max_bytes:
+            kept.sort()
+            # Evict down to 90% of the cap so the next compaction is not due right away
+            target = self.max_bytes * 0.9
+            for mtime, size, path in kept:
+                if total <= target:
+                    break
+                if self._unlink(path):
+                    total -= size
+                    evicted += 1
+        self._bytes = total
+        self.last_compaction = {'files': len(kept) - evicted, 'bytes': total,
+                                'expired': expired, 'evicted': evicted, 'at': now}
+        return self.last_compaction
+
+    @staticmethod
+    def _unlink(path: str) -> int:
+        try:
+            os.unlink(path)
+            return 1
+        except FileNotFoundError:
+            return 0
+
+    def start(self) -> None:
+        """Start the background compactor (first pass right away)."""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._compact_loop, name='snippet-compactor', daemon=True)
+            self._thread.start()
+
+    def _compact_loop(self) -> None:
+        while True:
+            try:
+                stats = self.compact()
+                if stats['expired'] or stats['evicted']:
+                    logger.info(f"Snippet store: {stats['expired']} expired, {stats['evicted']} evicted, "
+                                f"{stats['files']} kept ({stats['bytes']} bytes)")
+            except Exception as e:
+                logger.warning(f"Snippet compaction failed: {e}")
+            self._wake.wait(self.compact_interval)
+            self._wake.clear()
+
+    def stats(self) -> dict:
+        return {'bytes': self._bytes, 'maxBytes': self.max_bytes, 'ttl': self.ttl,
+                'lastCompaction': self.last_compaction}
+
+
+_SNIPPETS = SnippetStore(SNIPPET_DIR)
 
 
 def _load_snippet(snippet_id: str) -> dict | None:
-    p = _snippet_path(snippet_id)
     try:
-        if not p.exists() or not p.is_file():
-            return None
-        data = json.loads(p.read_text(encoding='utf-8'))
+        data = _SNIPPETS.load(snippet_id)
         if not isinstance(data, dict):
             return None
         code = data.get('code')
@@ -85,13 +357,7 @@ def _load_snippet(snippet_id: str) -> dict | None:
 
 
 def _store_snippet(snippet_id: str, snippet: dict) -> None:
-    p = _snippet_path(snippet_id)
-    with _SNIPPET_LOCK:
-        if p.exists():
-            return
-        tmp = p.with_suffix(p.suffix + '.tmp')
-        tmp.write_text(json.dumps(snippet, ensure_ascii=False), encoding='utf-8')
-        tmp.replace(p)
+    _SNIPPETS.store(snippet_id, snippet)
 
 # Common bash fixes - patterns and their corrections
 BASH_FIXES = [
@@ -247,37 +513,100 @@ def apply_brace_fixes(code: str) -> tuple[str, list, list]:
     return '\n'.join(lines), warnings, fixes
 
 
+def shellcheck_path() -> str | None:
+    """Return the ShellCheck binary path, re-probing PATH at most every SHELLCHECK_PROBE_TTL seconds."""
+    now = time.monotonic()
+    with _SHELLCHECK_LOCK:
+        if _shellcheck_probe['checked_at'] and now - _shellcheck_probe['checked_at'] < SHELLCHECK_PROBE_TTL:
+            return _shellcheck_probe['path']
+    path = shutil.which('shellcheck')
+    with _SHELLCHECK_LOCK:
+        _shellcheck_probe['path'] = path
+        _shellcheck_probe['checked_at'] = now
+    return path
+
+
+def _cached_shellcheck_output(key: str) -> str | None:
+    with _SHELLCHECK_LOCK:
+        stdout = _SHELLCHECK_CACHE.get(key)
+        if stdout is not None:
+            _SHELLCHECK_CACHE.move_to_end(key)
+        return stdout
+
+
 def run_shellcheck(code: str) -> dict:
-    """Run ShellCheck on the code and return parsed results."""
+    """Run ShellCheck on the code and return parsed results.
+
+    The script is passed on stdin, so concurrent requests never share a temp
+    file. Output is cached by script hash; identical buffers skip the subprocess.
+    """
+    binary = shellcheck_path()
+    if binary is None:
+        return {'success': False, 'error': 'ShellCheck not installed'}
+
+    key = hashlib.sha256(code.encode('utf-8')).hexdigest()
+    stdout = _cached_shellcheck_output(key)
+    owner = False
+    if stdout is None:
+        # Single flight: concurrent requests for the same buffer wait for one run
+        with _SHELLCHECK_LOCK:
+            pending = _SHELLCHECK_PENDING.get(key)
+            if pending is None:
+                pending = _SHELLCHECK_PENDING[key] = threading.Event()
+                owner = True
+        if not owner:
+            pending.wait(SHELLCHECK_TIMEOUT)
+            stdout = _cached_shellcheck_output(key)
+            if stdout is None:
+                return {'success': False, 'error': 'ShellCheck unavailable'}
+
     try:
-        # Write code to temp file
-        temp_file = '/tmp/shellcheck_input.sh'
-        with open(temp_file, 'w') as f:
-            f.write(code)
-        
-        # Run ShellCheck with JSON output
-        result = subprocess.run(
-            ['shellcheck', '-f', 'json', '-s', 'bash', temp_file],
-            capture_output=True,
-            text=True
-        )
-        
-        # Parse JSON output
-        if result.stdout:
-            issues = json.loads(result.stdout)
-            return {'success': True, 'issues': issues}
-        
-        return {'success': True, 'issues': []}
-        
+        if stdout is None:
+            if not _SHELLCHECK_SLOTS.acquire(timeout=SHELLCHECK_TIMEOUT):
+                return {'success': False, 'error': 'ShellCheck busy'}
+            try:
+                # Run ShellCheck with JSON output
+                result = subprocess.run(
+                    [binary, '-f', 'json', '-s', 'bash', '-'],
+                    input=code,
+                    capture_output=True,
+                    text=True,
+                    timeout=SHELLCHECK_TIMEOUT,
+                )
+            finally:
+                _SHELLCHECK_SLOTS.release()
+            stdout = result.stdout
+            # Parse before caching so malformed output is never cached
+            issues = json.loads(stdout) if stdout else []
+            with _SHELLCHECK_LOCK:
+                _SHELLCHECK_CACHE[key] = stdout
+                _SHELLCHECK_CACHE.move_to_end(key)
+                while len(_SHELLCHECK_CACHE) > SHELLCHECK_CACHE_SIZE:
+                    _SHELLCHECK_CACHE.popitem(last=False)
+        else:
+            issues = json.loads(stdout) if stdout else []
+
+        return {'success': True, 'issues': issues}
+
     except FileNotFoundError:
         logger.warning("ShellCheck not found, using built-in analysis")
+        with _SHELLCHECK_LOCK:
+            _shellcheck_probe['checked_at'] = 0.0
         return {'success': False, 'error': 'ShellCheck not installed'}
+    except subprocess.TimeoutExpired:
+        logger.warning(f"ShellCheck timed out after {SHELLCHECK_TIMEOUT}s, using built-in analysis")
+        return {'success': False, 'error': 'ShellCheck timed out'}
     except json.JSONDecodeError as e:
         logger.error(f"JSON parse error: {e}")
         return {'success': False, 'error': str(e)}
     except Exception as e:
         logger.error(f"ShellCheck error: {e}")
         return {'success': False, 'error': str(e)}
+    finally:
+        if owner:
+            with _SHELLCHECK_LOCK:
+                _SHELLCHECK_PENDING.pop(key, None)
+            pending.set()
 
 
 def analyze_with_builtin(code: str) -> dict:
@@ -546,14 +875,12 @@ def _read_text_file(path: Path, max_bytes: int) -> tuple[str | None, str | None]
         return None, 'read_error'
 
 
-def batch_analyze_directory(
-    root: str | None = None,
-    max_files: int = 500,
-    max_bytes: int = 200_000,
-    include_hidden: bool = False,
-    include_details: bool = False,
-    workers: int | None = None,
-) -> dict:
+def _list_batch_files(
+    root: str | None,
+    max_files: int,
+    include_hidden: bool,
+) -> tuple[Path, list[Path]]:
+    """Validate the batch root and list at most ``max_files`` files below it."""
     requested_root = (root or '').strip()
     if not requested_root:
         root_path = (REPO_ROOT / 'examples').resolve()
@@ -566,86 +893,146 @@ def batch_analyze_directory(
     if not root_path.exists() or not root_path.is_dir():
         raise ValueError('root must be an existing directory')
 
-    max_files = int(max_files) if max_files is not None else 500
-    max_bytes = int(max_bytes) if max_bytes is not None else 200_000
-    if max_files <= 0:
-        max_files = 1
-    if max_bytes <= 0:
-        max_bytes = 1
-
     file_paths: list[Path] = []
-    for dirpath, dirnames, filenames in os.walk(str(root_path)):
-        if not include_hidden:
-            dirnames[:] = [d for d in dirnames if not d.startswith('.')]
-            filenames = [f for f in filenames if not f.startswith('.')]
-        for fn in filenames:
+    if _pactfix_walk_files is not None:
+        # Single pass that prunes node_modules/.git/venv/... and honours .gitignore
+        file_paths = list(islice(_pactfix_walk_files(root_path, include_hidden=include_hidden), max_files))
+    else:
+        for dirpath, dirnames, filenames in os.walk(str(root_path)):
+            if not include_hidden:
+                dirnames[:] = [d for d in dirnames if not d.startswith('.')]
+                filenames = [f for f in filenames if not f.startswith('.')]
+            for fn in filenames:
+                if len(file_paths) >= max_files:
+                    break
+                p = Path(dirpath) / fn
+                file_paths.append(p)
             if len(file_paths) >= max_files:
                 break
-            p = Path(dirpath) / fn
-            file_paths.append(p)
-        if len(file_paths) >= max_files:
-            break
+    return root_path, file_paths
 
-    t0 = time.perf_counter()
-    totals = {
-        'filesListed': len(file_paths),
+
+def _batch_limits(max_files, max_bytes) -> tuple[int, int]:
+    max_files = int(max_files) if max_files is not None else 500
+    max_bytes = int(max_bytes) if max_bytes is not None else 200_000
+    return max(max_files, 1), max(max_bytes, 1)
+
+
+def _analyze_batch_file(p: Path, max_bytes: int, include_details: bool) -> dict:
+    rel = None
+    try:
+        rel = str(p.resolve().relative_to(REPO_ROOT))
+    except Exception:
+        rel = str(p)
+
+    code, skip_reason = _read_text_file(p, max_bytes=max_bytes)
+    if code is None:
+        return {
+            'path': rel,
+            'skipped': True,
+            'skipReason': skip_reason,
+            'errors': 0,
+            'warnings': 0,
+            'fixes': 0,
+        }
+
+    result = analyze_code_multi(code, filename=str(p))
+    errors = result.get('errors') or []
+    warnings = result.get('warnings') or []
+    fixes = result.get('fixes') or []
+
+    item = {
+        'path': rel,
+        'skipped': False,
+        'language': result.get('language'),
+        'errors': len(errors),
+        'warnings': len(warnings),
+        'fixes': len(fixes),
+    }
+    if include_details:
+        item['errorItems'] = errors
+        item['warningItems'] = warnings
+        item['fixItems'] = fixes
+    return item
+
+
+def iter_batch_results(
+    file_paths: list[Path],
+    max_bytes: int,
+    include_details: bool = False,
+    workers: int | None = None,
+    deadline: float | None = None,
+):
+    """Yield one result dict per file, in completion order.
+
+    At most a few tasks per worker are queued at a time, so finished results
+    are handed to the caller instead of piling up in pending futures. Closing
+    the generator cancels the files not yet started. Past ``deadline`` (a
+    ``time.perf_counter()`` value) it raises ``FutureTimeoutError`` without
+    waiting for the files still running.
+    """
+    workers = workers or min(32, (os.cpu_count() or 1) + 4)
+    ex = ThreadPoolExecutor(max_workers=workers)
+    window = workers * 2
+    paths = iter(file_paths)
+    pending = set()
+    try:
+        for p in islice(paths, window):
+            pending.add(ex.submit(_analyze_batch_file, p, max_bytes, include_details))
+        while pending:
+            remaining = None if deadline is None else deadline - time.perf_counter()
+            if remaining is not None and remaining <= 0:
+                raise FutureTimeoutError()
+            done, pending = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+            if not done:
+                raise FutureTimeoutError()
+            for fut in done:
+                yield fut.result()
+                nxt = next(paths, None)
+                if nxt is not None:
+                    pending.add(ex.submit(_analyze_batch_file, nxt, max_bytes, include_details))
+    finally:
+        ex.shutdown(wait=False, cancel_futures=True)
+
+
+def _new_batch_totals(files_listed: int) -> dict:
+    return {
+        'filesListed': files_listed,
         'filesAnalyzed': 0,
         'filesSkipped': 0,
         'errors': 0,
         'warnings': 0,
         'fixes': 0,
     }
-    files: list[dict] = []
 
-    def _analyze_one(p: Path) -> dict:
-        rel = None
-        try:
-            rel = str(p.resolve().relative_to(REPO_ROOT))
-        except Exception:
-            rel = str(p)
 
-        code, skip_reason = _read_text_file(p, max_bytes=max_bytes)
-        if code is None:
-            return {
-                'path': rel,
-                'skipped': True,
-                'skipReason': skip_reason,
-                'errors': 0,
-                'warnings': 0,
-                'fixes': 0,
-            }
+def _add_to_batch_totals(totals: dict, item: dict) -> None:
+    if item.get('skipped'):
+        totals['filesSkipped'] += 1
+    else:
+        totals['filesAnalyzed'] += 1
+        totals['errors'] += int(item.get('errors') or 0)
+        totals['warnings'] += int(item.get('warnings') or 0)
+        totals['fixes'] += int(item.get('fixes') or 0)
 
-        result = analyze_code_multi(code, filename=str(p))
-        errors = result.get('errors') or []
-        warnings = result.get('warnings') or []
-        fixes = result.get('fixes') or []
 
-        item = {
-            'path': rel,
-            'skipped': False,
-            'language': result.get('language'),
-            'errors': len(errors),
-            'warnings': len(warnings),
-            'fixes': len(fixes),
-        }
-        if include_details:
-            item['errorItems'] = errors
-            item['warningItems'] = warnings
-            item['fixItems'] = fixes
-        return item
-
-    with ThreadPoolExecutor(max_workers=workers) as ex:
-        futures = [ex.submit(_analyze_one, p) for p in file_paths]
-        for fut in as_completed(futures):
-            item = fut.result()
-            files.append(item)
-            if item.get('skipped'):
-                totals['filesSkipped'] += 1
-            else:
-                totals['filesAnalyzed'] += 1
-                totals['errors'] += int(item.get('errors') or 0)
-                totals['warnings'] += int(item.get('warnings') or 0)
-                totals['fixes'] += int(item.get('fixes') or 0)
+def batch_analyze_directory(
+    root: str | None = None,
+    max_files: int = 500,
+    max_bytes: int = 200_000,
+    include_hidden: bool = False,
+    include_details: bool = False,
+    workers: int | None = None,
+) -> dict:
+    max_files, max_bytes = _batch_limits(max_files, max_bytes)
+    root_path, file_paths = _list_batch_files(root, max_files, include_hidden)
+
+    t0 = time.perf_counter()
+    totals = _new_batch_totals(len(file_paths))
+    files: list[dict] = []
+    for item in iter_batch_results(file_paths, max_bytes, include_details, workers):
+        files.append(item)
+        _add_to_batch_totals(totals, item)
 
     files.sort(key=lambda x: (-(x.get('errors') or 0), -(x.get('warnings') or 0), x.get('path') or ''))
     duration_ms = int((time.perf_counter() - t0) * 1000)
@@ -658,6 +1045,62 @@ def batch_analyze_directory(
     }
 
 
+def stream_batch_analysis(
+    root: str | None = None,
+    max_files: int = 500,
+    max_bytes: int = 200_000,
+    include_hidden: bool = False,
+    include_details: bool = False,
+    workers: int | None = None,
+    timeout: float | None = None,
+):
+    """Streaming variant of ``batch_analyze_directory``.
+
+    Validates the root eagerly (raising ValueError before anything is sent)
+    and returns a generator of NDJSON records: ``{"type": "file", ...}`` per
+    file as it completes, then one ``{"type": "totals", ...}`` record. If
+    ``timeout`` elapses, the remaining files are cancelled and the totals
+    record carries ``"timedOut": true``; an analysis failure stops the
+    stream with an ``"error"`` in the totals record.
+    """
+    max_files, max_bytes = _batch_limits(max_files, max_bytes)
+    root_path, file_paths = _list_batch_files(root, max_files, include_hidden)
+
+    def _records():
+        t0 = time.perf_counter()
+        totals = _new_batch_totals(len(file_paths))
+        timed_out = False
+        deadline = None if timeout is None else t0 + timeout
+        results = iter_batch_results(file_paths, max_bytes, include_details, workers, deadline)
+        error = None
+        try:
+            for item in results:
+                _add_to_batch_totals(totals, item)
+                yield {'type': 'file', **item}
+        except FutureTimeoutError:
+            # A slow file must not hold the stream open past the timeout
+            timed_out = True
+        except Exception as e:
+            # Headers are already sent; report the failure in-band
+            logger.error(f"Batch analysis error: {e}")
+            error = str(e)
+        finally:
+            results.close()
+        final = {
+            'type': 'totals',
+            'root': str(root_path),
+            'durationMs': int((time.perf_counter() - t0) * 1000),
+            'totals': totals,
+        }
+        if timed_out:
+            final['timedOut'] = True
+        if error is not None:
+            final['error'] = error
+        yield final
+
+    return _records()
+
+
 def analyze_python_code(code: str) -> dict:
     """Analyze Python code for common issues."""
     errors = []
@@ -1914,13 +2357,607 @@ def add_fix_comments_lang(code: str, fixes: list, comment_char: str = '#') -> st
     return '\n'.join(lines)
 
 
+def _result_id(code: str, force_language: str | None, filename: str | None) -> str:
+    """Content hash of an analysis; for editor requests it is the snippet id of ``code``."""
+    if not filename and force_language in (None, 'markdown'):
+        return _snippet_id_for(code, force_language or 'code')
+    return _snippet_id_for(code, f"{force_language or ''}\0{filename or ''}")
+
+
+def _remember_result(result_id: str, entry: dict) -> None:
+    _RESULT_CACHE.put(result_id, entry)
+
+
+def _cached_result(result_id: str) -> dict | None:
+    return _RESULT_CACHE.get(result_id)
+
+
+def _pactfix_payload(pf_result, force_language: str | None, filename: str | None) -> dict:
+    """Response for a local pactfix result; remembers it as a base for incremental requests."""
+    result_id = _result_id(pf_result.original_code, force_language, filename)
+    if RESULT_CACHE_SIZE > 0:
+        _remember_result(result_id, {'result': pf_result, 'force_language': force_language, 'filename': filename})
+    result = pf_result.to_dict()
+    # Add comments for pactfix fixes
+    if result.get('fixes'):
+        result['fixedCode'] = add_fix_comments_lang(result['fixedCode'], result['fixes'], '#')
+    result['resultId'] = result_id
+    return result
+
+
+def analyze_incremental(data: dict) -> dict:
+    """Analyze ``base`` (a previous ``resultId``) with ``edits`` applied.
+
+    Each edit replaces lines ``start..end`` of the base text with ``lines``.
+    Line-local analyzers (see ``pactfix.incremental``) re-run only around the
+    edits; otherwise the reconstructed text is analyzed in full.
+    """
+    entry = _cached_result(str(data.get('base'))) if _pactfix_reanalyze is not None else None
+    if entry is None:
+        raise UnknownBaseError('Unknown base result, send the full code')
+    edits = data.get('edits')
+    if not isinstance(edits, list):
+        raise EditError('edits must be a list')
+
+    force_language = data.get('language')
+    filename = data.get('filename')
+    base = entry['result']
+    code = '\n'.join(apply_line_edits(base.original_code.split('\n'), edits)[0])
+
+    spliced = None
+    same_request = (force_language, filename) == (entry['force_language'], entry['filename'])
+    if same_request and (force_language or _pactfix_detect_language(code, filename)) == base.language:
+        spliced = _pactfix_reanalyze(base, edits, _pactfix_get_analyzer(base.language))
+
+    if spliced is None:
+        result = _pactfix_payload(_pactfix_analyze_code(code, filename=filename, force_language=force_language),
+                                  force_language, filename)
+        result['incremental'] = False
+        return result
+    pf_result, ranges = spliced
+    result = _pactfix_payload(pf_result, force_language, filename)
+    result['incremental'] = True
+    result['reanalyzedLines'] = [list(r) for r in ranges]
+    return result
+
+
+def _etag_matches(header: str | None, etag: str) -> bool:
+    """True if an If-None-Match ``header`` lists ``etag`` (weak tags compare equal)."""
+    if not header:
+        return False
+    for tag in header.split(','):
+        tag = tag.strip()
+        if tag.startswith('W/'):
+            tag = tag[2:]
+        if tag.strip('"') == etag:
+            return True
+    return False
+
+
+def _code_hash(code: str) -> str:
+    """Hash a client sends as ``codeHash`` for the text it already has."""
+    return hashlib.sha256(code.encode('utf-8')).hexdigest()
+
+
+def _unique_anchors(a: list[str], b: list[str]) -> list[tuple[int, int]]:
+    """Lines occurring exactly once in both ``a`` and ``b``, as ``(i, j)`` pairs increasing in both."""
+    seen_a: dict[str, int] = {}
+    for i, line in enumerate(a):
+        seen_a[line] = -1 if line in seen_a else i
+    seen_b: dict[str, int] = {}
+    for j, line in enumerate(b):
+        seen_b[line] = -1 if line in seen_b else j
+    pairs = [(seen_a[line], j) for line, j in seen_b.items() if j >= 0 and seen_a.get(line, -1) >= 0]
+    pairs.sort(key=lambda pair: pair[1])
+    # Longest increasing subsequence of the ``a`` positions (patience sorting)
+    tails: list[int] = []       # a position ending the best chain of each length
+    tail_index: list[int] = []  # index in ``pairs`` of that chain's last pair
+    previous = [-1] * len(pairs)
+    for k, (i, _) in enumerate(pairs):
+        length = bisect_left(tails, i)
+        if length == len(tails):
+            tails.append(i)
+            tail_index.append(k)
+        else:
+            tails[length] = i
+            tail_index[length] = k
+        previous[k] = tail_index[length - 1] if length else -1
+    anchors = []
+    k = tail_index[-1] if tail_index else -1
+    while k >= 0:
+        anchors.append(pairs[k])
+        k = previous[k]
+    anchors.reverse()
+    return anchors
+
+
+def line_edits(old: list[str], new: list[str], max_lines: int | None = None) -> list[dict] | None:
+    """Line-range edits (as in incremental requests) that turn ``old`` into ``new``.
+
+    A patience-style diff in O(n log n): lines that occur once in both texts
+    anchor the alignment, and between two anchors the common prefix and
+    suffix are kept and the rest is rewritten line by line (same length) or
+    replaced as a block. The edits are correct but not always minimal.
+    Returns None once they would carry more than ``max_lines`` lines
+    (counting one per edit).
+    """
+    edits: list[dict] = []
+    sent = 0
+    prev_i = prev_j = 0
+    for anchor_i, anchor_j in _unique_anchors(old, new) + [(len(old), len(new))]:
+        i0, i1, j0, j1 = prev_i, anchor_i, prev_j, anchor_j
+        prev_i, prev_j = anchor_i + 1, anchor_j + 1
+        while i0 < i1 and j0 < j1 and old[i0] == new[j0]:
+            i0 += 1
+            j0 += 1
+        while i1 > i0 and j1 > j0 and old[i1 - 1] == new[j1 - 1]:
+            i1 -= 1
+            j1 -= 1
+        if i0 == i1 and j0 == j1:
+            continue
+        if i1 - i0 == j1 - j0:
+            # Fixes mostly rewrite lines in place: only send the differing ones
+            k = 0
+            while k < i1 - i0:
+                if old[i0 + k] == new[j0 + k]:
+                    k += 1
+                    continue
+                end = k
+                while end < i1 - i0 and old[i0 + end] != new[j0 + end]:
+                    end += 1
+                edits.append({'start': i0 + k + 1, 'end': i0 + end, 'lines': new[j0 + k:j0 + end]})
+                sent += 1 + end - k
+                k = end
+        else:
+            edits.append({'start': i0 + 1, 'end': i1, 'lines': new[j0:j1]})
+            sent += 1 + j1 - j0
+        if max_lines is not None and sent > max_lines:
+            return None
+    return edits
+
+
+def compact_result(result: dict) -> dict | None:
+    """``result`` for a client that already has its code, or None if that would not be smaller.
+
+    ``originalCode`` and ``fixedCode`` are replaced by ``fixedEdits``, the
+    line-range edits that turn the client's code into the fixed code, and
+    ``fixedHash`` to check the reconstruction.
+    """
+    original, fixed = result.get('originalCode', ''), result.get('fixedCode', '')
+    fixed_lines = fixed.split('\n')
+    edits = line_edits(original.split('\n'), fixed_lines, max_lines=len(fixed_lines))
+    if edits is None:
+        return None
+    compact = {k: v for k, v in result.items() if k not in ('originalCode', 'fixedCode')}
+    compact['fixedEdits'] = edits
+    compact['fixedHash'] = _code_hash(fixed)
+    compact['compact'] = True
+    return compact
+
+
+def _analysis_key(data: dict) -> str | None:
+    """Cache key / ETag of a full-code /api/analyze payload, None for incremental ones."""
+    code = data.get('code', '')
+    if data.get('base') is not None or not isinstance(code, str):
+        return None
+    return _result_id(code, data.get('language'), data.get('filename'))
+
+
+def _analysis_body(data: dict) -> tuple[bytes, str | None]:
+    """Serialized response to an /api/analyze payload and its ``resultId``.
+
+    The body is the ``compact_result`` when the payload's ``codeHash`` is the
+    hash of the analyzed text. Runs inside the bounded analysis call, so
+    compacting and serializing a large result counts against REQUEST_TIMEOUT.
+    """
+    result = analyze_request(data)
+    response = result
+    code_hash = data.get('codeHash')
+    if code_hash is not None and code_hash == _code_hash(result.get('originalCode', '')):
+        response = compact_result(result) or result
+    return json.dumps(response, ensure_ascii=False).encode('utf-8'), result.get('resultId')
+
+
+def cached_analysis(data: dict, if_none_match: str | None = None, run=None) -> tuple[int, bytes | None, str | None]:
+    """Answer an /api/analyze payload from ``_ANALYSIS_CACHE`` or by running the analysis.
+
+    Returns ``(status, body, etag)``: 304 with no body when ``if_none_match``
+    names a cached result (full or compact), otherwise 200 with the
+    serialized response. ``run(fn, data)`` runs the analysis (default:
+    ``run_bounded``). Incremental requests are never cached but still get
+    their ``resultId`` as ETag.
+    """
+    key = _analysis_key(data)
+    cache_key = key
+    if key is not None:
+        compact_key = f'{key}\0compact'
+        code_hash = data.get('codeHash')
+        if code_hash is not None and code_hash == _code_hash(data['code']):
+            cache_key, other_key = compact_key, key
+        else:
+            other_key = compact_key
+        body = _ANALYSIS_CACHE.get(cache_key)
+        if body is not None:
+            return (304, None, key) if _etag_matches(if_none_match, key) else (200, body, key)
+        # The client revalidating may have received the other representation
+        if _etag_matches(if_none_match, key) and _ANALYSIS_CACHE.get(other_key) is not None:
+            return 304, None, key
+    body, result_id = (run or run_bounded)(_analysis_body, data)
+    if key is not None:
+        _ANALYSIS_CACHE.put(cache_key, body, len(body))
+    return 200, body, key or result_id
+
+
+def analyze_request(data: dict) -> dict:
+    """Analyze one /api/analyze payload: remote pactfix API, local pactfix, then legacy analyzers."""
+    if data.get('base') is not None:
+        return analyze_incremental(data)
+
+    code = data.get('code', '')
+    filename = data.get('filename')
+    force_language = data.get('language')
+
+    logger.info(f"Analyzing code ({len(code)} chars)")
+
+    # Try pactfix API service first if configured
+    result = None
+    if _REMOTE is not None:
+        result = _call_pactfix_api(data)
+
+    # Try local pactfix-py analyzer if available
+    if result is None and PACTFIX_LOCAL_AVAILABLE and _pactfix_analyze_code is not None:
+        try:
+            pf_result = _pactfix_analyze_code(code, filename=filename, force_language=force_language)
+            if hasattr(pf_result, 'to_dict'):
+                result = _pactfix_payload(pf_result, force_language, filename)
+            else:
+                result = pf_result
+                # Add comments for pactfix fixes
+                if result and result.get('fixes'):
+                    result['fixedCode'] = add_fix_comments_lang(result['fixedCode'], result['fixes'], '#')
+        except Exception as e:
+            logger.warning(f"Local pactfix analyzer error, falling back to local legacy: {e}")
+
+    # Fallback to local analysis
+    if result is None:
+        result = analyze_code_multi(code, force_language=force_language, filename=filename)
+    return result
+
+
+class CircuitBreaker:
+    """Opens after ``threshold`` consecutive failures; after ``cooldown`` seconds one probe may pass."""
+
+    def __init__(self, threshold: int, cooldown: float):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.failures = 0
+        self._opened_at: float | None = None
+        self._probing = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._opened_at is None:
+                return 'closed'
+            if self._probing or time.monotonic() - self._opened_at < self.cooldown:
+                return 'open'
+            return 'half-open'
+
+    def allow(self) -> bool:
+        """True if a call may go out; in half-open state only one probe at a time."""
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            if self._probing or time.monotonic() - self._opened_at < self.cooldown:
+                return False
+            self._probing = True
+            return True
+
+    def record(self, ok: bool) -> None:
+        with self._lock:
+            self._probing = False
+            if ok:
+                self.failures = 0
+                self._opened_at = None
+                return
+            self.failures += 1
+            if self._opened_at is not None or self.failures >= self.threshold:
+                self._opened_at = time.monotonic()
+
+
+class RemoteAnalyzer:
+    """Client for the pactfix API at ``base_url``.
+
+    Requests reuse keep-alive connections from a small pool and go through a
+    ``CircuitBreaker``: once the service keeps failing, calls return None at
+    once and callers analyze locally until a probe succeeds. Health is cached
+    for ``health_ttl`` seconds and also follows the outcome of real calls.
+    """
+
+    def __init__(self, base_url: str, pool_size: int = PACTFIX_API_POOL, timeout: float = PACTFIX_API_TIMEOUT,
+                 breaker: CircuitBreaker | None = None, health_ttl: float = PACTFIX_HEALTH_TTL):
+        url = urlparse(base_url)
+        self.base_url = base_url
+        self._https = url.scheme == 'https'
+        self._host = url.hostname or 'localhost'
+        self._port = url.port
+        self._prefix = url.path.rstrip('/')
+        self.pool_size = max(1, pool_size)
+        self.timeout = timeout
+        self.breaker = breaker or CircuitBreaker(PACTFIX_API_FAILURES, PACTFIX_API_COOLDOWN)
+        self.health_ttl = health_ttl
+        self._idle: list = []  # LIFO: the most recently used connection is the most likely alive
+        self._closed = False
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=self.pool_size, thread_name_prefix='pactfix-api')
+        self._health = {'ok': False, 'checked_at': None, 'refreshing': False}
+        self.counters = {'requests': 0, 'failures': 0, 'rejected': 0, 'hedged': 0, 'connections': 0}
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self.counters[name] += 1
+
+    def _connection(self) -> tuple:
+        """(connection, reused) from the pool, or a new one."""
+        with self._lock:
+            if self._idle:
+                return self._idle.pop(), True
+            self.counters['connections'] += 1
+        cls = http.client.HTTPSConnection if self._https else http.client.HTTPConnection
+        return cls(self._host, self._port, timeout=self.timeout), False
+
+    def _release(self, conn) -> None:
+        with self._lock:
+            if not self._closed and len(self._idle) < self.pool_size:
+                self._idle.append(conn)
+                return
+        conn.close()
+
+    def request(self, method: str, path: str, body: bytes | None = None, timeout: float | None = None) -> tuple:
+        """Send one request; returns ``(status, body)``. Network errors propagate."""
+        headers = {'Content-Type': 'application/json'} if body is not None else {}
+        for attempt in range(2):
+            conn, reused = self._connection()
+            conn.timeout = self.timeout if timeout is None else timeout
+            if conn.sock is not None:
+                conn.sock.settimeout(conn.timeout)
+            try:
+                conn.request(method, self._prefix + path, body=body, headers=headers)
+                resp = conn.getresponse()
+                data = resp.read()
+            except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+                conn.close()
+                # The server closed an idle keep-alive connection: retry once on a fresh one
+                if reused and attempt == 0:
+                    continue
+                raise
+            except Exception:
+                conn.close()
+                raise
+            if resp.will_close:
+                conn.close()
+            else:
+                self._release(conn)
+            return resp.status, data
+        raise http.client.RemoteDisconnected('Remote end closed connection')
+
+    def _set_health(self, ok: bool) -> None:
+        with self._lock:
+            self._health.update(ok=ok, checked_at=time.monotonic())
+
+    def analyze(self, data: dict) -> dict | None:
+        """Remote analysis of ``data``, or None on failure or while the circuit is open."""
+        if not self.breaker.allow():
+            self._count('rejected')
+            return None
+        self._count('requests')
+        try:
+            status, body = self.request('POST', '/api/analyze', json.dumps(data).encode('utf-8'))
+            if status != 200:
+                raise RuntimeError(f'HTTP {status}')
+            result = json.loads(body.decode('utf-8'))
+        except Exception as e:
+            self._count('failures')
+            self.breaker.record(False)
+            self._set_health(False)
+            logger.warning(f"Pactfix API error, falling back to local: {e}")
+            return None
+        self.breaker.record(True)
+        self._set_health(True)
+        logger.info(f"Pactfix API response: {result.get('language', 'unknown')}")
+        return result
+
+    def submit(self, data: dict):
+        """Start ``analyze`` in the background; None while the circuit is open."""
+        if self.breaker.state == 'open':
+            self._count('rejected')
+            return None
+        return self._executor.submit(self.analyze, data)
+
+    def healthy(self) -> bool:
+        """Cached health; at most one request thread refreshes it, the others get the last value."""
+        with self._lock:
+            h = self._health
+            fresh = h['checked_at'] is not None and time.monotonic() - h['checked_at'] < self.health_ttl
+            if fresh or h['refreshing'] or self.breaker.state == 'open':
+                return h['ok'] and self.breaker.state != 'open'
+            h['refreshing'] = True
+        ok = False
+        try:
+            ok = self.request('GET', '/api/health', timeout=2)[0] == 200
+        except Exception:
+            pass
+        with self._lock:
+            self._health.update(ok=ok, checked_at=time.monotonic(), refreshing=False)
+        return ok
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {**self.counters, 'state': self.breaker.state, 'idle': len(self._idle)}
+
+    def close(self) -> None:
+        """Close the idle connections and stop the call executor."""
+        with self._lock:
+            idle, self._idle = self._idle, []
+            self._closed = True  # connections released from now on are closed
+        for conn in idle:
+            conn.close()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+_REMOTE = RemoteAnalyzer(PACTFIX_API_URL) if PACTFIX_API_URL else None
+
+
+def _call_pactfix_api(data: dict) -> dict | None:
+    """Remote analysis, hedged: past PACTFIX_API_HEDGE_MS the caller analyzes locally instead.
+
+    The remote call keeps running in the background and still counts for the
+    circuit breaker, but its result is dropped. A budget of 0 waits for the
+    remote answer (up to PACTFIX_API_TIMEOUT).
+    """
+    if _REMOTE is None:
+        return None
+    future = _REMOTE.submit(data)
+    if future is None:
+        return None
+    try:
+        return future.result(timeout=PACTFIX_API_HEDGE or None)
+    except FutureTimeoutError:
+        # Still queued behind other remote calls: do not send it at all
+        future.cancel()
+        _REMOTE._count('hedged')
+        logger.info(f"Pactfix API slower than {PACTFIX_API_HEDGE * 1000:.0f} ms, analyzing locally")
+        return None
+
+
+def run_bounded(fn, *args, timeout: float = None, **kwargs):
+    """Run ``fn`` on the shared analysis pool; raises FutureTimeoutError after ``timeout`` seconds.
+
+    The worker cannot be interrupted, but the request thread is freed and the
+    client gets a 504 instead of waiting indefinitely.
+    """
+    future = _ANALYSIS_EXECUTOR.submit(fn, *args, **kwargs)
+    return future.result(timeout=REQUEST_TIMEOUT if timeout is None else timeout)
+
+
+def _session_seq(data: dict) -> tuple[str | None, int | None]:
+    """``session``/``seq`` of an /api/analyze payload, (None, None) if absent or invalid."""
+    session, seq = data.get('session'), data.get('seq')
+    if not isinstance(session, str) or not session or len(session) > 128:
+        return None, None
+    if not isinstance(seq, int) or isinstance(seq, bool):
+        return None, None
+    return session, seq
+
+
+def run_latest(session: str | None, seq: int | None, fn, *args, timeout: float = None):
+    """Like ``run_bounded``, but only the newest request of an editor session runs.
+
+    A request whose ``seq`` is not above the last one seen for ``session``
+    is rejected, and a newer request cancels the previous one while it is
+    still queued, so its worker goes to requests whose result will be shown.
+    A request that already started runs to completion. Raises
+    ``SupersededError`` for dropped requests.
+    """
+    if session is None:
+        return run_bounded(fn, *args, timeout=timeout)
+    with _SESSION_LOCK:
+        previous = _SESSIONS.get(session)
+        if previous is not None and previous[0] >= seq:
+            _superseded['count'] += 1
+            raise SupersededError(f'Request {seq} of session {session} is older than {previous[0]}')
+        future = _ANALYSIS_EXECUTOR.submit(fn, *args)
+        _SESSIONS[session] = (seq, future)
+        _SESSIONS.move_to_end(session)
+        while len(_SESSIONS) > ANALYSIS_SESSIONS:
+            _SESSIONS.popitem(last=False)
+    if previous is not None and previous[1].cancel():
+        with _SESSION_LOCK:
+            _superseded['count'] += 1
+    try:
+        return future.result(timeout=REQUEST_TIMEOUT if timeout is None else timeout)
+    except CancelledError:
+        raise SupersededError(f'Request {seq} of session {session} was superseded')
+
+
+class DebugServer(ThreadingHTTPServer):
+    """Thread-per-connection server; worker threads never block shutdown."""
+
+    daemon_threads = True
+    request_queue_size = 128
+
+
 class DebugHandler(SimpleHTTPRequestHandler):
     """HTTP handler for the debug server."""
+
+    # Socket timeout for reading requests, so idle or slow clients cannot hold a thread
+    timeout = SOCKET_TIMEOUT
     
     def __init__(self, *args, directory=None, **kwargs):
         self.directory = directory or '/app'
         super().__init__(*args, directory=self.directory, **kwargs)
-    
+
+    def _send_json(self, status: int, payload, headers: dict | None = None) -> None:
+        self._send_json_body(status, json.dumps(payload, ensure_ascii=False).encode('utf-8'), headers)
+
+    def _send_json_body(self, status: int, body: bytes, headers: dict | None = None) -> None:
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('Access-Control-Allow-Origin', '*')
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def _send_ndjson(self, records) -> None:
+        """Stream records as NDJSON, one line per record, with chunked encoding on HTTP/1.1."""
+        chunked = self.request_version == 'HTTP/1.1'
+        if chunked:
+            # Only this response is HTTP/1.1; everything else stays HTTP/1.0 with close-delimited bodies
+            self.protocol_version = 'HTTP/1.1'
+        self.close_connection = True
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/x-ndjson')
+        self.send_header('Cache-Control', 'no-cache')
+        self.send_header('Access-Control-Allow-Origin', '*')
+        if chunked:
+            self.send_header('Transfer-Encoding', 'chunked')
+        self.send_header('Connection', 'close')
+        self.end_headers()
+        try:
+            for record in records:
+                line = json.dumps(record, ensure_ascii=False).encode('utf-8') + b'\n'
+                if chunked:
+                    self.wfile.write(b'%x\r\n%s\r\n' % (len(line), line))
+                else:
+                    self.wfile.write(line)
+                self.wfile.flush()
+            if chunked:
+                self.wfile.write(b'0\r\n\r\n')
+        except (BrokenPipeError, ConnectionResetError):
+            logger.info("Client disconnected during NDJSON stream")
+        finally:
+            records.close()
+
+    def _send_analysis(self, status: int, body: bytes | None, etag: str | None) -> None:
+        """Send a ``cached_analysis`` response; clients revalidate with If-None-Match."""
+        headers = {'Cache-Control': 'no-cache', 'Access-Control-Expose-Headers': 'ETag', 'Vary': 'Accept-Encoding'}
+        if etag:
+            headers['ETag'] = f'"{etag}"'
+        if status != 304:
+            if len(body) >= GZIP_MIN_BYTES and 'gzip' in self.headers.get('Accept-Encoding', ''):
+                body = gzip.compress(body, compresslevel=5, mtime=0)
+                headers['Content-Encoding'] = 'gzip'
+            self._send_json_body(status, body, headers)
+            return
+        self.send_response(304)
+        self.send_header('Access-Control-Allow-Origin', '*')
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+
     def do_GET(self):
         """Handle GET requests."""
         path = urlparse(self.path).path
@@ -1931,20 +2968,11 @@ class DebugHandler(SimpleHTTPRequestHandler):
             self.end_headers()
             
             # Check ShellCheck availability
-            shellcheck_available = subprocess.run(
-                ['which', 'shellcheck'], capture_output=True
-            ).returncode == 0
-            
-            # Check pactfix API availability
-            pactfix_available = False
-            if PACTFIX_API_URL:
-                try:
-                    req = urllib.request.Request(f"{PACTFIX_API_URL}/api/health")
-                    with urllib.request.urlopen(req, timeout=2) as resp:
-                        pactfix_available = resp.status == 200
-                except:
-                    pass
+            shellcheck_available = shellcheck_path() is not None
             
+            # Pactfix API availability, cached for PACTFIX_HEALTH_TTL seconds
+            pactfix_available = _REMOTE.healthy() if _REMOTE is not None else False
+
             health = {
                 'status': 'healthy',
                 'version': '1.2.0',
@@ -1955,9 +2983,31 @@ class DebugHandler(SimpleHTTPRequestHandler):
                     'auto_fix': True,
                     'pactfix_api': pactfix_available,
                     'pactfix_url': PACTFIX_API_URL or None
-                }
+                },
+                'stats': {
+                    'superseded_requests': _superseded['count'],
+                    'analysis_cache': _ANALYSIS_CACHE.stats(),
+                    'snippets': _SNIPPETS.stats(),
+                    'pactfix_api': _REMOTE.stats() if _REMOTE is not None else None,
+                },
             }
             self.wfile.write(json.dumps(health).encode())
+        elif re.fullmatch(r'/api/snippet/[a-fA-F0-9]{64}/analysis', path):
+            # Analysis of a shared snippet, as the editor would request it after loading it
+            snippet = _load_snippet(path.split('/')[3])
+            if snippet is None:
+                self.send_error(404, 'Not Found')
+                return
+            data = {'code': snippet['code'].strip()}
+            if snippet['mode'] == 'markdown':
+                data['language'] = 'markdown'
+            try:
+                self._send_analysis(*cached_analysis(data, self.headers.get('If-None-Match')))
+            except FutureTimeoutError:
+                self._send_json(504, {'error': 'Analysis timed out'})
+            except Exception as e:
+                logger.error(f"Snippet analysis error: {e}")
+                self.send_error(500, str(e))
         elif path.startswith('/api/snippet/'):
             snippet_id = path[len('/api/snippet/'):].strip()
             if not re.fullmatch(r'[a-fA-F0-9]{64}', snippet_id or ''):
@@ -1972,14 +3022,28 @@ class DebugHandler(SimpleHTTPRequestHandler):
             self.send_header('Content-Type', 'application/json')
             self.send_header('Access-Control-Allow-Origin', '*')
             self.send_header('ETag', f'"{snippet_id}"')
-            self.send_header('Cache-Control', 'public, max-age=31536000, immutable')
+            # Content never changes for an id, but the link expires after SNIPPET_TTL
+            self.send_header('Cache-Control', f'public, max-age={int(SNIPPET_TTL) or 31536000}, immutable')
             self.end_headers()
             self.wfile.write(json.dumps(snippet, ensure_ascii=False).encode('utf-8'))
         else:
             super().do_GET()
     
     def do_POST(self):
-        """Handle POST requests for code analysis."""
+        """Handle POST requests for code analysis, limited to MAX_IN_FLIGHT at a time."""
+        if not _IN_FLIGHT.acquire(blocking=False):
+            self.close_connection = True
+            self._send_json(503, {'error': 'Server busy, retry shortly'}, {'Retry-After': '1'})
+            return
+        try:
+            self._handle_post()
+        except FutureTimeoutError:
+            logger.warning(f"Request timed out: {self.path}")
+            self._send_json(504, {'error': 'Analysis timed out'})
+        finally:
+            _IN_FLIGHT.release()
+
+    def _handle_post(self):
         path = urlparse(self.path).path
         if path == '/api/batch_analyze':
             content_length = int(self.headers.get('Content-Length', 0))
@@ -1996,20 +3060,33 @@ class DebugHandler(SimpleHTTPRequestHandler):
                 if workers is not None:
                     workers = int(workers)
 
-                result = batch_analyze_directory(
+                if data.get('stream') or 'application/x-ndjson' in (self.headers.get('Accept') or ''):
+                    records = stream_batch_analysis(
+                        root=root,
+                        max_files=max_files,
+                        max_bytes=max_bytes,
+                        include_hidden=include_hidden,
+                        include_details=include_details,
+                        workers=workers,
+                        timeout=BATCH_TIMEOUT,
+                    )
+                    self._send_ndjson(records)
+                    return
+
+                result = run_bounded(
+                    batch_analyze_directory,
                     root=root,
                     max_files=max_files,
                     max_bytes=max_bytes,
                     include_hidden=include_hidden,
                     include_details=include_details,
                     workers=workers,
+                    timeout=BATCH_TIMEOUT,
                 )
 
-                self.send_response(200)
-                self.send_header('Content-Type', 'application/json')
-                self.send_header('Access-Control-Allow-Origin', '*')
-                self.end_headers()
-                self.wfile.write(json.dumps(result).encode())
+                self._send_json(200, result)
+            except FutureTimeoutError:
+                raise
             except json.JSONDecodeError as e:
                 self.send_error(400, f'Invalid JSON: {e}')
             except ValueError as e:
@@ -2042,11 +3119,7 @@ class DebugHandler(SimpleHTTPRequestHandler):
                 snippet_id = _snippet_id_for(code, mode)
                 _store_snippet(snippet_id, {'code': code, 'mode': mode})
 
-                self.send_response(200)
-                self.send_header('Content-Type', 'application/json')
-                self.send_header('Access-Control-Allow-Origin', '*')
-                self.end_headers()
-                self.wfile.write(json.dumps({'id': snippet_id}).encode('utf-8'))
+                self._send_json(200, {'id': snippet_id})
             except json.JSONDecodeError as e:
                 self.send_error(400, f'Invalid JSON: {e}')
             except Exception as e:
@@ -2060,74 +3133,34 @@ class DebugHandler(SimpleHTTPRequestHandler):
             
             try:
                 data = json.loads(body)
-                code = data.get('code', '')
-                filename = data.get('filename')
-                force_language = data.get('language')
-                
-                logger.info(f"Analyzing code ({len(code)} chars)")
-                
-                # Try pactfix API service first if configured
-                result = None
-                if PACTFIX_API_URL:
-                    result = self._call_pactfix_api(data)
-
-                # Try local pactfix-py analyzer if available
-                if result is None and PACTFIX_LOCAL_AVAILABLE and _pactfix_analyze_code is not None:
-                    try:
-                        pf_result = _pactfix_analyze_code(code, filename=filename, force_language=force_language)
-                        if hasattr(pf_result, 'to_dict'):
-                            result = pf_result.to_dict()
-                        else:
-                            result = pf_result
-                        # Add comments for pactfix fixes
-                        if result and result.get('fixes'):
-                            result['fixedCode'] = add_fix_comments_lang(result['fixedCode'], result['fixes'], '#')
-                    except Exception as e:
-                        logger.warning(f"Local pactfix analyzer error, falling back to local legacy: {e}")
-                
-                # Fallback to local analysis
-                if result is None:
-                    result = analyze_code_multi(code, force_language=force_language, filename=filename)
-                
-                self.send_response(200)
-                self.send_header('Content-Type', 'application/json')
-                self.send_header('Access-Control-Allow-Origin', '*')
-                self.end_headers()
-                self.wfile.write(json.dumps(result).encode())
-                
+                status, payload, etag = cached_analysis(
+                    data, self.headers.get('If-None-Match'),
+                    run=lambda fn, d: run_latest(*_session_seq(d), fn, d),
+                )
+                self._send_analysis(status, payload, etag)
+            except FutureTimeoutError:
+                raise
             except json.JSONDecodeError as e:
                 self.send_error(400, f'Invalid JSON: {e}')
+            except SupersededError as e:
+                logger.info(str(e))
+                self._send_json(409, {'error': 'Superseded by a newer request', 'code': 'SUPERSEDED'})
+            except UnknownBaseError as e:
+                self._send_json(409, {'error': str(e), 'code': 'BASE_NOT_FOUND'})
+            except EditError as e:
+                self._send_json(400, {'error': str(e)})
             except Exception as e:
                 logger.error(f"Analysis error: {e}")
                 self.send_error(500, str(e))
         else:
             self.send_error(404, 'Not Found')
     
-    def _call_pactfix_api(self, data: dict) -> dict:
-        """Call the pactfix API service."""
-        try:
-            req = urllib.request.Request(
-                f"{PACTFIX_API_URL}/api/analyze",
-                data=json.dumps(data).encode('utf-8'),
-                headers={'Content-Type': 'application/json'}
-            )
-            with urllib.request.urlopen(req, timeout=10) as response:
-                result = json.loads(response.read().decode('utf-8'))
-                logger.info(f"Pactfix API response: {result.get('language', 'unknown')}")
-                return result
-        except (urllib.error.URLError, urllib.error.HTTPError) as e:
-            logger.warning(f"Pactfix API error, falling back to local: {e}")
-            return None
-        except Exception as e:
-            logger.warning(f"Pactfix API exception: {e}")
-            return None
-    
     def do_OPTIONS(self):
         """Handle CORS preflight requests."""
         self.send_response(200)
         self.send_header('Access-Control-Allow-Origin', '*')
         self.send_header('Access-Control-Allow-Methods', 'GET, POST, OPTIONS')
-        self.send_header('Access-Control-Allow-Headers', 'Content-Type')
+        self.send_header('Access-Control-Allow-Headers', 'Content-Type, If-None-Match')
         self.end_headers()
     
     def log_message(self, format, *args):
@@ -2149,11 +3182,14 @@ def main():
         app_dir = local_app_dir if os.path.isdir(local_app_dir) else '/app'
     
     handler = lambda *args, **kwargs: DebugHandler(*args, directory=app_dir, **kwargs)
-    httpd = HTTPServer(server_address, handler)
+    httpd = DebugServer(server_address, handler)
+    _SNIPPETS.start()
     
     logger.info(f"🚀 Pactown Live Debug Server starting on port {port}")
     logger.info(f"📂 Serving files from {app_dir}")
-    logger.info(f"🔍 ShellCheck integration: {'enabled' if subprocess.run(['which', 'shellcheck'], capture_output=True).returncode == 0 else 'using fallback'}")
+    logger.info(f"🧵 Max in-flight requests: {MAX_IN_FLIGHT}, analysis workers: {ANALYSIS_WORKERS}, timeout: {REQUEST_TIMEOUT}s")
+    logger.info(f"🔍 ShellCheck integration: {'enabled' if shellcheck_path() else 'using fallback'}")
+    logger.info(f"💾 Snippets in {SNIPPET_DIR}, TTL {SNIPPET_TTL:.0f}s, cap {SNIPPET_MAX_BYTES} bytes")
     
     try:
         httpd.serve_forever()
@@ -0,0 +1,37 @@
+import sys
+import time
+import unittest
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import server  # noqa: E402
+
+
+class StreamBatchTimeoutTest(unittest.TestCase):
+    def test_slow_file_does_not_hold_the_stream_past_the_timeout(self) -> None:
+        analyze = server._analyze_batch_file
+
+        def slow_first(p, max_bytes, include_details):
+            if p == first:
+                time.sleep(2.0)
+            return analyze(p, max_bytes, include_details)
+
+        _, paths = server._list_batch_files("examples", 5, False)
+        self.assertTrue(paths)
+        first = paths[0]
+        with mock.patch.object(server, "_analyze_batch_file", slow_first):
+            started = time.monotonic()
+            records = list(server.stream_batch_analysis("examples", max_files=5, workers=1, timeout=0.3))
+            elapsed = time.monotonic() - started
+
+        self.assertLess(elapsed, 1.5)
+        final = records[-1]
+        self.assertEqual(final["type"], "totals")
+        self.assertTrue(final.get("timedOut"))
+        self.assertNotIn("error", final)
+
+
+if __name__ == "__main__":
+    unittest.main()
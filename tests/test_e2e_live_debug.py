@@ -1,3 +1,5 @@
+import gzip
+import hashlib
 import json
 import os
 import socket
@@ -5,8 +7,9 @@ import subprocess
 import sys
 import time
 import unittest
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from urllib.error import URLError
+from urllib.error import HTTPError, URLError
 from urllib.request import Request, urlopen
 
 
@@ -145,6 +148,244 @@ done
         self.assertTrue(any(w.get("code") == "BASH001" for w in warnings))
         self.assertFalse(any(w.get("code") == "SC2086" and w.get("line") == 5 for w in warnings))
 
+    def test_api_analyze_handles_concurrent_editors(self) -> None:
+        def analyze(i: int) -> tuple:
+            code = f"#!/bin/bash\necho $VAR{i}\n"
+            req = Request(
+                f"http://127.0.0.1:{self.port}/api/analyze",
+                method="POST",
+                headers={"Content-Type": "application/json"},
+                data=json.dumps({"code": code}).encode("utf-8"),
+            )
+            with urlopen(req, timeout=10.0) as resp:
+                return resp.status, json.loads(resp.read().decode("utf-8"))
+
+        with ThreadPoolExecutor(max_workers=20) as pool:
+            results = list(pool.map(analyze, range(20)))
+
+        for i, (status, result) in enumerate(results):
+            self.assertEqual(status, 200)
+            self.assertIn(f"${{VAR{i}}}", result.get("fixedCode", ""))
+
+    def _post_analyze(self, payload: dict) -> tuple:
+        req = Request(
+            f"http://127.0.0.1:{self.port}/api/analyze",
+            method="POST",
+            headers={"Content-Type": "application/json"},
+            data=json.dumps(payload).encode("utf-8"),
+        )
+        try:
+            with urlopen(req, timeout=5.0) as resp:
+                return resp.status, json.loads(resp.read().decode("utf-8"))
+        except HTTPError as e:
+            return e.code, json.loads(e.read().decode("utf-8") or "{}")
+
+    def test_api_analyze_incremental_edit(self) -> None:
+        lines = ["#!/bin/bash"] + [f"echo step{i} $DIR{i}" for i in range(200)] + ["cd /tmp"]
+        status, base = self._post_analyze({"code": "\n".join(lines)})
+        self.assertEqual(status, 200)
+        self.assertTrue(base.get("resultId"))
+
+        # Replace line 101 with two lines, one of them new and faulty
+        edits = [{"start": 101, "end": 101, "lines": ["read NAME", "echo ok"]}]
+        status, result = self._post_analyze({"base": base["resultId"], "edits": edits})
+        self.assertEqual(status, 200)
+        self.assertTrue(result.get("incremental"))
+        self.assertEqual(result.get("reanalyzedLines"), [[101, 102]])
+
+        new_code = "\n".join(lines[:100] + ["read NAME", "echo ok"] + lines[101:])
+        status, full = self._post_analyze({"code": new_code})
+        self.assertEqual(status, 200)
+        for key in ("originalCode", "fixedCode", "errors", "warnings", "fixes", "resultId"):
+            self.assertEqual(result.get(key), full.get(key), key)
+        self.assertTrue(any(w["code"] == "SC2162" and w["line"] == 101 for w in result["warnings"]))
+        self.assertTrue(any(w["code"] == "SC2164" and w["line"] == 203 for w in result["warnings"]))
+
+    def test_api_analyze_incremental_unknown_base(self) -> None:
+        status, result = self._post_analyze({"base": "0" * 64, "edits": []})
+        self.assertEqual(status, 409)
+        self.assertEqual(result.get("code"), "BASE_NOT_FOUND")
+
+        status, base = self._post_analyze({"code": "echo $A"})
+        status, result = self._post_analyze({"base": base["resultId"], "edits": [{"start": 5, "end": 5, "lines": []}]})
+        self.assertEqual(status, 400)
+
+    def test_api_analyze_compact_response(self) -> None:
+        lines = ["#!/bin/bash"] + [f"echo step{i} $DIR{i}" for i in range(200)] + ["cd /tmp"]
+        code = "\n".join(lines)
+        code_hash = hashlib.sha256(code.encode("utf-8")).hexdigest()
+        status, full = self._post_analyze({"code": code})
+        status, compact = self._post_analyze({"code": code, "codeHash": code_hash})
+        self.assertEqual(status, 200)
+        self.assertTrue(compact.get("compact"))
+        self.assertNotIn("originalCode", compact)
+        self.assertNotIn("fixedCode", compact)
+        for key in ("errors", "warnings", "fixes", "resultId"):
+            self.assertEqual(compact.get(key), full.get(key), key)
+
+        fixed = list(lines)
+        for edit in reversed(compact["fixedEdits"]):
+            fixed[edit["start"] - 1:edit["end"]] = edit["lines"]
+        self.assertEqual("\n".join(fixed), full["fixedCode"])
+        self.assertEqual(compact["fixedHash"], hashlib.sha256(full["fixedCode"].encode("utf-8")).hexdigest())
+
+        # Incremental requests: the hash is of the text after the edits
+        edits = [{"start": 2, "end": 2, "lines": ["read NAME"]}]
+        new_hash = hashlib.sha256("\n".join(lines[:1] + ["read NAME"] + lines[2:]).encode("utf-8")).hexdigest()
+        status, result = self._post_analyze({"base": full["resultId"], "edits": edits, "codeHash": new_hash})
+        self.assertTrue(result.get("compact"))
+        self.assertTrue(result.get("incremental"))
+
+        # A stale hash gets the full response, large ones gzipped on request
+        status, result = self._post_analyze({"code": code, "codeHash": "0" * 64})
+        self.assertEqual(result, full)
+        req = Request(
+            f"http://127.0.0.1:{self.port}/api/analyze",
+            method="POST",
+            headers={"Content-Type": "application/json", "Accept-Encoding": "gzip"},
+            data=json.dumps({"code": code}).encode("utf-8"),
+        )
+        with urlopen(req, timeout=5.0) as resp:
+            self.assertEqual(resp.headers.get("Content-Encoding"), "gzip")
+            self.assertEqual(json.loads(gzip.decompress(resp.read())), full)
+
+    def test_api_analyze_revalidates_compact_responses(self) -> None:
+        code = f"#!/bin/bash\necho $COMPACT{time.time_ns()}"
+        code_hash = hashlib.sha256(code.encode("utf-8")).hexdigest()
+        status, compact = self._post_analyze({"code": code, "codeHash": code_hash})
+        self.assertTrue(compact.get("compact"))
+        # Same text again without the hash: either cached representation answers 304
+        req = Request(
+            f"http://127.0.0.1:{self.port}/api/analyze",
+            method="POST",
+            headers={"Content-Type": "application/json", "If-None-Match": f'"{compact["resultId"]}"'},
+            data=json.dumps({"code": code}).encode("utf-8"),
+        )
+        with self.assertRaises(HTTPError) as ctx:
+            urlopen(req, timeout=5.0)
+        self.assertEqual(ctx.exception.code, 304)
+
+    def test_api_analyze_compacts_large_insert_heavy_manifest(self) -> None:
+        doc = (
+            "apiVersion: apps/v1\nkind: Deployment\nmetadata:\n  name: web-{i}\nspec:\n  replicas: 2\n"
+            "  template:\n    spec:\n      containers:\n        - name: web\n          image: nginx:latest\n"
+            "          ports: [{{containerPort: 80}}]"
+        )
+        code = "\n---\n".join(doc.format(i=i) for i in range(600))
+        code_hash = hashlib.sha256(code.encode("utf-8")).hexdigest()
+        started = time.monotonic()
+        status, compact = self._post_analyze({"code": code, "language": "kubernetes", "codeHash": code_hash})
+        elapsed = time.monotonic() - started
+        self.assertEqual(status, 200)
+        self.assertLess(elapsed, 5.0)
+
+        status, full = self._post_analyze({"code": code, "language": "kubernetes"})
+        self.assertGreater(full["fixedCode"].count("\n"), 2 * code.count("\n"))
+        if compact.get("compact"):
+            fixed = code.split("\n")
+            for edit in reversed(compact["fixedEdits"]):
+                fixed[edit["start"] - 1:edit["end"]] = edit["lines"]
+            self.assertEqual("\n".join(fixed), full["fixedCode"])
+        else:
+            self.assertEqual(compact, full)
+
+    def test_api_analyze_drops_superseded_requests(self) -> None:
+        session = f"test-{time.time()}"
+        status, _ = self._post_analyze({"code": "echo $A", "session": session, "seq": 2})
+        self.assertEqual(status, 200)
+        status, result = self._post_analyze({"code": "echo $B", "session": session, "seq": 1})
+        self.assertEqual(status, 409)
+        self.assertEqual(result.get("code"), "SUPERSEDED")
+
+        # A burst from one editor: whatever gets dropped, the newest request is answered
+        with ThreadPoolExecutor(max_workers=10) as ex:
+            statuses = list(ex.map(
+                lambda seq: self._post_analyze({"code": f"echo ${seq}", "session": session, "seq": seq})[0],
+                range(3, 23),
+            ))
+        self.assertEqual(statuses[-1], 200)
+        self.assertTrue(set(statuses) <= {200, 409}, statuses)
+
+        with urlopen(f"http://127.0.0.1:{self.port}/api/health", timeout=2.0) as resp:
+            health = json.loads(resp.read().decode("utf-8"))
+        self.assertGreaterEqual(health["stats"]["superseded_requests"], 1)
+
+    def _get(self, path: str, headers: dict | None = None) -> tuple:
+        req = Request(f"http://127.0.0.1:{self.port}{path}", headers=headers or {})
+        try:
+            with urlopen(req, timeout=5.0) as resp:
+                return resp.status, resp.headers.get("ETag"), resp.read()
+        except HTTPError as e:
+            return e.code, e.headers.get("ETag"), e.read()
+
+    def _cache_stats(self) -> dict:
+        return json.loads(self._get("/api/health")[2])["stats"]["analysis_cache"]
+
+    def test_api_analyze_caches_results_with_etag(self) -> None:
+        payload = {"code": f"#!/bin/bash\necho $CACHED{time.time_ns()}"}
+        before = self._cache_stats()
+        req = lambda headers: Request(  # noqa: E731
+            f"http://127.0.0.1:{self.port}/api/analyze", method="POST",
+            headers={"Content-Type": "application/json", **headers},
+            data=json.dumps(payload).encode("utf-8"),
+        )
+        with urlopen(req({}), timeout=5.0) as resp:
+            etag, first = resp.headers.get("ETag"), resp.read()
+        with urlopen(req({}), timeout=5.0) as resp:
+            self.assertEqual(resp.headers.get("ETag"), etag)
+            self.assertEqual(resp.read(), first)
+        self.assertEqual(json.loads(first)["resultId"], etag.strip('"'))
+        with self.assertRaises(HTTPError) as ctx:
+            urlopen(req({"If-None-Match": etag}), timeout=5.0)
+        self.assertEqual(ctx.exception.code, 304)
+
+        after = self._cache_stats()
+        self.assertEqual(after["hits"] - before["hits"], 2)
+        self.assertGreater(after["bytes"], 0)
+        self.assertLessEqual(after["bytes"], after["maxBytes"])
+
+    def test_snippet_analysis_uses_snippet_id_as_etag(self) -> None:
+        code = f"echo $SHARED{time.time_ns()}"
+        req = Request(
+            f"http://127.0.0.1:{self.port}/api/snippet",
+            method="POST",
+            headers={"Content-Type": "application/json"},
+            data=json.dumps({"code": code, "mode": "code"}).encode("utf-8"),
+        )
+        with urlopen(req, timeout=5.0) as resp:
+            snippet_id = json.loads(resp.read())["id"]
+
+        status, etag, body = self._get(f"/api/snippet/{snippet_id}/analysis")
+        self.assertEqual(status, 200)
+        self.assertEqual(etag, f'"{snippet_id}"')
+        status, result = self._post_analyze({"code": code})
+        self.assertEqual(result, json.loads(body))
+
+        status, _, body = self._get(f"/api/snippet/{snippet_id}/analysis", {"If-None-Match": etag})
+        self.assertEqual((status, body), (304, b""))
+        self.assertEqual(self._get(f"/api/snippet/{'0' * 64}/analysis")[0], 404)
+
+    def test_api_batch_analyze_streams_ndjson(self) -> None:
+        req = Request(
+            f"http://127.0.0.1:{self.port}/api/batch_analyze",
+            method="POST",
+            headers={"Content-Type": "application/json", "Accept": "application/x-ndjson"},
+            data=json.dumps({"root": "examples", "max_files": 10}).encode("utf-8"),
+        )
+
+        with urlopen(req, timeout=10.0) as resp:
+            self.assertEqual(resp.status, 200)
+            self.assertEqual(resp.headers.get("Content-Type"), "application/x-ndjson")
+            self.assertEqual(resp.headers.get("Transfer-Encoding"), "chunked")
+            records = [json.loads(line) for line in resp if line.strip()]
+
+        files = [r for r in records if r.get("type") == "file"]
+        self.assertEqual(records[-1].get("type"), "totals")
+        totals = records[-1]["totals"]
+        self.assertEqual(len(files), int(totals["filesListed"]))
+        self.assertEqual(sum(int(f.get("errors") or 0) for f in files), int(totals["errors"]))
+        self.assertNotIn("error", records[-1])
+
     def test_api_batch_analyze_scans_directory(self) -> None:
         fixture_dir = self.repo_root / "tests" / "_batch_fixture"
         fixture_dir.mkdir(parents=True, exist_ok=True)
@@ -0,0 +1,119 @@
+import json
+import sys
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import server  # noqa: E402
+
+
+class FakePactfixAPI(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    state: dict = {}
+
+    def _reply(self, status: int, payload: dict) -> None:
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def setup(self) -> None:
+        super().setup()
+        self.state["connections"] += 1
+
+    def do_GET(self) -> None:
+        self.state["health"] += 1
+        self._reply(200, {"status": "healthy"})
+
+    def do_POST(self) -> None:
+        data = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        self.state["analyses"] += 1
+        time.sleep(self.state["delay"])
+        if self.state["fail"]:
+            self._reply(500, {"error": "down"})
+        else:
+            self._reply(200, {"originalCode": data["code"], "fixedCode": data["code"], "language": "remote",
+                              "errors": [], "warnings": [], "fixes": []})
+
+    def log_message(self, format, *args) -> None:
+        pass
+
+
+class RemoteAnalyzerTest(unittest.TestCase):
+    def setUp(self) -> None:
+        FakePactfixAPI.state = {"connections": 0, "health": 0, "analyses": 0, "delay": 0.0, "fail": False}
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), FakePactfixAPI)
+        self.httpd.daemon_threads = True
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+        self.state = FakePactfixAPI.state
+        self.remotes = []
+
+    def tearDown(self) -> None:
+        for remote in self.remotes:
+            remote.close()
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def _remote(self, **kwargs) -> "server.RemoteAnalyzer":
+        breaker = server.CircuitBreaker(kwargs.pop("threshold", 3), kwargs.pop("cooldown", 30))
+        remote = server.RemoteAnalyzer(self.url, breaker=breaker, **kwargs)
+        self.remotes.append(remote)
+        return remote
+
+    def test_connections_are_kept_alive(self) -> None:
+        remote = self._remote()
+        for i in range(5):
+            self.assertEqual(remote.analyze({"code": f"echo {i}"})["language"], "remote")
+        self.assertEqual(self.state["connections"], 1)
+        self.assertEqual(remote.stats()["connections"], 1)
+
+    def test_circuit_opens_after_failures_and_probes_after_cooldown(self) -> None:
+        self.state["fail"] = True
+        remote = self._remote(threshold=3, cooldown=0.2)
+        for _ in range(5):
+            self.assertIsNone(remote.analyze({"code": "x"}))
+        self.assertEqual(self.state["analyses"], 3)
+        self.assertEqual(remote.breaker.state, "open")
+        self.assertIsNone(remote.submit({"code": "x"}))
+
+        time.sleep(0.25)
+        self.state["fail"] = False
+        self.assertIsNotNone(remote.analyze({"code": "x"}))
+        self.assertEqual(remote.breaker.state, "closed")
+        self.assertEqual(remote.stats()["rejected"], 3)
+
+    def test_health_is_cached(self) -> None:
+        remote = self._remote(health_ttl=60)
+        self.assertTrue(remote.healthy())
+        self.assertTrue(remote.healthy())
+        self.assertEqual(self.state["health"], 1)
+
+        self.state["fail"] = True
+        remote.analyze({"code": "x"})
+        self.assertFalse(remote.healthy())
+        self.assertEqual(self.state["health"], 1)
+
+    def test_slow_remote_is_hedged_with_local_analysis(self) -> None:
+        self.state["delay"] = 1.0
+        saved = server._REMOTE, server.PACTFIX_API_HEDGE
+        server._REMOTE, server.PACTFIX_API_HEDGE = self._remote(), 0.05
+        try:
+            start = time.perf_counter()
+            result = server.analyze_request({"code": "#!/bin/bash\necho $A\n"})
+            elapsed = time.perf_counter() - start
+        finally:
+            server._REMOTE, server.PACTFIX_API_HEDGE = saved
+        self.assertLess(elapsed, 0.9)
+        self.assertNotEqual(result.get("language"), "remote")
+        self.assertIn("fixedCode", result)
+
+
+if __name__ == "__main__":
+    unittest.main()
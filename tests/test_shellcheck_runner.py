@@ -0,0 +1,61 @@
+import stat
+import sys
+import tempfile
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import server  # noqa: E402
+
+FAKE_SHELLCHECK = """#!/bin/sh
+echo x >> "{calls}"
+[ "$5" = "-" ] || exit 2
+cat > /dev/null
+sleep 0.2
+echo '[{{"line": 1, "column": 6, "level": "info", "code": 2086, "message": "quote"}}]'
+"""
+
+
+class ShellcheckRunnerTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.calls = Path(self.tmp.name) / "calls"
+        binary = Path(self.tmp.name) / "shellcheck"
+        binary.write_text(FAKE_SHELLCHECK.format(calls=self.calls), encoding="utf-8")
+        binary.chmod(binary.stat().st_mode | stat.S_IEXEC)
+
+        self._probe = dict(server._shellcheck_probe)
+        server._shellcheck_probe.update(path=str(binary), checked_at=time.monotonic())
+        server._SHELLCHECK_CACHE.clear()
+
+    def tearDown(self) -> None:
+        server._shellcheck_probe.update(self._probe)
+        server._SHELLCHECK_CACHE.clear()
+        self.tmp.cleanup()
+
+    def _spawns(self) -> int:
+        return self.calls.read_text().count("x") if self.calls.exists() else 0
+
+    def test_concurrent_runs_share_one_process_per_script(self) -> None:
+        scripts = [f"echo $V{i % 3}" for i in range(24)]
+        with ThreadPoolExecutor(max_workers=12) as pool:
+            results = list(pool.map(server.run_shellcheck, scripts))
+
+        self.assertTrue(all(r["success"] for r in results))
+        self.assertEqual(results[0]["issues"][0]["code"], 2086)
+        self.assertEqual(self._spawns(), 3)
+
+        server.run_shellcheck("echo $V0")
+        self.assertEqual(self._spawns(), 3)
+
+    def test_missing_binary_falls_back(self) -> None:
+        server._shellcheck_probe.update(path=None, checked_at=time.monotonic())
+        self.assertEqual(server.run_shellcheck("echo hi"), {"success": False, "error": "ShellCheck not installed"})
+        self.assertEqual(self._spawns(), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,86 @@
+import gzip
+import json
+import os
+import sys
+import tempfile
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import server  # noqa: E402
+
+
+class SnippetStoreTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmp.name)
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+
+    def _age(self, path: Path, seconds: float) -> None:
+        t = time.time() - seconds
+        os.utime(path, (t, t))
+
+    def test_store_is_sharded_and_compressed(self) -> None:
+        store = server.SnippetStore(self.root)
+        sid = server._snippet_id_for("echo $A\n" * 100, "code")
+        store.store(sid, {"code": "echo $A\n" * 100, "mode": "code"})
+
+        path = self.root / sid[:2] / f"{sid}.json.gz"
+        self.assertTrue(path.is_file())
+        self.assertLess(path.stat().st_size, 200)
+        self.assertEqual(json.loads(gzip.decompress(path.read_bytes()))["mode"], "code")
+        self.assertEqual(store.load(sid), {"code": "echo $A\n" * 100, "mode": "code"})
+        self.assertIsNone(store.load("0" * 64))
+
+    def test_concurrent_saves_of_one_snippet(self) -> None:
+        store = server.SnippetStore(self.root)
+        sid = "ab" * 32
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            list(pool.map(lambda _: store.store(sid, {"code": "x", "mode": None}), range(32)))
+        self.assertEqual(store.load(sid), {"code": "x", "mode": None})
+        self.assertEqual([p.name for p in (self.root / "ab").iterdir()], [f"{sid}.json.gz"])
+
+    def test_legacy_flat_files_are_read(self) -> None:
+        sid = "cd" * 32
+        (self.root / f"{sid}.json").write_text(json.dumps({"code": "ls", "mode": "code"}), encoding="utf-8")
+        self.assertEqual(server.SnippetStore(self.root).load(sid), {"code": "ls", "mode": "code"})
+
+    def test_expired_snippets_are_hidden_and_compacted(self) -> None:
+        store = server.SnippetStore(self.root, ttl=3600)
+        old, fresh, legacy = "01" * 32, "02" * 32, "03" * 32
+        store.store(old, {"code": "old"})
+        store.store(fresh, {"code": "fresh"})
+        (self.root / f"{legacy}.json").write_text('{"code": "legacy"}', encoding="utf-8")
+        self._age(store.path(old), 7200)
+        self._age(self.root / f"{legacy}.json", 7200)
+
+        self.assertIsNone(store.load(old))
+        stats = store.compact()
+        self.assertEqual((stats["expired"], stats["files"]), (2, 1))
+        self.assertFalse(store.path(old).exists())
+        self.assertEqual(store.load(fresh), {"code": "fresh"})
+
+    def test_size_cap_evicts_least_recently_used(self) -> None:
+        store = server.SnippetStore(self.root, max_bytes=10_000)
+        ids = [f"{i:064x}" for i in range(40)]
+        for age, sid in enumerate(reversed(ids)):
+            store.store(sid, {"code": os.urandom(200).hex()})
+            self._age(store.path(sid), 100 + 10 * age)
+        # Reading one of the oldest marks it as used
+        self.assertIsNotNone(store.load(ids[0]))
+
+        stats = store.compact()
+        self.assertGreater(stats["evicted"], 0)
+        self.assertLessEqual(stats["bytes"], 9_000)
+        self.assertTrue(store.path(ids[0]).exists())
+        self.assertTrue(store.path(ids[-1]).exists())
+        self.assertFalse(store.path(ids[1]).exists())
+
+
+if __name__ == "__main__":
+    unittest.main()